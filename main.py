@@ -1,3 +1,4 @@
+import argparse
 import asyncio
 import os
 import sys
@@ -10,26 +11,23 @@ SRC = os.path.join(ROOT, "src")
 if os.path.isdir(SRC) and SRC not in sys.path:
     sys.path.insert(0, SRC)
 
-from mcp.server.stdio import stdio_server
-from mcp.server import Server
-from tools import register_tools
+from pnd_agents.server import serve
 
 
-async def main():
+async def main(argv=None):
     """Main entry point for the MCP server."""
-    # Create a new MCP server
-    server = Server(name="pnd-agents")
-
-    # Register all tools
-    register_tools(server)
-
-    # Run the server using stdio transport
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            server.create_initialization_options()
-        )
+    parser = argparse.ArgumentParser(description="PG AI Squad MCP server")
+    parser.add_argument(
+        "--http",
+        action="store_true",
+        help="Serve many clients over streamable HTTP/SSE instead of stdio"
+    )
+    parser.add_argument("--host", help="Interface for --http (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, help="Port for --http (default: 8765)")
+    args = parser.parse_args(argv)
+
+    # stdio by default, as launched from the Claude config
+    await serve(http=args.http, host=args.host, port=args.port)
 
 
 if __name__ == "__main__":
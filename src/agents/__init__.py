@@ -2,43 +2,44 @@
 PND Agents Package
 
 Re-exports all agent classes for convenient imports.
+
+The re-exports are resolved on first attribute access, so importing one
+agent (e.g. `from agents.qa_agent import QAAgent`) does not import every
+other agent and its dependencies.
 """
 
-from .amplience_placement_agent import AmplicencePlacementAgent
-from .analytics_agent import AnalyticsAgent
-from .broken_experience_detector_agent import BrokenExperienceDetectorAgent
-from .commerce_agent import CommerceAgent
-from .data_scientist_agent import DataScientistAgent
-from .figma_reader_agent import FigmaReaderAgent
-from .qa_agent import QAAgent
-from .sonar_validation_agent import SonarValidationAgent
-from .task_manager_agent import TaskManagerAgent
-from .technical_debt_agent import TechnicalDebtAgent
-from .test_analysis_design import TestAnalysisDesignAgent
-from .unit_test_agent import UnitTestAgent
-
-# PM Agent Pack
-from .pm_agent_pack import (
-    PRDToJiraAgent,
-    ExecSummaryAgent,
-    RoadmapReviewAgent,
-)
-
-__all__ = [
-    "AmplicencePlacementAgent",
-    "AnalyticsAgent",
-    "BrokenExperienceDetectorAgent",
-    "CommerceAgent",
-    "DataScientistAgent",
-    "FigmaReaderAgent",
-    "QAAgent",
-    "SonarValidationAgent",
-    "TaskManagerAgent",
-    "TechnicalDebtAgent",
-    "TestAnalysisDesignAgent",
-    "UnitTestAgent",
+import importlib
+
+# Exported name -> submodule defining it
+_EXPORTS = {
+    "AmplicencePlacementAgent": "amplience_placement_agent",
+    "AnalyticsAgent": "analytics_agent",
+    "BrokenExperienceDetectorAgent": "broken_experience_detector_agent",
+    "CommerceAgent": "commerce_agent",
+    "DataScientistAgent": "data_scientist_agent",
+    "FigmaReaderAgent": "figma_reader_agent",
+    "QAAgent": "qa_agent",
+    "SonarValidationAgent": "sonar_validation_agent",
+    "TaskManagerAgent": "task_manager_agent",
+    "TechnicalDebtAgent": "technical_debt_agent",
+    "TestAnalysisDesignAgent": "test_analysis_design",
+    "UnitTestAgent": "unit_test_agent",
     # PM Agent Pack
-    "PRDToJiraAgent",
-    "ExecSummaryAgent",
-    "RoadmapReviewAgent",
-]
+    "PRDToJiraAgent": "pm_agent_pack",
+    "ExecSummaryAgent": "pm_agent_pack",
+    "RoadmapReviewAgent": "pm_agent_pack",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -14,8 +14,10 @@ from .agent import (
     PerformanceFinding,
     ScanReport,
     scan_site,
+    scan_sites,
     async_scan_site,
 )
+from .browser_pool import BrowserPool, get_browser_pool, close_browser_pools
 
 __all__ = [
     "BrokenExperienceDetectorAgent",
@@ -27,5 +29,9 @@ __all__ = [
     "PerformanceFinding",
     "ScanReport",
     "scan_site",
+    "scan_sites",
     "async_scan_site",
+    "BrowserPool",
+    "get_browser_pool",
+    "close_browser_pools",
 ]
@@ -11,7 +11,7 @@ import asyncio
 import re
 import time
 from dataclasses import dataclass, field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Callable
 from urllib.parse import urljoin
 from enum import Enum
 
@@ -413,16 +413,25 @@ class BrokenExperienceDetectorAgent:
         r"amplience\.net",
     ]
     
-    def __init__(self, headless: bool = True, timeout: int = 60000):
+    # Browser context used for every scan
+    CONTEXT_OPTIONS = {
+        "viewport": {"width": 1920, "height": 1080},
+        "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    }
+    
+    def __init__(self, headless: bool = True, timeout: int = 60000, browser_pool=None):
         """
         Initialize the Broken Experience Detector Agent.
         
         Args:
             headless: Run browser in headless mode (default: True)
             timeout: Page load timeout in milliseconds (default: 60000)
+            browser_pool: Optional BrowserPool to take an isolated context
+                          from, instead of launching a browser per scan
         """
         self.headless = headless
         self.timeout = timeout
+        self.browser_pool = browser_pool
         self._browser = None
         self._context = None
         self._page = None
@@ -433,15 +442,15 @@ class BrokenExperienceDetectorAgent:
         self._failed_requests: List[Dict[str, Any]] = []
     
     async def _init_browser(self):
-        """Initialize the Playwright browser."""
-        from playwright.async_api import async_playwright
-        
-        self._playwright = await async_playwright().start()
-        self._browser = await self._playwright.chromium.launch(headless=self.headless)
-        self._context = await self._browser.new_context(
-            viewport={"width": 1920, "height": 1080},
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        )
+        """Initialize the Playwright browser, or take a context from the browser pool."""
+        if self.browser_pool is not None:
+            self._context = await self.browser_pool.acquire_context(**self.CONTEXT_OPTIONS)
+        else:
+            from playwright.async_api import async_playwright
+            
+            self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(headless=self.headless)
+            self._context = await self._browser.new_context(**self.CONTEXT_OPTIONS)
         self._page = await self._context.new_page()
         
         # Set up network request monitoring
@@ -496,6 +505,13 @@ class BrokenExperienceDetectorAgent:
     
     async def _close_browser(self):
         """Close the browser and clean up."""
+        if self.browser_pool is not None:
+            # Closing the context closes its page; the pooled browser stays up
+            if self._context:
+                await self.browser_pool.release_context(self._context)
+            self._context = None
+            self._page = None
+            return
         if self._page:
             await self._page.close()
         if self._context:
@@ -505,12 +521,18 @@ class BrokenExperienceDetectorAgent:
         if hasattr(self, '_playwright'):
             await self._playwright.stop()
     
-    async def scan_site(self, url: str) -> ScanReport:
+    async def scan_site(
+        self,
+        url: str,
+        on_progress: Optional[Callable[[int, int, str], None]] = None
+    ) -> ScanReport:
         """
         Scan a website and generate a comprehensive report.
         
         Args:
             url: The URL to scan
+            on_progress: Called as on_progress(done, total, message) as
+                         each scan stage starts
             
         Returns:
             ScanReport with all detected issues
@@ -528,8 +550,22 @@ class BrokenExperienceDetectorAgent:
         self._console_messages = []
         self._failed_requests = []
         
+        checks = [
+            ("console errors", self._check_console_errors),
+            ("network issues", self._check_network_issues),
+            ("broken images", self._check_broken_images),
+            ("broken links", self._check_broken_links),
+            ("SEO", self._check_seo_issues),
+            ("accessibility", self._check_accessibility_issues),
+            ("performance", self._check_performance_issues),
+            ("UX", self._check_ux_issues),
+        ]
+        total = len(checks) + 1
+        
         try:
             await self._init_browser()
+            if on_progress:
+                on_progress(0, total, f"Loading {url}")
             
             # Navigate to the page using domcontentloaded instead of networkidle
             # networkidle can hang indefinitely on heavy e-commerce sites with analytics
@@ -559,14 +595,10 @@ class BrokenExperienceDetectorAgent:
             await asyncio.sleep(3 if page_load_partial else 2)
             
             # Run all checks
-            await self._check_console_errors(report)
-            await self._check_network_issues(report)
-            await self._check_broken_images(report)
-            await self._check_broken_links(report)
-            await self._check_seo_issues(report)
-            await self._check_accessibility_issues(report)
-            await self._check_performance_issues(report)
-            await self._check_ux_issues(report)
+            for done, (label, check) in enumerate(checks, start=1):
+                if on_progress:
+                    on_progress(done, total, f"Checking {label}")
+                await check(report)
             
             # Calculate score
             report.score = self._calculate_score(report)
@@ -1216,6 +1248,38 @@ def scan_site(url: str, headless: bool = True) -> Dict[str, Any]:
     }
 
 
+async def scan_sites(
+    urls: List[str],
+    headless: bool = True,
+    max_concurrent: int = 2,
+    max_scans_per_browser: int = 50
+) -> List[ScanReport]:
+    """
+    Scan several URLs with one warm browser.
+    
+    Each scan gets its own browser context from a BrowserPool, so only the
+    first scan pays for launching Chromium.
+    
+    Args:
+        urls: The URLs to scan
+        headless: Run browser in headless mode (default: True)
+        max_concurrent: Scans running at once
+        max_scans_per_browser: Scans before the browser is relaunched
+    
+    Returns:
+        One ScanReport per URL, in input order
+    """
+    from .browser_pool import BrowserPool
+    
+    async with BrowserPool(
+        headless=headless,
+        max_contexts=max_concurrent,
+        max_scans_per_browser=max_scans_per_browser
+    ) as pool:
+        agents = [BrokenExperienceDetectorAgent(headless=headless, browser_pool=pool) for _ in urls]
+        return await asyncio.gather(*(agent.scan_site(url) for agent, url in zip(agents, urls)))
+
+
 async def async_scan_site(url: str, headless: bool = True) -> Dict[str, Any]:
     """
     Async convenience function to scan a site and return results.
@@ -0,0 +1,220 @@
+"""
+Browser Pool
+
+Keeps one Chromium instance warm for back-to-back broken experience scans.
+
+Launching Chromium costs one to two seconds per scan. The pool launches it
+once, hands each scan its own browser context (separate cookies, storage
+and cache), and bounds how many contexts are open at once. The browser is
+replaced after a number of scans, to cap memory growth, and relaunched if
+it crashes or disconnects.
+
+Playwright's async objects belong to the event loop that created them, so
+a pool must only be used from one loop; get_browser_pool() keeps one pool
+per running loop.
+"""
+
+import asyncio
+import logging
+import weakref
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger("pnd_agents.browser_pool")
+
+# Browser contexts open at once
+DEFAULT_MAX_CONTEXTS = 4
+
+# Scans served by one browser before it is replaced
+DEFAULT_MAX_SCANS_PER_BROWSER = 50
+
+
+class BrowserPool:
+    """
+    Persistent Playwright Chromium browser handing out isolated contexts.
+    
+    Features:
+    - Lazy launch on first use
+    - One fresh browser context per scan, at most max_contexts at once
+    - Browser recycled after max_scans_per_browser scans, once idle
+    - Automatic relaunch after a crash or disconnect
+    """
+    
+    def __init__(
+        self,
+        headless: bool = True,
+        max_contexts: int = DEFAULT_MAX_CONTEXTS,
+        max_scans_per_browser: int = DEFAULT_MAX_SCANS_PER_BROWSER,
+        launch_options: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Initialize the browser pool.
+        
+        Args:
+            headless: Run the browser in headless mode.
+            max_contexts: Maximum browser contexts open at once; further
+                          scans wait for a free slot.
+            max_scans_per_browser: Contexts served by one browser before it
+                                   is closed and relaunched.
+            launch_options: Extra keyword arguments for chromium.launch().
+        """
+        if max_contexts < 1:
+            raise ValueError("max_contexts must be at least 1")
+        self.headless = headless
+        self.max_contexts = max_contexts
+        self.max_scans_per_browser = max_scans_per_browser
+        self.launch_options = launch_options or {}
+        
+        self._playwright = None
+        self._browser = None
+        self._browser_scans = 0
+        self._active: Dict[Any, Any] = {}  # Context -> browser that created it
+        self._retired: List[Any] = []  # Browsers waiting for their last context to close
+        self._slots = asyncio.Semaphore(max_contexts)
+        self._lock = asyncio.Lock()
+        self._closed = False
+        self._launches = 0
+        self._scans = 0
+    
+    async def acquire_context(self, **context_options) -> Any:
+        """
+        Open a new browser context, launching the browser if needed.
+        
+        Waits while max_contexts contexts are open. Hand the context back
+        with release_context().
+        
+        Args:
+            **context_options: Options for browser.new_context(), such as
+                               viewport or user_agent.
+        """
+        if self._closed:
+            raise RuntimeError("BrowserPool is closed")
+        
+        await self._slots.acquire()
+        browser = None
+        try:
+            async with self._lock:
+                browser = await self._get_browser()
+                self._browser_scans += 1
+                self._scans += 1
+                if self._browser_scans >= self.max_scans_per_browser:
+                    # Serve this scan, then let the browser go once its contexts close
+                    self._browser = None
+                    self._retired.append(browser)
+            context = await browser.new_context(**context_options)
+        except BaseException:
+            self._slots.release()
+            if browser is not None and browser in self._retired and browser not in self._active.values():
+                self._retired.remove(browser)
+                await self._close_browser(browser)
+            raise
+        
+        self._active[context] = browser
+        return context
+    
+    async def release_context(self, context: Any):
+        """Close a context from acquire_context() and free its slot."""
+        if context not in self._active:
+            return
+        browser = self._active.pop(context)
+        try:
+            await context.close()
+        except Exception as e:
+            # The browser may have crashed with the page; it is relaunched on next use
+            logger.warning(f"Failed to close browser context: {e}")
+        finally:
+            self._slots.release()
+        
+        if browser in self._retired and browser not in self._active.values():
+            self._retired.remove(browser)
+            await self._close_browser(browser)
+    
+    async def close(self):
+        """Close every context, the browser and Playwright."""
+        self._closed = True
+        async with self._lock:
+            for context in list(self._active):
+                try:
+                    await context.close()
+                except Exception:
+                    pass
+            self._active.clear()
+            
+            browsers = self._retired + ([self._browser] if self._browser else [])
+            self._retired = []
+            self._browser = None
+            for browser in browsers:
+                await self._close_browser(browser)
+            
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get pool counters."""
+        return {
+            "launches": self._launches,
+            "scans": self._scans,
+            "active_contexts": len(self._active),
+            "browser_scans": self._browser_scans,
+            "connected": bool(self._browser and self._browser.is_connected()),
+        }
+    
+    async def __aenter__(self) -> "BrowserPool":
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+    
+    async def _get_browser(self) -> Any:
+        """Get the live browser, launching a new one if needed. Called with the lock held."""
+        if self._browser is not None and self._browser.is_connected():
+            return self._browser
+        
+        if self._browser is not None:
+            logger.warning("Browser disconnected; relaunching")
+            crashed, self._browser = self._browser, None
+            if crashed in self._active.values():
+                self._retired.append(crashed)
+            else:
+                await self._close_browser(crashed)
+        
+        if self._playwright is None:
+            from playwright.async_api import async_playwright
+            self._playwright = await async_playwright().start()
+        
+        self._browser = await self._playwright.chromium.launch(headless=self.headless, **self.launch_options)
+        self._browser_scans = 0
+        self._launches += 1
+        return self._browser
+    
+    @staticmethod
+    async def _close_browser(browser: Any):
+        """Close a browser, ignoring one that already crashed."""
+        try:
+            await browser.close()
+        except Exception as e:
+            logger.warning(f"Failed to close browser: {e}")
+
+
+# Event loop -> {headless: BrowserPool}
+_browser_pools: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def get_browser_pool(headless: bool = True) -> BrowserPool:
+    """
+    Get the shared browser pool for the running event loop.
+    
+    Must be called from a coroutine. Pools are kept per headless setting.
+    """
+    loop = asyncio.get_running_loop()
+    pools = _browser_pools.setdefault(loop, {})
+    if headless not in pools:
+        pools[headless] = BrowserPool(headless=headless)
+    return pools[headless]
+
+
+async def close_browser_pools():
+    """Close the shared browser pools of the running event loop."""
+    pools = _browser_pools.pop(asyncio.get_running_loop(), {})
+    for pool in pools.values():
+        await pool.close()
@@ -14,6 +14,8 @@ from typing import Optional, List, Dict, Any
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 
+from workflows.tracing import http_event_hooks
+
 
 class ProductCategory(Enum):
     """Common product categories."""
@@ -137,6 +139,7 @@ class CommerceAgent:
                 "x-dw-client-id": self.client_id,
             },
             timeout=30.0,
+            event_hooks=http_event_hooks(),
         )
         
         self._auth_token: Optional[str] = None
@@ -328,6 +331,9 @@ class CommerceAgent:
             
             return data.get("hits", [])
         except Exception as e:
+            if isinstance(e, httpx.HTTPStatusError) and e.response.status_code == 401:
+                # Guest token expired; authenticate again on the next search
+                self._auth_token = None
             # If OCAPI fails, return mock data for POC
             return self._get_mock_products(query, category, max_price, min_price)
     
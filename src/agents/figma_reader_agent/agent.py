@@ -14,6 +14,8 @@ from typing import Optional, List, Dict, Any
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 
+from workflows.tracing import http_event_hooks
+
 
 class FigmaNodeType(Enum):
     """Types of Figma nodes."""
@@ -264,6 +266,7 @@ class FigmaReaderAgent:
                 "Content-Type": "application/json",
             },
             timeout=30.0,
+            event_hooks=http_event_hooks(),
         )
         
         # Cache for styles
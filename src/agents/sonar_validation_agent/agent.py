@@ -20,6 +20,8 @@ from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
 
+from workflows.tracing import http_event_hooks
+
 from ..coding_standards import (
     REPO_IGNORED_RULES,
     TEST_GENERATION_LIMITS,
@@ -420,6 +422,7 @@ class SonarValidationAgent:
         self.client = httpx.Client(
             headers=headers,
             timeout=30.0,
+            event_hooks=http_event_hooks(),
         )
     
     def get_repo_policy(self, repo_name: str) -> RepoPolicy:
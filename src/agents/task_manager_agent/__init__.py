@@ -1,11 +1,18 @@
 """
 Task Manager Agent Package
 
-Exports the TaskManagerAgent class.
+Exports the TaskManagerAgent class, the concurrent workflow job queue and
+batch task helpers.
 """
 
 from .agent import TaskManagerAgent
+from .job_queue import WorkflowJob, WorkflowJobQueue
+from .batch import BatchTask, read_tasks
 
 __all__ = [
     "TaskManagerAgent",
+    "WorkflowJob",
+    "WorkflowJobQueue",
+    "BatchTask",
+    "read_tasks",
 ]
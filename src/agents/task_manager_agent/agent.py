@@ -7,6 +7,8 @@ executing agents in sequence or parallel, and producing final deliverables.
 Supports:
 - Sequential execution (default)
 - Parallel execution for independent agents
+- Dependency-driven (DAG) execution
+- Batch runs over JSONL/CSV task files with resumable results
 - Cross-agent communication
 - Comprehensive summary output with trace events
 """
@@ -16,8 +18,9 @@ import logging
 import os
 import subprocess
 import sys
+from concurrent.futures import FIRST_COMPLETED
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Callable
+from typing import Dict, List, Any, Optional, Callable, Iterable, Union
 
 # Add src/ directory to path for imports
 # Path: src/agents/task_manager_agent/agent.py
@@ -33,6 +36,7 @@ from workflows.workflow_engine import (
     AgentResult
 )
 from workflows.agent_dispatcher import AgentDispatcher, get_dispatcher
+from .batch import BatchResultWriter, BatchTask, load_finished, to_batch_task
 
 logger = logging.getLogger("pnd_agents.task_manager")
 
@@ -64,7 +68,17 @@ class TaskManagerAgent:
         "default": [["frontend"], ["review"], ["unit_test"], ["sonar"]],
     }
     
-    def __init__(self, rules_file: Optional[str] = None, repo_root: Optional[str] = None):
+    # Upstream dependencies per agent for DAG execution, keyed by task type.
+    # Task types without an entry derive their graph from PARALLEL_GROUPS.
+    DEPENDENCIES: Dict[str, Dict[str, List[str]]] = {}
+    
+    def __init__(
+        self,
+        rules_file: Optional[str] = None,
+        repo_root: Optional[str] = None,
+        use_result_cache: bool = False,
+        adaptive_scheduling: bool = False
+    ):
         """
         Initialize the Task Manager Agent.
         
@@ -75,6 +89,10 @@ class TaskManagerAgent:
                       and the repo has a .claude/repo-profile.json, the
                       Code Singularity pattern will be used to inject
                       repo context into all workflows.
+            use_result_cache: Reuse cached results of cacheable agents when
+                             their inputs and the repo revision are unchanged.
+            adaptive_scheduling: Order stages and size worker pools from
+                                historical agent durations.
         """
         if rules_file is None:
             # Go up from src/agents/task_manager_agent/ to repo root, then into workflows/
@@ -90,6 +108,10 @@ class TaskManagerAgent:
             rules_file = os.path.join(pnd_agents_root, "workflows", "workflow_rules.json")
         
         self.engine = WorkflowEngine(rules_file)
+        if use_result_cache:
+            self.engine.enable_result_cache()
+        if adaptive_scheduling:
+            self.engine.enable_adaptive_scheduler()
         self.dispatcher = get_dispatcher()
         self._rules_file = rules_file
         self._repo_root = repo_root
@@ -108,6 +130,20 @@ class TaskManagerAgent:
         if repo_root:
             self._init_repo_adapter(repo_root)
     
+    def shutdown(self, wait: bool = True):
+        """
+        Release the engine's worker pools and write queued stage durations.
+        
+        Call once the agent is no longer needed, or use it as a context manager.
+        """
+        self.engine.shutdown(wait=wait)
+    
+    def __enter__(self) -> "TaskManagerAgent":
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
+    
     def _init_repo_adapter(self, repo_root: str):
         """
         Initialize RepoAdapter for Code Singularity pattern.
@@ -162,7 +198,7 @@ class TaskManagerAgent:
         return None
     
     def _load_parallel_groups_from_rules(self):
-        """Load parallel groups from workflow_rules.json if available."""
+        """Load parallel groups and DAG dependencies from workflow_rules.json if available."""
         try:
             if os.path.exists(self._rules_file):
                 with open(self._rules_file, "r") as f:
@@ -170,9 +206,30 @@ class TaskManagerAgent:
                     if "parallel_groups" in rules:
                         self.PARALLEL_GROUPS.update(rules["parallel_groups"])
                         logger.info(f"Loaded parallel groups from {self._rules_file}")
+                    if "dependencies" in rules:
+                        self.DEPENDENCIES.update(rules["dependencies"])
+                        logger.info(f"Loaded DAG dependencies from {self._rules_file}")
         except Exception as e:
             logger.warning(f"Could not load parallel groups from rules file: {e}")
     
+    def get_dependencies(self, task_type_key: str) -> Dict[str, List[str]]:
+        """
+        Get the DAG dependencies for a task type.
+        
+        Falls back to a graph derived from the parallel groups, where each
+        agent depends on every agent of the previous group.
+        
+        Args:
+            task_type_key: Task type value (e.g., "figma", "frontend").
+        
+        Returns:
+            Mapping of agent name to the agents it depends on.
+        """
+        if task_type_key in self.DEPENDENCIES:
+            return {agent: list(deps) for agent, deps in self.DEPENDENCIES[task_type_key].items()}
+        parallel_groups = self.PARALLEL_GROUPS.get(task_type_key, self.PARALLEL_GROUPS["default"])
+        return WorkflowEngine.dependencies_from_groups(parallel_groups)
+    
     def _get_current_git_branch(self) -> Optional[str]:
         """Get the current git branch name.
         
@@ -381,33 +438,44 @@ class TaskManagerAgent:
         task_description: str,
         metadata: Optional[Dict[str, Any]] = None,
         verbose: bool = True,
-        max_workers: int = 4
+        max_workers: Optional[int] = None,
+        use_dag: bool = False,
+        manage_git_branch: bool = True
     ) -> WorkflowContext:
         """
         Run a task workflow with parallel execution support.
         
         Agents within the same group run in parallel, groups run sequentially.
+        With use_dag, each agent instead starts as soon as its upstream
+        dependencies finish.
         
         Args:
             task_description: Natural language task description.
             metadata: Optional metadata (ticket ID, branch name, etc.)
             verbose: Whether to print progress updates.
-            max_workers: Maximum number of parallel workers.
+            max_workers: Maximum number of parallel workers. Defaults to the
+                        engine's: 4, or sized from agent duration history
+                        with adaptive scheduling.
+            use_dag: Whether to use dependency-driven (DAG) scheduling.
+            manage_git_branch: Whether to check out the task's git branch first.
+                              Disable when running several tasks concurrently
+                              in one checkout.
             
         Returns:
             WorkflowContext with results from all stages.
         """
         # Ensure we're on the correct git branch before making changes
-        if not self._ensure_git_branch(metadata, verbose):
+        if manage_git_branch and not self._ensure_git_branch(metadata, verbose):
             raise RuntimeError("Failed to setup git branch. Aborting to prevent changes on main branch.")
         
         context = self.engine.create_workflow(task_description, metadata)
         
         task_type_key = context.task_type.value
         parallel_groups = self.PARALLEL_GROUPS.get(task_type_key, self.PARALLEL_GROUPS["default"])
+        dependencies = self.get_dependencies(task_type_key) if use_dag else None
         
         if verbose:
-            self._print_plan(context, parallel_groups)
+            self._print_plan(context, parallel_groups, dependencies)
         
         def on_start(agent_name: str, ctx: WorkflowContext):
             if verbose:
@@ -432,7 +500,8 @@ class TaskManagerAgent:
             on_stage_start=on_start,
             on_stage_complete=on_complete,
             max_workers=max_workers,
-            continue_on_error=True
+            continue_on_error=True,
+            dependencies=dependencies
         )
         
         if verbose:
@@ -440,17 +509,116 @@ class TaskManagerAgent:
         
         return context
     
-    def resume_task(self, verbose: bool = True) -> Optional[WorkflowContext]:
+    def run_tasks(
+        self,
+        tasks: Iterable[Union[str, Dict[str, Any], BatchTask]],
+        output_path: Optional[str] = None,
+        max_concurrent_jobs: int = 4,
+        max_workers_per_job: int = 4,
+        use_dag: bool = True,
+        retry_failed: bool = False,
+        verbose: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Run many tasks through a bounded pool of concurrent workflows.
+        
+        Tasks are consumed lazily (e.g. from batch.read_tasks), so only a
+        small window is held in memory. All workflows share this agent's
+        engine, dispatcher and pooled agent clients. Each finished task is
+        appended to output_path as one JSON line; rerunning with the same
+        output_path skips tasks that already have a result, so an
+        interrupted batch continues where it stopped.
+        
+        Git branches are not switched, since the workflows share one checkout.
+        
+        Args:
+            tasks: Description strings, dicts (see batch.to_batch_task) or BatchTasks.
+            output_path: JSONL results file, also used as the resume cursor.
+            max_concurrent_jobs: Maximum number of workflows running at once.
+            max_workers_per_job: Maximum parallel stages within one workflow.
+            use_dag: Whether workflows use dependency-driven (DAG) scheduling.
+            retry_failed: Re-run tasks whose recorded result is not "completed".
+            verbose: Whether to print a line per finished task.
+        
+        Returns:
+            Counts of completed, failed and skipped (already finished) tasks.
+        """
+        from .job_queue import WorkflowJobQueue
+        
+        finished = load_finished(output_path, retry_failed) if output_path else set()
+        counts = {"completed": 0, "failed": 0, "skipped": 0}
+        # Keep a few tasks queued per slot so workers never wait on the input
+        window = max(1, max_concurrent_jobs) * 2
+        in_flight: Dict[str, BatchTask] = {}
+        
+        queue = WorkflowJobQueue(
+            self,
+            max_concurrent_jobs=max_concurrent_jobs,
+            max_workers_per_job=max_workers_per_job,
+            use_dag=use_dag
+        )
+        writer = BatchResultWriter(output_path) if output_path else None
+        
+        def collect():
+            for job in queue.wait(list(in_flight), return_when=FIRST_COMPLETED):
+                if not job.done:
+                    continue
+                task = in_flight.pop(job.job_id)
+                record = {"task_id": task.task_id, "index": task.index, **job.to_dict()}
+                if record["result"]:
+                    # The full trace stays in the workflow's context journal
+                    record["result"].pop("trace", None)
+                if writer:
+                    writer.write(record)
+                counts["completed" if job.status == "completed" else "failed"] += 1
+                
+                if verbose:
+                    status_icon = "✓" if job.status == "completed" else "✗"
+                    print(f"[{datetime.now().strftime('%H:%M:%S')}] {status_icon} {task.task_id}: {job.status} ({job.workflow_id or job.error})")
+        
+        finished_cleanly = False
+        try:
+            for index, item in enumerate(tasks):
+                task = to_batch_task(item, index)
+                if task.task_id in finished:
+                    counts["skipped"] += 1
+                    continue
+                
+                while len(in_flight) >= window:
+                    collect()
+                
+                job = queue.submit(task.task_description, {**task.metadata, "batch_task_id": task.task_id})
+                in_flight[job.job_id] = task
+            
+            while in_flight:
+                collect()
+            finished_cleanly = True
+        finally:
+            # On interruption, unfinished tasks have no result yet and run again next time
+            queue.shutdown(wait=finished_cleanly, cancel_pending=not finished_cleanly)
+            if writer:
+                writer.close()
+        
+        summary = {"output": output_path, **counts}
+        if verbose:
+            print(f"\nBatch finished: {counts['completed']} completed, {counts['failed']} failed, {counts['skipped']} skipped")
+        return summary
+    
+    def resume_task(self, verbose: bool = True, workflow_id: Optional[str] = None) -> Optional[WorkflowContext]:
         """
         Resume a previously interrupted task.
         
+        Works for sequential, parallel and DAG runs: completed stages keep
+        their saved outputs and only unfinished stages run again.
+        
         Args:
             verbose: Whether to print progress updates.
+            workflow_id: Workflow to resume. Defaults to the most recent one.
             
         Returns:
             WorkflowContext if a task was resumed, None otherwise.
         """
-        context = self.engine.load_context()
+        context = self.engine.load_context(workflow_id)
         if not context:
             if verbose:
                 print("No interrupted task found.")
@@ -465,71 +633,55 @@ class TaskManagerAgent:
             print(f"Resuming task: {context.task_description[:50]}...")
             print(f"Current stage: {context.current_agent}")
         
-        # Find where to resume
-        resume_from = None
-        for agent in context.pipeline:
-            stage = context.stages.get(agent)
-            if stage and stage.status in ["pending", "in_progress"]:
-                resume_from = agent
-                break
-        
-        if not resume_from:
+        pending = [
+            agent for agent in context.pipeline
+            if agent not in context.stages
+            or context.stages[agent].status not in self.engine.RESUME_DONE_STATUSES
+        ]
+        if not pending:
             if verbose:
                 print("All stages completed.")
             return context
         
-        # Continue from resume point
-        resume_idx = context.pipeline.index(resume_from)
-        remaining_pipeline = context.pipeline[resume_idx:]
-        
-        # Get last output for input
-        current_input = context.get_last_output()
-        if not current_input:
-            current_input = {
-                "task": context.task_description,
-                "metadata": context.metadata
-            }
+        if verbose:
+            print(f"Re-running: {', '.join(pending)}")
         
-        for agent_name in remaining_pipeline:
+        def on_start(agent_name: str, ctx: WorkflowContext):
             if verbose:
                 print(f"\n[{datetime.now().strftime('%H:%M:%S')}] Running: {agent_name.capitalize()}Agent")
-            
-            result = self.engine.execute_agent(agent_name, context, current_input)
-            
+            if self._on_stage_start:
+                self._on_stage_start(agent_name, ctx)
+        
+        def on_complete(agent_name: str, result: AgentResult, ctx: WorkflowContext):
             if verbose:
-                status_icon = "✓" if result.status == "success" else "✗"
+                status_icon = "✓" if result.status == "success" else "✗" if result.status == "error" else "○"
                 print(f"[{datetime.now().strftime('%H:%M:%S')}] {status_icon} Completed: {agent_name.capitalize()}Agent")
-            
-            if result.status == "error":
-                context.status = "failed"
-                break
-            
-            if result.data:
-                current_input = {
-                    **current_input,
-                    "previous_agent": agent_name,
-                    "previous_output": result.data
-                }
-        
-        if context.status != "failed":
-            context.status = "completed"
+            if self._on_stage_complete:
+                self._on_stage_complete(agent_name, result, ctx)
         
-        context.completed_at = datetime.utcnow().isoformat()
-        self.engine.save_context(context)
+        # Replays the recorded sequential/parallel/DAG plan, skipping finished stages
+        context = self.engine.resume_workflow(
+            context,
+            on_stage_start=on_start,
+            on_stage_complete=on_complete
+        )
         
         if verbose:
             self._print_summary(context)
         
         return context
     
-    def get_status(self) -> Optional[Dict[str, Any]]:
+    def get_status(self, workflow_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
         Get the status of the current/last task.
         
+        Args:
+            workflow_id: Workflow to report on. Defaults to the most recent one.
+        
         Returns:
             Dictionary with task status, or None if no task exists.
         """
-        context = self.engine.load_context()
+        context = self.engine.load_context(workflow_id)
         if not context:
             return None
         
@@ -550,11 +702,21 @@ class TaskManagerAgent:
             }
         }
     
-    def clear_task(self):
-        """Clear the current task context."""
-        self.engine.clear_context()
+    def clear_task(self, workflow_id: Optional[str] = None):
+        """
+        Clear saved task contexts.
+        
+        Args:
+            workflow_id: Workflow to clear. Clears every saved workflow if None.
+        """
+        self.engine.clear_context(workflow_id)
     
-    def _print_plan(self, context: WorkflowContext, parallel_groups: Optional[List[List[str]]] = None):
+    def _print_plan(
+        self,
+        context: WorkflowContext,
+        parallel_groups: Optional[List[List[str]]] = None,
+        dependencies: Optional[Dict[str, List[str]]] = None
+    ):
         """Print the workflow plan."""
         print("\n" + "=" * 60)
         print("TASK MANAGER AGENT - Workflow Plan")
@@ -563,7 +725,14 @@ class TaskManagerAgent:
         print(f"Detected Type: {context.task_type.value}")
         print(f"Workflow ID: {context.workflow_id}")
         
-        if parallel_groups:
+        if dependencies:
+            print(f"\nExecution Mode: DAG")
+            print("\nDependencies:")
+            for agent in WorkflowEngine.topological_order(dependencies):
+                upstream = dependencies[agent]
+                after = ", ".join(a.capitalize() + "Agent" for a in upstream) if upstream else "start"
+                print(f"  {agent.capitalize()}Agent <- {after}")
+        elif parallel_groups:
             print(f"\nExecution Mode: PARALLEL")
             print("\nParallel Groups:")
             for i, group in enumerate(parallel_groups):
@@ -723,9 +892,9 @@ def run_task(task_description: str, metadata: Optional[Dict[str, Any]] = None, v
     Returns:
         Dictionary with workflow results.
     """
-    agent = TaskManagerAgent()
-    context = agent.run_task(task_description, metadata, verbose)
-    return agent.to_dict(context)
+    with TaskManagerAgent() as agent:
+        context = agent.run_task(task_description, metadata, verbose)
+        return agent.to_dict(context)
 
 
 def analyze_task(task_description: str) -> Dict[str, Any]:
@@ -738,5 +907,5 @@ def analyze_task(task_description: str) -> Dict[str, Any]:
     Returns:
         Dictionary with task analysis and workflow plan.
     """
-    agent = TaskManagerAgent()
-    return agent.analyze_task(task_description)
+    with TaskManagerAgent() as agent:
+        return agent.analyze_task(task_description)
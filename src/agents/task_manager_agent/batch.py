@@ -0,0 +1,153 @@
+"""
+Batch Tasks
+
+Reads task backlogs from JSONL or CSV files and writes batch results
+incrementally, for TaskManagerAgent.run_tasks and `pnd-agents run-batch`.
+
+The results file doubles as the resume cursor: each finished task is
+appended as one JSON line carrying its task_id, so rerunning a batch with
+the same results file skips every task that already has a result.
+"""
+
+import csv
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Any, Iterator, Optional, Set, Union
+
+# Input fields holding the task description, in order of preference
+DESCRIPTION_FIELDS = ("task", "task_description", "description", "summary")
+
+# Input fields identifying a task across runs, in order of preference
+ID_FIELDS = ("id", "task_id", "ticket_id", "key")
+
+
+@dataclass
+class BatchTask:
+    """One task read from a batch input."""
+    task_id: str
+    task_description: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    index: int = 0
+
+
+def to_batch_task(item: Union[str, Dict[str, Any], BatchTask], index: int) -> BatchTask:
+    """
+    Normalize a batch input item.
+    
+    Items are plain description strings or dicts with a description field
+    (see DESCRIPTION_FIELDS), an optional ID (see ID_FIELDS) and optional
+    "metadata". Other non-empty fields, such as CSV columns, are added to
+    the metadata. Tasks without an ID are identified by their position.
+    
+    Raises:
+        ValueError: If a dict item has no description.
+    """
+    if isinstance(item, BatchTask):
+        return item
+    if isinstance(item, str):
+        return BatchTask(task_id=str(index), task_description=item, index=index)
+    
+    description = next((item[name] for name in DESCRIPTION_FIELDS if item.get(name)), None)
+    if not description:
+        raise ValueError(f"Task {index} has no description (expected one of: {', '.join(DESCRIPTION_FIELDS)})")
+    
+    task_id = next((str(item[name]) for name in ID_FIELDS if item.get(name)), str(index))
+    metadata = dict(item.get("metadata") or {})
+    for key, value in item.items():
+        if key not in DESCRIPTION_FIELDS and key not in ("id", "task_id", "metadata") and value not in (None, ""):
+            metadata.setdefault(key, value)
+    
+    return BatchTask(task_id=task_id, task_description=str(description), metadata=metadata, index=index)
+
+
+def read_tasks(path: str, file_format: Optional[str] = None) -> Iterator[BatchTask]:
+    """
+    Stream tasks from a JSONL or CSV file.
+    
+    JSONL lines are JSON objects or strings; blank lines are skipped. CSV
+    files need a header row with a description column.
+    
+    Args:
+        path: Input file path.
+        file_format: "jsonl" or "csv". Defaults to the file extension.
+    
+    Raises:
+        ValueError: If a line is not valid JSON or a task has no description.
+    """
+    file_format = file_format or ("csv" if path.lower().endswith(".csv") else "jsonl")
+    
+    with open(path, "r", newline="" if file_format == "csv" else None) as f:
+        if file_format == "csv":
+            for index, row in enumerate(csv.DictReader(f)):
+                yield to_batch_task(row, index)
+            return
+        
+        index = 0
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{line_number}: invalid JSON: {e}") from None
+            yield to_batch_task(item, index)
+            index += 1
+
+
+def load_finished(output_path: str, retry_failed: bool = False) -> Set[str]:
+    """
+    Get the IDs of tasks that already have a result in a results file.
+    
+    Args:
+        output_path: Results file written by a previous run.
+        retry_failed: Leave failed tasks out, so they run again.
+    """
+    finished: Set[str] = set()
+    if not os.path.exists(output_path):
+        return finished
+    
+    with open(output_path, "r") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A torn final write from an interrupted run; that task runs again
+                continue
+            if retry_failed and record.get("status") != "completed":
+                continue
+            finished.add(str(record.get("task_id")))
+    
+    return finished
+
+
+class BatchResultWriter:
+    """Appends one JSON line per finished task, flushed as it is written."""
+    
+    def __init__(self, output_path: str):
+        directory = os.path.dirname(output_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.output_path = output_path
+        self._file = open(output_path, "a")
+        # Terminate a torn last line from an interrupted run so the next record starts cleanly
+        if self._file.tell() > 0:
+            with open(output_path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    self._file.write("\n")
+    
+    def write(self, record: Dict[str, Any]):
+        """Append a result record."""
+        self._file.write(json.dumps(record, default=str) + "\n")
+        self._file.flush()
+    
+    def close(self):
+        """Close the results file."""
+        self._file.close()
+    
+    def __enter__(self) -> "BatchResultWriter":
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
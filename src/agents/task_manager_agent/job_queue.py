@@ -0,0 +1,265 @@
+"""
+Workflow Job Queue
+
+Runs many task workflows concurrently from one process, e.g. to push a
+batch of Jira tickets through the Task Manager at once.
+
+Every job gets its own WorkflowContext (and context journal), while all
+jobs share one TaskManagerAgent: one engine, one dispatcher, the engine's
+process pool and the pooled agent instances with their HTTP clients.
+"""
+
+import logging
+import threading
+import uuid
+from concurrent.futures import ALL_COMPLETED, Future, ThreadPoolExecutor, wait as wait_futures
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Any, Optional, TYPE_CHECKING
+
+from workflows.workflow_engine import WorkflowContext
+
+if TYPE_CHECKING:
+    from .agent import TaskManagerAgent
+
+logger = logging.getLogger("pnd_agents.job_queue")
+
+
+@dataclass
+class WorkflowJob:
+    """A task queued for execution."""
+    job_id: str
+    task_description: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    status: str = "queued"  # queued, running, completed, failed, cancelled
+    workflow_id: Optional[str] = None
+    submitted_at: str = ""
+    started_at: Optional[str] = None
+    completed_at: Optional[str] = None
+    error: Optional[str] = None
+    context: Optional[WorkflowContext] = None
+    
+    def __post_init__(self):
+        if not self.submitted_at:
+            self.submitted_at = datetime.utcnow().isoformat()
+    
+    @property
+    def done(self) -> bool:
+        """Whether the job has finished (successfully or not)."""
+        return self.status in ("completed", "failed", "cancelled")
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert job status and results to a dictionary."""
+        return {
+            "job_id": self.job_id,
+            "task_description": self.task_description,
+            "status": self.status,
+            "workflow_id": self.workflow_id,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "completed_at": self.completed_at,
+            "error": self.error,
+            "result": self.context.get_summary() if self.context else None,
+        }
+
+
+class WorkflowJobQueue:
+    """
+    Queue that runs task workflows concurrently.
+    
+    Features:
+    - Global limit on concurrently running workflows
+    - Per-agent concurrency limits shared across all jobs
+    - Isolated context per job, with per-job status and results
+    - Shared engine, dispatcher and pooled agent instances
+    
+    Jobs do not switch git branches: concurrent jobs share one checkout,
+    so branch management is left to the caller.
+    """
+    
+    def __init__(
+        self,
+        task_manager: Optional["TaskManagerAgent"] = None,
+        max_concurrent_jobs: int = 4,
+        agent_limits: Optional[Dict[str, int]] = None,
+        max_workers_per_job: int = 4,
+        use_dag: bool = True
+    ):
+        """
+        Initialize the job queue.
+        
+        Args:
+            task_manager: TaskManagerAgent shared by all jobs. Created if not
+                         provided, and then shut down with the queue.
+            max_concurrent_jobs: Maximum number of workflows running at once.
+            agent_limits: Optional per-agent concurrency limits, e.g. {"sonar": 2}.
+                         Overrides "maxConcurrency" from the rules file.
+            max_workers_per_job: Maximum parallel stages within one workflow.
+            use_dag: Whether jobs use dependency-driven (DAG) scheduling.
+        """
+        # A task manager created here is shut down with the queue
+        self._own_task_manager = task_manager is None
+        if task_manager is None:
+            from .agent import TaskManagerAgent
+            task_manager = TaskManagerAgent()
+        
+        self.task_manager = task_manager
+        self.max_workers_per_job = max_workers_per_job
+        self.use_dag = use_dag
+        
+        for agent_name, limit in (agent_limits or {}).items():
+            self.task_manager.engine.set_agent_concurrency(agent_name, limit)
+        
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_concurrent_jobs),
+            thread_name_prefix="pnd-workflow-job"
+        )
+        self._jobs: Dict[str, WorkflowJob] = {}
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+    
+    def submit(self, task_description: str, metadata: Optional[Dict[str, Any]] = None) -> WorkflowJob:
+        """
+        Queue a task for execution.
+        
+        Args:
+            task_description: Natural language task description.
+            metadata: Optional metadata (ticket ID, etc.)
+        
+        Returns:
+            The queued WorkflowJob.
+        """
+        job = WorkflowJob(
+            job_id=str(uuid.uuid4())[:8],
+            task_description=task_description,
+            metadata=dict(metadata or {})
+        )
+        
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._futures[job.job_id] = self._executor.submit(self._run_job, job)
+        
+        return job
+    
+    def submit_many(self, tasks: List[Dict[str, Any]]) -> List[WorkflowJob]:
+        """
+        Queue several tasks.
+        
+        Args:
+            tasks: List of dicts with "task_description" and optional "metadata".
+        
+        Returns:
+            The queued jobs, in input order.
+        """
+        return [self.submit(task["task_description"], task.get("metadata")) for task in tasks]
+    
+    def get_job(self, job_id: str) -> Optional[WorkflowJob]:
+        """Get a job by ID."""
+        return self._jobs.get(job_id)
+    
+    def get_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job's status and results as a dictionary."""
+        job = self._jobs.get(job_id)
+        return job.to_dict() if job else None
+    
+    def list_jobs(self, status: Optional[str] = None) -> List[WorkflowJob]:
+        """List jobs in submission order, optionally filtered by status."""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return [job for job in jobs if status is None or job.status == status]
+    
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a job that has not started yet.
+        
+        Returns:
+            True if the job was cancelled.
+        """
+        future = self._futures.get(job_id)
+        if future is None or not future.cancel():
+            return False
+        
+        job = self._jobs[job_id]
+        job.status = "cancelled"
+        job.completed_at = datetime.utcnow().isoformat()
+        return True
+    
+    def wait(
+        self,
+        job_ids: Optional[List[str]] = None,
+        timeout: Optional[float] = None,
+        return_when: str = ALL_COMPLETED
+    ) -> List[WorkflowJob]:
+        """
+        Wait for jobs to finish.
+        
+        Args:
+            job_ids: Jobs to wait for. Defaults to every submitted job.
+            timeout: Maximum seconds to wait.
+            return_when: concurrent.futures.ALL_COMPLETED, or FIRST_COMPLETED
+                        to return as soon as any of the jobs finishes.
+        
+        Returns:
+            The requested jobs; unfinished ones keep their current status.
+        """
+        with self._lock:
+            job_ids = list(self._futures) if job_ids is None else job_ids
+            futures = [self._futures[job_id] for job_id in job_ids if job_id in self._futures]
+        
+        wait_futures(futures, timeout=timeout, return_when=return_when)
+        return [self._jobs[job_id] for job_id in job_ids if job_id in self._jobs]
+    
+    def summary(self) -> Dict[str, Any]:
+        """Get job counts by status."""
+        counts: Dict[str, int] = {}
+        for job in self.list_jobs():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {"total": sum(counts.values()), "by_status": counts}
+    
+    def shutdown(self, wait: bool = True, cancel_pending: bool = False):
+        """
+        Stop accepting jobs and release the worker threads.
+        
+        Args:
+            wait: Whether to wait for running jobs to finish.
+            cancel_pending: Whether to cancel jobs that have not started.
+        """
+        if cancel_pending:
+            for job in self.list_jobs(status="queued"):
+                self.cancel(job.job_id)
+        self._executor.shutdown(wait=wait)
+        if self._own_task_manager:
+            self.task_manager.shutdown(wait=wait)
+    
+    def __enter__(self) -> "WorkflowJobQueue":
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown(wait=True)
+    
+    def _run_job(self, job: WorkflowJob) -> WorkflowJob:
+        """Run one job's workflow on the shared task manager."""
+        job.status = "running"
+        job.started_at = datetime.utcnow().isoformat()
+        logger.info(f"Job {job.job_id} started: {job.task_description[:60]}")
+        
+        try:
+            context = self.task_manager.run_task_parallel(
+                job.task_description,
+                metadata={**job.metadata, "job_id": job.job_id},
+                verbose=False,
+                max_workers=self.max_workers_per_job,
+                use_dag=self.use_dag,
+                manage_git_branch=False
+            )
+            job.context = context
+            job.workflow_id = context.workflow_id
+            job.status = "completed" if context.status == "completed" else "failed"
+        except Exception as e:
+            logger.error(f"Job {job.job_id} failed: {e}")
+            job.status = "failed"
+            job.error = str(e)
+        
+        job.completed_at = datetime.utcnow().isoformat()
+        logger.info(f"Job {job.job_id} finished: {job.status}")
+        return job
@@ -17,12 +17,14 @@ tech leads, and leadership without modifying any code.
 
 import os
 import re
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Callable
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
 import httpx
 
+from workflows.tracing import http_event_hooks
+
 
 class DebtCategory(Enum):
     """Categories of technical debt."""
@@ -321,6 +323,7 @@ class TechnicalDebtAgent:
         self.client = httpx.Client(
             headers=headers,
             timeout=30.0,
+            event_hooks=http_event_hooks(),
         )
         
         self._debt_items: List[DebtItem] = []
@@ -1022,7 +1025,8 @@ class TechnicalDebtAgent:
         include_sonarcloud: bool = True,
         sonar_project_key: Optional[str] = None,
         sonar_branch: str = "main",
-        output_format: str = "both"
+        output_format: str = "both",
+        on_progress: Optional[Callable[[int, int, str], None]] = None
     ) -> TechnicalDebtReport:
         """
         Perform comprehensive technical debt analysis on a repository.
@@ -1033,10 +1037,16 @@ class TechnicalDebtAgent:
             sonar_project_key: SonarCloud project key (optional)
             sonar_branch: Branch to analyze in SonarCloud
             output_format: Output format (json, markdown, both)
+            on_progress: Called as on_progress(done, total, message) as
+                         each analysis stage starts
             
         Returns:
             TechnicalDebtReport with complete analysis
         """
+        def progress(done: int, message: str):
+            if on_progress:
+                on_progress(done, 6, message)
+        
         self._debt_items = []
         self._item_counter = 0
         
@@ -1052,15 +1062,20 @@ class TechnicalDebtAgent:
         repo_name = repo_profile.get("identity", {}).get("name") if repo_profile else repo.name
         
         # Perform static analysis
+        progress(0, "Analyzing source files")
         code_items = self.analyze_directory(repo_path)
+        progress(1, "Analyzing test coverage")
         test_items = self.analyze_test_coverage(repo_path)
+        progress(2, "Analyzing dependencies")
         dep_items = self.analyze_dependencies(repo_path)
+        progress(3, "Analyzing architecture")
         arch_items = self.analyze_architecture(repo_path)
         
         all_items = code_items + test_items + dep_items + arch_items
         
         # Optionally include SonarCloud data
         sonarcloud_integrated = False
+        progress(4, "Fetching SonarCloud issues")
         if include_sonarcloud and self.token:
             sonar_items = self.fetch_sonarcloud_issues(
                 project_key=sonar_project_key,
@@ -1071,6 +1086,7 @@ class TechnicalDebtAgent:
                 sonarcloud_integrated = True
         
         # Calculate summary and hotspots
+        progress(5, "Summarizing")
         summary = self._calculate_summary(all_items)
         hotspots = self._calculate_hotspots(all_items)
         recommendations = self._generate_recommendations(all_items, summary)
@@ -801,24 +801,34 @@ def cmd_status(args):
 
 
 def cmd_scan(args):
-    """Scan a URL for broken experiences."""
+    """Scan one or more URLs for broken experiences."""
     import asyncio
     import sys
     
     # Add parent directory to path for imports
     sys.path.insert(0, str(get_pnd_agents_path()))
     
-    from agents.broken_experience_detector_agent import BrokenExperienceDetectorAgent
+    from agents.broken_experience_detector_agent import scan_sites
     
-    url = args.url
+    urls = args.url
     output_format = args.format
     
-    print(color(f"\nScanning: {url}", Colors.CYAN))
-    print(color("This may take 30-60 seconds...\n", Colors.YELLOW))
+    print(color(f"\nScanning: {', '.join(urls)}", Colors.CYAN))
+    print(color("This may take 30-60 seconds per URL...\n", Colors.YELLOW))
     
     try:
-        agent = BrokenExperienceDetectorAgent(headless=True)
-        report = asyncio.run(agent.scan_site(url))
+        # One browser is launched for all URLs; each scan gets its own context
+        reports = asyncio.run(scan_sites(urls, headless=True, max_concurrent=args.concurrency))
+    except Exception as e:
+        print(color(f"\nError scanning URL: {e}", Colors.RED))
+        if os.environ.get("DEBUG"):
+            import traceback
+            traceback.print_exc()
+        return 1
+    
+    for report in reports:
+        if len(reports) > 1:
+            print(color(f"\n{'#' * 60}\n{report.url}\n{'#' * 60}", Colors.BOLD))
         
         if output_format == "json":
             import json
@@ -840,14 +850,31 @@ def cmd_scan(args):
         print(color(f"\n{'=' * 60}", Colors.CYAN))
         print(color(f"Scan Complete! Score: {report.score}/100", Colors.GREEN if report.score >= 70 else Colors.YELLOW if report.score >= 50 else Colors.RED))
         print(color(f"{'=' * 60}", Colors.CYAN))
-        
-        return 0
-    except Exception as e:
-        print(color(f"\nError scanning URL: {e}", Colors.RED))
-        if os.environ.get("DEBUG"):
-            import traceback
-            traceback.print_exc()
-        return 1
+    
+    return 0
+
+
+def cmd_serve(args):
+    """Run the MCP server over stdio or HTTP."""
+    import asyncio
+    import sys
+    
+    # Add parent directory to path for imports
+    sys.path.insert(0, str(get_pnd_agents_path()))
+    
+    from pnd_agents.server import DEFAULT_HTTP_HOST, DEFAULT_HTTP_PORT, serve
+    
+    if args.http:
+        # stdout stays quiet in stdio mode, where it carries the protocol
+        host = args.host or DEFAULT_HTTP_HOST
+        port = args.port or DEFAULT_HTTP_PORT
+        print(color(f"\nServing MCP on http://{host}:{port}/mcp (SSE: /sse)", Colors.CYAN))
+    
+    try:
+        asyncio.run(serve(http=args.http, host=args.host, port=args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
 
 
 def cmd_run_task(args):
@@ -872,7 +899,7 @@ def cmd_run_task(args):
     print(color("=" * 60, Colors.CYAN))
     
     # Create task manager
-    agent = TaskManagerAgent()
+    agent = TaskManagerAgent(use_result_cache=args.cache, adaptive_scheduling=args.adaptive)
     
     if args.plan_only:
         # Just show the plan without executing
@@ -882,6 +909,7 @@ def cmd_run_task(args):
         print(f"\nPipeline ({len(plan['pipeline'])} stages):")
         for stage in plan['stages']:
             print(f"  {stage['step']}. {color(stage['agent'].capitalize() + 'Agent', Colors.CYAN)} -> {stage['description']}")
+        agent.shutdown()
         return 0
     
     # Build metadata
@@ -893,7 +921,10 @@ def cmd_run_task(args):
     
     # Run the task
     try:
-        context = agent.run_task(task, metadata=metadata, verbose=not args.quiet)
+        if args.dag or args.adaptive:
+            context = agent.run_task_parallel(task, metadata=metadata, verbose=not args.quiet, use_dag=args.dag)
+        else:
+            context = agent.run_task(task, metadata=metadata, verbose=not args.quiet)
         
         if args.output:
             # Write output to file
@@ -915,6 +946,61 @@ def cmd_run_task(args):
             import traceback
             traceback.print_exc()
         return 1
+    finally:
+        agent.shutdown()
+
+
+def cmd_run_batch(args):
+    """Run a batch of tasks from a JSONL or CSV file."""
+    import sys
+    import os
+    
+    # Add parent directory to path for imports
+    pnd_agents_path = get_pnd_agents_path()
+    sys.path.insert(0, str(pnd_agents_path))
+    
+    try:
+        from agents.task_manager_agent import TaskManagerAgent, read_tasks
+    except ImportError as e:
+        print(color(f"Error importing TaskManagerAgent: {e}", Colors.RED))
+        return 1
+    
+    if not os.path.exists(args.input):
+        print(color(f"Input file not found: {args.input}", Colors.RED))
+        return 1
+    
+    output = args.output or f"{os.path.splitext(args.input)[0]}.results.jsonl"
+    
+    print(color("\n" + "=" * 60, Colors.CYAN))
+    print(color("PND AGENTS - Batch Run", Colors.BOLD))
+    print(color("=" * 60, Colors.CYAN))
+    print(f"Input:  {args.input}")
+    print(f"Output: {output}")
+    
+    # One agent (engine, dispatcher, pooled clients) serves the whole batch
+    agent = TaskManagerAgent(use_result_cache=args.cache, adaptive_scheduling=args.adaptive)
+    
+    try:
+        summary = agent.run_tasks(
+            read_tasks(args.input, args.format),
+            output_path=output,
+            max_concurrent_jobs=args.concurrency,
+            max_workers_per_job=args.workers,
+            use_dag=not args.groups,
+            retry_failed=args.retry_failed,
+            verbose=not args.quiet
+        )
+    except ValueError as e:
+        print(color(f"\nInvalid input: {e}", Colors.RED))
+        return 1
+    except KeyboardInterrupt:
+        print(color(f"\nInterrupted. Run the same command again to continue from {output}", Colors.YELLOW))
+        return 130
+    finally:
+        agent.shutdown()
+    
+    print(color(f"\nResults written to {output}", Colors.GREEN))
+    return 0 if summary["failed"] == 0 else 1
 
 
 def cmd_analyze_task(args):
@@ -953,6 +1039,71 @@ def cmd_analyze_task(args):
     return 0
 
 
+def cmd_analyze_run(args):
+    """Show the critical path and bottlenecks of a finished workflow run."""
+    import sys
+    import json
+
+    # Add parent directory to path for imports
+    pnd_agents_path = get_pnd_agents_path()
+    sys.path.insert(0, str(pnd_agents_path))
+
+    try:
+        from workflows.workflow_engine import WorkflowEngine
+    except ImportError as e:
+        print(color(f"Error importing WorkflowEngine: {e}", Colors.RED))
+        return 1
+
+    engine = WorkflowEngine(
+        str(pnd_agents_path / "workflows" / "workflow_rules.json"),
+        context_dir=args.context_dir
+    )
+    try:
+        report = engine.analyze_run(args.workflow_id)
+    except KeyError:
+        print(color(f"Workflow not found: {args.workflow_id}", Colors.RED))
+        return 1
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    print(color("\n" + "=" * 60, Colors.CYAN))
+    print(color("RUN ANALYSIS", Colors.BOLD))
+    print(color("=" * 60, Colors.CYAN))
+
+    utilization = report["utilization"]
+    print(f"\nWorkflow: {report['workflow_id']} ({report['mode']}, {report['status']})")
+    print(f"Wall time: {report['wall_seconds']:.1f}s (plan with recorded durations: {report['simulated_seconds']:.1f}s)")
+    print(
+        f"Utilization: {utilization['utilization']:.0%} of {utilization['workers']} workers "
+        f"(peak {utilization['peak_concurrency']} concurrent)"
+    )
+
+    critical = report["critical_path"]
+    print(f"\nCritical path ({critical['seconds']:.1f}s):")
+    for stage in critical["stages"]:
+        wait = f", waited {stage['wait_seconds']:.1f}s" if stage["wait_seconds"] >= 0.05 else ""
+        print(f"  {color(stage['agent'], Colors.CYAN)} {stage['duration_seconds']:.1f}s{wait}")
+
+    if report["groups"]:
+        print("\nParallel groups:")
+        for group in report["groups"]:
+            print(
+                f"  {group['group']}. {', '.join(group['agents'])}: {group['wall_seconds']:.1f}s wall, "
+                f"{group['idle_seconds']:.1f}s idle waiting for {color(group['slowest'], Colors.YELLOW)}"
+            )
+
+    print("\nWhat if:")
+    if not report["what_if"]:
+        print("  No change to the plan would shorten this run")
+    for what_if in report["what_if"]:
+        print(f"  {color(what_if['description'], Colors.GREEN)}")
+
+    print(color("\n" + "=" * 60, Colors.CYAN))
+    return 0
+
+
 def cmd_sprint_report(args):
     """Generate a sprint AI report."""
     import sys
@@ -1119,10 +1270,13 @@ Examples:
   pnd-agents config --show      Show current configuration
   pnd-agents status             Show installation status
   pnd-agents uninstall          Remove from Claude config
-  pnd-agents scan <url>         Scan URL for broken experiences
+  pnd-agents scan <url>...      Scan URLs for broken experiences
+  pnd-agents serve --http       Serve many MCP clients from one process
   pnd-agents run-task "Create Stories carousel from Figma: ..."
   pnd-agents run-task "Build React component" --plan-only
+  pnd-agents run-task "Build React component" --dag
   pnd-agents analyze-task "Create API endpoint for products"
+  pnd-agents analyze-run <workflow_id>    Show the critical path of a finished run
   pnd-agents sprint-report --sprint-id 16597    Generate AI report for sprint
   pnd-agents sprint-report --board-id 795       Generate AI report for active sprint
   pnd-agents sprint-report --sprint-id 16597 --format json -o report.json
@@ -1179,10 +1333,17 @@ Examples:
     uninstall_parser.set_defaults(func=cmd_uninstall)
     
     # Scan command
-    scan_parser = subparsers.add_parser("scan", help="Scan a URL for broken experiences")
+    scan_parser = subparsers.add_parser("scan", help="Scan URLs for broken experiences")
     scan_parser.add_argument(
         "url",
-        help="URL to scan (e.g., 'https://us.pandora.net', 'http://localhost:3000')"
+        nargs="+",
+        help="URLs to scan (e.g., 'https://us.pandora.net', 'http://localhost:3000'); all scans share one browser"
+    )
+    scan_parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=2,
+        help="Number of URLs to scan at once (default: 2)"
     )
     scan_parser.add_argument(
         "--format",
@@ -1192,6 +1353,24 @@ Examples:
     )
     scan_parser.set_defaults(func=cmd_scan)
     
+    # Serve command
+    serve_parser = subparsers.add_parser("serve", help="Run the MCP server")
+    serve_parser.add_argument(
+        "--http",
+        action="store_true",
+        help="Serve many clients over streamable HTTP (/mcp) and SSE (/sse) instead of stdio"
+    )
+    serve_parser.add_argument(
+        "--host",
+        help="Interface to bind with --http (default: PND_MCP_HOST or 127.0.0.1)"
+    )
+    serve_parser.add_argument(
+        "--port",
+        type=int,
+        help="Port to listen on with --http (default: PND_MCP_PORT or 8765)"
+    )
+    serve_parser.set_defaults(func=cmd_serve)
+    
     # Run-task command
     run_task_parser = subparsers.add_parser("run-task", help="Run a task through the workflow engine")
     run_task_parser.add_argument(
@@ -1216,12 +1395,82 @@ Examples:
         action="store_true",
         help="Suppress verbose output"
     )
+    run_task_parser.add_argument(
+        "--dag",
+        action="store_true",
+        help="Run agents as a dependency graph, starting each as soon as its upstream agents finish"
+    )
+    run_task_parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Reuse cached results of deterministic agents when inputs and the repo revision are unchanged"
+    )
+    run_task_parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="Run agents in parallel groups (or with --dag, as a graph), ordered and sized from historical agent durations"
+    )
     run_task_parser.add_argument(
         "--output",
         help="Output file path for workflow results (JSON)"
     )
     run_task_parser.set_defaults(func=cmd_run_task)
     
+    # Run-batch command
+    run_batch_parser = subparsers.add_parser("run-batch", help="Run many tasks from a JSONL or CSV file")
+    run_batch_parser.add_argument(
+        "--input",
+        required=True,
+        help="Task file: JSONL (one object or string per line) or CSV with a 'task' or 'description' column"
+    )
+    run_batch_parser.add_argument(
+        "--output",
+        help="Results file (JSONL), also used to resume an interrupted batch (default: <input>.results.jsonl)"
+    )
+    run_batch_parser.add_argument(
+        "--format",
+        choices=["jsonl", "csv"],
+        help="Input format (default: from the file extension)"
+    )
+    run_batch_parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Number of tasks run at once (default: 4)"
+    )
+    run_batch_parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Parallel agents within each task (default: 4)"
+    )
+    run_batch_parser.add_argument(
+        "--groups",
+        action="store_true",
+        help="Run agents in parallel groups instead of as a dependency graph"
+    )
+    run_batch_parser.add_argument(
+        "--retry-failed",
+        action="store_true",
+        help="Re-run tasks that failed in a previous run"
+    )
+    run_batch_parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Reuse cached results of deterministic agents when inputs and the repo revision are unchanged"
+    )
+    run_batch_parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="Order agents and size worker pools from historical agent durations, up to --workers"
+    )
+    run_batch_parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Suppress per-task progress output"
+    )
+    run_batch_parser.set_defaults(func=cmd_run_batch)
+    
     # Analyze-task command
     analyze_parser = subparsers.add_parser("analyze-task", help="Analyze a task and show the workflow plan")
     analyze_parser.add_argument(
@@ -1229,6 +1478,26 @@ Examples:
         help="Task description to analyze"
     )
     analyze_parser.set_defaults(func=cmd_analyze_task)
+    
+    # Analyze-run command
+    analyze_run_parser = subparsers.add_parser(
+        "analyze-run", help="Show the critical path, idle time and what-if speedups of a finished workflow run"
+    )
+    analyze_run_parser.add_argument(
+        "workflow_id",
+        nargs="?",
+        help="Workflow ID (default: the most recently updated workflow)"
+    )
+    analyze_run_parser.add_argument(
+        "--context-dir",
+        help="Directory holding the saved workflow contexts (default: from workflow_rules.json)"
+    )
+    analyze_run_parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the full report as JSON"
+    )
+    analyze_run_parser.set_defaults(func=cmd_analyze_run)
 
     # Sprint-report command
     sprint_parser = subparsers.add_parser("sprint-report", help="Generate sprint AI contribution report")
@@ -0,0 +1,143 @@
+"""
+PND Agents MCP Server
+
+Runs the PG AI Squad MCP server over one of two transports:
+
+- stdio: one client per process, as launched from the Claude config.
+- HTTP: one long-lived process serving many clients, which share warm
+  agents, HTTP connection pools and tool caches. Streamable HTTP is served
+  at /mcp and the older SSE transport at /sse (messages are posted to
+  /messages/). Workflow state is kept per MCP session.
+"""
+
+import contextlib
+import os
+import sys
+from typing import Optional, Tuple
+
+from mcp.server import Server
+
+from tools import register_tools
+from tools.agent_pool import shutdown_agent_pool
+from tools.registry import ToolRegistry, shutdown_task_managers
+
+# Address the HTTP transport listens on; loopback only unless configured
+DEFAULT_HTTP_HOST = os.environ.get("PND_MCP_HOST", "127.0.0.1")
+DEFAULT_HTTP_PORT = int(os.environ.get("PND_MCP_PORT", "8765"))
+
+
+def create_server(isolate_sessions: bool = False) -> Tuple[Server, ToolRegistry]:
+    """
+    Create the MCP server with every tool registered.
+    
+    Args:
+        isolate_sessions: Keep workflow state per MCP session.
+    
+    Returns:
+        The server and the registry serving its tools.
+    """
+    server = Server(name="pnd-agents")
+    registry = register_tools(server, isolate_sessions=isolate_sessions)
+    return server, registry
+
+
+async def shutdown(registry: ToolRegistry):
+    """Release the worker pools, task manager engines, pooled agents and warm browser."""
+    # Stop the tool worker pools without waiting for abandoned calls, then
+    # the shared workflow engines, then close the pooled agents' HTTP clients
+    registry.shutdown(wait=False)
+    shutdown_task_managers(wait=False)
+    shutdown_agent_pool()
+    if "agents.broken_experience_detector_agent" in sys.modules:
+        # Only loaded once a scan ran; closes the warm Chromium
+        from agents.broken_experience_detector_agent import close_browser_pools
+        await close_browser_pools()
+
+
+async def run_stdio():
+    """Serve one client over stdin/stdout."""
+    from mcp.server.stdio import stdio_server
+    
+    server, registry = create_server()
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(
+                read_stream,
+                write_stream,
+                server.create_initialization_options()
+            )
+    finally:
+        await shutdown(registry)
+
+
+def create_http_app(server: Server):
+    """
+    Build the Starlette app serving the streamable HTTP and SSE transports.
+    
+    Every client connection gets its own MCP session on the shared server.
+    """
+    from mcp.server.sse import SseServerTransport
+    from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+    from starlette.applications import Starlette
+    from starlette.responses import Response
+    from starlette.routing import Mount, Route
+    
+    session_manager = StreamableHTTPSessionManager(app=server)
+    sse = SseServerTransport("/messages/")
+    
+    async def handle_streamable_http(scope, receive, send):
+        await session_manager.handle_request(scope, receive, send)
+    
+    async def handle_sse(request):
+        async with sse.connect_sse(request.scope, request.receive, request._send) as (read_stream, write_stream):
+            await server.run(
+                read_stream,
+                write_stream,
+                server.create_initialization_options()
+            )
+        return Response()
+    
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        async with session_manager.run():
+            yield
+    
+    return Starlette(
+        routes=[
+            Mount("/mcp", app=handle_streamable_http),
+            Route("/sse", endpoint=handle_sse, methods=["GET"]),
+            Mount("/messages/", app=sse.handle_post_message),
+        ],
+        lifespan=lifespan,
+    )
+
+
+async def run_http(host: Optional[str] = None, port: Optional[int] = None):
+    """
+    Serve many clients over HTTP until interrupted.
+    
+    Args:
+        host: Interface to bind (default: PND_MCP_HOST or 127.0.0.1).
+        port: Port to listen on (default: PND_MCP_PORT or 8765).
+    """
+    import uvicorn
+    
+    server, registry = create_server(isolate_sessions=True)
+    config = uvicorn.Config(
+        create_http_app(server),
+        host=host or DEFAULT_HTTP_HOST,
+        port=port or DEFAULT_HTTP_PORT,
+        log_level="info",
+    )
+    try:
+        await uvicorn.Server(config).serve()
+    finally:
+        await shutdown(registry)
+
+
+async def serve(http: bool = False, host: Optional[str] = None, port: Optional[int] = None):
+    """Run the MCP server over HTTP or stdio."""
+    if http:
+        await run_http(host, port)
+    else:
+        await run_stdio()
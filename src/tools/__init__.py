@@ -5,15 +5,27 @@ Core tools for the Pandora Group AI Squad agent system.
 These tools provide the Effects system for agents to interact with
 the filesystem, run commands, parse Figma designs, interact with
 Amplience CMS, and analyze HAR files.
+
+register_tools and the sprint report helpers are imported on first access:
+the registry pulls in the MCP SDK, which scripts using only the lightweight
+tools should not pay for.
 """
 
+import importlib
+
 from .filesystem import FilesystemTool
 from .command_runner import CommandRunner
 from .figma_parser import FigmaParser
 from .amplience_api import AmplienceAPI
 from .har_analyzer import HARAnalyzer
-from .registry import register_tools
-from .sprint_ai_report import SprintAIReportGenerator, generate_sprint_report, identify_ai_commits_in_range
+
+# Lazily imported name -> submodule defining it
+_LAZY_EXPORTS = {
+    'register_tools': 'registry',
+    'SprintAIReportGenerator': 'sprint_ai_report',
+    'generate_sprint_report': 'sprint_ai_report',
+    'identify_ai_commits_in_range': 'sprint_ai_report',
+}
 
 __all__ = [
     'FilesystemTool',
@@ -28,3 +40,12 @@ __all__ = [
 ]
 
 __version__ = '1.0.0'
+
+
+def __getattr__(name):
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{_LAZY_EXPORTS[name]}', __name__), name)
+    globals()[name] = value
+    return value
+
@@ -0,0 +1,237 @@
+"""
+Agent Pool
+
+Per-process pool of reusable agent instances.
+
+Agents such as FigmaReaderAgent and SonarValidationAgent hold an httpx
+client; creating one per call pays a new connection (and TLS handshake)
+every time. The pool hands out instances exclusively: a leased agent is
+never shared by two callers at once, and is returned to the pool for the
+next caller when the lease ends, keeping its keep-alive connections warm.
+
+Idle instances are closed after idle_timeout seconds by a background
+reaper, and an instance can be given a max_age (e.g. the lifetime of an
+auth token it caches) after which it is closed instead of reused. The
+process-wide pool is closed on interpreter exit, or explicitly with
+shutdown_agent_pool().
+"""
+
+import atexit
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger("pnd_agents.agent_pool")
+
+
+class AgentPool:
+    """
+    Thread-safe pool of idle agent instances keyed by agent kind.
+    
+    Features:
+    - Lazy creation via a factory on first lease
+    - Exclusive leases, so stateful agents are safe across concurrent jobs
+    - Bounded number of idle instances per key
+    - Idle eviction and an optional maximum age per instance
+    - close() releases every pooled HTTP client
+    """
+    
+    def __init__(
+        self,
+        max_idle_per_key: int = 8,
+        idle_timeout: Optional[float] = 300.0,
+        max_age: Optional[float] = None
+    ):
+        """
+        Initialize the agent pool.
+        
+        Args:
+            max_idle_per_key: Maximum idle instances kept per key; extra
+                             instances are closed when released.
+            idle_timeout: Seconds an instance may sit idle before it is
+                          closed. None keeps idle instances until close().
+            max_age: Default seconds after creation when an instance is
+                     closed instead of reused. None for no limit.
+        """
+        self.max_idle_per_key = max_idle_per_key
+        self.idle_timeout = idle_timeout
+        self.max_age = max_age
+        # Idle instances per key as (agent, idle since, expiry) tuples
+        self._idle: Dict[Hashable, List[Tuple[Any, float, Optional[float]]]] = {}
+        # Expiry of instances created with a max age, by id while leased
+        self._expires: Dict[int, float] = {}
+        self._lock = threading.Lock()
+        self._created = 0
+        self._reused = 0
+        self._evicted = 0
+        self._reaper: Optional[threading.Thread] = None
+        self._stop_reaper = threading.Event()
+    
+    def acquire(self, key: Hashable, factory: Callable[[], Any], max_age: Optional[float] = None) -> Any:
+        """
+        Take an idle instance for key, or create one with factory.
+        
+        Callers must hand the instance back with release().
+        
+        Args:
+            key: Pool key, e.g. the agent kind and its configuration.
+            factory: Creates a new instance when none is idle.
+            max_age: Seconds after creation when a new instance is retired.
+                     Defaults to the pool's max_age.
+        """
+        expired = []
+        agent = None
+        now = time.monotonic()
+        with self._lock:
+            idle = self._idle.get(key)
+            while idle:
+                candidate, _, expires = idle.pop()
+                if expires is not None and expires <= now:
+                    expired.append(candidate)
+                    continue
+                if expires is not None:
+                    self._expires[id(candidate)] = expires
+                self._reused += 1
+                agent = candidate
+                break
+            self._evicted += len(expired)
+            if agent is None:
+                self._created += 1
+        
+        for candidate in expired:
+            self._close_agent(candidate)
+        if agent is not None:
+            return agent
+        
+        agent = factory()
+        max_age = self.max_age if max_age is None else max_age
+        if max_age is not None:
+            with self._lock:
+                self._expires[id(agent)] = time.monotonic() + max_age
+        return agent
+    
+    def release(self, key: Hashable, agent: Any):
+        """Return a leased instance to the pool, closing it if the pool is full or it expired."""
+        now = time.monotonic()
+        with self._lock:
+            expires = self._expires.pop(id(agent), None)
+            idle = self._idle.setdefault(key, [])
+            if (expires is None or expires > now) and len(idle) < self.max_idle_per_key:
+                idle.append((agent, now, expires))
+                self._start_reaper()
+                return
+            if expires is not None and expires <= now:
+                self._evicted += 1
+        
+        self._close_agent(agent)
+    
+    @contextmanager
+    def lease(self, key: Hashable, factory: Callable[[], Any], max_age: Optional[float] = None) -> Iterator[Any]:
+        """Context manager form of acquire()/release()."""
+        agent = self.acquire(key, factory, max_age=max_age)
+        try:
+            yield agent
+        finally:
+            self.release(key, agent)
+    
+    def evict_idle(self) -> int:
+        """
+        Close instances idle longer than idle_timeout or past their max age.
+        
+        Returns:
+            Number of instances closed.
+        """
+        now = time.monotonic()
+        evicted = []
+        with self._lock:
+            for key, idle in list(self._idle.items()):
+                keep = []
+                for entry in idle:
+                    agent, idle_since, expires = entry
+                    stale = self.idle_timeout is not None and now - idle_since >= self.idle_timeout
+                    if stale or (expires is not None and expires <= now):
+                        evicted.append(agent)
+                    else:
+                        keep.append(entry)
+                if keep:
+                    self._idle[key] = keep
+                else:
+                    del self._idle[key]
+            self._evicted += len(evicted)
+        
+        for agent in evicted:
+            self._close_agent(agent)
+        return len(evicted)
+    
+    def close(self):
+        """Stop idle eviction and close and drop every idle instance."""
+        self._stop_reaper.set()
+        with self._lock:
+            idle_agents = [entry[0] for entries in self._idle.values() for entry in entries]
+            self._idle.clear()
+            reaper, self._reaper = self._reaper, None
+        
+        for agent in idle_agents:
+            self._close_agent(agent)
+        if reaper is not None and reaper is not threading.current_thread():
+            reaper.join(timeout=5)
+        self._stop_reaper.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get pool counters."""
+        with self._lock:
+            return {
+                "created": self._created,
+                "reused": self._reused,
+                "evicted": self._evicted,
+                "idle": {str(key): len(agents) for key, agents in self._idle.items()},
+            }
+    
+    def _start_reaper(self):
+        """Start the idle eviction thread. Called with the lock held."""
+        if self.idle_timeout is None or self._reaper is not None:
+            return
+        interval = max(self.idle_timeout / 2, 0.01)
+        
+        def reap():
+            while not self._stop_reaper.wait(interval):
+                self.evict_idle()
+        
+        self._reaper = threading.Thread(target=reap, name="agent-pool-reaper", daemon=True)
+        self._reaper.start()
+    
+    @staticmethod
+    def _close_agent(agent: Any):
+        """Close an agent's resources if it supports it."""
+        close = getattr(agent, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception as e:
+                logger.warning(f"Failed to close pooled agent {type(agent).__name__}: {e}")
+
+
+_agent_pool: Optional[AgentPool] = None
+_agent_pool_lock = threading.Lock()
+
+
+def get_agent_pool() -> AgentPool:
+    """Get the process-wide agent pool, closed automatically at interpreter exit."""
+    global _agent_pool
+    with _agent_pool_lock:
+        if _agent_pool is None:
+            _agent_pool = AgentPool()
+            atexit.register(shutdown_agent_pool)
+        return _agent_pool
+
+
+def shutdown_agent_pool():
+    """Close the process-wide agent pool; a later get_agent_pool() starts a new one."""
+    global _agent_pool
+    with _agent_pool_lock:
+        pool, _agent_pool = _agent_pool, None
+    if pool is not None:
+        atexit.unregister(shutdown_agent_pool)
+        pool.close()
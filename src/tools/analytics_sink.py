@@ -0,0 +1,248 @@
+"""
+Analytics Sink
+
+Background writer for analytics events recorded on the agent hot path.
+
+AnalyticsStore.store_event re-reads and rewrites the whole daily events
+file, so recording two events per agent call made every stage pay I/O
+proportional to the file size. The sink instead appends events to a
+bounded in-memory queue and returns; a writer thread drains the queue and
+commits each batch with one read and one write per daily file.
+
+When the queue is full the overflow policy decides what gives: drop the
+new event (the default), drop the oldest queued event, or block the
+caller for up to block_timeout seconds before dropping. Queued events are
+flushed at interpreter exit, or explicitly with flush() or
+shutdown_analytics_sink().
+"""
+
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+from .analytics_store import AnalyticsEvent, AnalyticsStore
+
+logger = logging.getLogger("pnd_agents.analytics_sink")
+
+# Events held in memory before the overflow policy applies
+DEFAULT_MAX_QUEUE = int(os.environ.get("PND_ANALYTICS_QUEUE_SIZE", "10000"))
+
+# Most events written in one batch
+DEFAULT_BATCH_SIZE = int(os.environ.get("PND_ANALYTICS_BATCH_SIZE", "500"))
+
+# Seconds the writer waits for more events before writing a partial batch
+DEFAULT_FLUSH_INTERVAL = float(os.environ.get("PND_ANALYTICS_FLUSH_INTERVAL", "0.5"))
+
+# What to do with an event when the queue is full:
+# - drop_new: discard the new event
+# - drop_oldest: discard the oldest queued event to make room
+# - block: wait up to block_timeout seconds for room, then discard the new event
+OVERFLOW_POLICIES = ("drop_new", "drop_oldest", "block")
+DEFAULT_OVERFLOW = os.environ.get("PND_ANALYTICS_OVERFLOW", "drop_new")
+
+
+class AnalyticsSink:
+    """
+    Bounded queue of analytics events drained by a background writer.
+    
+    Features:
+    - submit() only appends to memory; the writer thread starts on first use
+    - Group commit: one load and save per daily file per batch
+    - drop_new, drop_oldest or block overflow policy
+    - flush() waits until every queued event is written
+    """
+    
+    def __init__(
+        self,
+        store: Optional[AnalyticsStore] = None,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        overflow: str = DEFAULT_OVERFLOW,
+        block_timeout: float = 1.0,
+        store_factory: Callable[[], AnalyticsStore] = AnalyticsStore
+    ):
+        """
+        Initialize the sink.
+        
+        Args:
+            store: Store to write to; created with store_factory on the
+                   writer thread when not given.
+            max_queue: Events held in memory before the overflow policy applies.
+            batch_size: Most events written in one batch.
+            flush_interval: Seconds to wait for more events before writing a
+                            partial batch.
+            overflow: One of OVERFLOW_POLICIES.
+            block_timeout: Seconds the "block" policy waits for room.
+            store_factory: Creates the store when none is given.
+        
+        Raises:
+            ValueError: If the overflow policy is unknown.
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow} (expected one of {OVERFLOW_POLICIES})")
+        
+        self.max_queue = max(1, max_queue)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self._store = store
+        self._store_factory = store_factory
+        self._pending: deque = deque()
+        self._writing = 0  # Events taken by the writer and not yet written
+        self._flush_requested = False
+        self._closed = False
+        self._writer: Optional[threading.Thread] = None
+        self._cond = threading.Condition()
+        self._stats = {"submitted": 0, "written": 0, "dropped": 0, "failed": 0, "batches": 0}
+    
+    def submit(self, event: AnalyticsEvent) -> bool:
+        """
+        Queue an event for writing.
+        
+        Returns:
+            True if the event was queued, False if it was dropped.
+        """
+        with self._cond:
+            if self._closed:
+                self._stats["dropped"] += 1
+                return False
+            
+            if len(self._pending) >= self.max_queue and self.overflow == "block":
+                self._cond.notify_all()
+                self._cond.wait_for(
+                    lambda: len(self._pending) < self.max_queue or self._closed,
+                    self.block_timeout
+                )
+            if len(self._pending) >= self.max_queue:
+                self._stats["dropped"] += 1
+                if self.overflow != "drop_oldest":
+                    return False
+                self._pending.popleft()
+            
+            self._pending.append(event)
+            self._stats["submitted"] += 1
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._run, name="analytics-sink", daemon=True)
+                self._writer.start()
+            elif len(self._pending) >= self.batch_size:
+                self._cond.notify_all()
+            return True
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Write every queued event now.
+        
+        Args:
+            timeout: Seconds to wait; None to wait until done.
+        
+        Returns:
+            True if the queue was drained within the timeout.
+        """
+        with self._cond:
+            if self._writer is None:
+                return not self._pending
+            self._flush_requested = True
+            self._cond.notify_all()
+            return self._cond.wait_for(lambda: not self._pending and not self._writing, timeout)
+    
+    def close(self, timeout: Optional[float] = 5.0) -> bool:
+        """
+        Flush queued events and stop the writer. Later events are dropped.
+        
+        Returns:
+            True if every queued event was written within the timeout.
+        """
+        flushed = self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            writer = self._writer
+        if writer is not None:
+            writer.join(timeout)
+        return flushed
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get event counters and the current queue length."""
+        with self._cond:
+            return {**self._stats, "queued": len(self._pending) + self._writing}
+    
+    def _take_batch(self) -> Optional[List[AnalyticsEvent]]:
+        """Wait for the next batch; None once closed and drained."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._pending or self._closed)
+            if not self._pending:
+                return None
+            
+            # Give a burst of events time to arrive, so they share one write
+            deadline = time.monotonic() + self.flush_interval
+            while len(self._pending) < self.batch_size and not self._flush_requested and not self._closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            
+            batch = [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+            self._writing = len(batch)
+            # Wake producers blocked on a full queue
+            self._cond.notify_all()
+            return batch
+    
+    def _run(self):
+        """Writer loop: take a batch, write it, repeat until closed."""
+        while True:
+            batch = self._take_batch()
+            if batch is None:
+                return
+            
+            written = 0
+            try:
+                if self._store is None:
+                    self._store = self._store_factory()
+                written = self._store.store_events(batch)
+            except Exception as e:
+                logger.error(f"Failed to write {len(batch)} analytics events: {e}")
+            
+            with self._cond:
+                self._writing = 0
+                self._stats["written"] += written
+                self._stats["failed"] += len(batch) - written
+                self._stats["batches"] += 1
+                if not self._pending:
+                    self._flush_requested = False
+                self._cond.notify_all()
+
+
+_analytics_sink: Optional[AnalyticsSink] = None
+_analytics_sink_lock = threading.Lock()
+
+
+def get_analytics_sink() -> AnalyticsSink:
+    """Get the process-wide analytics sink, flushed automatically at interpreter exit."""
+    global _analytics_sink
+    with _analytics_sink_lock:
+        if _analytics_sink is None:
+            _analytics_sink = AnalyticsSink()
+            atexit.register(shutdown_analytics_sink)
+        return _analytics_sink
+
+
+def shutdown_analytics_sink(timeout: Optional[float] = 5.0) -> bool:
+    """
+    Flush and close the process-wide sink; a later get_analytics_sink() starts a new one.
+    
+    Returns:
+        True if every queued event was written within the timeout.
+    """
+    global _analytics_sink
+    with _analytics_sink_lock:
+        sink, _analytics_sink = _analytics_sink, None
+    if sink is None:
+        return True
+    atexit.unregister(shutdown_analytics_sink)
+    return sink.close(timeout)
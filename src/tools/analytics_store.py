@@ -14,12 +14,16 @@ from typing import Dict, List, Any, Optional
 
 logger = logging.getLogger("pnd_agents.analytics_store")
 
+# Event type of workflow stage handler times, recorded for adaptive
+# scheduling; kept apart from the task_* events that count as tasks
+STAGE_DURATION_EVENT = "stage_duration"
+
 
 @dataclass
 class AnalyticsEvent:
     """Represents a single analytics event."""
     event_id: str
-    event_type: str  # task_started, task_completed, task_failed
+    event_type: str  # task_started, task_completed, task_failed, stage_duration
     agent_name: str
     timestamp: str
     data: Dict[str, Any] = field(default_factory=dict)
@@ -122,6 +126,44 @@ class AnalyticsStore:
             logger.error(f"Failed to store event: {e}")
             return False
     
+    def store_events(self, events: List[AnalyticsEvent]) -> int:
+        """
+        Store several events with one load and save per daily log file.
+        
+        Args:
+            events: AnalyticsEvents to store, oldest first
+        
+        Returns:
+            Number of events stored
+        """
+        by_date: Dict[str, List[AnalyticsEvent]] = {}
+        for event in events:
+            by_date.setdefault(self._extract_date(event.timestamp), []).append(event)
+        
+        stored = 0
+        for date_str, date_events in by_date.items():
+            try:
+                log_file = self.log_dir / f"events_{date_str}.json"
+                existing = self._load_file(log_file)
+                positions = {e.get("eventId"): i for i, e in enumerate(existing)}
+                
+                # Later events replace earlier ones with the same ID, as with store_event
+                for event in date_events:
+                    idx = positions.get(event.event_id)
+                    if idx is not None:
+                        existing[idx] = event.to_dict()
+                    else:
+                        positions[event.event_id] = len(existing)
+                        existing.append(event.to_dict())
+                
+                self._save_file(log_file, existing)
+                stored += len(date_events)
+            except Exception as e:
+                logger.error(f"Failed to store events for {date_str}: {e}")
+        
+        logger.debug(f"Stored {stored} events")
+        return stored
+    
     def get_event(self, event_id: str, date: Optional[str] = None) -> Optional[AnalyticsEvent]:
         """
         Get a specific event by ID.
@@ -377,6 +419,50 @@ class AnalyticsStore:
             "totalErrors": total_errors,
         }
     
+    def get_duration_stats(
+        self,
+        days: int = 14,
+        task_type: Optional[str] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get duration percentiles per agent from successful stage_duration events.
+        
+        Args:
+            days: Number of days to include
+            task_type: Only events recorded for this workflow task type
+        
+        Returns:
+            Dict of agent name -> {"count", "p50", "p95"}, durations in ms
+        """
+        durations: Dict[str, List[float]] = {}
+        
+        for i in range(days):
+            date_str = (datetime.utcnow() - timedelta(days=i)).strftime("%Y-%m-%d")
+            log_file = self.log_dir / f"events_{date_str}.json"
+            
+            if log_file.exists():
+                for event_data in self._load_file(log_file):
+                    if event_data.get("eventType") != STAGE_DURATION_EVENT:
+                        continue
+                    data = event_data.get("data", {})
+                    if data.get("status") != "success":
+                        continue
+                    if task_type and data.get("taskType") != task_type:
+                        continue
+                    duration = data.get("duration")
+                    if isinstance(duration, (int, float)):
+                        durations.setdefault(event_data.get("agentName", ""), []).append(duration)
+        
+        stats = {}
+        for agent_name, values in durations.items():
+            values.sort()
+            stats[agent_name] = {
+                "count": len(values),
+                "p50": values[int(round(0.50 * (len(values) - 1)))],
+                "p95": values[int(round(0.95 * (len(values) - 1)))],
+            }
+        return stats
+    
     def get_daily_summary(self, date: Optional[str] = None) -> Dict[str, Any]:
         """
         Get summary for a specific day.
@@ -546,7 +632,8 @@ def record_event(
     task_description: str = "",
     jira_task_id: Optional[str] = None,
     metrics: Optional[Dict[str, Any]] = None,
-    errors: Optional[List[str]] = None
+    errors: Optional[List[str]] = None,
+    background: bool = False
 ) -> bool:
     """
     Convenience function for recording analytics events.
@@ -562,12 +649,12 @@ def record_event(
         jira_task_id: Optional JIRA issue key
         metrics: Optional metrics dictionary
         errors: Optional error list
+        background: Queue the event on the process-wide analytics sink
+                    instead of writing it before returning
         
     Returns:
-        True if successful
+        True if successful (with background, if the event was queued)
     """
-    store = AnalyticsStore()
-    
     event_id = f"{agent_name}_{datetime.utcnow().strftime('%Y%m%d%H%M%S')}"
     if jira_task_id:
         event_id = f"{agent_name}_{jira_task_id}"
@@ -591,4 +678,8 @@ def record_event(
         data=event_data,
     )
     
-    return store.store_event(event)
+    if background:
+        from .analytics_sink import get_analytics_sink
+        return get_analytics_sink().submit(event)
+    
+    return AnalyticsStore().store_event(event)
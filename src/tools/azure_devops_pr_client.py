@@ -262,6 +262,7 @@ class AzureDevOpsPRClient:
                     "Azure DevOps PAT not configured. "
                     "Set AZURE_DEVOPS_PAT or AZURE_DEVOPS_TOKEN environment variable."
                 )
+            from workflows.tracing import http_event_hooks
             credentials = base64.b64encode(f":{self.config.pat}".encode()).decode()
             self._client = httpx.Client(
                 headers={
@@ -270,6 +271,7 @@ class AzureDevOpsPRClient:
                     "Content-Type": "application/json",
                 },
                 timeout=60.0,
+                event_hooks=http_event_hooks(),
                 follow_redirects=False,
             )
         return self._client
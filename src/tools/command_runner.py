@@ -112,18 +112,21 @@ class CommandRunner:
             raise ValueError(f"Command not allowed: {command}")
         
         import time
+        from workflows.tracing import tracer
         start_time = time.time()
         
         try:
-            result = subprocess.run(
-                command,
-                shell=True,
-                cwd=self.working_dir,
-                env=self.env,
-                capture_output=capture_output,
-                text=True,
-                timeout=timeout or self.timeout
-            )
+            with tracer.span(command.split(" ", 1)[0], "subprocess", {"command": command}) as span:
+                result = subprocess.run(
+                    command,
+                    shell=True,
+                    cwd=self.working_dir,
+                    env=self.env,
+                    capture_output=capture_output,
+                    text=True,
+                    timeout=timeout or self.timeout
+                )
+                span.set_attribute("exit_code", result.returncode)
             
             duration_ms = (time.time() - start_time) * 1000
             
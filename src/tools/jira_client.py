@@ -190,6 +190,7 @@ class JiraClient:
     def client(self) -> httpx.Client:
         """Get or create HTTP client."""
         if self._client is None:
+            from workflows.tracing import http_event_hooks
             self._client = httpx.Client(
                 base_url=self._get_api_base_url(),
                 auth=(self.config.email, self.config.api_token),
@@ -198,6 +199,7 @@ class JiraClient:
                     "Content-Type": "application/json",
                 },
                 timeout=self.config.timeout_ms / 1000.0,
+                event_hooks=http_event_hooks(),
             )
         return self._client
     
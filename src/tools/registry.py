@@ -2,2738 +2,3717 @@
 MCP Tool Registry
 
 Registers all PG AI Squad tools with the MCP server.
+
+Each tool is declared as a ToolSpec (name, schema and handler) in a
+ToolRegistry. The registry builds the MCP Tool list once and dispatches
+calls with a dictionary lookup. Third-party tool packs can add their own
+specs with register_tool_pack() before register_tools() runs.
+
+Synchronous handlers (httpx clients, subprocesses, large json.dumps) run on
+bounded worker pools instead of the event loop, so one slow call does not
+stall the other tool calls in flight. I/O-bound and CPU-bound tools use
+separate pools, and a tool can cap how many of its calls run at once.
+
+Identical concurrent calls to a read-only tool share one run, and a tool
+can keep its result for a few seconds after it completes.
+
+Every handler run is timed (queued and running) and its payload sizes and
+errors counted; the mcp_server_stats tool reports them per tool.
+
+Long-running tools report staged work as MCP progress notifications.
+Responses larger than the byte budget are spilled to a local results file;
+the client gets the first page with a result_id and cursor, and pages
+through the rest with the fetch_result tool.
 """
 
+import asyncio
+import atexit
+import contextvars
+import functools
+import importlib.util
+import inspect
+import json
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 from mcp import types
 from mcp.server import Server
-from typing import Any
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
 
 from .filesystem import FilesystemTool
 from .command_runner import CommandRunner
 from .figma_parser import FigmaParser
 from .amplience_api import AmplienceAPI
 from .har_analyzer import HARAnalyzer
-
-# Import Figma Reader Agent (for API-based Figma reading)
+from .agent_pool import get_agent_pool
+from .result_store import ResultStore, paginate
+from .sessions import SessionTable, ToolSession, current_session, resolve_workflow_id
+from .tool_metrics import HISTOGRAMS, ToolMetrics
+
+# Agent modules are imported inside the tool handlers that use them, so
+# starting the server (and listing tools) does not pay for importing every
+# agent and its dependencies. Python caches each module after first use.
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from agents.figma_reader_agent import FigmaReaderAgent
-from agents.commerce_agent import CommerceAgent
-from agents.broken_experience_detector_agent import BrokenExperienceDetectorAgent
-from agents.unit_test_agent import UnitTestAgent
-from agents.qa_agent import QAAgent
-from agents.sonar_validation_agent import SonarValidationAgent, validate_for_pr
-from agents.analytics_agent import AnalyticsAgent
-from agents.task_manager_agent import TaskManagerAgent
-from tools.jira_client import JiraClient, JiraConfig
-from tools.sprint_ai_report import SprintAIReportGenerator, generate_sprint_report, identify_ai_commits_in_range
-
-
-def register_tools(server: Server) -> None:
+
+logger = logging.getLogger("pnd_agents.tools")
+
+ToolResult = List[types.TextContent]
+ToolHandler = Callable[..., Union[ToolResult, Awaitable[ToolResult]]]
+
+
+class ToolError(list):
+    """
+    A handler's error response.
+    
+    Sent to the client like any other result, but counted as a failed call
+    in the tool metrics and never reused from the read cache.
+    """
+
+
+def tool_error(text: str) -> ToolError:
+    """Build the error response of a handler that handled its own failure."""
+    return ToolError([types.TextContent(type="text", text=text)])
+
+# Worker pools for synchronous handlers
+TOOL_POOLS = ("io", "cpu")
+
+# Pool sizes; CPU-bound handlers mostly hold the GIL, so more threads only add contention
+DEFAULT_IO_WORKERS = int(os.environ.get("PND_TOOL_IO_WORKERS", "16"))
+DEFAULT_CPU_WORKERS = int(os.environ.get("PND_TOOL_CPU_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+# Largest response sent inline; bigger results are spilled and paged
+DEFAULT_MAX_RESULT_BYTES = int(os.environ.get("PND_TOOL_MAX_RESULT_BYTES", "100000"))
+
+# Where spilled results are kept for fetch_result
+DEFAULT_RESULTS_DIR = os.environ.get("PND_TOOL_RESULTS_DIR", "/tmp/pnd_agent_results")
+
+# Prometheus text file the tool metrics are written to; unset to disable
+DEFAULT_METRICS_FILE = os.environ.get("PND_TOOL_METRICS_FILE") or None
+
+# Seconds a read-only result is reused after it completes, for tools that
+# do not set their own cache_ttl; 0 only shares calls still in flight
+DEFAULT_READ_CACHE_TTL = float(os.environ.get("PND_TOOL_READ_CACHE_TTL", "0"))
+
+# Figma's REST API is rate limited and files rarely change within a minute
+FIGMA_READ_CACHE_TTL = 60
+
+# OCAPI guest tokens are valid for 30 minutes; pooled commerce agents cache
+# theirs, so they are retired before it expires
+COMMERCE_AGENT_MAX_AGE = 25 * 60
+
+
+class ToolProgress:
+    """
+    Progress reporter for one tool call.
+    
+    Call it as progress(done, total, message) from the handler, on the event
+    loop or a worker thread. Each call becomes an MCP progress notification
+    when the client sent a progress token, and does nothing otherwise.
+    """
+    
+    def __init__(
+        self,
+        send: Optional[Callable[[float, Optional[float], Optional[str]], Awaitable[None]]] = None,
+        loop: Optional[asyncio.AbstractEventLoop] = None
+    ):
+        """
+        Initialize the reporter.
+        
+        Args:
+            send: Coroutine function sending one notification.
+            loop: Event loop the notifications are sent on.
+        """
+        self._send = send
+        self._loop = loop
+    
+    @property
+    def enabled(self) -> bool:
+        """Whether the client asked for progress."""
+        return self._send is not None
+    
+    def __call__(self, progress: float, total: Optional[float] = None, message: Optional[str] = None):
+        if self._send is None:
+            return
+        coro = self._send(progress, total, message)
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            future = asyncio.ensure_future(coro)
+        else:
+            future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        future.add_done_callback(self._log_failure)
+    
+    @staticmethod
+    def _log_failure(future):
+        if not future.cancelled() and future.exception() is not None:
+            logger.warning(f"Failed to send progress notification: {future.exception()}")
+
+
+@dataclass
+class ToolSpec:
+    """Declaration of one MCP tool: its schema and the handler that runs it."""
+    name: str
+    description: str
+    input_schema: Dict[str, Any]
+    handler: ToolHandler
+    is_async: Optional[bool] = None  # Detected from the handler when not given
+    pool: str = "io"  # Worker pool for sync handlers: io, cpu
+    max_concurrency: Optional[int] = None  # Calls of this tool running at once; None for no limit
+    progress: bool = False  # Handler takes a ToolProgress as second argument
+    spill: bool = True  # Spill responses over the byte budget to fetch_result
+    read_only: bool = False  # Identical concurrent calls share one run
+    cache_ttl: Optional[float] = None  # Seconds a read_only result is reused; None for the registry default
+    
+    def __post_init__(self):
+        if self.is_async is None:
+            self.is_async = inspect.iscoroutinefunction(self.handler)
+        if self.pool not in TOOL_POOLS:
+            raise ValueError(f"Invalid pool for tool {self.name}: {self.pool} (expected one of: {', '.join(TOOL_POOLS)})")
+        if self.max_concurrency is not None and self.max_concurrency < 1:
+            raise ValueError(f"max_concurrency for tool {self.name} must be at least 1")
+        if self.cache_ttl is not None and not self.read_only:
+            raise ValueError(f"cache_ttl for tool {self.name} requires read_only=True")
+    
+    def to_tool(self) -> types.Tool:
+        """Build the MCP Tool advertised by list_tools."""
+        return types.Tool(
+            name=self.name,
+            description=self.description,
+            inputSchema=self.input_schema
+        )
+
+
+class ToolRegistry:
+    """
+    Name -> ToolSpec table behind the MCP list_tools and call_tool handlers.
+    
+    The Tool list is built on first request and cached until a tool is
+    registered or removed. Async handlers run on the event loop; sync
+    handlers run on the worker pool named by their spec.
+    """
+    
+    def __init__(
+        self,
+        io_workers: Optional[int] = None,
+        cpu_workers: Optional[int] = None,
+        max_result_bytes: Optional[int] = None,
+        results_dir: Optional[str] = None,
+        read_cache_ttl: Optional[float] = None,
+        metrics_file: Optional[str] = None
+    ):
+        """
+        Initialize the registry.
+        
+        Args:
+            io_workers: Threads for I/O-bound sync handlers
+                        (default: PND_TOOL_IO_WORKERS or 16).
+            cpu_workers: Threads for CPU-bound sync handlers
+                         (default: PND_TOOL_CPU_WORKERS or min(4, CPUs)).
+            max_result_bytes: Byte budget for one response
+                              (default: PND_TOOL_MAX_RESULT_BYTES or 100000).
+            results_dir: Directory for spilled results
+                         (default: PND_TOOL_RESULTS_DIR or /tmp/pnd_agent_results).
+            read_cache_ttl: Seconds read-only results are reused after they
+                            complete (default: PND_TOOL_READ_CACHE_TTL or 0).
+            metrics_file: Prometheus text file for the tool metrics
+                          (default: PND_TOOL_METRICS_FILE, or none).
+        """
+        self.max_result_bytes = max_result_bytes or DEFAULT_MAX_RESULT_BYTES
+        self.result_store = ResultStore(results_dir or DEFAULT_RESULTS_DIR)
+        self.read_cache_ttl = DEFAULT_READ_CACHE_TTL if read_cache_ttl is None else read_cache_ttl
+        self.metrics = ToolMetrics(metrics_file or DEFAULT_METRICS_FILE)
+        self.started_at = time.time()
+        self._specs: Dict[str, ToolSpec] = {}
+        self._tools: Optional[List[types.Tool]] = None
+        self._pool_sizes = {
+            "io": io_workers or DEFAULT_IO_WORKERS,
+            "cpu": cpu_workers or DEFAULT_CPU_WORKERS,
+        }
+        self._executors: Dict[str, ThreadPoolExecutor] = {}
+        self._limits: Dict[str, asyncio.Semaphore] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}  # Call key -> shared run of a read-only tool
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._recent: Dict[str, Tuple[float, ToolResult]] = {}  # Call key -> (expiry, result)
+        self._lock = threading.Lock()
+        # Queue depth and utilisation counters
+        self._pool_queued = {pool: 0 for pool in TOOL_POOLS}
+        self._pool_running = {pool: 0 for pool in TOOL_POOLS}
+        self._tool_waiting: Dict[str, int] = {}
+        self._tool_active: Dict[str, int] = {}
+        self._coalesced = 0
+        self._cache_hits = 0
+    
+    def register(self, spec: ToolSpec, replace: bool = False) -> None:
+        """
+        Add a tool.
+        
+        Args:
+            spec: The tool to add.
+            replace: Replace an existing tool with the same name.
+        
+        Raises:
+            ValueError: If a tool with the same name exists and replace is False.
+        """
+        if spec.name in self._specs and not replace:
+            raise ValueError(f"Tool already registered: {spec.name}")
+        self._specs[spec.name] = spec
+        self._tools = None
+        self._forget(spec.name)
+    
+    def register_all(self, specs: List[ToolSpec], replace: bool = False) -> None:
+        """Add several tools."""
+        for spec in specs:
+            self.register(spec, replace=replace)
+    
+    def unregister(self, name: str) -> bool:
+        """Remove a tool. Returns False if it was not registered."""
+        if self._specs.pop(name, None) is None:
+            return False
+        self._tools = None
+        self._forget(name)
+        return True
+    
+    def get(self, name: str) -> Optional[ToolSpec]:
+        """Get a tool spec by name."""
+        return self._specs.get(name)
+    
+    def names(self) -> List[str]:
+        """Get the registered tool names in registration order."""
+        return list(self._specs)
+    
+    def __contains__(self, name: str) -> bool:
+        return name in self._specs
+    
+    def __len__(self) -> int:
+        return len(self._specs)
+    
+    def list_tools(self) -> List[types.Tool]:
+        """Get the MCP Tool list, built once and cached."""
+        if self._tools is None:
+            self._tools = [spec.to_tool() for spec in self._specs.values()]
+        return self._tools
+    
+    async def call(
+        self,
+        name: str,
+        arguments: Dict[str, Any],
+        progress: Optional[ToolProgress] = None
+    ) -> ToolResult:
+        """
+        Run a tool.
+        
+        Waits for a free slot when the tool is at its max_concurrency, then
+        awaits an async handler or runs a sync handler on its worker pool.
+        A response over the byte budget is replaced by its first page.
+        
+        Calls to a read_only tool with the same arguments as a call still
+        running wait for that call's result instead of running again; a
+        completed result is reused until its cache_ttl expires.
+        
+        Args:
+            name: Tool name.
+            arguments: Tool arguments.
+            progress: Reporter passed to handlers declared with progress=True.
+        
+        Raises:
+            ValueError: If the tool is not registered.
+        """
+        spec = self._specs.get(name)
+        if spec is None:
+            raise ValueError(f"Unknown tool: {name}")
+        self._bind_loop()
+        if not spec.read_only:
+            return await self._execute(spec, arguments, progress)
+        
+        key = self._call_key(name, arguments)
+        with self._lock:
+            cached = self._recent.get(key)
+            if cached is not None and cached[0] > time.monotonic():
+                self._cache_hits += 1
+                return list(cached[1])
+        
+        shared = self._inflight.get(key)
+        if shared is None:
+            # A task, so cancelling the first caller does not cancel the others
+            shared = asyncio.ensure_future(self._execute(spec, arguments, progress))
+            self._inflight[key] = shared
+            shared.add_done_callback(functools.partial(self._land, spec, key))
+        else:
+            with self._lock:
+                self._coalesced += 1
+        return list(await asyncio.shield(shared))
+    
+    async def _execute(self, spec: ToolSpec, arguments: Dict[str, Any], progress: Optional[ToolProgress]) -> ToolResult:
+        """Run a handler and apply the byte budget to its response."""
+        if spec.progress:
+            invoke = functools.partial(spec.handler, arguments, progress or ToolProgress())
+        else:
+            invoke = functools.partial(spec.handler, arguments)
+        result = await self._run(spec, invoke)
+        
+        request_bytes = len(json.dumps(arguments, default=str).encode("utf-8"))
+        response_bytes = sum(
+            len(item.text.encode("utf-8")) for item in result or [] if isinstance(item, types.TextContent)
+        )
+        self.metrics.observe_payload(spec.name, request_bytes, response_bytes)
+        self._write_metrics()
+        return self._apply_budget(spec, result)
+    
+    def _land(self, spec: ToolSpec, key: str, shared: asyncio.Future):
+        """Drop a finished shared run and keep its result for the cache TTL."""
+        if self._inflight.get(key) is shared:
+            del self._inflight[key]
+        if shared.cancelled() or shared.exception() is not None or isinstance(shared.result(), ToolError):
+            return
+        ttl = self.read_cache_ttl if spec.cache_ttl is None else spec.cache_ttl
+        if ttl <= 0 or self._specs.get(spec.name) is not spec:
+            return
+        now = time.monotonic()
+        with self._lock:
+            for stale in [k for k, (expiry, _) in self._recent.items() if expiry <= now]:
+                del self._recent[stale]
+            self._recent[key] = (now + ttl, shared.result())
+    
+    def _forget(self, name: str):
+        """Drop cached results of a tool that was replaced or removed."""
+        prefix = self._call_key(name, None)
+        with self._lock:
+            for key in [k for k in self._recent if k.startswith(prefix)]:
+                del self._recent[key]
+    
+    @staticmethod
+    def _call_key(name: str, arguments: Optional[Dict[str, Any]]) -> str:
+        """Key identifying a call: tool name plus canonical JSON arguments."""
+        if arguments is None:
+            return f"{name}\0"
+        return f"{name}\0{json.dumps(arguments, sort_keys=True, separators=(',', ':'), default=str)}"
+    
+    def fetch_result(self, result_id: str, cursor: Optional[str] = None, max_bytes: Optional[int] = None) -> ToolResult:
+        """
+        Read a page of a spilled result.
+        
+        The page text comes first, followed by a JSON footer with the
+        next_cursor (null on the last page).
+        """
+        max_bytes = min(max_bytes or self.max_result_bytes, self.max_result_bytes)
+        page = self.result_store.read_page(result_id, cursor, max_bytes)
+        footer = {
+            "result_id": result_id,
+            "next_cursor": page["next_cursor"],
+            "total_bytes": page["total_bytes"],
+        }
+        return [
+            types.TextContent(type="text", text=page["text"]),
+            types.TextContent(type="text", text=json.dumps(footer)),
+        ]
+    
+    def _apply_budget(self, spec: ToolSpec, result: ToolResult) -> ToolResult:
+        """Spill a text response over the byte budget and return its first page."""
+        if not spec.spill or not isinstance(result, list):
+            return result
+        texts = [item.text for item in result if isinstance(item, types.TextContent)]
+        if len(texts) != len(result):
+            return result
+        text = "\n".join(texts)
+        if len(text.encode("utf-8")) <= self.max_result_bytes:
+            return result
+        
+        result_id = self.result_store.save(text)
+        first = self.result_store.read_page(result_id, None, self.max_result_bytes)
+        footer = {
+            "truncated": True,
+            "result_id": result_id,
+            "next_cursor": first["next_cursor"],
+            "total_bytes": first["total_bytes"],
+            "hint": "Call fetch_result with this result_id and next_cursor for the rest",
+        }
+        return [
+            types.TextContent(type="text", text=first["text"]),
+            types.TextContent(type="text", text=json.dumps(footer)),
+        ]
+    
+    async def _run(self, spec: ToolSpec, invoke: Callable[[], Any]) -> ToolResult:
+        """Run a handler within the tool's concurrency limit, recording its timing."""
+        name = spec.name
+        enqueued = time.perf_counter()
+        timing: Dict[str, float] = {}
+        
+        def timed() -> ToolResult:
+            timing["started"] = time.perf_counter()
+            try:
+                return invoke()
+            finally:
+                timing["finished"] = time.perf_counter()
+        
+        limit = self._limit(spec)
+        if limit is not None:
+            self._count(self._tool_waiting, name, 1)
+            try:
+                await limit.acquire()
+            finally:
+                self._count(self._tool_waiting, name, -1)
+        
+        self._count(self._tool_active, name, 1)
+        error = False
+        try:
+            if spec.is_async:
+                timing["started"] = time.perf_counter()
+                try:
+                    result = await invoke()
+                finally:
+                    timing["finished"] = time.perf_counter()
+            else:
+                result = await asyncio.wrap_future(self._submit(spec, timed))
+            # Handlers that catch their own failures return a ToolError
+            error = isinstance(result, ToolError)
+            return result
+        except Exception:
+            error = True
+            raise
+        finally:
+            self._count(self._tool_active, name, -1)
+            if limit is not None:
+                limit.release()
+            # Calls cancelled before their handler finished are not timed
+            if "finished" in timing:
+                self.metrics.observe_call(
+                    name,
+                    queue_seconds=timing["started"] - enqueued,
+                    run_seconds=timing["finished"] - timing["started"],
+                    error=error
+                )
+    
+    def queue_depth(self) -> int:
+        """Get the number of tool calls waiting for a concurrency slot or a worker thread."""
+        with self._lock:
+            return sum(self._tool_waiting.values()) + sum(self._pool_queued.values())
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get worker pool and per-tool concurrency counters.
+        
+        Returns:
+            Dict with "queue_depth", "pools" (workers, queued, running per
+            pool), "tools" (waiting and active calls per busy tool),
+            "coalesced" (calls that joined a running duplicate) and
+            "cache_hits" (calls served from a cached result).
+        """
+        with self._lock:
+            pools = {
+                pool: {
+                    "workers": self._pool_sizes[pool],
+                    "queued": self._pool_queued[pool],
+                    "running": self._pool_running[pool],
+                }
+                for pool in TOOL_POOLS
+            }
+            tools = {
+                name: {
+                    "waiting": self._tool_waiting.get(name, 0),
+                    "active": self._tool_active.get(name, 0),
+                    "max_concurrency": self._specs[name].max_concurrency if name in self._specs else None,
+                }
+                for name in set(self._tool_waiting) | set(self._tool_active)
+            }
+            queue_depth = sum(self._tool_waiting.values()) + sum(self._pool_queued.values())
+            coalesced, cache_hits = self._coalesced, self._cache_hits
+        
+        return {
+            "queue_depth": queue_depth,
+            "pools": pools,
+            "tools": tools,
+            "coalesced": coalesced,
+            "cache_hits": cache_hits,
+        }
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker pools and write the final metrics. Pools are recreated if another call arrives."""
+        with self._lock:
+            executors = list(self._executors.values())
+            self._executors.clear()
+        for executor in executors:
+            executor.shutdown(wait=wait, cancel_futures=not wait)
+        self._write_metrics(force=True)
+    
+    def _write_metrics(self, force: bool = False):
+        """Update the Prometheus file, if configured, without failing the call."""
+        try:
+            self.metrics.write_prometheus(force=force)
+        except OSError as e:
+            logger.warning(f"Failed to write tool metrics: {e}")
+    
+    def _bind_loop(self):
+        """Reset the semaphores and shared runs when called from a new event loop."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Semaphores and futures are bound to the loop that created them
+            self._limits = {}
+            self._inflight = {}
+            self._loop = loop
+    
+    def _limit(self, spec: ToolSpec) -> Optional[asyncio.Semaphore]:
+        """Get the concurrency semaphore for a tool on the running event loop."""
+        if spec.max_concurrency is None:
+            return None
+        self._bind_loop()
+        limit = self._limits.get(spec.name)
+        if limit is None:
+            limit = self._limits[spec.name] = asyncio.Semaphore(spec.max_concurrency)
+        return limit
+    
+    def _submit(self, spec: ToolSpec, invoke: Callable[[], ToolResult]) -> Future:
+        """Queue a sync handler on its worker pool, tracking queue depth."""
+        pool = spec.pool
+        with self._lock:
+            executor = self._executors.get(pool)
+            if executor is None:
+                executor = self._executors[pool] = ThreadPoolExecutor(
+                    max_workers=self._pool_sizes[pool],
+                    thread_name_prefix=f"mcp-tool-{pool}"
+                )
+            self._pool_queued[pool] += 1
+        
+        started = threading.Event()
+        
+        def run() -> ToolResult:
+            with self._lock:
+                self._pool_queued[pool] -= 1
+                self._pool_running[pool] += 1
+            started.set()
+            try:
+                return invoke()
+            finally:
+                with self._lock:
+                    self._pool_running[pool] -= 1
+        
+        def on_done(future: Future):
+            # A call cancelled while still queued never reaches run()
+            if future.cancelled() and not started.is_set():
+                with self._lock:
+                    self._pool_queued[pool] -= 1
+        
+        # Handlers see the caller's context variables, such as the MCP session
+        future = executor.submit(contextvars.copy_context().run, run)
+        future.add_done_callback(on_done)
+        return future
+    
+    def _count(self, counter: Dict[str, int], name: str, delta: int):
+        with self._lock:
+            value = counter.get(name, 0) + delta
+            if value:
+                counter[name] = value
+            else:
+                counter.pop(name, None)
+
+
+# Callables adding third-party tools to the registry, see register_tool_pack()
+_TOOL_PACKS: List[Callable[[ToolRegistry], None]] = []
+
+
+def register_tool_pack(pack: Callable[[ToolRegistry], None]) -> Callable[[ToolRegistry], None]:
+    """
+    Add a tool pack, applied by every later register_tools() call.
+    
+    A pack receives the ToolRegistry after the built-in tools are
+    registered and calls registry.register() for each of its tools. Can
+    be used as a decorator.
+    """
+    _TOOL_PACKS.append(pack)
+    return pack
+
+
+# TaskManagerAgents shared by the task_manager_* tools, keyed by use_result_cache
+_task_managers: Dict[bool, Any] = {}
+_task_managers_lock = threading.Lock()
+
+
+def get_task_manager(use_result_cache: bool = False) -> Any:
+    """
+    Get the server's shared TaskManagerAgent, created on first use.
+    
+    Every task_manager_* call runs on the same engine and dispatcher;
+    clients' workflows are kept apart by their MCP session. Runs asking for
+    the result cache get a second instance with it enabled, so the cache
+    stays off for everyone else. Shut down at interpreter exit or with
+    shutdown_task_managers().
+    """
+    with _task_managers_lock:
+        task_manager = _task_managers.get(use_result_cache)
+        if task_manager is None:
+            from agents.task_manager_agent import TaskManagerAgent
+            task_manager = TaskManagerAgent(use_result_cache=use_result_cache)
+            if not _task_managers:
+                atexit.register(shutdown_task_managers)
+            _task_managers[use_result_cache] = task_manager
+        return task_manager
+
+
+def shutdown_task_managers(wait: bool = True):
+    """Shut down the shared TaskManagerAgents; a later get_task_manager() starts new ones."""
+    with _task_managers_lock:
+        task_managers = list(_task_managers.values())
+        _task_managers.clear()
+    if task_managers:
+        atexit.unregister(shutdown_task_managers)
+    for task_manager in task_managers:
+        task_manager.shutdown(wait=wait)
+
+
+def register_tools(
+    server: Server,
+    registry: Optional[ToolRegistry] = None,
+    isolate_sessions: bool = False
+) -> ToolRegistry:
     """
     Register all PG AI Squad tools with the MCP server.
 
     Args:
         server: The MCP server instance to register tools with.
-    """
+        registry: Registry to serve from. Defaults to a new registry.
+        isolate_sessions: Keep workflow state per MCP session, for servers
+                          shared by several clients (the HTTP transport).
 
-    # Initialize tool instances
-    fs_tool = FilesystemTool()
-    cmd_runner = CommandRunner()
-    figma_parser = FigmaParser()
-    amplience_api = AmplienceAPI()
-    har_analyzer = HARAnalyzer()
+    Returns:
+        The registry holding the built-in and tool pack tools.
+    """
+    if registry is None:
+        registry = ToolRegistry()
+    registry.register_all(builtin_tool_specs())
+    registry.register(fetch_result_spec(registry))
+    registry.register(server_stats_spec(registry))
+    for pack in _TOOL_PACKS:
+        pack(registry)
+    sessions = SessionTable() if isolate_sessions else None
 
     # Register list_tools handler
     @server.list_tools()
     async def list_tools() -> list[types.Tool]:
         """List all available tools."""
-        return [
-            # Filesystem Tools
-            types.Tool(
-                name="fs_read_file",
-                description="Read the contents of a file",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "path": {
-                            "type": "string",
-                            "description": "Path to the file to read"
-                        },
-                        "encoding": {
-                            "type": "string",
-                            "description": "File encoding (default: utf-8)",
-                            "default": "utf-8"
-                        }
-                    },
-                    "required": ["path"]
-                }
-            ),
-            types.Tool(
-                name="fs_write_file",
-                description="Write content to a file",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "path": {
-                            "type": "string",
-                            "description": "Path to the file to write"
-                        },
-                        "content": {
-                            "type": "string",
-                            "description": "Content to write to the file"
-                        },
-                        "encoding": {
-                            "type": "string",
-                            "description": "File encoding (default: utf-8)",
-                            "default": "utf-8"
-                        },
-                        "create_dirs": {
-                            "type": "boolean",
-                            "description": "Create parent directories if needed (default: true)",
-                            "default": True
-                        }
-                    },
-                    "required": ["path", "content"]
+        return registry.list_tools()
+
+    # Register call_tool handler
+    @server.call_tool()
+    async def call_tool(name: str, arguments: dict[str, Any]) -> list[types.TextContent]:
+        """Handle tool calls."""
+
+        token = current_session.set(request_session(server, sessions)) if sessions is not None else None
+        try:
+            return await registry.call(name, arguments, progress=request_progress(server))
+
+        except Exception as e:
+            return [types.TextContent(
+                type="text",
+                text=f"Error executing tool '{name}': {str(e)}"
+            )]
+        finally:
+            if token is not None:
+                current_session.reset(token)
+
+    return registry
+
+
+def request_session(server: Server, sessions: SessionTable) -> Optional[ToolSession]:
+    """Get the tool session of the client whose request is being handled."""
+    try:
+        return sessions.get(server.request_context.session)
+    except (LookupError, AttributeError):
+        return None
+
+
+def request_progress(server: Server) -> ToolProgress:
+    """Build the progress reporter for the request being handled."""
+    try:
+        ctx = server.request_context
+    except (LookupError, AttributeError):
+        return ToolProgress()
+    token = getattr(ctx.meta, "progressToken", None) if ctx.meta else None
+    if token is None:
+        return ToolProgress()
+    
+    async def send(progress: float, total: Optional[float], message: Optional[str]):
+        try:
+            await ctx.session.send_progress_notification(token, progress, total=total, message=message)
+        except TypeError:
+            # MCP SDK releases before progress messages
+            await ctx.session.send_progress_notification(token, progress, total=total)
+    
+    return ToolProgress(send, asyncio.get_running_loop())
+
+
+def fetch_result_spec(registry: ToolRegistry) -> ToolSpec:
+    """Build the fetch_result tool, which pages through spilled results."""
+    def handle_fetch_result(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        return registry.fetch_result(
+            arguments["result_id"],
+            arguments.get("cursor"),
+            arguments.get("max_bytes")
+        )
+    
+    return ToolSpec(
+        name="fetch_result",
+        description="Fetch the next page of a large tool result. Large results return a result_id and next_cursor instead of the full text.",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "result_id": {
+                    "type": "string",
+                    "description": "The result_id from the truncated response"
+                },
+                "cursor": {
+                    "type": "string",
+                    "description": "The next_cursor from the previous page"
+                },
+                "max_bytes": {
+                    "type": "integer",
+                    "description": "Maximum page size in bytes (default and maximum: the server's byte budget)"
+                }
+            },
+            "required": ["result_id"]
+        },
+        handler=handle_fetch_result,
+        spill=False
+    )
+
+
+# mcp_server_stats sort keys: histogram keys sort by p95, counters by value
+STATS_SORT_KEYS = ("run_seconds", "queue_seconds", "response_bytes", "request_bytes", "errors", "calls")
+
+
+def server_stats_spec(registry: ToolRegistry) -> ToolSpec:
+    """Build the mcp_server_stats tool, which reports per-tool metrics."""
+    def handle_mcp_server_stats(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        sort_by = arguments.get("sort_by", "run_seconds")
+        if sort_by not in STATS_SORT_KEYS:
+            raise ValueError(f"Invalid sort_by: {sort_by} (expected one of: {', '.join(STATS_SORT_KEYS)})")
+        
+        tools = [{"tool": name, **metrics} for name, metrics in registry.metrics.snapshot(arguments.get("tool")).items()]
+        if sort_by in HISTOGRAMS:
+            tools.sort(key=lambda entry: entry[sort_by]["p95"] or 0, reverse=True)
+        else:
+            tools.sort(key=lambda entry: entry[sort_by], reverse=True)
+        if arguments.get("limit"):
+            tools = tools[:arguments["limit"]]
+        
+        stats = registry.stats()
+        result = {
+            "uptime_seconds": round(time.time() - registry.started_at, 1),
+            "queue_depth": stats["queue_depth"],
+            "pools": stats["pools"],
+            "active": stats["tools"],
+            "coalesced": stats["coalesced"],
+            "cache_hits": stats["cache_hits"],
+            "prometheus_file": registry.metrics.prometheus_path,
+            "tools": tools,
+        }
+        return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+    
+    return ToolSpec(
+        name="mcp_server_stats",
+        description="Get MCP server metrics: per-tool call counts, errors, queue and run time percentiles (seconds) and payload sizes (bytes), plus worker pool load. Use this to find slow tools.",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "tool": {
+                    "type": "string",
+                    "description": "Only report this tool"
+                },
+                "sort_by": {
+                    "type": "string",
+                    "enum": list(STATS_SORT_KEYS),
+                    "description": "Order tools by this metric, highest first (default: run_seconds, by p95)",
+                    "default": "run_seconds"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of tools to report"
+                }
+            }
+        },
+        handler=handle_mcp_server_stats
+    )
+
+
+def builtin_tool_specs() -> List[ToolSpec]:
+    """Build the specs for all built-in PG AI Squad tools."""
+
+    # Initialize tool instances. FigmaParser and HARAnalyzer keep per-file
+    # state, so each call creates its own now that handlers run concurrently.
+    fs_tool = FilesystemTool()
+    cmd_runner = CommandRunner()
+    amplience_api = AmplienceAPI()
+
+    def lease_sonar_agent(project_key: str):
+        """Lease a pooled SonarValidationAgent for a project."""
+        from agents.sonar_validation_agent import SonarValidationAgent
+        return get_agent_pool().lease(("sonar", project_key), lambda: SonarValidationAgent(project_key=project_key))
+    
+    # Filesystem tools
+    def handle_fs_read_file(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        result = fs_tool.read_file(
+            arguments["path"],
+            arguments.get("encoding", "utf-8")
+        )
+        return [types.TextContent(type="text", text=result)]
+
+    def handle_fs_write_file(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        result = fs_tool.write_file(
+            arguments["path"],
+            arguments["content"],
+            arguments.get("encoding", "utf-8"),
+            arguments.get("create_dirs", True)
+        )
+        return [types.TextContent(type="text", text=f"File written: {result}")]
+
+    def handle_fs_list_directory(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        result = fs_tool.list_directory(
+            arguments["path"],
+            arguments.get("recursive", False)
+        )
+        files = [f.path for f in result]
+        if "cursor" not in arguments and "page_size" not in arguments:
+            return [types.TextContent(type="text", text="\n".join(files))]
+        page, next_cursor = paginate(files, arguments.get("cursor"), arguments.get("page_size", 500))
+        footer = json.dumps({"next_cursor": next_cursor, "total": len(files)})
+        return [types.TextContent(type="text", text="\n".join(page + [footer]))]
+
+    def handle_fs_read_json(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        result = fs_tool.read_json(arguments["path"])
+        import json
+        return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+
+    def handle_fs_write_json(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        result = fs_tool.write_json(
+            arguments["path"],
+            arguments["data"],
+            arguments.get("indent", 2)
+        )
+        return [types.TextContent(type="text", text=f"JSON written: {result}")]
+
+    # Command runner tools
+    def handle_cmd_run(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        result = cmd_runner.run(
+            arguments["command"],
+            arguments.get("args", []),
+            arguments.get("timeout", 300)
+        )
+        output = f"Exit code: {result.exit_code}\n\nStdout:\n{result.stdout}\n\nStderr:\n{result.stderr}"
+        return [types.TextContent(type="text", text=output)]
+
+    def handle_cmd_run_eslint(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        result = cmd_runner.run_eslint(
+            arguments["paths"],
+            arguments.get("fix", False)
+        )
+        output = f"Exit code: {result.exit_code}\n\n{result.stdout}"
+        return [types.TextContent(type="text", text=output)]
+
+    def handle_cmd_run_prettier(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        result = cmd_runner.run_prettier(
+            arguments["paths"],
+            arguments.get("check", False)
+        )
+        output = f"Exit code: {result.exit_code}\n\n{result.stdout}"
+        return [types.TextContent(type="text", text=output)]
+
+    def handle_cmd_run_tests(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        result = cmd_runner.test(arguments.get("coverage", False))
+        output = f"Exit code: {result.exit_code}\n\n{result.stdout}"
+        return [types.TextContent(type="text", text=output)]
+
+    # Figma parser tools
+    def handle_figma_parse_file(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        result = FigmaParser().parse_file(arguments["file_path"])
+        import json
+        return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+
+    def handle_figma_extract_colors(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        result = FigmaParser().extract_colors(arguments["file_path"])
+        import json
+        return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+
+    # Figma Reader Agent tools (API-based)
+    def handle_figma_read(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        from agents.figma_reader_agent import FigmaReaderAgent
+        import json
+        try:
+            with get_agent_pool().lease("figma", FigmaReaderAgent) as figma_reader:
+                result = figma_reader.get_component_for_frontend_agent(
+                    arguments["url_or_file_key"],
+                    arguments.get("node_id")
+                )
+            return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+        except ValueError as ve:
+            return tool_error(f"Figma Reader Error: {str(ve)}")
+
+    # Amplience API tools
+    def handle_amplience_fetch_by_key(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        result = amplience_api.fetch_by_key(
+            arguments["key"],
+            arguments.get("vse")
+        )
+        import json
+        return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+
+    def handle_amplience_fetch_by_id(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        result = amplience_api.fetch_by_id(
+            arguments["id"],
+            arguments.get("vse")
+        )
+        import json
+        return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+
+    # HAR analyzer tools
+    def handle_har_parse_file(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        result = HARAnalyzer().parse_file(arguments["file_path"])
+        import json
+        return [types.TextContent(type="text", text=json.dumps(result.to_dict(), indent=2))]
+
+    def handle_har_get_performance_metrics(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        result = HARAnalyzer().get_performance_metrics(arguments["file_path"])
+        import json
+        return [types.TextContent(type="text", text=json.dumps(result.to_dict(), indent=2))]
+
+    # Commerce Agent tools
+    def handle_commerce_find_product_and_prepare_cart(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        from agents.commerce_agent import CommerceAgent
+        import json
+        try:
+            with get_agent_pool().lease("commerce", CommerceAgent, max_age=COMMERCE_AGENT_MAX_AGE) as commerce_agent:
+                result = commerce_agent.find_product_and_prepare_cart(
+                    arguments["goal"],
+                    arguments.get("currency")
+                )
+            return [types.TextContent(type="text", text=json.dumps(result.to_dict(), indent=2))]
+        except Exception as ce:
+            return tool_error(f"Commerce Agent Error: {str(ce)}")
+
+    # Broken Experience Detector Agent tools
+    async def handle_broken_experience_detector_scan_site(arguments: Dict[str, Any], progress: ToolProgress) -> list[types.TextContent]:
+        from agents.broken_experience_detector_agent import BrokenExperienceDetectorAgent, get_browser_pool
+        import json
+        try:
+            # Scans share the server's warm browser, each in its own context
+            bx_agent = BrokenExperienceDetectorAgent(headless=True, browser_pool=get_browser_pool())
+            # Use await directly since call_tool is already async
+            report = await bx_agent.scan_site(arguments["url"], on_progress=progress)
+            
+            output_format = arguments.get("output_format", "both")
+            
+            if output_format == "json":
+                return [types.TextContent(type="text", text=json.dumps(report.to_dict(), indent=2))]
+            elif output_format == "markdown":
+                return [types.TextContent(type="text", text=report.to_markdown())]
+            else:  # both
+                result = {
+                    "json": report.to_dict(),
+                    "markdown": report.to_markdown()
                 }
-            ),
-            types.Tool(
-                name="fs_list_directory",
-                description="List files and directories in a path",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "path": {
-                            "type": "string",
-                            "description": "Path to the directory to list"
-                        },
-                        "recursive": {
-                            "type": "boolean",
-                            "description": "List recursively (default: false)",
-                            "default": False
-                        }
-                    },
-                    "required": ["path"]
+                return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+        except Exception as bx_error:
+            return tool_error(f"Broken Experience Detector Error: {str(bx_error)}")
+
+    # Unit Test Agent tools
+    def handle_unit_test_generate(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        import json
+        try:
+            from agents.unit_test_agent import UnitTestAgent, TestFramework
+            
+            framework_str = arguments.get("framework", "jest")
+            framework = TestFramework.JEST if framework_str == "jest" else TestFramework.VITEST
+            
+            agent = UnitTestAgent(framework=framework)
+            test_file = agent.generate_test_file(
+                arguments["source_file"],
+                arguments.get("content")
+            )
+            test_code = agent.generate_test_code(test_file)
+            
+            result = {
+                "testFile": test_file.to_dict(),
+                "testCode": test_code,
+            }
+            return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+        except Exception as ut_error:
+            return tool_error(f"Unit Test Agent Error: {str(ut_error)}")
+
+    def handle_unit_test_analyze(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        import json
+        try:
+            from agents.unit_test_agent import UnitTestAgent
+            
+            agent = UnitTestAgent()
+            analysis = agent.analyze_file(
+                arguments["source_file"],
+                arguments.get("content")
+            )
+            return [types.TextContent(type="text", text=json.dumps(analysis, indent=2))]
+        except Exception as ut_error:
+            return tool_error(f"Unit Test Agent Error: {str(ut_error)}")
+
+    # QA Agent tools
+    def handle_qa_validate(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        import json
+        try:
+            from agents.qa_agent import QAAgent
+            
+            agent = QAAgent()
+            result = agent.validate_implementation(
+                test_cases=arguments.get("test_cases", []),
+                code_paths=arguments.get("code_paths", []),
+                acceptance_criteria=arguments.get("acceptance_criteria", []),
+            )
+            return [types.TextContent(type="text", text=json.dumps(result.to_dict(), indent=2))]
+        except Exception as qa_error:
+            return tool_error(f"QA Agent Error: {str(qa_error)}")
+
+    # Sonar Validation Agent tools
+    def handle_sonar_validate(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        import json
+        try:
+            project_key = arguments.get("project_key", "pandora-jewelry_spark_pandora-group")
+            branch = arguments.get("branch", "master")
+            repo_path = arguments.get("repo_path")
+            
+            with lease_sonar_agent(project_key) as agent:
+                result = agent.validate(branch, repo_path)
+            
+            return [types.TextContent(type="text", text=json.dumps(result.to_dict(), indent=2))]
+        except Exception as sonar_error:
+            return tool_error(f"Sonar Validation Error: {str(sonar_error)}")
+
+    def handle_sonar_get_issues(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        import json
+        try:
+            project_key = arguments.get("project_key", "pandora-jewelry_spark_pandora-group")
+            branch = arguments.get("branch", "master")
+            severities = arguments.get("severities")
+            types_filter = arguments.get("types")
+            
+            with lease_sonar_agent(project_key) as agent:
+                issues = agent.fetch_issues(branch, severities, types_filter)
+            
+            issues_data = [issue.to_dict() for issue in issues]
+            return [types.TextContent(type="text", text=json.dumps(issues_data, indent=2))]
+        except Exception as sonar_error:
+            return tool_error(f"Sonar Issues Error: {str(sonar_error)}")
+
+    def handle_sonar_get_coverage(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        import json
+        try:
+            project_key = arguments.get("project_key", "pandora-jewelry_spark_pandora-group")
+            branch = arguments.get("branch", "master")
+            
+            with lease_sonar_agent(project_key) as agent:
+                coverage = agent.fetch_coverage(branch)
+            
+            return [types.TextContent(type="text", text=json.dumps(coverage.to_dict(), indent=2))]
+        except Exception as sonar_error:
+            return tool_error(f"Sonar Coverage Error: {str(sonar_error)}")
+
+    def handle_sonar_get_quality_gate(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        import json
+        try:
+            project_key = arguments.get("project_key", "pandora-jewelry_spark_pandora-group")
+            branch = arguments.get("branch", "master")
+            
+            with lease_sonar_agent(project_key) as agent:
+                status = agent.fetch_project_status(branch)
+            
+            return [types.TextContent(type="text", text=json.dumps(status, indent=2))]
+        except Exception as sonar_error:
+            return tool_error(f"Sonar Quality Gate Error: {str(sonar_error)}")
+
+    def handle_sonar_validate_for_pr(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        from agents.sonar_validation_agent import validate_for_pr
+        import json
+        try:
+            project_key = arguments.get("project_key", "pandora-jewelry_spark_pandora-group")
+            branch = arguments.get("branch", "master")
+            repo_path = arguments.get("repo_path")
+            
+            result = validate_for_pr(branch, repo_path, project_key)
+            
+            return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+        except Exception as sonar_error:
+            return tool_error(f"Sonar PR Validation Error: {str(sonar_error)}")
+
+    # Analytics Agent tools
+    def handle_analytics_track_task_start(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        from agents.analytics_agent import AnalyticsAgent
+        import json
+        try:
+            analytics_agent = AnalyticsAgent()
+            metrics = analytics_agent.on_task_started(
+                agent_name=arguments["agent_name"],
+                task_description=arguments["task_description"],
+                jira_task_id=arguments.get("jira_task_id"),
+                workflow_id=arguments.get("workflow_id"),
+            )
+            result = {
+                "status": "success",
+                "message": f"Task started for {arguments['agent_name']}",
+                "metrics": metrics.to_dict(),
+            }
+            return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+        except Exception as analytics_error:
+            return tool_error(f"Analytics Error: {str(analytics_error)}")
+
+    def handle_analytics_track_task_end(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        from agents.analytics_agent import AnalyticsAgent
+        import json
+        try:
+            analytics_agent = AnalyticsAgent()
+            metrics_input = {
+                "duration": arguments.get("duration", 0),
+                "iterations": arguments.get("iterations", 1),
+                "errors": arguments.get("errors", []),
+                "effectivenessScore": arguments.get("effectiveness_score"),
+                "requiresHumanReview": arguments.get("requires_human_review", False),
+                "confidenceScore": arguments.get("confidence_score", 1.0),
+            }
+            metrics = analytics_agent.on_task_completed(
+                agent_name=arguments["agent_name"],
+                jira_task_id=arguments.get("jira_task_id"),
+                metrics=metrics_input,
+            )
+            result = {
+                "status": "success",
+                "message": f"Task completed for {arguments['agent_name']}",
+                "metrics": metrics.to_dict(),
+            }
+            return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+        except Exception as analytics_error:
+            return tool_error(f"Analytics Error: {str(analytics_error)}")
+
+    def handle_analytics_track_task_failure(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        from agents.analytics_agent import AnalyticsAgent
+        import json
+        try:
+            analytics_agent = AnalyticsAgent()
+            metrics = analytics_agent.on_task_failed(
+                agent_name=arguments["agent_name"],
+                jira_task_id=arguments.get("jira_task_id"),
+                errors=arguments.get("errors", []),
+            )
+            result = {
+                "status": "success",
+                "message": f"Task failure recorded for {arguments['agent_name']}",
+                "metrics": metrics.to_dict(),
+            }
+            return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+        except Exception as analytics_error:
+            return tool_error(f"Analytics Error: {str(analytics_error)}")
+
+    def handle_analytics_generate_report(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        from agents.analytics_agent import AnalyticsAgent
+        import json
+        try:
+            analytics_agent = AnalyticsAgent()
+            output_format = arguments.get("format", "json")
+            days = arguments.get("days", 14)
+            
+            if output_format == "markdown":
+                report = analytics_agent.generate_markdown_report(days=days)
+                return [types.TextContent(type="text", text=report)]
+            else:
+                report = analytics_agent.generate_json_report(days=days)
+                return [types.TextContent(type="text", text=json.dumps(report, indent=2))]
+        except Exception as analytics_error:
+            return tool_error(f"Analytics Error: {str(analytics_error)}")
+
+    def handle_analytics_list(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        from agents.analytics_agent import AnalyticsAgent
+        import json
+        try:
+            analytics_agent = AnalyticsAgent()
+            analytics = analytics_agent.list_analytics(
+                days=arguments.get("days", 7),
+                agent_name=arguments.get("agent_name"),
+                status=arguments.get("status"),
+            )
+            result = {
+                "status": "success",
+                "count": len(analytics),
+                "tasks": analytics,
+            }
+            return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+        except Exception as analytics_error:
+            return tool_error(f"Analytics Error: {str(analytics_error)}")
+
+    def handle_analytics_update_jira_task(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        from tools.jira_client import JiraClient, JiraConfig
+        import json
+        import os
+        try:
+            # Build JIRA config with optional overrides
+            jira_base_url = arguments.get("jira_base_url") or os.environ.get("JIRA_BASE_URL", "")
+            jira_email = arguments.get("jira_email") or os.environ.get("JIRA_EMAIL", "")
+            jira_api_token = os.environ.get("JIRA_API_TOKEN", "")
+            
+            jira_config = JiraConfig(
+                base_url=jira_base_url,
+                email=jira_email,
+                api_token=jira_api_token,
+            )
+            jira_client = JiraClient(config=jira_config)
+            
+            duration_ms = arguments.get("duration_ms", 0)
+            if duration_ms < 60000:
+                duration_str = f"{duration_ms / 1000:.1f}s"
+            else:
+                minutes = duration_ms / 60000
+                seconds = (duration_ms % 60000) / 1000
+                duration_str = f"{minutes:.0f}m {seconds:.0f}s"
+            
+            errors_count = arguments.get("errors", 0)
+            error_str = f"{errors_count} (auto-fixed)" if errors_count > 0 else "0"
+            
+            comment = f"""AI Agent Update - PG AI Squad
+
+Agent: {arguments['agent_name']}
+Task: {arguments.get('task_name', 'N/A')}
+Status: {arguments['status']}
+
+Metrics:
+- Duration: {duration_str}
+- Iterations: {arguments.get('iterations', 1)}
+- Errors: {error_str}
+- Effectiveness Score: {arguments.get('effectiveness_score', 'N/A')}%
+- Human Review Required: {'Yes' if arguments.get('requires_human_review') else 'No'}
+
+AI Productivity Tracker Agent v1.0"""
+            
+            jira_client.add_comment(arguments["jira_task_id"], comment)
+            
+            if arguments.get("effectiveness_score") is not None:
+                jira_client.update_ai_fields(
+                    arguments["jira_task_id"],
+                    ai_used=True,
+                    agent_name=arguments["agent_name"],
+                    efficiency_score=arguments.get("effectiveness_score"),
+                    duration_ms=duration_ms,
+                )
+            
+            result = {
+                "status": "success",
+                "message": f"JIRA issue {arguments['jira_task_id']} updated",
+            }
+            return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+        except Exception as jira_error:
+            return tool_error(f"JIRA Update Error: {str(jira_error)}")
+
+    def handle_analytics_get_config(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        from agents.analytics_agent import AnalyticsAgent
+        import json
+        try:
+            analytics_agent = AnalyticsAgent()
+            result = {
+                "status": "success",
+                "config": analytics_agent.config,
+            }
+            return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+        except Exception as analytics_error:
+            return tool_error(f"Analytics Error: {str(analytics_error)}")
+
+    def handle_analytics_update_config(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        from agents.analytics_agent import AnalyticsAgent
+        import json
+        try:
+            analytics_agent = AnalyticsAgent()
+            for key, value in arguments.items():
+                if key in analytics_agent.config:
+                    analytics_agent.config[key] = value
+            
+            result = {
+                "status": "success",
+                "message": "Configuration updated",
+                "config": analytics_agent.config,
+            }
+            return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+        except Exception as analytics_error:
+            return tool_error(f"Analytics Error: {str(analytics_error)}")
+
+    # Task Manager Agent tools
+    def handle_task_manager_analyze(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        import json
+        try:
+            task_manager = get_task_manager()
+            result = task_manager.analyze_task(arguments["task_description"])
+            return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+        except Exception as tm_error:
+            return tool_error(f"Task Manager Error: {str(tm_error)}")
+
+    def handle_task_manager_run(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        import json
+        try:
+            task_manager = get_task_manager(use_result_cache=bool(arguments.get("cache", False)))
+            metadata = {}
+            if arguments.get("jira_task_id"):
+                metadata["jira_task_id"] = arguments["jira_task_id"]
+            if arguments.get("branch_name"):
+                metadata["branch_name"] = arguments["branch_name"]
+            
+            if arguments.get("parallel", False) or arguments.get("dag", False):
+                context = task_manager.run_task_parallel(
+                    arguments["task_description"],
+                    metadata=metadata if metadata else None,
+                    verbose=False,
+                    use_dag=arguments.get("dag", False)
+                )
+            else:
+                context = task_manager.run_task(
+                    arguments["task_description"],
+                    metadata=metadata if metadata else None,
+                    verbose=False
+                )
+            session = current_session.get()
+            if session is not None:
+                session.add_workflow(context.workflow_id)
+            result = task_manager.to_dict(context)
+            return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+        except Exception as tm_error:
+            return tool_error(f"Task Manager Error: {str(tm_error)}")
+
+    def handle_task_manager_status(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        import json
+        try:
+            task_manager = get_task_manager()
+            status = task_manager.get_status(workflow_id=resolve_workflow_id(arguments.get("workflow_id")))
+            if status:
+                return [types.TextContent(type="text", text=json.dumps(status, indent=2))]
+            else:
+                return [types.TextContent(type="text", text=json.dumps({"status": "no_task", "message": "No task found"}, indent=2))]
+        except LookupError:
+            return [types.TextContent(type="text", text=json.dumps({"status": "no_task", "message": "No task found"}, indent=2))]
+        except Exception as tm_error:
+            return tool_error(f"Task Manager Error: {str(tm_error)}")
+
+    def handle_task_manager_resume(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        import json
+        try:
+            task_manager = get_task_manager()
+            context = task_manager.resume_task(verbose=False, workflow_id=resolve_workflow_id(arguments.get("workflow_id")))
+            if context:
+                result = task_manager.to_dict(context)
+                return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+            else:
+                return [types.TextContent(type="text", text=json.dumps({"status": "no_task", "message": "No interrupted task found"}, indent=2))]
+        except LookupError:
+            return [types.TextContent(type="text", text=json.dumps({"status": "no_task", "message": "No interrupted task found"}, indent=2))]
+        except Exception as tm_error:
+            return tool_error(f"Task Manager Error: {str(tm_error)}")
+
+    def handle_task_manager_clear(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        import json
+        try:
+            task_manager = get_task_manager()
+            session = current_session.get()
+            if session is not None and not arguments.get("workflow_id"):
+                # Only this client's workflows, never every saved context
+                for workflow_id in list(session.workflow_ids):
+                    task_manager.clear_task(workflow_id=workflow_id)
+                    session.remove_workflow(workflow_id)
+            else:
+                task_manager.clear_task(workflow_id=arguments.get("workflow_id"))
+                if session is not None:
+                    session.remove_workflow(arguments["workflow_id"])
+            return [types.TextContent(type="text", text=json.dumps({"status": "success", "message": "Task context cleared"}, indent=2))]
+        except Exception as tm_error:
+            return tool_error(f"Task Manager Error: {str(tm_error)}")
+
+    # Sprint AI Report Tools
+    def handle_sprint_ai_report(arguments: Dict[str, Any], progress: ToolProgress) -> list[types.TextContent]:
+        from tools.sprint_ai_report import generate_sprint_report
+        import json
+        try:
+            sprint_id = arguments.get("sprint_id")
+            board_id = arguments.get("board_id")
+            include_commits = arguments.get("include_commits", True)
+            output_format = arguments.get("format", "markdown")
+
+            if not sprint_id and not board_id:
+                return tool_error("Error: Either sprint_id or board_id must be provided")
+
+            report = generate_sprint_report(
+                sprint_id=sprint_id,
+                board_id=board_id,
+                include_commits=include_commits,
+                output_format=output_format,
+                on_progress=progress
+            )
+            return [types.TextContent(type="text", text=report)]
+        except Exception as report_error:
+            return tool_error(f"Sprint Report Error: {str(report_error)}")
+
+    def handle_sprint_ai_commits(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        from tools.sprint_ai_report import identify_ai_commits_in_range
+        import json
+        try:
+            start_date = arguments["start_date"]
+            end_date = arguments["end_date"]
+
+            commits = identify_ai_commits_in_range(start_date, end_date)
+            result = {
+                "status": "success",
+                "count": len(commits),
+                "commits": commits
+            }
+            return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+        except Exception as commits_error:
+            return tool_error(f"AI Commits Error: {str(commits_error)}")
+
+    # Confluence Publishing Tools
+    def handle_confluence_publish_sprint_report(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        import json
+        try:
+            from .sprint_ai_report import generate_and_publish_sprint_report
+
+            sprint_id = arguments.get("sprint_id")
+            board_id = arguments.get("board_id")
+
+            if not sprint_id and not board_id:
+                return tool_error("Error: Either sprint_id or board_id must be provided")
+
+            result = generate_and_publish_sprint_report(
+                sprint_id=sprint_id,
+                board_id=board_id,
+                space_key=arguments.get("space_key"),
+                page_title=arguments.get("page_title"),
+                parent_page_id=arguments.get("parent_page_id"),
+                include_commits=arguments.get("include_commits", True)
+            )
+            return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+        except Exception as publish_error:
+            return tool_error(f"Confluence Publish Error: {str(publish_error)}")
+
+    def handle_confluence_publish_page(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        import json
+        try:
+            from .sprint_ai_report import publish_to_confluence
+
+            result = publish_to_confluence(
+                content=arguments["content"],
+                space_key=arguments["space_key"],
+                title=arguments["title"],
+                parent_page_id=arguments.get("parent_page_id")
+            )
+            return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+        except Exception as publish_error:
+            return tool_error(f"Confluence Publish Error: {str(publish_error)}")
+
+    # Value Delivered Report Tools
+    def handle_sprint_value_delivered_report(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        import json
+        try:
+            from .sprint_ai_report import generate_value_delivered_report
+
+            sprint_id = arguments.get("sprint_id")
+            board_id = arguments.get("board_id")
+
+            if not sprint_id and not board_id:
+                return tool_error("Error: Either sprint_id or board_id must be provided")
+
+            result = generate_value_delivered_report(
+                sprint_id=sprint_id,
+                board_id=board_id,
+                team_filter=arguments.get("team_filter"),
+                include_ai_metrics=arguments.get("include_ai_metrics", True),
+                output_format=arguments.get("format", "markdown")
+            )
+            return [types.TextContent(type="text", text=result)]
+        except Exception as report_error:
+            return tool_error(f"Value Delivered Report Error: {str(report_error)}")
+
+    def handle_confluence_publish_value_delivered_report(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        import json
+        try:
+            from .sprint_ai_report import generate_and_publish_value_delivered_report
+
+            sprint_id = arguments.get("sprint_id")
+            board_id = arguments.get("board_id")
+
+            if not sprint_id and not board_id:
+                return tool_error("Error: Either sprint_id or board_id must be provided")
+
+            result = generate_and_publish_value_delivered_report(
+                sprint_id=sprint_id,
+                board_id=board_id,
+                team_filter=arguments.get("team_filter"),
+                space_key=arguments.get("space_key"),
+                page_title=arguments.get("page_title"),
+                parent_page_id=arguments.get("parent_page_id"),
+                include_ai_metrics=arguments.get("include_ai_metrics", True)
+            )
+            return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+        except Exception as publish_error:
+            return tool_error(f"Value Delivered Report Publish Error: {str(publish_error)}")
+
+    def handle_multi_board_value_delivered_report(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        try:
+            from .sprint_ai_report import generate_multi_board_value_delivered_report
+
+            board_configs = arguments.get("board_configs", [])
+            if not board_configs:
+                return tool_error("Error: board_configs is required")
+
+            result = generate_multi_board_value_delivered_report(
+                board_configs=board_configs,
+                include_ai_metrics=arguments.get("include_ai_metrics", True),
+                include_charts=arguments.get("include_charts", True)
+            )
+            return [types.TextContent(type="text", text=result)]
+        except Exception as report_error:
+            return tool_error(f"Multi-Board Value Delivered Report Error: {str(report_error)}")
+
+    # Delivery Report Agent Tools
+    def handle_delivery_report_generate(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        import json
+        try:
+            from .delivery_report_agent import generate_delivery_report
+
+            board_ids = arguments.get("board_ids", [])
+            if not board_ids:
+                return tool_error("Error: board_ids is required")
+
+            result = generate_delivery_report(
+                board_ids=board_ids,
+                workspace_name=arguments.get("workspace_name", "Default Workspace"),
+                project_keys=arguments.get("project_keys"),
+                num_sprints=arguments.get("num_sprints"),
+                start_date=arguments.get("start_date"),
+                end_date=arguments.get("end_date"),
+                include_ai_metrics=arguments.get("include_ai_metrics", True),
+                output_format=arguments.get("output_format", "markdown_with_charts")
+            )
+            return [types.TextContent(type="text", text=result)]
+        except Exception as report_error:
+            return tool_error(f"Delivery Report Error: {str(report_error)}")
+
+    def handle_delivery_report_publish(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        import json
+        try:
+            from .delivery_report_agent import generate_and_publish_delivery_report
+
+            board_ids = arguments.get("board_ids", [])
+            if not board_ids:
+                return tool_error("Error: board_ids is required")
+
+            result = generate_and_publish_delivery_report(
+                board_ids=board_ids,
+                workspace_name=arguments.get("workspace_name", "Default Workspace"),
+                project_keys=arguments.get("project_keys"),
+                num_sprints=arguments.get("num_sprints"),
+                start_date=arguments.get("start_date"),
+                end_date=arguments.get("end_date"),
+                space_key=arguments.get("space_key"),
+                page_title=arguments.get("page_title"),
+                parent_page_id=arguments.get("parent_page_id"),
+                include_ai_metrics=arguments.get("include_ai_metrics", True),
+                include_charts=arguments.get("include_charts", True)
+            )
+            return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+        except Exception as publish_error:
+            return tool_error(f"Delivery Report Publish Error: {str(publish_error)}")
+
+    def handle_delivery_report_compare(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        try:
+            from .delivery_report_agent import generate_delivery_report_comparison
+
+            board_configs = arguments.get("board_configs", [])
+            if not board_configs:
+                return tool_error("Error: board_configs is required")
+
+            result = generate_delivery_report_comparison(
+                board_configs=board_configs,
+                num_sprints=arguments.get("num_sprints"),
+                start_date=arguments.get("start_date"),
+                end_date=arguments.get("end_date"),
+                include_ai_metrics=arguments.get("include_ai_metrics", True)
+            )
+            return [types.TextContent(type="text", text=result)]
+        except Exception as compare_error:
+            return tool_error(f"Delivery Report Compare Error: {str(compare_error)}")
+
+    def handle_unit_test_advisor(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        import json
+        try:
+            from agents.unit_test_advisor import UnitTestAdvisorAgent
+            
+            agent = UnitTestAdvisorAgent()
+            result = agent.run({
+                "task_description": arguments.get("task", "Analyze and provide recommendations"),
+                "input_data": {
+                    "files": [arguments["source_file"]] if arguments.get("source_file") else [],
+                }
+            })
+            # Convert result to dict if it has to_dict method (generated agents return dataclass)
+            if hasattr(result, "to_dict"):
+                result = result.to_dict()
+            return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+        except Exception as e:
+            return tool_error(f"UnitTestAdvisor Agent Error: {str(e)}")
+
+    # PR Review Agent Tools
+    def handle_pr_review(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        import json
+        try:
+            from agents.pr_review_agent import PRReviewAgent, ReviewRole
+            
+            pr_url = arguments.get("pr_url")
+            if not pr_url:
+                return tool_error("Error: pr_url is required")
+            
+            role_str = arguments.get("role", "general")
+            role_map = {
+                "fe": ReviewRole.FRONTEND,
+                "frontend": ReviewRole.FRONTEND,
+                "qa": ReviewRole.QA,
+                "platform": ReviewRole.PLATFORM,
+                "backend": ReviewRole.BACKEND,
+                "general": ReviewRole.GENERAL,
+            }
+            role = role_map.get(role_str.lower(), ReviewRole.GENERAL)
+            
+            output_format = arguments.get("output_format", "markdown")
+            
+            agent = PRReviewAgent()
+            result = agent.review_pr(pr_url, role)
+            agent.close()
+            
+            if output_format == "json":
+                return [types.TextContent(type="text", text=json.dumps(result.to_dict(), indent=2))]
+            else:
+                return [types.TextContent(type="text", text=result.to_markdown())]
+        except Exception as pr_error:
+            return tool_error(f"PR Review Agent Error: {str(pr_error)}")
+
+    def handle_pr_review_get_pr_data(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        import json
+        try:
+            from tools.azure_devops_pr_client import AzureDevOpsPRClient
+            
+            pr_url = arguments.get("pr_url")
+            if not pr_url:
+                return tool_error("Error: pr_url is required")
+            
+            include_diffs = arguments.get("include_diffs", True)
+            include_content = arguments.get("include_content", True)
+            
+            client = AzureDevOpsPRClient()
+            pr_data = client.get_pr_for_review(pr_url, include_diffs, include_content)
+            client.close()
+            
+            return [types.TextContent(type="text", text=json.dumps(pr_data.to_dict(), indent=2))]
+        except Exception as pr_error:
+            return tool_error(f"PR Data Fetch Error: {str(pr_error)}")
+
+    def handle_pr_review_detect_tech_stack(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        import json
+        try:
+            from agents.pr_review_agent import PRReviewAgent
+            
+            pr_url = arguments.get("pr_url")
+            if not pr_url:
+                return tool_error("Error: pr_url is required")
+            
+            agent = PRReviewAgent()
+            pr_data = agent.pr_client.get_pr_for_review(pr_url)
+            tech_stack = agent.stack_detector.detect(pr_data.files, pr_data.diffs)
+            agent.close()
+            
+            return [types.TextContent(type="text", text=json.dumps(tech_stack.to_dict(), indent=2))]
+        except Exception as pr_error:
+            return tool_error(f"Tech Stack Detection Error: {str(pr_error)}")
+
+    # Technical Debt Agent Tools
+    def handle_tech_debt_analyze(arguments: Dict[str, Any], progress: ToolProgress) -> list[types.TextContent]:
+        import json
+        try:
+            from agents.technical_debt_agent import TechnicalDebtAgent
+            
+            repo_path = arguments.get("repo_path") or os.getcwd()
+            include_sonarcloud = arguments.get("include_sonarcloud", True)
+            sonar_project_key = arguments.get("sonar_project_key")
+            sonar_branch = arguments.get("sonar_branch", "main")
+            output_format = arguments.get("output_format", "both")
+            
+            agent = TechnicalDebtAgent()
+            report = agent.analyze(
+                repo_path=repo_path,
+                include_sonarcloud=include_sonarcloud,
+                sonar_project_key=sonar_project_key,
+                sonar_branch=sonar_branch,
+                output_format=output_format,
+                on_progress=progress
+            )
+            
+            if output_format == "json":
+                return [types.TextContent(type="text", text=json.dumps(report.to_dict(), indent=2))]
+            elif output_format == "markdown":
+                return [types.TextContent(type="text", text=report.to_markdown())]
+            else:  # both
+                result = {
+                    "json": report.to_dict(),
+                    "markdown": report.to_markdown()
                 }
-            ),
-            types.Tool(
-                name="fs_read_json",
-                description="Read and parse a JSON file",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "path": {
-                            "type": "string",
-                            "description": "Path to the JSON file"
-                        }
-                    },
-                    "required": ["path"]
+                return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+        except Exception as td_error:
+            return tool_error(f"Technical Debt Analysis Error: {str(td_error)}")
+
+    def handle_tech_debt_summary(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        try:
+            from agents.technical_debt_agent import TechnicalDebtAgent
+            
+            repo_path = arguments.get("repo_path") or os.getcwd()
+            include_sonarcloud = arguments.get("include_sonarcloud", True)
+            
+            agent = TechnicalDebtAgent()
+            summary = agent.generate_summary(repo_path, include_sonarcloud=include_sonarcloud)
+            
+            return [types.TextContent(type="text", text=summary)]
+        except Exception as td_error:
+            return tool_error(f"Technical Debt Summary Error: {str(td_error)}")
+
+    def handle_tech_debt_register(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        try:
+            from agents.technical_debt_agent import TechnicalDebtAgent
+            
+            repo_path = arguments.get("repo_path") or os.getcwd()
+            include_sonarcloud = arguments.get("include_sonarcloud", True)
+            
+            agent = TechnicalDebtAgent()
+            register = agent.generate_register(repo_path, include_sonarcloud=include_sonarcloud)
+            
+            return [types.TextContent(type="text", text=register)]
+        except Exception as td_error:
+            return tool_error(f"Technical Debt Register Error: {str(td_error)}")
+
+    # Jira Integration Tools
+    def handle_jira_get_issue(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        from tools.jira_client import JiraClient
+        import json
+        try:
+            with get_agent_pool().lease("jira", JiraClient) as jira_client:
+                issue = jira_client.get_issue(
+                    arguments["issue_key"],
+                    arguments.get("fields")
+                )
+            
+            if issue:
+                result = {
+                    "key": issue.key,
+                    "id": issue.id,
+                    "summary": issue.summary,
+                    "status": issue.status,
+                    "issue_type": issue.issue_type,
+                    "description": issue.description,
+                    "assignee": issue.assignee,
+                    "priority": issue.priority,
+                    "labels": issue.labels,
                 }
-            ),
-            types.Tool(
-                name="fs_write_json",
-                description="Write data to a JSON file",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "path": {
-                            "type": "string",
-                            "description": "Path to the JSON file"
-                        },
-                        "data": {
-                            "type": "object",
-                            "description": "Data to write (object or array)"
-                        },
-                        "indent": {
-                            "type": "integer",
-                            "description": "JSON indentation level (default: 2)",
-                            "default": 2
-                        }
+                return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+            else:
+                return [types.TextContent(type="text", text=f"Issue {arguments['issue_key']} not found")]
+        except Exception as jira_error:
+            return tool_error(f"JIRA Error: {str(jira_error)}")
+
+    def handle_jira_search_issues(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        from tools.jira_client import JiraClient
+        import json
+        try:
+            with get_agent_pool().lease("jira", JiraClient) as jira_client:
+                issues = jira_client.search_issues(
+                    arguments["jql"],
+                    arguments.get("max_results", 50),
+                    arguments.get("fields")
+                )
+            
+            results = []
+            for issue in issues:
+                results.append({
+                    "key": issue.key,
+                    "id": issue.id,
+                    "summary": issue.summary,
+                    "status": issue.status,
+                    "issue_type": issue.issue_type,
+                    "assignee": issue.assignee,
+                    "priority": issue.priority,
+                    "labels": issue.labels,
+                })
+            
+            return [types.TextContent(type="text", text=json.dumps({
+                "total": len(results),
+                "issues": results
+            }, indent=2))]
+        except Exception as jira_error:
+            return tool_error(f"JIRA Search Error: {str(jira_error)}")
+
+    def handle_jira_get_project(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        from tools.jira_client import JiraClient
+        import json
+        try:
+            with get_agent_pool().lease("jira", JiraClient) as jira_client:
+                project = jira_client.get_project(arguments["project_key"])
+            
+            if project:
+                return [types.TextContent(type="text", text=json.dumps(project, indent=2))]
+            else:
+                return [types.TextContent(type="text", text=f"Project {arguments['project_key']} not found")]
+        except Exception as jira_error:
+            return tool_error(f"JIRA Project Error: {str(jira_error)}")
+
+    def handle_jira_test_connection(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        from tools.jira_client import JiraClient
+        import json
+        try:
+            with get_agent_pool().lease("jira", JiraClient) as jira_client:
+                success = jira_client.test_connection()
+            
+            if success:
+                return [types.TextContent(type="text", text=json.dumps({
+                    "status": "connected",
+                    "message": "Successfully connected to JIRA"
+                }, indent=2))]
+            else:
+                return [types.TextContent(type="text", text=json.dumps({
+                    "status": "failed",
+                    "message": "Failed to connect to JIRA. Check JIRA_BASE_URL, JIRA_EMAIL, and JIRA_API_TOKEN environment variables."
+                }, indent=2))]
+        except Exception as jira_error:
+            return tool_error(f"JIRA Connection Error: {str(jira_error)}")
+
+    def handle_jira_add_comment(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        from tools.jira_client import JiraClient
+        import json
+        try:
+            with get_agent_pool().lease("jira", JiraClient) as jira_client:
+                result = jira_client.add_comment(
+                    arguments["issue_key"],
+                    arguments["comment"],
+                    add_qain_label=False  # Don't auto-add qAIn label for general comments
+                )
+            
+            return [types.TextContent(type="text", text=json.dumps({
+                "status": "success",
+                "message": f"Comment added to {arguments['issue_key']}",
+                "comment_id": result.get("id")
+            }, indent=2))]
+        except Exception as jira_error:
+            return tool_error(f"JIRA Comment Error: {str(jira_error)}")
+
+    def handle_jira_get_transitions(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        from tools.jira_client import JiraClient
+        import json
+        try:
+            with get_agent_pool().lease("jira", JiraClient) as jira_client:
+                transitions = jira_client.get_transitions(arguments["issue_key"])
+            
+            return [types.TextContent(type="text", text=json.dumps({
+                "issue_key": arguments["issue_key"],
+                "transitions": transitions
+            }, indent=2))]
+        except Exception as jira_error:
+            return tool_error(f"JIRA Transitions Error: {str(jira_error)}")
+
+    # Pillar 3 Report Tools
+    def handle_pillar3_generate_report(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        import json
+        try:
+            from tools.pillar3_report import generate_pillar3_report
+            
+            result = generate_pillar3_report(
+                epic_key=arguments.get("epic_key"),
+                initiative_key=arguments.get("initiative_key"),
+                jql=arguments.get("jql"),
+                team_name=arguments.get("team_name", "TBD"),
+                output_format=arguments.get("output_format", "markdown")
+            )
+            
+            return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+        except Exception as pillar3_error:
+            return tool_error(f"Pillar 3 Report Error: {str(pillar3_error)}")
+
+    def handle_pillar3_publish_to_confluence(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        import json
+        try:
+            from tools.pillar3_report import generate_and_publish_pillar3_report
+            
+            result = generate_and_publish_pillar3_report(
+                epic_key=arguments.get("epic_key"),
+                initiative_key=arguments.get("initiative_key"),
+                jql=arguments.get("jql"),
+                team_name=arguments.get("team_name", "TBD"),
+                space_key=arguments["space_key"],
+                page_title=arguments.get("page_title"),
+                parent_page_id=arguments.get("parent_page_id"),
+                also_generate_pdf=arguments.get("also_generate_pdf", False)
+            )
+            
+            return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+        except Exception as pillar3_error:
+            return tool_error(f"Pillar 3 Confluence Error: {str(pillar3_error)}")
+
+    def handle_pillar3_generate_pdf(arguments: Dict[str, Any]) -> list[types.TextContent]:
+        import json
+        try:
+            from tools.pillar3_report import Pillar3ReportGenerator, generate_pillar3_pdf
+            
+            with Pillar3ReportGenerator() as generator:
+                epic_key = arguments.get("epic_key")
+                initiative_key = arguments.get("initiative_key")
+                jql = arguments.get("jql")
+                team_name = arguments.get("team_name", "TBD")
+                
+                if epic_key:
+                    report = generator.generate_report_from_epic(epic_key)
+                elif initiative_key:
+                    report = generator.generate_report_from_initiative(initiative_key)
+                elif jql:
+                    report = generator.generate_report_from_jql(jql, team_name)
+                else:
+                    return tool_error("Error: Must provide epic_key, initiative_key, or jql")
+                
+                output_path = arguments.get(
+                    "output_path",
+                    f"/tmp/pillar3_report_{report.team_initiative.replace(' ', '_')}.pdf"
+                )
+                generate_pillar3_pdf(report, output_path)
+                
+                return [types.TextContent(type="text", text=json.dumps({
+                    "status": "success",
+                    "pdf_path": output_path,
+                    "team_initiative": report.team_initiative,
+                    "report": report.to_dict()
+                }, indent=2))]
+        except Exception as pillar3_error:
+            return tool_error(f"Pillar 3 PDF Error: {str(pillar3_error)}")
+
+    specs = [
+        # Filesystem Tools
+        ToolSpec(
+            name="fs_read_file",
+            description="Read the contents of a file",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "path": {
+                        "type": "string",
+                        "description": "Path to the file to read"
                     },
-                    "required": ["path", "data"]
-                }
-            ),
-
-            # Command Runner Tools
-            types.Tool(
-                name="cmd_run",
-                description="Run a shell command",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "command": {
-                            "type": "string",
-                            "description": "Command to execute"
-                        },
-                        "args": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                            "description": "Command arguments",
-                            "default": []
-                        },
-                        "timeout": {
-                            "type": "integer",
-                            "description": "Timeout in seconds (default: 300)",
-                            "default": 300
-                        }
+                    "encoding": {
+                        "type": "string",
+                        "description": "File encoding (default: utf-8)",
+                        "default": "utf-8"
+                    }
+                },
+                "required": ["path"]
+            },
+            handler=handle_fs_read_file,
+            read_only=True
+        ),
+        ToolSpec(
+            name="fs_write_file",
+            description="Write content to a file",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "path": {
+                        "type": "string",
+                        "description": "Path to the file to write"
                     },
-                    "required": ["command"]
-                }
-            ),
-            types.Tool(
-                name="cmd_run_eslint",
-                description="Run ESLint on specified paths",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "paths": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                            "description": "Paths to lint"
-                        },
-                        "fix": {
-                            "type": "boolean",
-                            "description": "Auto-fix issues (default: false)",
-                            "default": False
-                        }
+                    "content": {
+                        "type": "string",
+                        "description": "Content to write to the file"
                     },
-                    "required": ["paths"]
-                }
-            ),
-            types.Tool(
-                name="cmd_run_prettier",
-                description="Run Prettier code formatter",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "paths": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                            "description": "Paths to format"
-                        },
-                        "check": {
-                            "type": "boolean",
-                            "description": "Check without writing (default: false)",
-                            "default": False
-                        }
+                    "encoding": {
+                        "type": "string",
+                        "description": "File encoding (default: utf-8)",
+                        "default": "utf-8"
                     },
-                    "required": ["paths"]
-                }
-            ),
-            types.Tool(
-                name="cmd_run_tests",
-                description="Run test suite",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "coverage": {
-                            "type": "boolean",
-                            "description": "Generate coverage report (default: false)",
-                            "default": False
-                        }
+                    "create_dirs": {
+                        "type": "boolean",
+                        "description": "Create parent directories if needed (default: true)",
+                        "default": True
                     }
-                }
-            ),
-
-            # Figma Parser Tools
-            types.Tool(
-                name="figma_parse_file",
-                description="Parse a Figma design file and extract component information",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "file_path": {
-                            "type": "string",
-                            "description": "Path to Figma JSON export file"
-                        }
-                    },
-                    "required": ["file_path"]
-                }
-            ),
-            types.Tool(
-                name="figma_extract_colors",
-                description="Extract color palette from Figma file",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "file_path": {
-                            "type": "string",
-                            "description": "Path to Figma JSON export file"
-                        }
-                    },
-                    "required": ["file_path"]
-                }
-            ),
-
-            # Figma Reader Agent Tools (API-based)
-            types.Tool(
-                name="figma_read",
-                description="Read a Figma design via the Figma API and extract component metadata, design tokens, variants, and assets. Returns normalized JSON for the Frontend Engineer Agent. Requires FIGMA_ACCESS_TOKEN environment variable.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "url_or_file_key": {
-                            "type": "string",
-                            "description": "Figma file URL (e.g., https://www.figma.com/file/ABC123/Design), node URL with node-id parameter, or just the file key"
-                        },
-                        "node_id": {
-                            "type": "string",
-                            "description": "Optional specific node ID to read (if not included in URL)"
-                        }
+                },
+                "required": ["path", "content"]
+            },
+            handler=handle_fs_write_file
+        ),
+        ToolSpec(
+            name="fs_list_directory",
+            description="List files and directories in a path",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "path": {
+                        "type": "string",
+                        "description": "Path to the directory to list"
                     },
-                    "required": ["url_or_file_key"]
-                }
-            ),
-
-            # Amplience API Tools
-            types.Tool(
-                name="amplience_fetch_by_key",
-                description="Fetch content from Amplience by delivery key",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "key": {
-                            "type": "string",
-                            "description": "Content delivery key"
-                        },
-                        "vse": {
-                            "type": "string",
-                            "description": "Virtual staging environment ID (for preview)",
-                        }
+                    "recursive": {
+                        "type": "boolean",
+                        "description": "List recursively (default: false)",
+                        "default": False
                     },
-                    "required": ["key"]
-                }
-            ),
-            types.Tool(
-                name="amplience_fetch_by_id",
-                description="Fetch content from Amplience by content ID",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "id": {
-                            "type": "string",
-                            "description": "Content ID"
-                        },
-                        "vse": {
-                            "type": "string",
-                            "description": "Virtual staging environment ID (for preview)",
-                        }
+                    "cursor": {
+                        "type": "string",
+                        "description": "Cursor from a previous page (enables paging; the last line of each page holds next_cursor)"
                     },
-                    "required": ["id"]
-                }
-            ),
-
-            # HAR Analyzer Tools
-            types.Tool(
-                name="har_parse_file",
-                description="Parse and analyze a HAR (HTTP Archive) file for performance insights",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "file_path": {
-                            "type": "string",
-                            "description": "Path to HAR file"
-                        }
-                    },
-                    "required": ["file_path"]
-                }
-            ),
-            types.Tool(
-                name="har_get_performance_metrics",
-                description="Extract performance metrics from HAR file",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "file_path": {
-                            "type": "string",
-                            "description": "Path to HAR file"
-                        }
-                    },
-                    "required": ["file_path"]
-                }
-            ),
-
-            # Commerce Agent Tools
-            types.Tool(
-                name="commerce_find_product_and_prepare_cart",
-                description="Find a product matching a natural language shopping goal and prepare cart-add metadata. Understands goals like 'silver bracelet under 700 DKK' or 'heart charms under 400 DKK'. Filters by price, material, and category. Returns product details ready for cart addition.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "goal": {
-                            "type": "string",
-                            "description": "Natural language shopping goal (e.g., 'silver bracelet under 700 DKK', 'heart charms under 400 DKK')"
-                        },
-                        "currency": {
-                            "type": "string",
-                            "description": "Optional currency override (DKK, GBP, EUR, USD). Defaults to currency detected in goal or DKK.",
-                            "enum": ["DKK", "GBP", "EUR", "USD"]
-                        }
+                    "page_size": {
+                        "type": "integer",
+                        "description": "Entries per page (default: 500)",
+                        "default": 500
+                    }
+                },
+                "required": ["path"]
+            },
+            handler=handle_fs_list_directory,
+            read_only=True
+        ),
+        ToolSpec(
+            name="fs_read_json",
+            description="Read and parse a JSON file",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "path": {
+                        "type": "string",
+                        "description": "Path to the JSON file"
+                    }
+                },
+                "required": ["path"]
+            },
+            handler=handle_fs_read_json,
+            read_only=True
+        ),
+        ToolSpec(
+            name="fs_write_json",
+            description="Write data to a JSON file",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "path": {
+                        "type": "string",
+                        "description": "Path to the JSON file"
                     },
-                    "required": ["goal"]
-                }
-            ),
-
-            # Broken Experience Detector Agent Tools
-            types.Tool(
-                name="broken_experience_detector_scan_site",
-                description="Scan a website URL for broken experiences including performance issues, UI/UX problems, accessibility violations, SEO issues, broken links, missing images, and JavaScript errors. Returns a comprehensive JSON report with a score (0-100) and a human-readable markdown summary. Use this to detect issues on any Pandora environment (e.g., https://us.pandora.net) or localhost.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "url": {
-                            "type": "string",
-                            "description": "The URL to scan (e.g., 'https://us.pandora.net', 'http://localhost:3000')"
-                        },
-                        "output_format": {
-                            "type": "string",
-                            "description": "Output format: 'json' for machine-readable, 'markdown' for human-readable, 'both' for both formats (default: 'both')",
-                            "enum": ["json", "markdown", "both"],
-                            "default": "both"
-                        }
-                    },
-                    "required": ["url"]
-                }
-            ),
-
-            # Unit Test Agent Tools
-            types.Tool(
-                name="unit_test_generate",
-                description="Generate comprehensive unit tests for source files with 100% coverage target. Can be used independently without Task Manager. Analyzes source code and generates Jest/Vitest tests for React components, utility functions, hooks, and API routes following Pandora coding standards.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "source_file": {
-                            "type": "string",
-                            "description": "Path to the source file to generate tests for"
-                        },
-                        "content": {
-                            "type": "string",
-                            "description": "Optional source code content (if file path is not accessible)"
-                        },
-                        "framework": {
-                            "type": "string",
-                            "description": "Test framework to use (jest or vitest)",
-                            "enum": ["jest", "vitest"],
-                            "default": "jest"
-                        }
-                    },
-                    "required": ["source_file"]
-                }
-            ),
-            types.Tool(
-                name="unit_test_analyze",
-                description="Analyze a source file to identify testable elements including functions, components, hooks, classes, and branches. Returns analysis results for test planning.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "source_file": {
-                            "type": "string",
-                            "description": "Path to the source file to analyze"
-                        },
-                        "content": {
-                            "type": "string",
-                            "description": "Optional source code content (if file path is not accessible)"
-                        }
+                    "data": {
+                        "type": "object",
+                        "description": "Data to write (object or array)"
                     },
-                    "required": ["source_file"]
-                }
-            ),
-
-            # QA Agent Tools
-            types.Tool(
-                name="qa_validate",
-                description="Validate implementation against test cases and acceptance criteria. Gets test cases from user input or validates against provided criteria. Returns validation status, pass rate, and recommendations.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "test_cases": {
-                            "type": "array",
-                            "items": {
-                                "type": "object",
-                                "properties": {
-                                    "name": {"type": "string"},
-                                    "description": {"type": "string"},
-                                    "type": {"type": "string"}
-                                }
-                            },
-                            "description": "List of test cases to validate against"
-                        },
-                        "code_paths": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                            "description": "Paths to code files to validate"
-                        },
-                        "acceptance_criteria": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                            "description": "List of acceptance criteria to validate"
-                        }
+                    "indent": {
+                        "type": "integer",
+                        "description": "JSON indentation level (default: 2)",
+                        "default": 2
+                    }
+                },
+                "required": ["path", "data"]
+            },
+            handler=handle_fs_write_json
+        ),
+
+        # Command Runner Tools
+        ToolSpec(
+            name="cmd_run",
+            description="Run a shell command",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "command": {
+                        "type": "string",
+                        "description": "Command to execute"
                     },
-                    "required": []
-                }
-            ),
-
-            # Sonar Validation Agent Tools
-            types.Tool(
-                name="sonar_validate",
-                description="Validate code against SonarCloud quality gates. Fetches issues, coverage, duplications, and generates fix plans. Returns comprehensive validation results with quality gate status, issues by severity/type, coverage metrics, and prioritized fix plans. Requires SONAR_TOKEN environment variable.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "branch": {
-                            "type": "string",
-                            "description": "Branch to validate (default: master)",
-                            "default": "master"
-                        },
-                        "project_key": {
-                            "type": "string",
-                            "description": "SonarCloud project key (default: pandora-jewelry_spark_pandora-group)",
-                            "default": "pandora-jewelry_spark_pandora-group"
-                        },
-                        "repo_path": {
-                            "type": "string",
-                            "description": "Optional path to repository for pipeline analysis"
-                        }
+                    "args": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Command arguments",
+                        "default": []
                     },
-                    "required": []
-                }
-            ),
-            types.Tool(
-                name="sonar_get_issues",
-                description="Fetch issues from SonarCloud filtered by severity and type. Returns list of issues with file locations, messages, and rules.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "branch": {
-                            "type": "string",
-                            "description": "Branch to check (default: master)",
-                            "default": "master"
-                        },
-                        "project_key": {
-                            "type": "string",
-                            "description": "SonarCloud project key (default: pandora-jewelry_spark_pandora-group)",
-                            "default": "pandora-jewelry_spark_pandora-group"
-                        },
-                        "severities": {
-                            "type": "array",
-                            "items": {"type": "string", "enum": ["BLOCKER", "CRITICAL", "MAJOR", "MINOR", "INFO"]},
-                            "description": "Filter by severity levels (e.g., ['BLOCKER', 'CRITICAL'])"
-                        },
-                        "types": {
-                            "type": "array",
-                            "items": {"type": "string", "enum": ["BUG", "VULNERABILITY", "CODE_SMELL", "SECURITY_HOTSPOT"]},
-                            "description": "Filter by issue types (e.g., ['BUG', 'VULNERABILITY'])"
-                        }
+                    "timeout": {
+                        "type": "integer",
+                        "description": "Timeout in seconds (default: 300)",
+                        "default": 300
+                    }
+                },
+                "required": ["command"]
+            },
+            handler=handle_cmd_run
+        ),
+        ToolSpec(
+            name="cmd_run_eslint",
+            description="Run ESLint on specified paths",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "paths": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Paths to lint"
                     },
-                    "required": []
-                }
-            ),
-            types.Tool(
-                name="sonar_get_coverage",
-                description="Fetch code coverage metrics from SonarCloud including line coverage, branch coverage, and uncovered lines/conditions.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "branch": {
-                            "type": "string",
-                            "description": "Branch to check (default: master)",
-                            "default": "master"
-                        },
-                        "project_key": {
-                            "type": "string",
-                            "description": "SonarCloud project key (default: pandora-jewelry_spark_pandora-group)",
-                            "default": "pandora-jewelry_spark_pandora-group"
-                        }
+                    "fix": {
+                        "type": "boolean",
+                        "description": "Auto-fix issues (default: false)",
+                        "default": False
+                    }
+                },
+                "required": ["paths"]
+            },
+            handler=handle_cmd_run_eslint,
+            max_concurrency=2
+        ),
+        ToolSpec(
+            name="cmd_run_prettier",
+            description="Run Prettier code formatter",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "paths": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Paths to format"
                     },
-                    "required": []
+                    "check": {
+                        "type": "boolean",
+                        "description": "Check without writing (default: false)",
+                        "default": False
+                    }
+                },
+                "required": ["paths"]
+            },
+            handler=handle_cmd_run_prettier,
+            max_concurrency=2
+        ),
+        ToolSpec(
+            name="cmd_run_tests",
+            description="Run test suite",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "coverage": {
+                        "type": "boolean",
+                        "description": "Generate coverage report (default: false)",
+                        "default": False
+                    }
                 }
-            ),
-            types.Tool(
-                name="sonar_get_quality_gate",
-                description="Fetch quality gate status from SonarCloud including pass/fail status and condition details.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "branch": {
-                            "type": "string",
-                            "description": "Branch to check (default: master)",
-                            "default": "master"
-                        },
-                        "project_key": {
-                            "type": "string",
-                            "description": "SonarCloud project key (default: pandora-jewelry_spark_pandora-group)",
-                            "default": "pandora-jewelry_spark_pandora-group"
-                        }
+            },
+            handler=handle_cmd_run_tests,
+            max_concurrency=1
+        ),
+
+        # Figma Parser Tools
+        ToolSpec(
+            name="figma_parse_file",
+            description="Parse a Figma design file and extract component information",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "file_path": {
+                        "type": "string",
+                        "description": "Path to Figma JSON export file"
+                    }
+                },
+                "required": ["file_path"]
+            },
+            handler=handle_figma_parse_file,
+            pool="cpu",
+            read_only=True
+        ),
+        ToolSpec(
+            name="figma_extract_colors",
+            description="Extract color palette from Figma file",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "file_path": {
+                        "type": "string",
+                        "description": "Path to Figma JSON export file"
+                    }
+                },
+                "required": ["file_path"]
+            },
+            handler=handle_figma_extract_colors,
+            pool="cpu",
+            read_only=True
+        ),
+
+        # Figma Reader Agent Tools (API-based)
+        ToolSpec(
+            name="figma_read",
+            description="Read a Figma design via the Figma API and extract component metadata, design tokens, variants, and assets. Returns normalized JSON for the Frontend Engineer Agent. Requires FIGMA_ACCESS_TOKEN environment variable.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "url_or_file_key": {
+                        "type": "string",
+                        "description": "Figma file URL (e.g., https://www.figma.com/file/ABC123/Design), node URL with node-id parameter, or just the file key"
                     },
-                    "required": []
-                }
-            ),
-            types.Tool(
-                name="sonar_validate_for_pr",
-                description="Validate code for PR readiness. Returns validation results, a markdown checklist for PR, and whether the code is ready for PR based on quality gate status.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "branch": {
-                            "type": "string",
-                            "description": "Branch to validate (default: master)",
-                            "default": "master"
-                        },
-                        "project_key": {
-                            "type": "string",
-                            "description": "SonarCloud project key (default: pandora-jewelry_spark_pandora-group)",
-                            "default": "pandora-jewelry_spark_pandora-group"
-                        },
-                        "repo_path": {
-                            "type": "string",
-                            "description": "Optional path to repository for pipeline analysis"
-                        }
+                    "node_id": {
+                        "type": "string",
+                        "description": "Optional specific node ID to read (if not included in URL)"
+                    }
+                },
+                "required": ["url_or_file_key"]
+            },
+            handler=handle_figma_read,
+            read_only=True,
+            cache_ttl=FIGMA_READ_CACHE_TTL
+        ),
+
+        # Amplience API Tools
+        ToolSpec(
+            name="amplience_fetch_by_key",
+            description="Fetch content from Amplience by delivery key",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "key": {
+                        "type": "string",
+                        "description": "Content delivery key"
                     },
-                    "required": []
-                }
-            ),
-            # Analytics Agent Tools
-            types.Tool(
-                name="analytics_track_task_start",
-                description="Record the start of an AI agent task. Call this when an agent begins working on a task to track metrics.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "agent_name": {
-                            "type": "string",
-                            "description": "Name of the agent starting the task (e.g., 'Frontend Engineer Agent', 'Unit Test Agent')"
-                        },
-                        "task_description": {
-                            "type": "string",
-                            "description": "Description of the task being started"
-                        },
-                        "jira_task_id": {
-                            "type": "string",
-                            "description": "Optional JIRA issue key (e.g., 'EPA-123')"
-                        },
-                        "workflow_id": {
-                            "type": "string",
-                            "description": "Optional workflow ID for correlation"
-                        }
+                    "vse": {
+                        "type": "string",
+                        "description": "Virtual staging environment ID (for preview)",
+                    }
+                },
+                "required": ["key"]
+            },
+            handler=handle_amplience_fetch_by_key,
+            read_only=True
+        ),
+        ToolSpec(
+            name="amplience_fetch_by_id",
+            description="Fetch content from Amplience by content ID",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "id": {
+                        "type": "string",
+                        "description": "Content ID"
                     },
-                    "required": ["agent_name", "task_description"]
-                }
-            ),
-            types.Tool(
-                name="analytics_track_task_end",
-                description="Record the completion of an AI agent task. Call this when an agent finishes a task to record metrics and optionally update JIRA.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "agent_name": {
-                            "type": "string",
-                            "description": "Name of the agent completing the task"
-                        },
-                        "jira_task_id": {
-                            "type": "string",
-                            "description": "Optional JIRA issue key (e.g., 'EPA-123')"
-                        },
-                        "duration": {
-                            "type": "number",
-                            "description": "Duration in milliseconds"
-                        },
-                        "iterations": {
-                            "type": "integer",
-                            "description": "Number of attempts/iterations made",
-                            "default": 1
-                        },
-                        "errors": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                            "description": "List of error messages encountered (empty if none)"
-                        },
-                        "effectiveness_score": {
-                            "type": "number",
-                            "description": "Effectiveness score (0-100), calculated automatically if not provided"
-                        },
-                        "requires_human_review": {
-                            "type": "boolean",
-                            "description": "Whether the task requires human review",
-                            "default": False
-                        }
+                    "vse": {
+                        "type": "string",
+                        "description": "Virtual staging environment ID (for preview)",
+                    }
+                },
+                "required": ["id"]
+            },
+            handler=handle_amplience_fetch_by_id,
+            read_only=True
+        ),
+
+        # HAR Analyzer Tools
+        ToolSpec(
+            name="har_parse_file",
+            description="Parse and analyze a HAR (HTTP Archive) file for performance insights",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "file_path": {
+                        "type": "string",
+                        "description": "Path to HAR file"
+                    }
+                },
+                "required": ["file_path"]
+            },
+            handler=handle_har_parse_file,
+            pool="cpu",
+            read_only=True
+        ),
+        ToolSpec(
+            name="har_get_performance_metrics",
+            description="Extract performance metrics from HAR file",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "file_path": {
+                        "type": "string",
+                        "description": "Path to HAR file"
+                    }
+                },
+                "required": ["file_path"]
+            },
+            handler=handle_har_get_performance_metrics,
+            pool="cpu",
+            read_only=True
+        ),
+
+        # Commerce Agent Tools
+        ToolSpec(
+            name="commerce_find_product_and_prepare_cart",
+            description="Find a product matching a natural language shopping goal and prepare cart-add metadata. Understands goals like 'silver bracelet under 700 DKK' or 'heart charms under 400 DKK'. Filters by price, material, and category. Returns product details ready for cart addition.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "goal": {
+                        "type": "string",
+                        "description": "Natural language shopping goal (e.g., 'silver bracelet under 700 DKK', 'heart charms under 400 DKK')"
                     },
-                    "required": ["agent_name"]
-                }
-            ),
-            types.Tool(
-                name="analytics_track_task_failure",
-                description="Record the failure of an AI agent task. Call this when an agent fails to complete a task.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "agent_name": {
-                            "type": "string",
-                            "description": "Name of the agent that failed"
-                        },
-                        "jira_task_id": {
-                            "type": "string",
-                            "description": "Optional JIRA issue key (e.g., 'EPA-123')"
-                        },
-                        "errors": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                            "description": "List of error messages"
-                        }
+                    "currency": {
+                        "type": "string",
+                        "description": "Optional currency override (DKK, GBP, EUR, USD). Defaults to currency detected in goal or DKK.",
+                        "enum": ["DKK", "GBP", "EUR", "USD"]
+                    }
+                },
+                "required": ["goal"]
+            },
+            handler=handle_commerce_find_product_and_prepare_cart
+        ),
+
+        # Broken Experience Detector Agent Tools
+        ToolSpec(
+            name="broken_experience_detector_scan_site",
+            description="Scan a website URL for broken experiences including performance issues, UI/UX problems, accessibility violations, SEO issues, broken links, missing images, and JavaScript errors. Returns a comprehensive JSON report with a score (0-100) and a human-readable markdown summary. Use this to detect issues on any Pandora environment (e.g., https://us.pandora.net) or localhost.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "url": {
+                        "type": "string",
+                        "description": "The URL to scan (e.g., 'https://us.pandora.net', 'http://localhost:3000')"
                     },
-                    "required": ["agent_name", "errors"]
-                }
-            ),
-            types.Tool(
-                name="analytics_generate_report",
-                description="Generate an analytics report for agent performance. Returns JSON or markdown format.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "days": {
-                            "type": "integer",
-                            "description": "Number of days to include in report",
-                            "default": 14
-                        },
-                        "agent_name": {
-                            "type": "string",
-                            "description": "Optional filter by specific agent name"
-                        },
-                        "format": {
-                            "type": "string",
-                            "description": "Output format (json or markdown)",
-                            "enum": ["json", "markdown"],
-                            "default": "json"
-                        }
+                    "output_format": {
+                        "type": "string",
+                        "description": "Output format: 'json' for machine-readable, 'markdown' for human-readable, 'both' for both formats (default: 'both')",
+                        "enum": ["json", "markdown", "both"],
+                        "default": "both"
                     }
-                }
-            ),
-            types.Tool(
-                name="analytics_list",
-                description="List stored analytics data with optional filters. Shows completed, failed, and in-progress tasks.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "days": {
-                            "type": "integer",
-                            "description": "Number of days to include",
-                            "default": 7
-                        },
-                        "agent_name": {
-                            "type": "string",
-                            "description": "Optional filter by agent name"
-                        },
-                        "status": {
-                            "type": "string",
-                            "description": "Optional filter by status",
-                            "enum": ["started", "completed", "failed"]
-                        }
+                },
+                "required": ["url"]
+            },
+            handler=handle_broken_experience_detector_scan_site,
+            max_concurrency=2,
+            progress=True
+        ),
+
+        # Unit Test Agent Tools
+        ToolSpec(
+            name="unit_test_generate",
+            description="Generate comprehensive unit tests for source files with 100% coverage target. Can be used independently without Task Manager. Analyzes source code and generates Jest/Vitest tests for React components, utility functions, hooks, and API routes following Pandora coding standards.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "source_file": {
+                        "type": "string",
+                        "description": "Path to the source file to generate tests for"
+                    },
+                    "content": {
+                        "type": "string",
+                        "description": "Optional source code content (if file path is not accessible)"
+                    },
+                    "framework": {
+                        "type": "string",
+                        "description": "Test framework to use (jest or vitest)",
+                        "enum": ["jest", "vitest"],
+                        "default": "jest"
                     }
-                }
-            ),
-            types.Tool(
-                name="analytics_update_jira_task",
-                description="Update a JIRA issue with AI agent metrics. Adds a formatted comment and updates custom fields. Supports optional JIRA config overrides for different boards/instances.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "jira_task_id": {
-                            "type": "string",
-                            "description": "JIRA issue key (e.g., 'EPA-123')"
-                        },
-                        "agent_name": {
-                            "type": "string",
-                            "description": "Name of the agent that completed the task"
-                        },
-                        "task_name": {
-                            "type": "string",
-                            "description": "Name/description of the task"
-                        },
-                        "status": {
-                            "type": "string",
-                            "description": "Task status (Completed, Failed, etc.)"
-                        },
-                        "duration_ms": {
-                            "type": "number",
-                            "description": "Duration in milliseconds"
-                        },
-                        "iterations": {
-                            "type": "integer",
-                            "description": "Number of iterations/attempts",
-                            "default": 1
-                        },
-                        "errors": {
-                            "type": "integer",
-                            "description": "Number of errors encountered",
-                            "default": 0
-                        },
-                        "effectiveness_score": {
-                            "type": "number",
-                            "description": "Effectiveness score (0-100)"
-                        },
-                        "requires_human_review": {
-                            "type": "boolean",
-                            "description": "Whether human review is required",
-                            "default": False
-                        },
-                        "jira_base_url": {
-                            "type": "string",
-                            "description": "Override JIRA base URL (e.g., 'https://pandoradigital.atlassian.net'). If not provided, uses JIRA_BASE_URL env var."
-                        },
-                        "jira_email": {
-                            "type": "string",
-                            "description": "Override JIRA account email. If not provided, uses JIRA_EMAIL env var."
-                        }
+                },
+                "required": ["source_file"]
+            },
+            handler=handle_unit_test_generate,
+            pool="cpu"
+        ),
+        ToolSpec(
+            name="unit_test_analyze",
+            description="Analyze a source file to identify testable elements including functions, components, hooks, classes, and branches. Returns analysis results for test planning.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "source_file": {
+                        "type": "string",
+                        "description": "Path to the source file to analyze"
                     },
-                    "required": ["jira_task_id", "agent_name", "status"]
-                }
-            ),
-            types.Tool(
-                name="analytics_get_config",
-                description="Get the current analytics configuration settings.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {}
-                }
-            ),
-            types.Tool(
-                name="analytics_update_config",
-                description="Update analytics configuration settings.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "log_directory": {
-                            "type": "string",
-                            "description": "Directory for analytics logs"
-                        },
-                        "retention_days": {
-                            "type": "integer",
-                            "description": "Number of days to retain logs"
-                        },
-                        "default_time_saved_hours": {
-                            "type": "number",
-                            "description": "Default hours saved per task"
+                    "content": {
+                        "type": "string",
+                        "description": "Optional source code content (if file path is not accessible)"
+                    }
+                },
+                "required": ["source_file"]
+            },
+            handler=handle_unit_test_analyze,
+            pool="cpu"
+        ),
+
+        # QA Agent Tools
+        ToolSpec(
+            name="qa_validate",
+            description="Validate implementation against test cases and acceptance criteria. Gets test cases from user input or validates against provided criteria. Returns validation status, pass rate, and recommendations.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "test_cases": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "name": {"type": "string"},
+                                "description": {"type": "string"},
+                                "type": {"type": "string"}
+                            }
                         },
-                        "jira_enabled": {
-                            "type": "boolean",
-                            "description": "Whether JIRA integration is enabled"
-                        }
+                        "description": "List of test cases to validate against"
+                    },
+                    "code_paths": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Paths to code files to validate"
+                    },
+                    "acceptance_criteria": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "List of acceptance criteria to validate"
+                    }
+                },
+                "required": []
+            },
+            handler=handle_qa_validate
+        ),
+
+        # Sonar Validation Agent Tools
+        ToolSpec(
+            name="sonar_validate",
+            description="Validate code against SonarCloud quality gates. Fetches issues, coverage, duplications, and generates fix plans. Returns comprehensive validation results with quality gate status, issues by severity/type, coverage metrics, and prioritized fix plans. Requires SONAR_TOKEN environment variable.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "branch": {
+                        "type": "string",
+                        "description": "Branch to validate (default: master)",
+                        "default": "master"
+                    },
+                    "project_key": {
+                        "type": "string",
+                        "description": "SonarCloud project key (default: pandora-jewelry_spark_pandora-group)",
+                        "default": "pandora-jewelry_spark_pandora-group"
+                    },
+                    "repo_path": {
+                        "type": "string",
+                        "description": "Optional path to repository for pipeline analysis"
+                    }
+                },
+                "required": []
+            },
+            handler=handle_sonar_validate
+        ),
+        ToolSpec(
+            name="sonar_get_issues",
+            description="Fetch issues from SonarCloud filtered by severity and type. Returns list of issues with file locations, messages, and rules.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "branch": {
+                        "type": "string",
+                        "description": "Branch to check (default: master)",
+                        "default": "master"
+                    },
+                    "project_key": {
+                        "type": "string",
+                        "description": "SonarCloud project key (default: pandora-jewelry_spark_pandora-group)",
+                        "default": "pandora-jewelry_spark_pandora-group"
+                    },
+                    "severities": {
+                        "type": "array",
+                        "items": {"type": "string", "enum": ["BLOCKER", "CRITICAL", "MAJOR", "MINOR", "INFO"]},
+                        "description": "Filter by severity levels (e.g., ['BLOCKER', 'CRITICAL'])"
+                    },
+                    "types": {
+                        "type": "array",
+                        "items": {"type": "string", "enum": ["BUG", "VULNERABILITY", "CODE_SMELL", "SECURITY_HOTSPOT"]},
+                        "description": "Filter by issue types (e.g., ['BUG', 'VULNERABILITY'])"
+                    }
+                },
+                "required": []
+            },
+            handler=handle_sonar_get_issues,
+            read_only=True
+        ),
+        ToolSpec(
+            name="sonar_get_coverage",
+            description="Fetch code coverage metrics from SonarCloud including line coverage, branch coverage, and uncovered lines/conditions.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "branch": {
+                        "type": "string",
+                        "description": "Branch to check (default: master)",
+                        "default": "master"
+                    },
+                    "project_key": {
+                        "type": "string",
+                        "description": "SonarCloud project key (default: pandora-jewelry_spark_pandora-group)",
+                        "default": "pandora-jewelry_spark_pandora-group"
+                    }
+                },
+                "required": []
+            },
+            handler=handle_sonar_get_coverage,
+            read_only=True
+        ),
+        ToolSpec(
+            name="sonar_get_quality_gate",
+            description="Fetch quality gate status from SonarCloud including pass/fail status and condition details.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "branch": {
+                        "type": "string",
+                        "description": "Branch to check (default: master)",
+                        "default": "master"
+                    },
+                    "project_key": {
+                        "type": "string",
+                        "description": "SonarCloud project key (default: pandora-jewelry_spark_pandora-group)",
+                        "default": "pandora-jewelry_spark_pandora-group"
+                    }
+                },
+                "required": []
+            },
+            handler=handle_sonar_get_quality_gate,
+            read_only=True
+        ),
+        ToolSpec(
+            name="sonar_validate_for_pr",
+            description="Validate code for PR readiness. Returns validation results, a markdown checklist for PR, and whether the code is ready for PR based on quality gate status.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "branch": {
+                        "type": "string",
+                        "description": "Branch to validate (default: master)",
+                        "default": "master"
+                    },
+                    "project_key": {
+                        "type": "string",
+                        "description": "SonarCloud project key (default: pandora-jewelry_spark_pandora-group)",
+                        "default": "pandora-jewelry_spark_pandora-group"
+                    },
+                    "repo_path": {
+                        "type": "string",
+                        "description": "Optional path to repository for pipeline analysis"
+                    }
+                },
+                "required": []
+            },
+            handler=handle_sonar_validate_for_pr
+        ),
+        # Analytics Agent Tools
+        ToolSpec(
+            name="analytics_track_task_start",
+            description="Record the start of an AI agent task. Call this when an agent begins working on a task to track metrics.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "agent_name": {
+                        "type": "string",
+                        "description": "Name of the agent starting the task (e.g., 'Frontend Engineer Agent', 'Unit Test Agent')"
+                    },
+                    "task_description": {
+                        "type": "string",
+                        "description": "Description of the task being started"
+                    },
+                    "jira_task_id": {
+                        "type": "string",
+                        "description": "Optional JIRA issue key (e.g., 'EPA-123')"
+                    },
+                    "workflow_id": {
+                        "type": "string",
+                        "description": "Optional workflow ID for correlation"
+                    }
+                },
+                "required": ["agent_name", "task_description"]
+            },
+            handler=handle_analytics_track_task_start
+        ),
+        ToolSpec(
+            name="analytics_track_task_end",
+            description="Record the completion of an AI agent task. Call this when an agent finishes a task to record metrics and optionally update JIRA.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "agent_name": {
+                        "type": "string",
+                        "description": "Name of the agent completing the task"
+                    },
+                    "jira_task_id": {
+                        "type": "string",
+                        "description": "Optional JIRA issue key (e.g., 'EPA-123')"
+                    },
+                    "duration": {
+                        "type": "number",
+                        "description": "Duration in milliseconds"
+                    },
+                    "iterations": {
+                        "type": "integer",
+                        "description": "Number of attempts/iterations made",
+                        "default": 1
+                    },
+                    "errors": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "List of error messages encountered (empty if none)"
+                    },
+                    "effectiveness_score": {
+                        "type": "number",
+                        "description": "Effectiveness score (0-100), calculated automatically if not provided"
+                    },
+                    "requires_human_review": {
+                        "type": "boolean",
+                        "description": "Whether the task requires human review",
+                        "default": False
+                    }
+                },
+                "required": ["agent_name"]
+            },
+            handler=handle_analytics_track_task_end
+        ),
+        ToolSpec(
+            name="analytics_track_task_failure",
+            description="Record the failure of an AI agent task. Call this when an agent fails to complete a task.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "agent_name": {
+                        "type": "string",
+                        "description": "Name of the agent that failed"
+                    },
+                    "jira_task_id": {
+                        "type": "string",
+                        "description": "Optional JIRA issue key (e.g., 'EPA-123')"
+                    },
+                    "errors": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "List of error messages"
+                    }
+                },
+                "required": ["agent_name", "errors"]
+            },
+            handler=handle_analytics_track_task_failure
+        ),
+        ToolSpec(
+            name="analytics_generate_report",
+            description="Generate an analytics report for agent performance. Returns JSON or markdown format.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "days": {
+                        "type": "integer",
+                        "description": "Number of days to include in report",
+                        "default": 14
+                    },
+                    "agent_name": {
+                        "type": "string",
+                        "description": "Optional filter by specific agent name"
+                    },
+                    "format": {
+                        "type": "string",
+                        "description": "Output format (json or markdown)",
+                        "enum": ["json", "markdown"],
+                        "default": "json"
                     }
                 }
-            ),
-
-            # Task Manager Agent Tools
-            types.Tool(
-                name="task_manager_analyze",
-                description="Analyze a task and return the workflow plan without executing. Shows which agents will be used and in what order.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "task_description": {
-                            "type": "string",
-                            "description": "Natural language task description (e.g., 'Create a ProductCard component from Figma design')"
-                        }
-                    },
-                    "required": ["task_description"]
-                }
-            ),
-            types.Tool(
-                name="task_manager_run",
-                description="Run a complete task workflow through the Task Manager Agent. Orchestrates multiple agents in sequence based on task type.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "task_description": {
-                            "type": "string",
-                            "description": "Natural language task description"
-                        },
-                        "jira_task_id": {
-                            "type": "string",
-                            "description": "Optional JIRA issue key for tracking"
-                        },
-                        "branch_name": {
-                            "type": "string",
-                            "description": "Optional Git branch name"
-                        },
-                        "parallel": {
-                            "type": "boolean",
-                            "description": "Run agents in parallel where possible (default: false)",
-                            "default": False
-                        }
+            },
+            handler=handle_analytics_generate_report
+        ),
+        ToolSpec(
+            name="analytics_list",
+            description="List stored analytics data with optional filters. Shows completed, failed, and in-progress tasks.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "days": {
+                        "type": "integer",
+                        "description": "Number of days to include",
+                        "default": 7
+                    },
+                    "agent_name": {
+                        "type": "string",
+                        "description": "Optional filter by agent name"
                     },
-                    "required": ["task_description"]
+                    "status": {
+                        "type": "string",
+                        "description": "Optional filter by status",
+                        "enum": ["started", "completed", "failed"]
+                    }
                 }
-            ),
-            types.Tool(
-                name="task_manager_status",
-                description="Get the status of the current or last task workflow.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {}
+            },
+            handler=handle_analytics_list
+        ),
+        ToolSpec(
+            name="analytics_update_jira_task",
+            description="Update a JIRA issue with AI agent metrics. Adds a formatted comment and updates custom fields. Supports optional JIRA config overrides for different boards/instances.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "jira_task_id": {
+                        "type": "string",
+                        "description": "JIRA issue key (e.g., 'EPA-123')"
+                    },
+                    "agent_name": {
+                        "type": "string",
+                        "description": "Name of the agent that completed the task"
+                    },
+                    "task_name": {
+                        "type": "string",
+                        "description": "Name/description of the task"
+                    },
+                    "status": {
+                        "type": "string",
+                        "description": "Task status (Completed, Failed, etc.)"
+                    },
+                    "duration_ms": {
+                        "type": "number",
+                        "description": "Duration in milliseconds"
+                    },
+                    "iterations": {
+                        "type": "integer",
+                        "description": "Number of iterations/attempts",
+                        "default": 1
+                    },
+                    "errors": {
+                        "type": "integer",
+                        "description": "Number of errors encountered",
+                        "default": 0
+                    },
+                    "effectiveness_score": {
+                        "type": "number",
+                        "description": "Effectiveness score (0-100)"
+                    },
+                    "requires_human_review": {
+                        "type": "boolean",
+                        "description": "Whether human review is required",
+                        "default": False
+                    },
+                    "jira_base_url": {
+                        "type": "string",
+                        "description": "Override JIRA base URL (e.g., 'https://pandoradigital.atlassian.net'). If not provided, uses JIRA_BASE_URL env var."
+                    },
+                    "jira_email": {
+                        "type": "string",
+                        "description": "Override JIRA account email. If not provided, uses JIRA_EMAIL env var."
+                    }
+                },
+                "required": ["jira_task_id", "agent_name", "status"]
+            },
+            handler=handle_analytics_update_jira_task
+        ),
+        ToolSpec(
+            name="analytics_get_config",
+            description="Get the current analytics configuration settings.",
+            input_schema={
+                "type": "object",
+                "properties": {}
+            },
+            handler=handle_analytics_get_config
+        ),
+        ToolSpec(
+            name="analytics_update_config",
+            description="Update analytics configuration settings.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "log_directory": {
+                        "type": "string",
+                        "description": "Directory for analytics logs"
+                    },
+                    "retention_days": {
+                        "type": "integer",
+                        "description": "Number of days to retain logs"
+                    },
+                    "default_time_saved_hours": {
+                        "type": "number",
+                        "description": "Default hours saved per task"
+                    },
+                    "jira_enabled": {
+                        "type": "boolean",
+                        "description": "Whether JIRA integration is enabled"
+                    }
                 }
-            ),
-            types.Tool(
-                name="task_manager_resume",
-                description="Resume a previously interrupted task workflow.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {}
+            },
+            handler=handle_analytics_update_config
+        ),
+
+        # Task Manager Agent Tools
+        ToolSpec(
+            name="task_manager_analyze",
+            description="Analyze a task and return the workflow plan without executing. Shows which agents will be used and in what order.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "task_description": {
+                        "type": "string",
+                        "description": "Natural language task description (e.g., 'Create a ProductCard component from Figma design')"
+                    }
+                },
+                "required": ["task_description"]
+            },
+            handler=handle_task_manager_analyze
+        ),
+        ToolSpec(
+            name="task_manager_run",
+            description="Run a complete task workflow through the Task Manager Agent. Orchestrates multiple agents in sequence based on task type.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "task_description": {
+                        "type": "string",
+                        "description": "Natural language task description"
+                    },
+                    "jira_task_id": {
+                        "type": "string",
+                        "description": "Optional JIRA issue key for tracking"
+                    },
+                    "branch_name": {
+                        "type": "string",
+                        "description": "Optional Git branch name"
+                    },
+                    "parallel": {
+                        "type": "boolean",
+                        "description": "Run agents in parallel where possible (default: false)",
+                        "default": False
+                    },
+                    "dag": {
+                        "type": "boolean",
+                        "description": "Start each agent as soon as its upstream dependencies finish instead of waiting for whole parallel groups (implies parallel, default: false)",
+                        "default": False
+                    },
+                    "cache": {
+                        "type": "boolean",
+                        "description": "Reuse cached results of deterministic agents (technical_debt, sonar pre-PR, unit_test) when inputs and the repo revision are unchanged (default: false)",
+                        "default": False
+                    }
+                },
+                "required": ["task_description"]
+            },
+            handler=handle_task_manager_run
+        ),
+        ToolSpec(
+            name="task_manager_status",
+            description="Get the status of the current or last task workflow.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "workflow_id": {
+                        "type": "string",
+                        "description": "Workflow ID to report on. Defaults to the most recent workflow."
+                    }
                 }
-            ),
-            types.Tool(
-                name="task_manager_clear",
-                description="Clear the current task context to start fresh.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {}
+            },
+            handler=handle_task_manager_status
+        ),
+        ToolSpec(
+            name="task_manager_resume",
+            description="Resume a previously interrupted task workflow.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "workflow_id": {
+                        "type": "string",
+                        "description": "Workflow ID to resume. Defaults to the most recent workflow."
+                    }
                 }
-            ),
-            # Sprint AI Report Tools
-            types.Tool(
-                name="sprint_ai_report",
-                description="Generate a comprehensive sprint report showing AI contribution metrics. Fetches data from JIRA and Azure DevOps to identify AI-generated commits. Designed for scrum masters and non-technical stakeholders - no repo cloning required.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "sprint_id": {
-                            "type": "integer",
-                            "description": "JIRA sprint ID (e.g., 16597)"
-                        },
-                        "board_id": {
-                            "type": "integer",
-                            "description": "JIRA board ID to find active sprint (e.g., 795). Use if sprint_id not known."
-                        },
-                        "include_commits": {
-                            "type": "boolean",
-                            "description": "Include Azure DevOps commit analysis (default: true)",
-                            "default": True
-                        },
-                        "format": {
-                            "type": "string",
-                            "description": "Output format: markdown (for display) or json (for processing)",
-                            "enum": ["markdown", "json"],
-                            "default": "markdown"
-                        }
+            },
+            handler=handle_task_manager_resume
+        ),
+        ToolSpec(
+            name="task_manager_clear",
+            description="Clear the current task context to start fresh.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "workflow_id": {
+                        "type": "string",
+                        "description": "Workflow ID to clear. Clears all saved workflows if omitted."
                     }
                 }
-            ),
-            types.Tool(
-                name="sprint_ai_commits",
-                description="Identify AI-generated commits in a date range by detecting Claude Code signatures. Returns list of commits with author, date, type, and linked JIRA issues.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "start_date": {
-                            "type": "string",
-                            "description": "Start date in ISO format (YYYY-MM-DD)"
-                        },
-                        "end_date": {
-                            "type": "string",
-                            "description": "End date in ISO format (YYYY-MM-DD)"
-                        }
+            },
+            handler=handle_task_manager_clear
+        ),
+        # Sprint AI Report Tools
+        ToolSpec(
+            name="sprint_ai_report",
+            description="Generate a comprehensive sprint report showing AI contribution metrics. Fetches data from JIRA and Azure DevOps to identify AI-generated commits. Designed for scrum masters and non-technical stakeholders - no repo cloning required.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "sprint_id": {
+                        "type": "integer",
+                        "description": "JIRA sprint ID (e.g., 16597)"
                     },
-                    "required": ["start_date", "end_date"]
-                }
-            ),
-            # Confluence Publishing Tools
-            types.Tool(
-                name="confluence_publish_sprint_report",
-                description="Generate a sprint AI report and automatically publish it to a Confluence page. Combines sprint_ai_report generation with Confluence publishing in one step.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "sprint_id": {
-                            "type": "integer",
-                            "description": "JIRA sprint ID"
-                        },
-                        "board_id": {
-                            "type": "integer",
-                            "description": "JIRA board ID to find active sprint. Use if sprint_id not known."
-                        },
-                        "space_key": {
-                            "type": "string",
-                            "description": "Confluence space key (e.g., 'SHAM'). Uses CONFLUENCE_SPACE_KEY env var if not provided."
-                        },
-                        "page_title": {
-                            "type": "string",
-                            "description": "Page title. Auto-generated from sprint name if not provided."
-                        },
-                        "parent_page_id": {
-                            "type": "string",
-                            "description": "Optional parent page ID to nest the report under."
-                        },
-                        "include_commits": {
-                            "type": "boolean",
-                            "description": "Include Azure DevOps commit analysis (default: true)",
-                            "default": True
-                        }
+                    "board_id": {
+                        "type": "integer",
+                        "description": "JIRA board ID to find active sprint (e.g., 795). Use if sprint_id not known."
+                    },
+                    "include_commits": {
+                        "type": "boolean",
+                        "description": "Include Azure DevOps commit analysis (default: true)",
+                        "default": True
+                    },
+                    "format": {
+                        "type": "string",
+                        "description": "Output format: markdown (for display) or json (for processing)",
+                        "enum": ["markdown", "json"],
+                        "default": "markdown"
                     }
                 }
-            ),
-            types.Tool(
-                name="confluence_publish_page",
-                description="Publish any markdown content to a Confluence page. Creates a new page or updates existing one with the same title.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "content": {
-                            "type": "string",
-                            "description": "Markdown content to publish"
-                        },
-                        "space_key": {
-                            "type": "string",
-                            "description": "Confluence space key (e.g., 'SHAM')"
-                        },
-                        "title": {
-                            "type": "string",
-                            "description": "Page title"
-                        },
-                        "parent_page_id": {
-                            "type": "string",
-                            "description": "Optional parent page ID"
-                        }
+            },
+            handler=handle_sprint_ai_report,
+            progress=True
+        ),
+        ToolSpec(
+            name="sprint_ai_commits",
+            description="Identify AI-generated commits in a date range by detecting Claude Code signatures. Returns list of commits with author, date, type, and linked JIRA issues.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "start_date": {
+                        "type": "string",
+                        "description": "Start date in ISO format (YYYY-MM-DD)"
+                    },
+                    "end_date": {
+                        "type": "string",
+                        "description": "End date in ISO format (YYYY-MM-DD)"
+                    }
+                },
+                "required": ["start_date", "end_date"]
+            },
+            handler=handle_sprint_ai_commits,
+            read_only=True
+        ),
+        # Confluence Publishing Tools
+        ToolSpec(
+            name="confluence_publish_sprint_report",
+            description="Generate a sprint AI report and automatically publish it to a Confluence page. Combines sprint_ai_report generation with Confluence publishing in one step.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "sprint_id": {
+                        "type": "integer",
+                        "description": "JIRA sprint ID"
                     },
-                    "required": ["content", "space_key", "title"]
+                    "board_id": {
+                        "type": "integer",
+                        "description": "JIRA board ID to find active sprint. Use if sprint_id not known."
+                    },
+                    "space_key": {
+                        "type": "string",
+                        "description": "Confluence space key (e.g., 'SHAM'). Uses CONFLUENCE_SPACE_KEY env var if not provided."
+                    },
+                    "page_title": {
+                        "type": "string",
+                        "description": "Page title. Auto-generated from sprint name if not provided."
+                    },
+                    "parent_page_id": {
+                        "type": "string",
+                        "description": "Optional parent page ID to nest the report under."
+                    },
+                    "include_commits": {
+                        "type": "boolean",
+                        "description": "Include Azure DevOps commit analysis (default: true)",
+                        "default": True
+                    }
                 }
-            ),
-            # Value Delivered Report Tools
-            types.Tool(
-                name="sprint_value_delivered_report",
-                description="Generate end-of-sprint value delivered report with Initiative/OKR linking, reliability metrics (commitment vs delivery, carryover, bug ratio), team breakdown, and AI contribution metrics. Designed for sprint retrospectives and stakeholder reporting.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "sprint_id": {
-                            "type": "integer",
-                            "description": "JIRA sprint ID"
-                        },
-                        "board_id": {
-                            "type": "integer",
-                            "description": "JIRA board ID to find active sprint. Use if sprint_id not known."
-                        },
-                        "team_filter": {
-                            "type": "string",
-                            "description": "Optional team/project key to filter results (e.g., 'EPA', 'INS')"
-                        },
-                        "include_ai_metrics": {
-                            "type": "boolean",
-                            "description": "Include AI contribution metrics (default: true)",
-                            "default": True
-                        },
-                        "format": {
-                            "type": "string",
-                            "description": "Output format: markdown (for display) or json (for processing)",
-                            "enum": ["markdown", "json"],
-                            "default": "markdown"
-                        }
+            },
+            handler=handle_confluence_publish_sprint_report
+        ),
+        ToolSpec(
+            name="confluence_publish_page",
+            description="Publish any markdown content to a Confluence page. Creates a new page or updates existing one with the same title.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "content": {
+                        "type": "string",
+                        "description": "Markdown content to publish"
+                    },
+                    "space_key": {
+                        "type": "string",
+                        "description": "Confluence space key (e.g., 'SHAM')"
+                    },
+                    "title": {
+                        "type": "string",
+                        "description": "Page title"
+                    },
+                    "parent_page_id": {
+                        "type": "string",
+                        "description": "Optional parent page ID"
+                    }
+                },
+                "required": ["content", "space_key", "title"]
+            },
+            handler=handle_confluence_publish_page
+        ),
+        # Value Delivered Report Tools
+        ToolSpec(
+            name="sprint_value_delivered_report",
+            description="Generate end-of-sprint value delivered report with Initiative/OKR linking, reliability metrics (commitment vs delivery, carryover, bug ratio), team breakdown, and AI contribution metrics. Designed for sprint retrospectives and stakeholder reporting.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "sprint_id": {
+                        "type": "integer",
+                        "description": "JIRA sprint ID"
+                    },
+                    "board_id": {
+                        "type": "integer",
+                        "description": "JIRA board ID to find active sprint. Use if sprint_id not known."
+                    },
+                    "team_filter": {
+                        "type": "string",
+                        "description": "Optional team/project key to filter results (e.g., 'EPA', 'INS')"
+                    },
+                    "include_ai_metrics": {
+                        "type": "boolean",
+                        "description": "Include AI contribution metrics (default: true)",
+                        "default": True
+                    },
+                    "format": {
+                        "type": "string",
+                        "description": "Output format: markdown (for display) or json (for processing)",
+                        "enum": ["markdown", "json"],
+                        "default": "markdown"
                     }
                 }
-            ),
-            types.Tool(
-                name="confluence_publish_value_delivered_report",
-                description="Generate end-of-sprint value delivered report and publish to Confluence. Includes Initiative/OKR linking, reliability metrics, team breakdown, and AI contribution.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "sprint_id": {
-                            "type": "integer",
-                            "description": "JIRA sprint ID"
-                        },
-                        "board_id": {
-                            "type": "integer",
-                            "description": "JIRA board ID to find active sprint. Use if sprint_id not known."
-                        },
-                        "team_filter": {
-                            "type": "string",
-                            "description": "Optional team/project key to filter results"
-                        },
-                        "space_key": {
-                            "type": "string",
-                            "description": "Confluence space key. Uses CONFLUENCE_SPACE_KEY env var if not provided."
-                        },
-                        "page_title": {
-                            "type": "string",
-                            "description": "Page title. Auto-generated from sprint name if not provided."
-                        },
-                        "parent_page_id": {
-                            "type": "string",
-                            "description": "Optional parent page ID to nest the report under."
-                        },
-                        "include_ai_metrics": {
-                            "type": "boolean",
-                            "description": "Include AI contribution metrics (default: true)",
-                            "default": True
-                        }
+            },
+            handler=handle_sprint_value_delivered_report
+        ),
+        ToolSpec(
+            name="confluence_publish_value_delivered_report",
+            description="Generate end-of-sprint value delivered report and publish to Confluence. Includes Initiative/OKR linking, reliability metrics, team breakdown, and AI contribution.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "sprint_id": {
+                        "type": "integer",
+                        "description": "JIRA sprint ID"
+                    },
+                    "board_id": {
+                        "type": "integer",
+                        "description": "JIRA board ID to find active sprint. Use if sprint_id not known."
+                    },
+                    "team_filter": {
+                        "type": "string",
+                        "description": "Optional team/project key to filter results"
+                    },
+                    "space_key": {
+                        "type": "string",
+                        "description": "Confluence space key. Uses CONFLUENCE_SPACE_KEY env var if not provided."
+                    },
+                    "page_title": {
+                        "type": "string",
+                        "description": "Page title. Auto-generated from sprint name if not provided."
+                    },
+                    "parent_page_id": {
+                        "type": "string",
+                        "description": "Optional parent page ID to nest the report under."
+                    },
+                    "include_ai_metrics": {
+                        "type": "boolean",
+                        "description": "Include AI contribution metrics (default: true)",
+                        "default": True
                     }
                 }
-            ),
-            types.Tool(
-                name="multi_board_value_delivered_report",
-                description="Generate value delivered report for multiple boards with comparison. Produces full value delivered report per board (Initiative/OKR, reliability metrics, carryover, AI contribution) plus cross-board comparison section with ASCII charts. Ideal for comparing Online vs Retail or multiple team boards.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "board_configs": {
-                            "type": "array",
-                            "items": {
-                                "type": "object",
-                                "properties": {
-                                    "board_id": {
-                                        "type": "integer",
-                                        "description": "JIRA board ID"
-                                    },
-                                    "name": {
-                                        "type": "string",
-                                        "description": "Display name for the board (e.g., 'FIND - Board 847')"
-                                    },
-                                    "sprint_id": {
-                                        "type": "integer",
-                                        "description": "Optional specific sprint ID (uses active sprint if not provided)"
-                                    }
+            },
+            handler=handle_confluence_publish_value_delivered_report
+        ),
+        ToolSpec(
+            name="multi_board_value_delivered_report",
+            description="Generate value delivered report for multiple boards with comparison. Produces full value delivered report per board (Initiative/OKR, reliability metrics, carryover, AI contribution) plus cross-board comparison section with ASCII charts. Ideal for comparing Online vs Retail or multiple team boards.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "board_configs": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "board_id": {
+                                    "type": "integer",
+                                    "description": "JIRA board ID"
                                 },
-                                "required": ["board_id"]
+                                "name": {
+                                    "type": "string",
+                                    "description": "Display name for the board (e.g., 'FIND - Board 847')"
+                                },
+                                "sprint_id": {
+                                    "type": "integer",
+                                    "description": "Optional specific sprint ID (uses active sprint if not provided)"
+                                }
                             },
-                            "description": "List of board configurations to generate reports for"
-                        },
-                        "include_ai_metrics": {
-                            "type": "boolean",
-                            "description": "Include AI contribution metrics (default: true)",
-                            "default": True
+                            "required": ["board_id"]
                         },
-                        "include_charts": {
-                            "type": "boolean",
-                            "description": "Include ASCII comparison charts (default: true)",
-                            "default": True
-                        }
+                        "description": "List of board configurations to generate reports for"
                     },
-                    "required": ["board_configs"]
-                }
-            ),
-            # Delivery Report Agent Tools
-            types.Tool(
-                name="delivery_report_generate",
-                description="Generate multi-sprint velocity report for delivery managers. Aggregates data from multiple closed sprints with ASCII horizontal bar charts showing rollover, commitment, and delivered story points. Supports cross-workspace reporting (Online/Retail) and per-sprint trend breakdown.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "board_ids": {
-                            "type": "array",
-                            "items": {"type": "integer"},
-                            "description": "List of JIRA board IDs to aggregate data from"
-                        },
-                        "workspace_name": {
-                            "type": "string",
-                            "description": "Name for the workspace/report (e.g., 'Online', 'Retail')",
-                            "default": "Default Workspace"
-                        },
-                        "project_keys": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                            "description": "Optional list of project keys to filter (e.g., ['EPA', 'INS'])"
-                        },
-                        "num_sprints": {
-                            "type": "integer",
-                            "description": "Number of recent closed sprints to include (default: all in date range)"
-                        },
-                        "start_date": {
-                            "type": "string",
-                            "description": "Filter sprints starting after this date (YYYY-MM-DD)"
-                        },
-                        "end_date": {
-                            "type": "string",
-                            "description": "Filter sprints ending before this date (YYYY-MM-DD)"
-                        },
-                        "include_ai_metrics": {
-                            "type": "boolean",
-                            "description": "Include AI contribution metrics (default: true)",
-                            "default": True
-                        },
-                        "output_format": {
-                            "type": "string",
-                            "description": "Output format: markdown, markdown_with_charts, or json",
-                            "enum": ["markdown", "markdown_with_charts", "json"],
-                            "default": "markdown_with_charts"
-                        }
-                    },
-                    "required": ["board_ids"]
-                }
-            ),
-            types.Tool(
-                name="delivery_report_publish",
-                description="Generate multi-sprint velocity report and publish to Confluence. Includes ASCII charts, cross-workspace aggregation, and per-sprint breakdown for delivery managers.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "board_ids": {
-                            "type": "array",
-                            "items": {"type": "integer"},
-                            "description": "List of JIRA board IDs to aggregate data from"
-                        },
-                        "workspace_name": {
-                            "type": "string",
-                            "description": "Name for the workspace/report (e.g., 'Online', 'Retail')",
-                            "default": "Default Workspace"
-                        },
-                        "project_keys": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                            "description": "Optional list of project keys to filter"
-                        },
-                        "num_sprints": {
-                            "type": "integer",
-                            "description": "Number of recent closed sprints to include"
-                        },
-                        "start_date": {
-                            "type": "string",
-                            "description": "Filter sprints starting after this date (YYYY-MM-DD)"
-                        },
-                        "end_date": {
-                            "type": "string",
-                            "description": "Filter sprints ending before this date (YYYY-MM-DD)"
-                        },
-                        "space_key": {
-                            "type": "string",
-                            "description": "Confluence space key. Uses CONFLUENCE_SPACE_KEY env var if not provided."
-                        },
-                        "page_title": {
-                            "type": "string",
-                            "description": "Page title. Auto-generated if not provided."
-                        },
-                        "parent_page_id": {
-                            "type": "string",
-                            "description": "Optional parent page ID to nest the report under."
-                        },
-                        "include_ai_metrics": {
-                            "type": "boolean",
-                            "description": "Include AI contribution metrics (default: true)",
-                            "default": True
-                        },
-                        "include_charts": {
-                            "type": "boolean",
-                            "description": "Include ASCII charts in output (default: true)",
-                            "default": True
-                        }
+                    "include_ai_metrics": {
+                        "type": "boolean",
+                        "description": "Include AI contribution metrics (default: true)",
+                        "default": True
                     },
-                    "required": ["board_ids"]
-                }
-            ),
-            types.Tool(
-                name="delivery_report_compare",
-                description="Generate comparison report with full report per board plus cross-board comparison table. Each board gets its own section with charts, tables, and AI metrics, followed by a final comparison section showing side-by-side metrics.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "board_configs": {
-                            "type": "array",
-                            "items": {
-                                "type": "object",
-                                "properties": {
-                                    "board_id": {
-                                        "type": "integer",
-                                        "description": "JIRA board ID"
-                                    },
-                                    "name": {
-                                        "type": "string",
-                                        "description": "Display name for the board (e.g., 'Board 847 - Inspire')"
-                                    },
-                                    "project_keys": {
-                                        "type": "array",
-                                        "items": {"type": "string"},
-                                        "description": "Optional list of project keys to filter"
-                                    }
+                    "include_charts": {
+                        "type": "boolean",
+                        "description": "Include ASCII comparison charts (default: true)",
+                        "default": True
+                    }
+                },
+                "required": ["board_configs"]
+            },
+            handler=handle_multi_board_value_delivered_report
+        ),
+        # Delivery Report Agent Tools
+        ToolSpec(
+            name="delivery_report_generate",
+            description="Generate multi-sprint velocity report for delivery managers. Aggregates data from multiple closed sprints with ASCII horizontal bar charts showing rollover, commitment, and delivered story points. Supports cross-workspace reporting (Online/Retail) and per-sprint trend breakdown.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "board_ids": {
+                        "type": "array",
+                        "items": {"type": "integer"},
+                        "description": "List of JIRA board IDs to aggregate data from"
+                    },
+                    "workspace_name": {
+                        "type": "string",
+                        "description": "Name for the workspace/report (e.g., 'Online', 'Retail')",
+                        "default": "Default Workspace"
+                    },
+                    "project_keys": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Optional list of project keys to filter (e.g., ['EPA', 'INS'])"
+                    },
+                    "num_sprints": {
+                        "type": "integer",
+                        "description": "Number of recent closed sprints to include (default: all in date range)"
+                    },
+                    "start_date": {
+                        "type": "string",
+                        "description": "Filter sprints starting after this date (YYYY-MM-DD)"
+                    },
+                    "end_date": {
+                        "type": "string",
+                        "description": "Filter sprints ending before this date (YYYY-MM-DD)"
+                    },
+                    "include_ai_metrics": {
+                        "type": "boolean",
+                        "description": "Include AI contribution metrics (default: true)",
+                        "default": True
+                    },
+                    "output_format": {
+                        "type": "string",
+                        "description": "Output format: markdown, markdown_with_charts, or json",
+                        "enum": ["markdown", "markdown_with_charts", "json"],
+                        "default": "markdown_with_charts"
+                    }
+                },
+                "required": ["board_ids"]
+            },
+            handler=handle_delivery_report_generate
+        ),
+        ToolSpec(
+            name="delivery_report_publish",
+            description="Generate multi-sprint velocity report and publish to Confluence. Includes ASCII charts, cross-workspace aggregation, and per-sprint breakdown for delivery managers.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "board_ids": {
+                        "type": "array",
+                        "items": {"type": "integer"},
+                        "description": "List of JIRA board IDs to aggregate data from"
+                    },
+                    "workspace_name": {
+                        "type": "string",
+                        "description": "Name for the workspace/report (e.g., 'Online', 'Retail')",
+                        "default": "Default Workspace"
+                    },
+                    "project_keys": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Optional list of project keys to filter"
+                    },
+                    "num_sprints": {
+                        "type": "integer",
+                        "description": "Number of recent closed sprints to include"
+                    },
+                    "start_date": {
+                        "type": "string",
+                        "description": "Filter sprints starting after this date (YYYY-MM-DD)"
+                    },
+                    "end_date": {
+                        "type": "string",
+                        "description": "Filter sprints ending before this date (YYYY-MM-DD)"
+                    },
+                    "space_key": {
+                        "type": "string",
+                        "description": "Confluence space key. Uses CONFLUENCE_SPACE_KEY env var if not provided."
+                    },
+                    "page_title": {
+                        "type": "string",
+                        "description": "Page title. Auto-generated if not provided."
+                    },
+                    "parent_page_id": {
+                        "type": "string",
+                        "description": "Optional parent page ID to nest the report under."
+                    },
+                    "include_ai_metrics": {
+                        "type": "boolean",
+                        "description": "Include AI contribution metrics (default: true)",
+                        "default": True
+                    },
+                    "include_charts": {
+                        "type": "boolean",
+                        "description": "Include ASCII charts in output (default: true)",
+                        "default": True
+                    }
+                },
+                "required": ["board_ids"]
+            },
+            handler=handle_delivery_report_publish
+        ),
+        ToolSpec(
+            name="delivery_report_compare",
+            description="Generate comparison report with full report per board plus cross-board comparison table. Each board gets its own section with charts, tables, and AI metrics, followed by a final comparison section showing side-by-side metrics.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "board_configs": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "board_id": {
+                                    "type": "integer",
+                                    "description": "JIRA board ID"
+                                },
+                                "name": {
+                                    "type": "string",
+                                    "description": "Display name for the board (e.g., 'Board 847 - Inspire')"
                                 },
-                                "required": ["board_id"]
+                                "project_keys": {
+                                    "type": "array",
+                                    "items": {"type": "string"},
+                                    "description": "Optional list of project keys to filter"
+                                }
                             },
-                            "description": "List of board configurations to compare"
+                            "required": ["board_id"]
                         },
-                        "num_sprints": {
-                            "type": "integer",
-                            "description": "Number of recent closed sprints per board"
-                        },
-                        "start_date": {
-                            "type": "string",
-                            "description": "Filter sprints starting after this date (YYYY-MM-DD)"
-                        },
-                        "end_date": {
-                            "type": "string",
-                            "description": "Filter sprints ending before this date (YYYY-MM-DD)"
-                        },
-                        "include_ai_metrics": {
-                            "type": "boolean",
-                            "description": "Include AI contribution metrics (default: true)",
-                            "default": True
-                        }
+                        "description": "List of board configurations to compare"
                     },
-                    "required": ["board_configs"]
-                }
-            ),
-
-            # PR Review Agent Tools
-            types.Tool(
-                name="pr_review",
-                description="Review an Azure DevOps Pull Request with structured, role-aware feedback. Automatically detects tech stack (Frontend, Backend, QA, Infra) and provides comprehensive review including summary, code quality, risk analysis, test coverage, architecture assessment, and actionable recommendations. Supports different review roles: fe (Frontend), qa (QA/Cypress), platform (Infrastructure), backend, or general.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "pr_url": {
-                            "type": "string",
-                            "description": "Azure DevOps PR URL (e.g., https://dev.azure.com/org/project/_git/repo/pullrequest/123)"
-                        },
-                        "role": {
-                            "type": "string",
-                            "description": "Review role/persona: 'fe' (Frontend), 'qa' (QA/Cypress), 'platform' (Infrastructure), 'backend', or 'general' (default). If not specified, role is auto-detected from tech stack.",
-                            "enum": ["fe", "qa", "platform", "backend", "general"]
-                        },
-                        "output_format": {
-                            "type": "string",
-                            "description": "Output format: 'json' for machine-readable, 'markdown' for human-readable (default: 'markdown')",
-                            "enum": ["json", "markdown"],
-                            "default": "markdown"
-                        }
-                    },
-                    "required": ["pr_url"]
-                }
-            ),
-            types.Tool(
-                name="pr_review_get_pr_data",
-                description="Fetch raw PR data from Azure DevOps without performing a review. Returns PR metadata, changed files, and diffs. Useful for custom analysis or when you need PR data for other purposes.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "pr_url": {
-                            "type": "string",
-                            "description": "Azure DevOps PR URL (e.g., https://dev.azure.com/org/project/_git/repo/pullrequest/123)"
-                        },
-                        "include_diffs": {
-                            "type": "boolean",
-                            "description": "Whether to include file diffs (default: true)",
-                            "default": True
-                        },
-                        "include_content": {
-                            "type": "boolean",
-                            "description": "Whether to include file contents (default: true)",
-                            "default": True
-                        }
+                    "num_sprints": {
+                        "type": "integer",
+                        "description": "Number of recent closed sprints per board"
                     },
-                    "required": ["pr_url"]
-                }
-            ),
-            types.Tool(
-                name="pr_review_detect_tech_stack",
-                description="Detect the technology stack from an Azure DevOps PR. Returns detected stacks (Frontend, Backend, QA, Infra), primary stack, confidence score, and evidence. Useful for understanding what technologies a PR touches.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "pr_url": {
-                            "type": "string",
-                            "description": "Azure DevOps PR URL (e.g., https://dev.azure.com/org/project/_git/repo/pullrequest/123)"
-                        }
-                    },
-                    "required": ["pr_url"]
-                }
-            ),
-
-            # Technical Debt Agent Tools
-            types.Tool(
-                name="tech_debt_analyze",
-                description="Analyze a repository for technical debt. Identifies TODO/FIXME comments, deprecated code, high complexity, large files/functions, test coverage gaps, dependency issues, and architecture problems. Returns a comprehensive report with severity ratings, impact assessment, and prioritized recommendations. Optionally integrates with SonarCloud for enhanced analysis.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "repo_path": {
-                            "type": "string",
-                            "description": "Path to the repository to analyze (default: current working directory)"
-                        },
-                        "include_sonarcloud": {
-                            "type": "boolean",
-                            "description": "Whether to include SonarCloud data if SONAR_TOKEN is available (default: true)",
-                            "default": True
-                        },
-                        "sonar_project_key": {
-                            "type": "string",
-                            "description": "SonarCloud project key (optional, uses default if not provided)"
-                        },
-                        "sonar_branch": {
-                            "type": "string",
-                            "description": "Branch to analyze in SonarCloud (default: main)",
-                            "default": "main"
-                        },
-                        "output_format": {
-                            "type": "string",
-                            "description": "Output format: 'json' for machine-readable, 'markdown' for human-readable, 'both' for both formats (default: 'both')",
-                            "enum": ["json", "markdown", "both"],
-                            "default": "both"
-                        }
-                    },
-                    "required": []
-                }
-            ),
-            types.Tool(
-                name="tech_debt_summary",
-                description="Generate an executive summary of technical debt for leadership. Provides high-level risk assessment, key findings, and recommended actions in a concise format suitable for stakeholder communication.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "repo_path": {
-                            "type": "string",
-                            "description": "Path to the repository to analyze (default: current working directory)"
-                        },
-                        "include_sonarcloud": {
-                            "type": "boolean",
-                            "description": "Whether to include SonarCloud data if SONAR_TOKEN is available (default: true)",
-                            "default": True
-                        }
+                    "start_date": {
+                        "type": "string",
+                        "description": "Filter sprints starting after this date (YYYY-MM-DD)"
                     },
-                    "required": []
-                }
-            ),
-            types.Tool(
-                name="tech_debt_register",
-                description="Generate a detailed technical debt register (inventory). Lists all identified debt items in a tabular format with ID, title, category, severity, effort, and location. Useful for tracking and sprint planning.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "repo_path": {
-                            "type": "string",
-                            "description": "Path to the repository to analyze (default: current working directory)"
-                        },
-                        "include_sonarcloud": {
-                            "type": "boolean",
-                            "description": "Whether to include SonarCloud data if SONAR_TOKEN is available (default: true)",
-                            "default": True
-                        }
+                    "end_date": {
+                        "type": "string",
+                        "description": "Filter sprints ending before this date (YYYY-MM-DD)"
                     },
-                    "required": []
-                }
-            ),
-
-            # Jira Integration Tools
-            types.Tool(
-                name="jira_get_issue",
-                description="Get a JIRA issue by its key. Returns issue details including summary, status, type, description, assignee, priority, and labels. Requires JIRA_BASE_URL, JIRA_EMAIL, and JIRA_API_TOKEN environment variables.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "issue_key": {
-                            "type": "string",
-                            "description": "JIRA issue key (e.g., 'EPA-123', 'PANDORA-456')"
-                        },
-                        "fields": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                            "description": "Optional list of specific fields to retrieve (e.g., ['summary', 'status', 'assignee']). If not provided, returns all standard fields."
-                        }
+                    "include_ai_metrics": {
+                        "type": "boolean",
+                        "description": "Include AI contribution metrics (default: true)",
+                        "default": True
+                    }
+                },
+                "required": ["board_configs"]
+            },
+            handler=handle_delivery_report_compare
+        ),
+
+        # PR Review Agent Tools
+        ToolSpec(
+            name="pr_review",
+            description="Review an Azure DevOps Pull Request with structured, role-aware feedback. Automatically detects tech stack (Frontend, Backend, QA, Infra) and provides comprehensive review including summary, code quality, risk analysis, test coverage, architecture assessment, and actionable recommendations. Supports different review roles: fe (Frontend), qa (QA/Cypress), platform (Infrastructure), backend, or general.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "pr_url": {
+                        "type": "string",
+                        "description": "Azure DevOps PR URL (e.g., https://dev.azure.com/org/project/_git/repo/pullrequest/123)"
                     },
-                    "required": ["issue_key"]
-                }
-            ),
-            types.Tool(
-                name="jira_search_issues",
-                description="Search for JIRA issues using JQL (JIRA Query Language). Returns a list of matching issues with their details. Requires JIRA_BASE_URL, JIRA_EMAIL, and JIRA_API_TOKEN environment variables.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "jql": {
-                            "type": "string",
-                            "description": "JQL query string (e.g., 'project = EPA AND status = \"In Progress\"', 'assignee = currentUser() AND sprint in openSprints()')"
-                        },
-                        "max_results": {
-                            "type": "integer",
-                            "description": "Maximum number of results to return (default: 50, max: 100)",
-                            "default": 50
-                        },
-                        "fields": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                            "description": "Optional list of specific fields to retrieve"
-                        }
+                    "role": {
+                        "type": "string",
+                        "description": "Review role/persona: 'fe' (Frontend), 'qa' (QA/Cypress), 'platform' (Infrastructure), 'backend', or 'general' (default). If not specified, role is auto-detected from tech stack.",
+                        "enum": ["fe", "qa", "platform", "backend", "general"]
                     },
-                    "required": ["jql"]
-                }
-            ),
-            types.Tool(
-                name="jira_get_project",
-                description="Get JIRA project details by project key. Returns project information including name, description, lead, and issue types. Requires JIRA_BASE_URL, JIRA_EMAIL, and JIRA_API_TOKEN environment variables.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "project_key": {
-                            "type": "string",
-                            "description": "JIRA project key (e.g., 'EPA', 'PANDORA')"
-                        }
-                    },
-                    "required": ["project_key"]
-                }
-            ),
-            types.Tool(
-                name="jira_test_connection",
-                description="Test the JIRA API connection. Returns connection status and authenticated user information. Requires JIRA_BASE_URL, JIRA_EMAIL, and JIRA_API_TOKEN environment variables.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {}
-                }
-            ),
-            types.Tool(
-                name="jira_add_comment",
-                description="Add a comment to a JIRA issue. Supports markdown formatting. Requires JIRA_BASE_URL, JIRA_EMAIL, and JIRA_API_TOKEN environment variables.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "issue_key": {
-                            "type": "string",
-                            "description": "JIRA issue key (e.g., 'EPA-123')"
-                        },
-                        "comment": {
-                            "type": "string",
-                            "description": "Comment text (supports markdown formatting)"
-                        }
+                    "output_format": {
+                        "type": "string",
+                        "description": "Output format: 'json' for machine-readable, 'markdown' for human-readable (default: 'markdown')",
+                        "enum": ["json", "markdown"],
+                        "default": "markdown"
+                    }
+                },
+                "required": ["pr_url"]
+            },
+            handler=handle_pr_review
+        ),
+        ToolSpec(
+            name="pr_review_get_pr_data",
+            description="Fetch raw PR data from Azure DevOps without performing a review. Returns PR metadata, changed files, and diffs. Useful for custom analysis or when you need PR data for other purposes.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "pr_url": {
+                        "type": "string",
+                        "description": "Azure DevOps PR URL (e.g., https://dev.azure.com/org/project/_git/repo/pullrequest/123)"
                     },
-                    "required": ["issue_key", "comment"]
-                }
-            ),
-            types.Tool(
-                name="jira_get_transitions",
-                description="Get available status transitions for a JIRA issue. Returns list of transitions that can be performed on the issue. Requires JIRA_BASE_URL, JIRA_EMAIL, and JIRA_API_TOKEN environment variables.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "issue_key": {
-                            "type": "string",
-                            "description": "JIRA issue key (e.g., 'EPA-123')"
-                        }
-                    },
-                    "required": ["issue_key"]
-                }
-            ),
-
-            # Pillar 3 Report Tools
-            types.Tool(
-                name="pillar3_generate_report",
-                description="Generate a Pillar 3 status report from JIRA data. Fetches Epic/Initiative data and maps it to the Pillar 3 template format with objectives, key results, RAG status, milestones, and outcomes. Requires JIRA_BASE_URL, JIRA_EMAIL, and JIRA_API_TOKEN environment variables.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "epic_key": {
-                            "type": "string",
-                            "description": "JIRA Epic key to generate report from (e.g., 'EPA-123')"
-                        },
-                        "initiative_key": {
-                            "type": "string",
-                            "description": "JIRA Initiative key to generate report from"
-                        },
-                        "jql": {
-                            "type": "string",
-                            "description": "JQL query to fetch issues for the report"
-                        },
-                        "team_name": {
-                            "type": "string",
-                            "description": "Team/Initiative name (used with JQL)",
-                            "default": "TBD"
-                        },
-                        "output_format": {
-                            "type": "string",
-                            "description": "Output format: 'markdown', 'json', or 'pdf'",
-                            "enum": ["markdown", "json", "pdf"],
-                            "default": "markdown"
-                        }
-                    },
-                    "required": []
-                }
-            ),
-            types.Tool(
-                name="pillar3_publish_to_confluence",
-                description="Generate a Pillar 3 report from JIRA and publish it to Confluence. Optionally also generates a PDF. Requires JIRA and Confluence credentials.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "epic_key": {
-                            "type": "string",
-                            "description": "JIRA Epic key to generate report from"
-                        },
-                        "initiative_key": {
-                            "type": "string",
-                            "description": "JIRA Initiative key to generate report from"
-                        },
-                        "jql": {
-                            "type": "string",
-                            "description": "JQL query to fetch issues for the report"
-                        },
-                        "team_name": {
-                            "type": "string",
-                            "description": "Team/Initiative name (used with JQL)",
-                            "default": "TBD"
-                        },
-                        "space_key": {
-                            "type": "string",
-                            "description": "Confluence space key to publish to"
-                        },
-                        "page_title": {
-                            "type": "string",
-                            "description": "Optional page title (defaults to report team/initiative name)"
-                        },
-                        "parent_page_id": {
-                            "type": "string",
-                            "description": "Optional parent page ID in Confluence"
-                        },
-                        "also_generate_pdf": {
-                            "type": "boolean",
-                            "description": "Also generate a PDF file (default: false)",
-                            "default": False
-                        }
+                    "include_diffs": {
+                        "type": "boolean",
+                        "description": "Whether to include file diffs (default: true)",
+                        "default": True
                     },
-                    "required": ["space_key"]
-                }
-            ),
-            types.Tool(
-                name="pillar3_generate_pdf",
-                description="Generate a Pillar 3 report PDF from JIRA data. Creates a professionally formatted PDF following the Pandora Pillar 3 template.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "epic_key": {
-                            "type": "string",
-                            "description": "JIRA Epic key to generate report from"
-                        },
-                        "initiative_key": {
-                            "type": "string",
-                            "description": "JIRA Initiative key to generate report from"
-                        },
-                        "jql": {
-                            "type": "string",
-                            "description": "JQL query to fetch issues for the report"
-                        },
-                        "team_name": {
-                            "type": "string",
-                            "description": "Team/Initiative name (used with JQL)",
-                            "default": "TBD"
-                        },
-                        "output_path": {
-                            "type": "string",
-                            "description": "Path for the output PDF file (default: /tmp/pillar3_report_<team_name>.pdf)"
-                        }
+                    "include_content": {
+                        "type": "boolean",
+                        "description": "Whether to include file contents (default: true)",
+                        "default": True
+                    }
+                },
+                "required": ["pr_url"]
+            },
+            handler=handle_pr_review_get_pr_data
+        ),
+        ToolSpec(
+            name="pr_review_detect_tech_stack",
+            description="Detect the technology stack from an Azure DevOps PR. Returns detected stacks (Frontend, Backend, QA, Infra), primary stack, confidence score, and evidence. Useful for understanding what technologies a PR touches.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "pr_url": {
+                        "type": "string",
+                        "description": "Azure DevOps PR URL (e.g., https://dev.azure.com/org/project/_git/repo/pullrequest/123)"
+                    }
+                },
+                "required": ["pr_url"]
+            },
+            handler=handle_pr_review_detect_tech_stack
+        ),
+
+        # Technical Debt Agent Tools
+        ToolSpec(
+            name="tech_debt_analyze",
+            description="Analyze a repository for technical debt. Identifies TODO/FIXME comments, deprecated code, high complexity, large files/functions, test coverage gaps, dependency issues, and architecture problems. Returns a comprehensive report with severity ratings, impact assessment, and prioritized recommendations. Optionally integrates with SonarCloud for enhanced analysis.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "repo_path": {
+                        "type": "string",
+                        "description": "Path to the repository to analyze (default: current working directory)"
                     },
-                    "required": []
-                }
-            ),
-        ]
-
-    # Register call_tool handler
-    @server.call_tool()
-    async def call_tool(name: str, arguments: dict[str, Any]) -> list[types.TextContent]:
-        """Handle tool calls."""
-
-        try:
-            # Filesystem tools
-            if name == "fs_read_file":
-                result = fs_tool.read_file(
-                    arguments["path"],
-                    arguments.get("encoding", "utf-8")
-                )
-                return [types.TextContent(type="text", text=result)]
-
-            elif name == "fs_write_file":
-                result = fs_tool.write_file(
-                    arguments["path"],
-                    arguments["content"],
-                    arguments.get("encoding", "utf-8"),
-                    arguments.get("create_dirs", True)
-                )
-                return [types.TextContent(type="text", text=f"File written: {result}")]
-
-            elif name == "fs_list_directory":
-                result = fs_tool.list_directory(
-                    arguments["path"],
-                    arguments.get("recursive", False)
-                )
-                files = [f.path for f in result]
-                return [types.TextContent(type="text", text="\n".join(files))]
-
-            elif name == "fs_read_json":
-                result = fs_tool.read_json(arguments["path"])
-                import json
-                return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
-
-            elif name == "fs_write_json":
-                result = fs_tool.write_json(
-                    arguments["path"],
-                    arguments["data"],
-                    arguments.get("indent", 2)
-                )
-                return [types.TextContent(type="text", text=f"JSON written: {result}")]
-
-            # Command runner tools
-            elif name == "cmd_run":
-                result = cmd_runner.run(
-                    arguments["command"],
-                    arguments.get("args", []),
-                    arguments.get("timeout", 300)
-                )
-                output = f"Exit code: {result.exit_code}\n\nStdout:\n{result.stdout}\n\nStderr:\n{result.stderr}"
-                return [types.TextContent(type="text", text=output)]
-
-            elif name == "cmd_run_eslint":
-                result = cmd_runner.run_eslint(
-                    arguments["paths"],
-                    arguments.get("fix", False)
-                )
-                output = f"Exit code: {result.exit_code}\n\n{result.stdout}"
-                return [types.TextContent(type="text", text=output)]
-
-            elif name == "cmd_run_prettier":
-                result = cmd_runner.run_prettier(
-                    arguments["paths"],
-                    arguments.get("check", False)
-                )
-                output = f"Exit code: {result.exit_code}\n\n{result.stdout}"
-                return [types.TextContent(type="text", text=output)]
-
-            elif name == "cmd_run_tests":
-                result = cmd_runner.test(arguments.get("coverage", False))
-                output = f"Exit code: {result.exit_code}\n\n{result.stdout}"
-                return [types.TextContent(type="text", text=output)]
-
-            # Figma parser tools
-            elif name == "figma_parse_file":
-                result = figma_parser.parse_file(arguments["file_path"])
-                import json
-                return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
-
-            elif name == "figma_extract_colors":
-                result = figma_parser.extract_colors(arguments["file_path"])
-                import json
-                return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
-
-            # Figma Reader Agent tools (API-based)
-            elif name == "figma_read":
-                import json
-                try:
-                    figma_reader = FigmaReaderAgent()
-                    result = figma_reader.get_component_for_frontend_agent(
-                        arguments["url_or_file_key"],
-                        arguments.get("node_id")
-                    )
-                    figma_reader.close()
-                    return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
-                except ValueError as ve:
-                    return [types.TextContent(type="text", text=f"Figma Reader Error: {str(ve)}")]
-
-            # Amplience API tools
-            elif name == "amplience_fetch_by_key":
-                result = amplience_api.fetch_by_key(
-                    arguments["key"],
-                    arguments.get("vse")
-                )
-                import json
-                return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
-
-            elif name == "amplience_fetch_by_id":
-                result = amplience_api.fetch_by_id(
-                    arguments["id"],
-                    arguments.get("vse")
-                )
-                import json
-                return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
-
-            # HAR analyzer tools
-            elif name == "har_parse_file":
-                result = har_analyzer.parse_file(arguments["file_path"])
-                import json
-                return [types.TextContent(type="text", text=json.dumps(result.to_dict(), indent=2))]
-
-            elif name == "har_get_performance_metrics":
-                result = har_analyzer.get_performance_metrics(arguments["file_path"])
-                import json
-                return [types.TextContent(type="text", text=json.dumps(result.to_dict(), indent=2))]
-
-            # Commerce Agent tools
-            elif name == "commerce_find_product_and_prepare_cart":
-                import json
-                try:
-                    commerce_agent = CommerceAgent()
-                    result = commerce_agent.find_product_and_prepare_cart(
-                        arguments["goal"],
-                        arguments.get("currency")
-                    )
-                    commerce_agent.close()
-                    return [types.TextContent(type="text", text=json.dumps(result.to_dict(), indent=2))]
-                except Exception as ce:
-                    return [types.TextContent(type="text", text=f"Commerce Agent Error: {str(ce)}")]
-
-            # Broken Experience Detector Agent tools
-            elif name == "broken_experience_detector_scan_site":
-                import json
-                try:
-                    bx_agent = BrokenExperienceDetectorAgent(headless=True)
-                    # Use await directly since call_tool is already async
-                    report = await bx_agent.scan_site(arguments["url"])
-                    
-                    output_format = arguments.get("output_format", "both")
-                    
-                    if output_format == "json":
-                        return [types.TextContent(type="text", text=json.dumps(report.to_dict(), indent=2))]
-                    elif output_format == "markdown":
-                        return [types.TextContent(type="text", text=report.to_markdown())]
-                    else:  # both
-                        result = {
-                            "json": report.to_dict(),
-                            "markdown": report.to_markdown()
-                        }
-                        return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
-                except Exception as bx_error:
-                    return [types.TextContent(type="text", text=f"Broken Experience Detector Error: {str(bx_error)}")]
-
-            # Unit Test Agent tools
-            elif name == "unit_test_generate":
-                import json
-                try:
-                    from agents.unit_test_agent import UnitTestAgent, TestFramework
-                    
-                    framework_str = arguments.get("framework", "jest")
-                    framework = TestFramework.JEST if framework_str == "jest" else TestFramework.VITEST
-                    
-                    agent = UnitTestAgent(framework=framework)
-                    test_file = agent.generate_test_file(
-                        arguments["source_file"],
-                        arguments.get("content")
-                    )
-                    test_code = agent.generate_test_code(test_file)
-                    
-                    result = {
-                        "testFile": test_file.to_dict(),
-                        "testCode": test_code,
+                    "include_sonarcloud": {
+                        "type": "boolean",
+                        "description": "Whether to include SonarCloud data if SONAR_TOKEN is available (default: true)",
+                        "default": True
+                    },
+                    "sonar_project_key": {
+                        "type": "string",
+                        "description": "SonarCloud project key (optional, uses default if not provided)"
+                    },
+                    "sonar_branch": {
+                        "type": "string",
+                        "description": "Branch to analyze in SonarCloud (default: main)",
+                        "default": "main"
+                    },
+                    "output_format": {
+                        "type": "string",
+                        "description": "Output format: 'json' for machine-readable, 'markdown' for human-readable, 'both' for both formats (default: 'both')",
+                        "enum": ["json", "markdown", "both"],
+                        "default": "both"
                     }
-                    return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
-                except Exception as ut_error:
-                    return [types.TextContent(type="text", text=f"Unit Test Agent Error: {str(ut_error)}")]
-
-            elif name == "unit_test_analyze":
-                import json
-                try:
-                    from agents.unit_test_agent import UnitTestAgent
-                    
-                    agent = UnitTestAgent()
-                    analysis = agent.analyze_file(
-                        arguments["source_file"],
-                        arguments.get("content")
-                    )
-                    return [types.TextContent(type="text", text=json.dumps(analysis, indent=2))]
-                except Exception as ut_error:
-                    return [types.TextContent(type="text", text=f"Unit Test Agent Error: {str(ut_error)}")]
-
-            # QA Agent tools
-            elif name == "qa_validate":
-                import json
-                try:
-                    from agents.qa_agent import QAAgent
-                    
-                    agent = QAAgent()
-                    result = agent.validate_implementation(
-                        test_cases=arguments.get("test_cases", []),
-                        code_paths=arguments.get("code_paths", []),
-                        acceptance_criteria=arguments.get("acceptance_criteria", []),
-                    )
-                    return [types.TextContent(type="text", text=json.dumps(result.to_dict(), indent=2))]
-                except Exception as qa_error:
-                    return [types.TextContent(type="text", text=f"QA Agent Error: {str(qa_error)}")]
-
-            # Sonar Validation Agent tools
-            elif name == "sonar_validate":
-                import json
-                try:
-                    project_key = arguments.get("project_key", "pandora-jewelry_spark_pandora-group")
-                    branch = arguments.get("branch", "master")
-                    repo_path = arguments.get("repo_path")
-                    
-                    agent = SonarValidationAgent(project_key=project_key)
-                    result = agent.validate(branch, repo_path)
-                    
-                    return [types.TextContent(type="text", text=json.dumps(result.to_dict(), indent=2))]
-                except Exception as sonar_error:
-                    return [types.TextContent(type="text", text=f"Sonar Validation Error: {str(sonar_error)}")]
-
-            elif name == "sonar_get_issues":
-                import json
-                try:
-                    project_key = arguments.get("project_key", "pandora-jewelry_spark_pandora-group")
-                    branch = arguments.get("branch", "master")
-                    severities = arguments.get("severities")
-                    types_filter = arguments.get("types")
-                    
-                    agent = SonarValidationAgent(project_key=project_key)
-                    issues = agent.fetch_issues(branch, severities, types_filter)
-                    
-                    issues_data = [issue.to_dict() for issue in issues]
-                    return [types.TextContent(type="text", text=json.dumps(issues_data, indent=2))]
-                except Exception as sonar_error:
-                    return [types.TextContent(type="text", text=f"Sonar Issues Error: {str(sonar_error)}")]
-
-            elif name == "sonar_get_coverage":
-                import json
-                try:
-                    project_key = arguments.get("project_key", "pandora-jewelry_spark_pandora-group")
-                    branch = arguments.get("branch", "master")
-                    
-                    agent = SonarValidationAgent(project_key=project_key)
-                    coverage = agent.fetch_coverage(branch)
-                    
-                    return [types.TextContent(type="text", text=json.dumps(coverage.to_dict(), indent=2))]
-                except Exception as sonar_error:
-                    return [types.TextContent(type="text", text=f"Sonar Coverage Error: {str(sonar_error)}")]
-
-            elif name == "sonar_get_quality_gate":
-                import json
-                try:
-                    project_key = arguments.get("project_key", "pandora-jewelry_spark_pandora-group")
-                    branch = arguments.get("branch", "master")
-                    
-                    agent = SonarValidationAgent(project_key=project_key)
-                    status = agent.fetch_project_status(branch)
-                    
-                    return [types.TextContent(type="text", text=json.dumps(status, indent=2))]
-                except Exception as sonar_error:
-                    return [types.TextContent(type="text", text=f"Sonar Quality Gate Error: {str(sonar_error)}")]
-
-            elif name == "sonar_validate_for_pr":
-                import json
-                try:
-                    project_key = arguments.get("project_key", "pandora-jewelry_spark_pandora-group")
-                    branch = arguments.get("branch", "master")
-                    repo_path = arguments.get("repo_path")
-                    
-                    result = validate_for_pr(branch, repo_path, project_key)
-                    
-                    return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
-                except Exception as sonar_error:
-                    return [types.TextContent(type="text", text=f"Sonar PR Validation Error: {str(sonar_error)}")]
-
-            # Analytics Agent tools
-            elif name == "analytics_track_task_start":
-                import json
-                try:
-                    analytics_agent = AnalyticsAgent()
-                    metrics = analytics_agent.on_task_started(
-                        agent_name=arguments["agent_name"],
-                        task_description=arguments["task_description"],
-                        jira_task_id=arguments.get("jira_task_id"),
-                        workflow_id=arguments.get("workflow_id"),
-                    )
-                    result = {
-                        "status": "success",
-                        "message": f"Task started for {arguments['agent_name']}",
-                        "metrics": metrics.to_dict(),
+                },
+                "required": []
+            },
+            handler=handle_tech_debt_analyze,
+            pool="cpu",
+            progress=True
+        ),
+        ToolSpec(
+            name="tech_debt_summary",
+            description="Generate an executive summary of technical debt for leadership. Provides high-level risk assessment, key findings, and recommended actions in a concise format suitable for stakeholder communication.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "repo_path": {
+                        "type": "string",
+                        "description": "Path to the repository to analyze (default: current working directory)"
+                    },
+                    "include_sonarcloud": {
+                        "type": "boolean",
+                        "description": "Whether to include SonarCloud data if SONAR_TOKEN is available (default: true)",
+                        "default": True
                     }
-                    return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
-                except Exception as analytics_error:
-                    return [types.TextContent(type="text", text=f"Analytics Error: {str(analytics_error)}")]
-
-            elif name == "analytics_track_task_end":
-                import json
-                try:
-                    analytics_agent = AnalyticsAgent()
-                    metrics_input = {
-                        "duration": arguments.get("duration", 0),
-                        "iterations": arguments.get("iterations", 1),
-                        "errors": arguments.get("errors", []),
-                        "effectivenessScore": arguments.get("effectiveness_score"),
-                        "requiresHumanReview": arguments.get("requires_human_review", False),
-                        "confidenceScore": arguments.get("confidence_score", 1.0),
+                },
+                "required": []
+            },
+            handler=handle_tech_debt_summary
+        ),
+        ToolSpec(
+            name="tech_debt_register",
+            description="Generate a detailed technical debt register (inventory). Lists all identified debt items in a tabular format with ID, title, category, severity, effort, and location. Useful for tracking and sprint planning.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "repo_path": {
+                        "type": "string",
+                        "description": "Path to the repository to analyze (default: current working directory)"
+                    },
+                    "include_sonarcloud": {
+                        "type": "boolean",
+                        "description": "Whether to include SonarCloud data if SONAR_TOKEN is available (default: true)",
+                        "default": True
                     }
-                    metrics = analytics_agent.on_task_completed(
-                        agent_name=arguments["agent_name"],
-                        jira_task_id=arguments.get("jira_task_id"),
-                        metrics=metrics_input,
-                    )
-                    result = {
-                        "status": "success",
-                        "message": f"Task completed for {arguments['agent_name']}",
-                        "metrics": metrics.to_dict(),
+                },
+                "required": []
+            },
+            handler=handle_tech_debt_register
+        ),
+
+        # Jira Integration Tools
+        ToolSpec(
+            name="jira_get_issue",
+            description="Get a JIRA issue by its key. Returns issue details including summary, status, type, description, assignee, priority, and labels. Requires JIRA_BASE_URL, JIRA_EMAIL, and JIRA_API_TOKEN environment variables.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "issue_key": {
+                        "type": "string",
+                        "description": "JIRA issue key (e.g., 'EPA-123', 'PANDORA-456')"
+                    },
+                    "fields": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Optional list of specific fields to retrieve (e.g., ['summary', 'status', 'assignee']). If not provided, returns all standard fields."
                     }
-                    return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
-                except Exception as analytics_error:
-                    return [types.TextContent(type="text", text=f"Analytics Error: {str(analytics_error)}")]
-
-            elif name == "analytics_track_task_failure":
-                import json
-                try:
-                    analytics_agent = AnalyticsAgent()
-                    metrics = analytics_agent.on_task_failed(
-                        agent_name=arguments["agent_name"],
-                        jira_task_id=arguments.get("jira_task_id"),
-                        errors=arguments.get("errors", []),
-                    )
-                    result = {
-                        "status": "success",
-                        "message": f"Task failure recorded for {arguments['agent_name']}",
-                        "metrics": metrics.to_dict(),
+                },
+                "required": ["issue_key"]
+            },
+            handler=handle_jira_get_issue,
+            read_only=True
+        ),
+        ToolSpec(
+            name="jira_search_issues",
+            description="Search for JIRA issues using JQL (JIRA Query Language). Returns a list of matching issues with their details. Requires JIRA_BASE_URL, JIRA_EMAIL, and JIRA_API_TOKEN environment variables.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "jql": {
+                        "type": "string",
+                        "description": "JQL query string (e.g., 'project = EPA AND status = \"In Progress\"', 'assignee = currentUser() AND sprint in openSprints()')"
+                    },
+                    "max_results": {
+                        "type": "integer",
+                        "description": "Maximum number of results to return (default: 50, max: 100)",
+                        "default": 50
+                    },
+                    "fields": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Optional list of specific fields to retrieve"
                     }
-                    return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
-                except Exception as analytics_error:
-                    return [types.TextContent(type="text", text=f"Analytics Error: {str(analytics_error)}")]
-
-            elif name == "analytics_generate_report":
-                import json
-                try:
-                    analytics_agent = AnalyticsAgent()
-                    output_format = arguments.get("format", "json")
-                    days = arguments.get("days", 14)
-                    
-                    if output_format == "markdown":
-                        report = analytics_agent.generate_markdown_report(days=days)
-                        return [types.TextContent(type="text", text=report)]
-                    else:
-                        report = analytics_agent.generate_json_report(days=days)
-                        return [types.TextContent(type="text", text=json.dumps(report, indent=2))]
-                except Exception as analytics_error:
-                    return [types.TextContent(type="text", text=f"Analytics Error: {str(analytics_error)}")]
-
-            elif name == "analytics_list":
-                import json
-                try:
-                    analytics_agent = AnalyticsAgent()
-                    analytics = analytics_agent.list_analytics(
-                        days=arguments.get("days", 7),
-                        agent_name=arguments.get("agent_name"),
-                        status=arguments.get("status"),
-                    )
-                    result = {
-                        "status": "success",
-                        "count": len(analytics),
-                        "tasks": analytics,
+                },
+                "required": ["jql"]
+            },
+            handler=handle_jira_search_issues,
+            read_only=True
+        ),
+        ToolSpec(
+            name="jira_get_project",
+            description="Get JIRA project details by project key. Returns project information including name, description, lead, and issue types. Requires JIRA_BASE_URL, JIRA_EMAIL, and JIRA_API_TOKEN environment variables.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "project_key": {
+                        "type": "string",
+                        "description": "JIRA project key (e.g., 'EPA', 'PANDORA')"
                     }
-                    return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
-                except Exception as analytics_error:
-                    return [types.TextContent(type="text", text=f"Analytics Error: {str(analytics_error)}")]
-
-            elif name == "analytics_update_jira_task":
-                import json
-                import os
-                try:
-                    # Build JIRA config with optional overrides
-                    jira_base_url = arguments.get("jira_base_url") or os.environ.get("JIRA_BASE_URL", "")
-                    jira_email = arguments.get("jira_email") or os.environ.get("JIRA_EMAIL", "")
-                    jira_api_token = os.environ.get("JIRA_API_TOKEN", "")
-                    
-                    jira_config = JiraConfig(
-                        base_url=jira_base_url,
-                        email=jira_email,
-                        api_token=jira_api_token,
-                    )
-                    jira_client = JiraClient(config=jira_config)
-                    
-                    duration_ms = arguments.get("duration_ms", 0)
-                    if duration_ms < 60000:
-                        duration_str = f"{duration_ms / 1000:.1f}s"
-                    else:
-                        minutes = duration_ms / 60000
-                        seconds = (duration_ms % 60000) / 1000
-                        duration_str = f"{minutes:.0f}m {seconds:.0f}s"
-                    
-                    errors_count = arguments.get("errors", 0)
-                    error_str = f"{errors_count} (auto-fixed)" if errors_count > 0 else "0"
-                    
-                    comment = f"""AI Agent Update - PG AI Squad
-
-Agent: {arguments['agent_name']}
-Task: {arguments.get('task_name', 'N/A')}
-Status: {arguments['status']}
-
-Metrics:
-- Duration: {duration_str}
-- Iterations: {arguments.get('iterations', 1)}
-- Errors: {error_str}
-- Effectiveness Score: {arguments.get('effectiveness_score', 'N/A')}%
-- Human Review Required: {'Yes' if arguments.get('requires_human_review') else 'No'}
-
-AI Productivity Tracker Agent v1.0"""
-                    
-                    jira_client.add_comment(arguments["jira_task_id"], comment)
-                    
-                    if arguments.get("effectiveness_score") is not None:
-                        jira_client.update_ai_fields(
-                            arguments["jira_task_id"],
-                            ai_used=True,
-                            agent_name=arguments["agent_name"],
-                            efficiency_score=arguments.get("effectiveness_score"),
-                            duration_ms=duration_ms,
-                        )
-                    
-                    result = {
-                        "status": "success",
-                        "message": f"JIRA issue {arguments['jira_task_id']} updated",
+                },
+                "required": ["project_key"]
+            },
+            handler=handle_jira_get_project,
+            read_only=True
+        ),
+        ToolSpec(
+            name="jira_test_connection",
+            description="Test the JIRA API connection. Returns connection status and authenticated user information. Requires JIRA_BASE_URL, JIRA_EMAIL, and JIRA_API_TOKEN environment variables.",
+            input_schema={
+                "type": "object",
+                "properties": {}
+            },
+            handler=handle_jira_test_connection
+        ),
+        ToolSpec(
+            name="jira_add_comment",
+            description="Add a comment to a JIRA issue. Supports markdown formatting. Requires JIRA_BASE_URL, JIRA_EMAIL, and JIRA_API_TOKEN environment variables.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "issue_key": {
+                        "type": "string",
+                        "description": "JIRA issue key (e.g., 'EPA-123')"
+                    },
+                    "comment": {
+                        "type": "string",
+                        "description": "Comment text (supports markdown formatting)"
                     }
-                    return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
-                except Exception as jira_error:
-                    return [types.TextContent(type="text", text=f"JIRA Update Error: {str(jira_error)}")]
-
-            elif name == "analytics_get_config":
-                import json
-                try:
-                    analytics_agent = AnalyticsAgent()
-                    result = {
-                        "status": "success",
-                        "config": analytics_agent.config,
+                },
+                "required": ["issue_key", "comment"]
+            },
+            handler=handle_jira_add_comment
+        ),
+        ToolSpec(
+            name="jira_get_transitions",
+            description="Get available status transitions for a JIRA issue. Returns list of transitions that can be performed on the issue. Requires JIRA_BASE_URL, JIRA_EMAIL, and JIRA_API_TOKEN environment variables.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "issue_key": {
+                        "type": "string",
+                        "description": "JIRA issue key (e.g., 'EPA-123')"
                     }
-                    return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
-                except Exception as analytics_error:
-                    return [types.TextContent(type="text", text=f"Analytics Error: {str(analytics_error)}")]
-
-            elif name == "analytics_update_config":
-                import json
-                try:
-                    analytics_agent = AnalyticsAgent()
-                    for key, value in arguments.items():
-                        if key in analytics_agent.config:
-                            analytics_agent.config[key] = value
-                    
-                    result = {
-                        "status": "success",
-                        "message": "Configuration updated",
-                        "config": analytics_agent.config,
+                },
+                "required": ["issue_key"]
+            },
+            handler=handle_jira_get_transitions,
+            read_only=True
+        ),
+
+        # Pillar 3 Report Tools
+        ToolSpec(
+            name="pillar3_generate_report",
+            description="Generate a Pillar 3 status report from JIRA data. Fetches Epic/Initiative data and maps it to the Pillar 3 template format with objectives, key results, RAG status, milestones, and outcomes. Requires JIRA_BASE_URL, JIRA_EMAIL, and JIRA_API_TOKEN environment variables.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "epic_key": {
+                        "type": "string",
+                        "description": "JIRA Epic key to generate report from (e.g., 'EPA-123')"
+                    },
+                    "initiative_key": {
+                        "type": "string",
+                        "description": "JIRA Initiative key to generate report from"
+                    },
+                    "jql": {
+                        "type": "string",
+                        "description": "JQL query to fetch issues for the report"
+                    },
+                    "team_name": {
+                        "type": "string",
+                        "description": "Team/Initiative name (used with JQL)",
+                        "default": "TBD"
+                    },
+                    "output_format": {
+                        "type": "string",
+                        "description": "Output format: 'markdown', 'json', or 'pdf'",
+                        "enum": ["markdown", "json", "pdf"],
+                        "default": "markdown"
                     }
-                    return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
-                except Exception as analytics_error:
-                    return [types.TextContent(type="text", text=f"Analytics Error: {str(analytics_error)}")]
-
-            # Task Manager Agent tools
-            elif name == "task_manager_analyze":
-                import json
-                try:
-                    task_manager = TaskManagerAgent()
-                    result = task_manager.analyze_task(arguments["task_description"])
-                    return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
-                except Exception as tm_error:
-                    return [types.TextContent(type="text", text=f"Task Manager Error: {str(tm_error)}")]
-
-            elif name == "task_manager_run":
-                import json
-                try:
-                    task_manager = TaskManagerAgent()
-                    metadata = {}
-                    if arguments.get("jira_task_id"):
-                        metadata["jira_task_id"] = arguments["jira_task_id"]
-                    if arguments.get("branch_name"):
-                        metadata["branch_name"] = arguments["branch_name"]
-                    
-                    if arguments.get("parallel", False):
-                        context = task_manager.run_task_parallel(
-                            arguments["task_description"],
-                            metadata=metadata if metadata else None,
-                            verbose=False
-                        )
-                    else:
-                        context = task_manager.run_task(
-                            arguments["task_description"],
-                            metadata=metadata if metadata else None,
-                            verbose=False
-                        )
-                    result = task_manager.to_dict(context)
-                    return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
-                except Exception as tm_error:
-                    return [types.TextContent(type="text", text=f"Task Manager Error: {str(tm_error)}")]
-
-            elif name == "task_manager_status":
-                import json
-                try:
-                    task_manager = TaskManagerAgent()
-                    status = task_manager.get_status()
-                    if status:
-                        return [types.TextContent(type="text", text=json.dumps(status, indent=2))]
-                    else:
-                        return [types.TextContent(type="text", text=json.dumps({"status": "no_task", "message": "No task found"}, indent=2))]
-                except Exception as tm_error:
-                    return [types.TextContent(type="text", text=f"Task Manager Error: {str(tm_error)}")]
-
-            elif name == "task_manager_resume":
-                import json
-                try:
-                    task_manager = TaskManagerAgent()
-                    context = task_manager.resume_task(verbose=False)
-                    if context:
-                        result = task_manager.to_dict(context)
-                        return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
-                    else:
-                        return [types.TextContent(type="text", text=json.dumps({"status": "no_task", "message": "No interrupted task found"}, indent=2))]
-                except Exception as tm_error:
-                    return [types.TextContent(type="text", text=f"Task Manager Error: {str(tm_error)}")]
-
-            elif name == "task_manager_clear":
-                import json
-                try:
-                    task_manager = TaskManagerAgent()
-                    task_manager.clear_task()
-                    return [types.TextContent(type="text", text=json.dumps({"status": "success", "message": "Task context cleared"}, indent=2))]
-                except Exception as tm_error:
-                    return [types.TextContent(type="text", text=f"Task Manager Error: {str(tm_error)}")]
-
-            # Sprint AI Report Tools
-            elif name == "sprint_ai_report":
-                import json
-                try:
-                    sprint_id = arguments.get("sprint_id")
-                    board_id = arguments.get("board_id")
-                    include_commits = arguments.get("include_commits", True)
-                    output_format = arguments.get("format", "markdown")
-
-                    if not sprint_id and not board_id:
-                        return [types.TextContent(type="text", text="Error: Either sprint_id or board_id must be provided")]
-
-                    report = generate_sprint_report(
-                        sprint_id=sprint_id,
-                        board_id=board_id,
-                        include_commits=include_commits,
-                        output_format=output_format
-                    )
-                    return [types.TextContent(type="text", text=report)]
-                except Exception as report_error:
-                    return [types.TextContent(type="text", text=f"Sprint Report Error: {str(report_error)}")]
-
-            elif name == "sprint_ai_commits":
-                import json
-                try:
-                    start_date = arguments["start_date"]
-                    end_date = arguments["end_date"]
-
-                    commits = identify_ai_commits_in_range(start_date, end_date)
-                    result = {
-                        "status": "success",
-                        "count": len(commits),
-                        "commits": commits
+                },
+                "required": []
+            },
+            handler=handle_pillar3_generate_report
+        ),
+        ToolSpec(
+            name="pillar3_publish_to_confluence",
+            description="Generate a Pillar 3 report from JIRA and publish it to Confluence. Optionally also generates a PDF. Requires JIRA and Confluence credentials.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "epic_key": {
+                        "type": "string",
+                        "description": "JIRA Epic key to generate report from"
+                    },
+                    "initiative_key": {
+                        "type": "string",
+                        "description": "JIRA Initiative key to generate report from"
+                    },
+                    "jql": {
+                        "type": "string",
+                        "description": "JQL query to fetch issues for the report"
+                    },
+                    "team_name": {
+                        "type": "string",
+                        "description": "Team/Initiative name (used with JQL)",
+                        "default": "TBD"
+                    },
+                    "space_key": {
+                        "type": "string",
+                        "description": "Confluence space key to publish to"
+                    },
+                    "page_title": {
+                        "type": "string",
+                        "description": "Optional page title (defaults to report team/initiative name)"
+                    },
+                    "parent_page_id": {
+                        "type": "string",
+                        "description": "Optional parent page ID in Confluence"
+                    },
+                    "also_generate_pdf": {
+                        "type": "boolean",
+                        "description": "Also generate a PDF file (default: false)",
+                        "default": False
                     }
-                    return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
-                except Exception as commits_error:
-                    return [types.TextContent(type="text", text=f"AI Commits Error: {str(commits_error)}")]
-
-            # Confluence Publishing Tools
-            elif name == "confluence_publish_sprint_report":
-                import json
-                try:
-                    from .sprint_ai_report import generate_and_publish_sprint_report
-
-                    sprint_id = arguments.get("sprint_id")
-                    board_id = arguments.get("board_id")
-
-                    if not sprint_id and not board_id:
-                        return [types.TextContent(type="text", text="Error: Either sprint_id or board_id must be provided")]
-
-                    result = generate_and_publish_sprint_report(
-                        sprint_id=sprint_id,
-                        board_id=board_id,
-                        space_key=arguments.get("space_key"),
-                        page_title=arguments.get("page_title"),
-                        parent_page_id=arguments.get("parent_page_id"),
-                        include_commits=arguments.get("include_commits", True)
-                    )
-                    return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
-                except Exception as publish_error:
-                    return [types.TextContent(type="text", text=f"Confluence Publish Error: {str(publish_error)}")]
-
-            elif name == "confluence_publish_page":
-                import json
-                try:
-                    from .sprint_ai_report import publish_to_confluence
-
-                    result = publish_to_confluence(
-                        content=arguments["content"],
-                        space_key=arguments["space_key"],
-                        title=arguments["title"],
-                        parent_page_id=arguments.get("parent_page_id")
-                    )
-                    return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
-                except Exception as publish_error:
-                    return [types.TextContent(type="text", text=f"Confluence Publish Error: {str(publish_error)}")]
-
-            # Value Delivered Report Tools
-            elif name == "sprint_value_delivered_report":
-                import json
-                try:
-                    from .sprint_ai_report import generate_value_delivered_report
-
-                    sprint_id = arguments.get("sprint_id")
-                    board_id = arguments.get("board_id")
-
-                    if not sprint_id and not board_id:
-                        return [types.TextContent(type="text", text="Error: Either sprint_id or board_id must be provided")]
-
-                    result = generate_value_delivered_report(
-                        sprint_id=sprint_id,
-                        board_id=board_id,
-                        team_filter=arguments.get("team_filter"),
-                        include_ai_metrics=arguments.get("include_ai_metrics", True),
-                        output_format=arguments.get("format", "markdown")
-                    )
-                    return [types.TextContent(type="text", text=result)]
-                except Exception as report_error:
-                    return [types.TextContent(type="text", text=f"Value Delivered Report Error: {str(report_error)}")]
-
-            elif name == "confluence_publish_value_delivered_report":
-                import json
-                try:
-                    from .sprint_ai_report import generate_and_publish_value_delivered_report
-
-                    sprint_id = arguments.get("sprint_id")
-                    board_id = arguments.get("board_id")
-
-                    if not sprint_id and not board_id:
-                        return [types.TextContent(type="text", text="Error: Either sprint_id or board_id must be provided")]
-
-                    result = generate_and_publish_value_delivered_report(
-                        sprint_id=sprint_id,
-                        board_id=board_id,
-                        team_filter=arguments.get("team_filter"),
-                        space_key=arguments.get("space_key"),
-                        page_title=arguments.get("page_title"),
-                        parent_page_id=arguments.get("parent_page_id"),
-                        include_ai_metrics=arguments.get("include_ai_metrics", True)
-                    )
-                    return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
-                except Exception as publish_error:
-                    return [types.TextContent(type="text", text=f"Value Delivered Report Publish Error: {str(publish_error)}")]
-
-            elif name == "multi_board_value_delivered_report":
-                try:
-                    from .sprint_ai_report import generate_multi_board_value_delivered_report
-
-                    board_configs = arguments.get("board_configs", [])
-                    if not board_configs:
-                        return [types.TextContent(type="text", text="Error: board_configs is required")]
-
-                    result = generate_multi_board_value_delivered_report(
-                        board_configs=board_configs,
-                        include_ai_metrics=arguments.get("include_ai_metrics", True),
-                        include_charts=arguments.get("include_charts", True)
-                    )
-                    return [types.TextContent(type="text", text=result)]
-                except Exception as report_error:
-                    return [types.TextContent(type="text", text=f"Multi-Board Value Delivered Report Error: {str(report_error)}")]
-
-            # Delivery Report Agent Tools
-            elif name == "delivery_report_generate":
-                import json
-                try:
-                    from .delivery_report_agent import generate_delivery_report
-
-                    board_ids = arguments.get("board_ids", [])
-                    if not board_ids:
-                        return [types.TextContent(type="text", text="Error: board_ids is required")]
-
-                    result = generate_delivery_report(
-                        board_ids=board_ids,
-                        workspace_name=arguments.get("workspace_name", "Default Workspace"),
-                        project_keys=arguments.get("project_keys"),
-                        num_sprints=arguments.get("num_sprints"),
-                        start_date=arguments.get("start_date"),
-                        end_date=arguments.get("end_date"),
-                        include_ai_metrics=arguments.get("include_ai_metrics", True),
-                        output_format=arguments.get("output_format", "markdown_with_charts")
-                    )
-                    return [types.TextContent(type="text", text=result)]
-                except Exception as report_error:
-                    return [types.TextContent(type="text", text=f"Delivery Report Error: {str(report_error)}")]
-
-            elif name == "delivery_report_publish":
-                import json
-                try:
-                    from .delivery_report_agent import generate_and_publish_delivery_report
-
-                    board_ids = arguments.get("board_ids", [])
-                    if not board_ids:
-                        return [types.TextContent(type="text", text="Error: board_ids is required")]
-
-                    result = generate_and_publish_delivery_report(
-                        board_ids=board_ids,
-                        workspace_name=arguments.get("workspace_name", "Default Workspace"),
-                        project_keys=arguments.get("project_keys"),
-                        num_sprints=arguments.get("num_sprints"),
-                        start_date=arguments.get("start_date"),
-                        end_date=arguments.get("end_date"),
-                        space_key=arguments.get("space_key"),
-                        page_title=arguments.get("page_title"),
-                        parent_page_id=arguments.get("parent_page_id"),
-                        include_ai_metrics=arguments.get("include_ai_metrics", True),
-                        include_charts=arguments.get("include_charts", True)
-                    )
-                    return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
-                except Exception as publish_error:
-                    return [types.TextContent(type="text", text=f"Delivery Report Publish Error: {str(publish_error)}")]
-
-            elif name == "delivery_report_compare":
-                try:
-                    from .delivery_report_agent import generate_delivery_report_comparison
-
-                    board_configs = arguments.get("board_configs", [])
-                    if not board_configs:
-                        return [types.TextContent(type="text", text="Error: board_configs is required")]
-
-                    result = generate_delivery_report_comparison(
-                        board_configs=board_configs,
-                        num_sprints=arguments.get("num_sprints"),
-                        start_date=arguments.get("start_date"),
-                        end_date=arguments.get("end_date"),
-                        include_ai_metrics=arguments.get("include_ai_metrics", True)
-                    )
-                    return [types.TextContent(type="text", text=result)]
-                except Exception as compare_error:
-                    return [types.TextContent(type="text", text=f"Delivery Report Compare Error: {str(compare_error)}")]
-
-            elif name == "unit_test_advisor":
-                import json
-                try:
-                    from agents.unit_test_advisor import UnitTestAdvisorAgent
-                    
-                    agent = UnitTestAdvisorAgent()
-                    result = agent.run({
-                        "task_description": arguments.get("task", "Analyze and provide recommendations"),
-                        "input_data": {
-                            "files": [arguments["source_file"]] if arguments.get("source_file") else [],
-                        }
-                    })
-                    # Convert result to dict if it has to_dict method (generated agents return dataclass)
-                    if hasattr(result, "to_dict"):
-                        result = result.to_dict()
-                    return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
-                except Exception as e:
-                    return [types.TextContent(type="text", text=f"UnitTestAdvisor Agent Error: {str(e)}")]
-
-            # PR Review Agent Tools
-            elif name == "pr_review":
-                import json
-                try:
-                    from agents.pr_review_agent import PRReviewAgent, ReviewRole
-                    
-                    pr_url = arguments.get("pr_url")
-                    if not pr_url:
-                        return [types.TextContent(type="text", text="Error: pr_url is required")]
-                    
-                    role_str = arguments.get("role", "general")
-                    role_map = {
-                        "fe": ReviewRole.FRONTEND,
-                        "frontend": ReviewRole.FRONTEND,
-                        "qa": ReviewRole.QA,
-                        "platform": ReviewRole.PLATFORM,
-                        "backend": ReviewRole.BACKEND,
-                        "general": ReviewRole.GENERAL,
+                },
+                "required": ["space_key"]
+            },
+            handler=handle_pillar3_publish_to_confluence
+        ),
+        ToolSpec(
+            name="pillar3_generate_pdf",
+            description="Generate a Pillar 3 report PDF from JIRA data. Creates a professionally formatted PDF following the Pandora Pillar 3 template.",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "epic_key": {
+                        "type": "string",
+                        "description": "JIRA Epic key to generate report from"
+                    },
+                    "initiative_key": {
+                        "type": "string",
+                        "description": "JIRA Initiative key to generate report from"
+                    },
+                    "jql": {
+                        "type": "string",
+                        "description": "JQL query to fetch issues for the report"
+                    },
+                    "team_name": {
+                        "type": "string",
+                        "description": "Team/Initiative name (used with JQL)",
+                        "default": "TBD"
+                    },
+                    "output_path": {
+                        "type": "string",
+                        "description": "Path for the output PDF file (default: /tmp/pillar3_report_<team_name>.pdf)"
                     }
-                    role = role_map.get(role_str.lower(), ReviewRole.GENERAL)
-                    
-                    output_format = arguments.get("output_format", "markdown")
-                    
-                    agent = PRReviewAgent()
-                    result = agent.review_pr(pr_url, role)
-                    agent.close()
-                    
-                    if output_format == "json":
-                        return [types.TextContent(type="text", text=json.dumps(result.to_dict(), indent=2))]
-                    else:
-                        return [types.TextContent(type="text", text=result.to_markdown())]
-                except Exception as pr_error:
-                    return [types.TextContent(type="text", text=f"PR Review Agent Error: {str(pr_error)}")]
-
-            elif name == "pr_review_get_pr_data":
-                import json
-                try:
-                    from tools.azure_devops_pr_client import AzureDevOpsPRClient
-                    
-                    pr_url = arguments.get("pr_url")
-                    if not pr_url:
-                        return [types.TextContent(type="text", text="Error: pr_url is required")]
-                    
-                    include_diffs = arguments.get("include_diffs", True)
-                    include_content = arguments.get("include_content", True)
-                    
-                    client = AzureDevOpsPRClient()
-                    pr_data = client.get_pr_for_review(pr_url, include_diffs, include_content)
-                    client.close()
-                    
-                    return [types.TextContent(type="text", text=json.dumps(pr_data.to_dict(), indent=2))]
-                except Exception as pr_error:
-                    return [types.TextContent(type="text", text=f"PR Data Fetch Error: {str(pr_error)}")]
-
-            elif name == "pr_review_detect_tech_stack":
-                import json
-                try:
-                    from agents.pr_review_agent import PRReviewAgent
-                    
-                    pr_url = arguments.get("pr_url")
-                    if not pr_url:
-                        return [types.TextContent(type="text", text="Error: pr_url is required")]
-                    
-                    agent = PRReviewAgent()
-                    pr_data = agent.pr_client.get_pr_for_review(pr_url)
-                    tech_stack = agent.stack_detector.detect(pr_data.files, pr_data.diffs)
-                    agent.close()
-                    
-                    return [types.TextContent(type="text", text=json.dumps(tech_stack.to_dict(), indent=2))]
-                except Exception as pr_error:
-                    return [types.TextContent(type="text", text=f"Tech Stack Detection Error: {str(pr_error)}")]
-
-            # Technical Debt Agent Tools
-            elif name == "tech_debt_analyze":
-                import json
-                try:
-                    from agents.technical_debt_agent import TechnicalDebtAgent
-                    
-                    repo_path = arguments.get("repo_path") or os.getcwd()
-                    include_sonarcloud = arguments.get("include_sonarcloud", True)
-                    sonar_project_key = arguments.get("sonar_project_key")
-                    sonar_branch = arguments.get("sonar_branch", "main")
-                    output_format = arguments.get("output_format", "both")
-                    
-                    agent = TechnicalDebtAgent()
-                    report = agent.analyze(
-                        repo_path=repo_path,
-                        include_sonarcloud=include_sonarcloud,
-                        sonar_project_key=sonar_project_key,
-                        sonar_branch=sonar_branch,
-                        output_format=output_format
-                    )
-                    
-                    if output_format == "json":
-                        return [types.TextContent(type="text", text=json.dumps(report.to_dict(), indent=2))]
-                    elif output_format == "markdown":
-                        return [types.TextContent(type="text", text=report.to_markdown())]
-                    else:  # both
-                        result = {
-                            "json": report.to_dict(),
-                            "markdown": report.to_markdown()
-                        }
-                        return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
-                except Exception as td_error:
-                    return [types.TextContent(type="text", text=f"Technical Debt Analysis Error: {str(td_error)}")]
-
-            elif name == "tech_debt_summary":
-                try:
-                    from agents.technical_debt_agent import TechnicalDebtAgent
-                    
-                    repo_path = arguments.get("repo_path") or os.getcwd()
-                    include_sonarcloud = arguments.get("include_sonarcloud", True)
-                    
-                    agent = TechnicalDebtAgent()
-                    summary = agent.generate_summary(repo_path, include_sonarcloud=include_sonarcloud)
-                    
-                    return [types.TextContent(type="text", text=summary)]
-                except Exception as td_error:
-                    return [types.TextContent(type="text", text=f"Technical Debt Summary Error: {str(td_error)}")]
-
-            elif name == "tech_debt_register":
-                try:
-                    from agents.technical_debt_agent import TechnicalDebtAgent
-                    
-                    repo_path = arguments.get("repo_path") or os.getcwd()
-                    include_sonarcloud = arguments.get("include_sonarcloud", True)
-                    
-                    agent = TechnicalDebtAgent()
-                    register = agent.generate_register(repo_path, include_sonarcloud=include_sonarcloud)
-                    
-                    return [types.TextContent(type="text", text=register)]
-                except Exception as td_error:
-                    return [types.TextContent(type="text", text=f"Technical Debt Register Error: {str(td_error)}")]
-
-            # Jira Integration Tools
-            elif name == "jira_get_issue":
-                import json
-                try:
-                    jira_client = JiraClient()
-                    issue = jira_client.get_issue(
-                        arguments["issue_key"],
-                        arguments.get("fields")
-                    )
-                    jira_client.close()
-                    
-                    if issue:
-                        result = {
-                            "key": issue.key,
-                            "id": issue.id,
-                            "summary": issue.summary,
-                            "status": issue.status,
-                            "issue_type": issue.issue_type,
-                            "description": issue.description,
-                            "assignee": issue.assignee,
-                            "priority": issue.priority,
-                            "labels": issue.labels,
-                        }
-                        return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
-                    else:
-                        return [types.TextContent(type="text", text=f"Issue {arguments['issue_key']} not found")]
-                except Exception as jira_error:
-                    return [types.TextContent(type="text", text=f"JIRA Error: {str(jira_error)}")]
-
-            elif name == "jira_search_issues":
-                import json
-                try:
-                    jira_client = JiraClient()
-                    issues = jira_client.search_issues(
-                        arguments["jql"],
-                        arguments.get("max_results", 50),
-                        arguments.get("fields")
-                    )
-                    jira_client.close()
-                    
-                    results = []
-                    for issue in issues:
-                        results.append({
-                            "key": issue.key,
-                            "id": issue.id,
-                            "summary": issue.summary,
-                            "status": issue.status,
-                            "issue_type": issue.issue_type,
-                            "assignee": issue.assignee,
-                            "priority": issue.priority,
-                            "labels": issue.labels,
-                        })
-                    
-                    return [types.TextContent(type="text", text=json.dumps({
-                        "total": len(results),
-                        "issues": results
-                    }, indent=2))]
-                except Exception as jira_error:
-                    return [types.TextContent(type="text", text=f"JIRA Search Error: {str(jira_error)}")]
-
-            elif name == "jira_get_project":
-                import json
-                try:
-                    jira_client = JiraClient()
-                    project = jira_client.get_project(arguments["project_key"])
-                    jira_client.close()
-                    
-                    if project:
-                        return [types.TextContent(type="text", text=json.dumps(project, indent=2))]
-                    else:
-                        return [types.TextContent(type="text", text=f"Project {arguments['project_key']} not found")]
-                except Exception as jira_error:
-                    return [types.TextContent(type="text", text=f"JIRA Project Error: {str(jira_error)}")]
-
-            elif name == "jira_test_connection":
-                import json
-                try:
-                    jira_client = JiraClient()
-                    success = jira_client.test_connection()
-                    jira_client.close()
-                    
-                    if success:
-                        return [types.TextContent(type="text", text=json.dumps({
-                            "status": "connected",
-                            "message": "Successfully connected to JIRA"
-                        }, indent=2))]
-                    else:
-                        return [types.TextContent(type="text", text=json.dumps({
-                            "status": "failed",
-                            "message": "Failed to connect to JIRA. Check JIRA_BASE_URL, JIRA_EMAIL, and JIRA_API_TOKEN environment variables."
-                        }, indent=2))]
-                except Exception as jira_error:
-                    return [types.TextContent(type="text", text=f"JIRA Connection Error: {str(jira_error)}")]
-
-            elif name == "jira_add_comment":
-                import json
-                try:
-                    jira_client = JiraClient()
-                    result = jira_client.add_comment(
-                        arguments["issue_key"],
-                        arguments["comment"],
-                        add_qain_label=False  # Don't auto-add qAIn label for general comments
-                    )
-                    jira_client.close()
-                    
-                    return [types.TextContent(type="text", text=json.dumps({
-                        "status": "success",
-                        "message": f"Comment added to {arguments['issue_key']}",
-                        "comment_id": result.get("id")
-                    }, indent=2))]
-                except Exception as jira_error:
-                    return [types.TextContent(type="text", text=f"JIRA Comment Error: {str(jira_error)}")]
-
-            elif name == "jira_get_transitions":
-                import json
-                try:
-                    jira_client = JiraClient()
-                    transitions = jira_client.get_transitions(arguments["issue_key"])
-                    jira_client.close()
-                    
-                    return [types.TextContent(type="text", text=json.dumps({
-                        "issue_key": arguments["issue_key"],
-                        "transitions": transitions
-                    }, indent=2))]
-                except Exception as jira_error:
-                    return [types.TextContent(type="text", text=f"JIRA Transitions Error: {str(jira_error)}")]
-
-            # Pillar 3 Report Tools
-            elif name == "pillar3_generate_report":
-                import json
-                try:
-                    from tools.pillar3_report import generate_pillar3_report
-                    
-                    result = generate_pillar3_report(
-                        epic_key=arguments.get("epic_key"),
-                        initiative_key=arguments.get("initiative_key"),
-                        jql=arguments.get("jql"),
-                        team_name=arguments.get("team_name", "TBD"),
-                        output_format=arguments.get("output_format", "markdown")
-                    )
-                    
-                    return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
-                except Exception as pillar3_error:
-                    return [types.TextContent(type="text", text=f"Pillar 3 Report Error: {str(pillar3_error)}")]
-
-            elif name == "pillar3_publish_to_confluence":
-                import json
-                try:
-                    from tools.pillar3_report import generate_and_publish_pillar3_report
-                    
-                    result = generate_and_publish_pillar3_report(
-                        epic_key=arguments.get("epic_key"),
-                        initiative_key=arguments.get("initiative_key"),
-                        jql=arguments.get("jql"),
-                        team_name=arguments.get("team_name", "TBD"),
-                        space_key=arguments["space_key"],
-                        page_title=arguments.get("page_title"),
-                        parent_page_id=arguments.get("parent_page_id"),
-                        also_generate_pdf=arguments.get("also_generate_pdf", False)
-                    )
-                    
-                    return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
-                except Exception as pillar3_error:
-                    return [types.TextContent(type="text", text=f"Pillar 3 Confluence Error: {str(pillar3_error)}")]
-
-            elif name == "pillar3_generate_pdf":
-                import json
-                try:
-                    from tools.pillar3_report import Pillar3ReportGenerator, generate_pillar3_pdf
-                    
-                    with Pillar3ReportGenerator() as generator:
-                        epic_key = arguments.get("epic_key")
-                        initiative_key = arguments.get("initiative_key")
-                        jql = arguments.get("jql")
-                        team_name = arguments.get("team_name", "TBD")
-                        
-                        if epic_key:
-                            report = generator.generate_report_from_epic(epic_key)
-                        elif initiative_key:
-                            report = generator.generate_report_from_initiative(initiative_key)
-                        elif jql:
-                            report = generator.generate_report_from_jql(jql, team_name)
-                        else:
-                            return [types.TextContent(type="text", text="Error: Must provide epic_key, initiative_key, or jql")]
-                        
-                        output_path = arguments.get(
-                            "output_path",
-                            f"/tmp/pillar3_report_{report.team_initiative.replace(' ', '_')}.pdf"
-                        )
-                        generate_pillar3_pdf(report, output_path)
-                        
-                        return [types.TextContent(type="text", text=json.dumps({
-                            "status": "success",
-                            "pdf_path": output_path,
-                            "team_initiative": report.team_initiative,
-                            "report": report.to_dict()
-                        }, indent=2))]
-                except Exception as pillar3_error:
-                    return [types.TextContent(type="text", text=f"Pillar 3 PDF Error: {str(pillar3_error)}")]
-
-            else:
-                raise ValueError(f"Unknown tool: {name}")
+                },
+                "required": []
+            },
+            handler=handle_pillar3_generate_pdf
+        ),
+    ]
+
+    # Generated by the meta-agent into agents/unit_test_advisor; only offered when installed
+    if importlib.util.find_spec("agents.unit_test_advisor") is not None:
+        specs.append(ToolSpec(
+            name="unit_test_advisor",
+            description="Get read-only unit test recommendations from the generated Unit Test Advisor agent",
+            input_schema={
+                "type": "object",
+                "properties": {
+                    "task": {
+                        "type": "string",
+                        "description": "What to analyze (default: general recommendations)"
+                    },
+                    "source_file": {
+                        "type": "string",
+                        "description": "Source file to analyze"
+                    }
+                },
+                "required": []
+            },
+            handler=handle_unit_test_advisor
+        ))
 
-        except Exception as e:
-            return [types.TextContent(
-                type="text",
-                text=f"Error executing tool '{name}': {str(e)}"
-            )]
+    return specs
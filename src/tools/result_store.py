@@ -0,0 +1,153 @@
+"""
+Result Store
+
+Spill files for MCP tool results that exceed the response byte budget.
+
+A large result is written once to a local file and the client receives the
+first page plus a result_id and cursor; the fetch_result tool reads the
+following pages. Cursors are byte offsets into the stored UTF-8 text, and
+pages end on a line break where possible so JSON stays readable.
+"""
+
+import os
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+# Stored results older than this are deleted when new results are saved
+DEFAULT_MAX_AGE_SECONDS = 24 * 60 * 60
+
+
+class ResultStore:
+    """Directory of spilled tool results, read back one page at a time."""
+    
+    def __init__(self, directory: str, max_age: float = DEFAULT_MAX_AGE_SECONDS):
+        """
+        Initialize the result store.
+        
+        Args:
+            directory: Directory for the result files.
+            max_age: Seconds after which stored results are deleted.
+        """
+        self.directory = directory
+        self.max_age = max_age
+    
+    def save(self, text: str) -> str:
+        """
+        Store a result.
+        
+        Returns:
+            The result_id to read it back with.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        self.cleanup()
+        result_id = uuid.uuid4().hex
+        path = self._path(result_id)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(text.encode("utf-8"))
+        os.replace(temp_path, path)
+        return result_id
+    
+    def read_page(self, result_id: str, cursor: Optional[str] = None, max_bytes: int = 65536) -> Dict[str, Any]:
+        """
+        Read one page of a stored result.
+        
+        Args:
+            result_id: ID returned by save().
+            cursor: Cursor from the previous page; None for the first page.
+            max_bytes: Maximum page size in bytes.
+        
+        Returns:
+            Dict with "text", "next_cursor" (None on the last page) and
+            "total_bytes".
+        
+        Raises:
+            KeyError: If the result does not exist or has expired.
+            ValueError: If the cursor is invalid.
+        """
+        path = self._path(result_id)
+        if not os.path.exists(path):
+            raise KeyError(f"Result not found or expired: {result_id}")
+        
+        offset = int(cursor or 0)
+        total_bytes = os.path.getsize(path)
+        if offset < 0 or offset > total_bytes:
+            raise ValueError(f"Invalid cursor: {cursor}")
+        
+        with open(path, "rb") as f:
+            f.seek(offset)
+            chunk = f.read(max(max_bytes, 4))
+        
+        page, consumed = self._cut_page(chunk, at_end=offset + len(chunk) >= total_bytes)
+        next_offset = offset + consumed
+        return {
+            "text": page,
+            "next_cursor": str(next_offset) if next_offset < total_bytes else None,
+            "total_bytes": total_bytes,
+        }
+    
+    def cleanup(self) -> int:
+        """Delete results older than max_age. Returns the number deleted."""
+        if not os.path.isdir(self.directory):
+            return 0
+        
+        cutoff = time.time() - self.max_age
+        removed = 0
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    removed += 1
+            except OSError:
+                continue
+        return removed
+    
+    def _path(self, result_id: str) -> str:
+        if not result_id or not all(c in "0123456789abcdef" for c in result_id):
+            raise KeyError(f"Invalid result_id: {result_id}")
+        return os.path.join(self.directory, f"{result_id}.txt")
+    
+    @staticmethod
+    def _cut_page(chunk: bytes, at_end: bool) -> Tuple[str, int]:
+        """Trim a chunk to a late line break, or a whole UTF-8 character, and decode it."""
+        if at_end:
+            return chunk.decode("utf-8"), len(chunk)
+        
+        newline = chunk.rfind(b"\n")
+        if newline >= len(chunk) // 2:
+            end = newline + 1
+        else:
+            # Long line: cut before a partial multi-byte character, if any
+            end = len(chunk)
+            lead = end - 1
+            while lead >= 0 and (chunk[lead] & 0xC0) == 0x80:
+                lead -= 1
+            if lead >= 0 and chunk[lead] >= 0xC0:
+                length = 2 if chunk[lead] < 0xE0 else 3 if chunk[lead] < 0xF0 else 4
+                if end - lead < length:
+                    end = lead
+        return chunk[:end].decode("utf-8"), end
+
+
+def paginate(items: List[Any], cursor: Optional[str] = None, page_size: int = 500) -> Tuple[List[Any], Optional[str]]:
+    """
+    Take one page of a list.
+    
+    Args:
+        items: The full result set.
+        cursor: Cursor from the previous page; None for the first page.
+        page_size: Items per page.
+    
+    Returns:
+        The page and the cursor for the next one (None on the last page).
+    
+    Raises:
+        ValueError: If the cursor is invalid.
+    """
+    start = int(cursor or 0)
+    if start < 0 or start > len(items):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    end = start + max(page_size, 1)
+    return items[start:end], (str(end) if end < len(items) else None)
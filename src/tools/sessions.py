@@ -0,0 +1,91 @@
+"""
+Tool Sessions
+
+Per-client state for an MCP server shared by several clients.
+
+Over stdio each client has its own server process. Over HTTP one process
+serves every client, so workflow state has to be kept per MCP session:
+task manager tools called without a workflow_id act on the workflows the
+calling session started, never on another client's.
+
+The session of the call being handled is held in a context variable,
+which the registry copies onto the worker thread running the handler.
+"""
+
+import threading
+import uuid
+import weakref
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, List, Optional
+
+
+@dataclass
+class ToolSession:
+    """State kept for one MCP client session."""
+    session_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    workflow_ids: List[str] = field(default_factory=list)  # Oldest first
+    
+    @property
+    def last_workflow_id(self) -> Optional[str]:
+        """The workflow this session started most recently."""
+        return self.workflow_ids[-1] if self.workflow_ids else None
+    
+    def add_workflow(self, workflow_id: str):
+        """Record a workflow started by this session."""
+        if workflow_id in self.workflow_ids:
+            self.workflow_ids.remove(workflow_id)
+        self.workflow_ids.append(workflow_id)
+    
+    def remove_workflow(self, workflow_id: str):
+        """Forget a workflow whose context was cleared."""
+        if workflow_id in self.workflow_ids:
+            self.workflow_ids.remove(workflow_id)
+
+
+# Session of the tool call being handled; None when sessions are not isolated
+current_session: ContextVar[Optional[ToolSession]] = ContextVar("pnd_tool_session", default=None)
+
+
+class SessionTable:
+    """
+    MCP session -> ToolSession.
+    
+    Entries are dropped with the transport's session object, so a client
+    that disconnects does not leave state behind.
+    """
+    
+    def __init__(self):
+        self._sessions: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+    
+    def get(self, session: Any) -> ToolSession:
+        """Get the state for an MCP session object, creating it on first use."""
+        with self._lock:
+            state = self._sessions.get(session)
+            if state is None:
+                state = self._sessions[session] = ToolSession()
+            return state
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+
+def resolve_workflow_id(workflow_id: Optional[str]) -> Optional[str]:
+    """
+    Get the workflow a task manager tool acts on.
+    
+    An explicit workflow_id is returned as given. Without one, calls outside
+    an isolated session get None (the most recent workflow on disk) and
+    calls in a session get that session's most recent workflow.
+    
+    Raises:
+        LookupError: If the session has not started a workflow.
+    """
+    session = current_session.get()
+    if workflow_id or session is None:
+        return workflow_id
+    if session.last_workflow_id is None:
+        raise LookupError("No task started in this session")
+    return session.last_workflow_id
@@ -15,7 +15,7 @@ import logging
 import os
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 import httpx
 
@@ -487,7 +487,8 @@ class SprintAIReportGenerator:
         sprint_id: Optional[int] = None,
         board_id: Optional[int] = None,
         include_commits: bool = True,
-        output_format: str = "markdown"
+        output_format: str = "markdown",
+        on_progress: Optional[Callable[[int, int, str], None]] = None
     ) -> str:
         """
         Generate comprehensive sprint AI report.
@@ -497,11 +498,18 @@ class SprintAIReportGenerator:
             board_id: JIRA board ID (to find active sprint)
             include_commits: Whether to fetch Azure DevOps commits
             output_format: "markdown" or "json"
+            on_progress: Called as on_progress(done, total, message) as
+                         each stage starts
 
         Returns:
             Formatted report string
         """
+        def progress(done: int, message: str):
+            if on_progress:
+                on_progress(done, 4, message)
+
         # Get sprint info
+        progress(0, "Fetching sprint")
         if sprint_id:
             sprint = self.get_sprint_by_id(sprint_id)
         elif board_id:
@@ -513,6 +521,7 @@ class SprintAIReportGenerator:
             return "Sprint not found"
 
         # Get sprint issues
+        progress(1, f"Fetching issues for {sprint.name}")
         issues = self.get_sprint_issues(sprint.id)
 
         # Initialize report
@@ -538,6 +547,7 @@ class SprintAIReportGenerator:
                 report.issues_by_status.setdefault("To Do", []).append(issue.key)
 
         # Get AI commits if configured
+        progress(2, "Fetching commits")
         if include_commits and self.config.azure_pat:
             ai_commits = self.identify_ai_commits(
                 report.start_date,
@@ -586,6 +596,7 @@ class SprintAIReportGenerator:
             )
 
         # Format output
+        progress(3, "Formatting report")
         if output_format == "json":
             return json.dumps(report.to_dict(), indent=2)
         else:
@@ -700,7 +711,8 @@ def generate_sprint_report(
     sprint_id: Optional[int] = None,
     board_id: Optional[int] = None,
     include_commits: bool = True,
-    output_format: str = "markdown"
+    output_format: str = "markdown",
+    on_progress: Optional[Callable[[int, int, str], None]] = None
 ) -> str:
     """
     Generate a sprint AI report.
@@ -713,6 +725,7 @@ def generate_sprint_report(
             board_id=board_id,
             include_commits=include_commits,
             output_format=output_format,
+            on_progress=on_progress,
         )
 
 
@@ -0,0 +1,217 @@
+"""
+Tool Metrics
+
+Per-tool latency, throughput and payload metrics for the MCP server.
+
+Each tool call records the time spent queued (waiting for a concurrency
+slot or a worker thread), the time spent running, the request and response
+sizes and whether it raised. Percentiles come from a window of recent
+samples; cumulative buckets are kept for the Prometheus text format, which
+can be written to a file for node_exporter's textfile collector.
+"""
+
+import bisect
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Sequence
+
+# Histogram bucket upper bounds
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# Recent samples kept per histogram for percentiles
+DEFAULT_WINDOW = 512
+
+# Minimum seconds between Prometheus file writes
+DEFAULT_WRITE_INTERVAL = 10.0
+
+# Histograms kept per tool: name -> (buckets, Prometheus metric, help text)
+HISTOGRAMS = {
+    "queue_seconds": (SECONDS_BUCKETS, "pnd_tool_queue_seconds", "Time a tool call waited for a slot or worker thread"),
+    "run_seconds": (SECONDS_BUCKETS, "pnd_tool_run_seconds", "Time a tool handler ran"),
+    "request_bytes": (BYTES_BUCKETS, "pnd_tool_request_bytes", "Size of the tool arguments as JSON"),
+    "response_bytes": (BYTES_BUCKETS, "pnd_tool_response_bytes", "Size of the tool response text before paging"),
+}
+
+
+class Histogram:
+    """Cumulative bucket counts plus a window of recent samples."""
+    
+    def __init__(self, buckets: Sequence[float], window: int = DEFAULT_WINDOW):
+        self.buckets = tuple(buckets)
+        self.bucket_counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent: deque = deque(maxlen=window)
+    
+    def observe(self, value: float):
+        """Record one sample."""
+        self.bucket_counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        self.recent.append(value)
+    
+    def percentile(self, q: float) -> Optional[float]:
+        """Get the q-th percentile (0-100) of the recent samples."""
+        if not self.recent:
+            return None
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+    
+    def summary(self) -> Dict[str, Any]:
+        """Get count, mean, p50, p95, p99 and max."""
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": self.max if self.count else None,
+        }
+
+
+class ToolMetrics:
+    """
+    Thread-safe metrics for every tool served by a registry.
+    
+    Features:
+    - Queue and run time histograms per tool
+    - Request and response size histograms per tool
+    - Call and error counters
+    - Optional Prometheus text file, rewritten at most every write_interval seconds
+    """
+    
+    def __init__(
+        self,
+        prometheus_path: Optional[str] = None,
+        write_interval: float = DEFAULT_WRITE_INTERVAL,
+        window: int = DEFAULT_WINDOW
+    ):
+        """
+        Initialize the metrics.
+        
+        Args:
+            prometheus_path: File to write the Prometheus text format to;
+                             None to keep metrics in memory only.
+            write_interval: Minimum seconds between file writes.
+            window: Recent samples kept per histogram for percentiles.
+        """
+        self.prometheus_path = prometheus_path
+        self.write_interval = write_interval
+        self.window = window
+        self._tools: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._last_write = 0.0
+    
+    def observe_call(self, tool: str, queue_seconds: float, run_seconds: float, error: bool = False):
+        """Record the timing of one handler run."""
+        with self._lock:
+            entry = self._entry(tool)
+            entry["calls"] += 1
+            if error:
+                entry["errors"] += 1
+            entry["queue_seconds"].observe(queue_seconds)
+            entry["run_seconds"].observe(run_seconds)
+    
+    def observe_payload(self, tool: str, request_bytes: int, response_bytes: int):
+        """Record the request and response sizes of one call."""
+        with self._lock:
+            entry = self._entry(tool)
+            entry["request_bytes"].observe(request_bytes)
+            entry["response_bytes"].observe(response_bytes)
+    
+    def snapshot(self, tool: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Get per-tool summaries.
+        
+        Args:
+            tool: Only this tool; None for every tool that was called.
+        
+        Returns:
+            Dict of tool name -> {"calls", "errors", "error_rate", and a
+            summary per histogram}.
+        """
+        with self._lock:
+            names = [tool] if tool is not None else sorted(self._tools)
+            result = {}
+            for name in names:
+                entry = self._tools.get(name)
+                if entry is None:
+                    continue
+                result[name] = {
+                    "calls": entry["calls"],
+                    "errors": entry["errors"],
+                    "error_rate": entry["errors"] / entry["calls"] if entry["calls"] else 0.0,
+                    **{key: entry[key].summary() for key in HISTOGRAMS},
+                }
+            return result
+    
+    def to_prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            tools = sorted(self._tools.items())
+            for metric, key, help_text in (
+                ("pnd_tool_calls_total", "calls", "Tool handler runs"),
+                ("pnd_tool_errors_total", "errors", "Tool handler runs that raised"),
+            ):
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} counter")
+                for name, entry in tools:
+                    lines.append(f'{metric}{{tool="{name}"}} {entry[key]}')
+            
+            for key, (buckets, metric, help_text) in HISTOGRAMS.items():
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} histogram")
+                for name, entry in tools:
+                    histogram = entry[key]
+                    cumulative = 0
+                    for bound, count in zip(list(buckets) + ["+Inf"], histogram.bucket_counts):
+                        cumulative += count
+                        lines.append(f'{metric}_bucket{{tool="{name}",le="{bound}"}} {cumulative}')
+                    lines.append(f'{metric}_sum{{tool="{name}"}} {histogram.total}')
+                    lines.append(f'{metric}_count{{tool="{name}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+    
+    def write_prometheus(self, force: bool = False) -> bool:
+        """
+        Write the Prometheus file, at most every write_interval seconds.
+        
+        Args:
+            force: Write even if the interval has not passed.
+        
+        Returns:
+            True if the file was written.
+        """
+        if not self.prometheus_path:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._last_write < self.write_interval:
+                return False
+            self._last_write = now
+        
+        directory = os.path.dirname(self.prometheus_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Written to a temp file and renamed, so scrapers never read half a file
+        temp_path = f"{self.prometheus_path}.tmp"
+        with open(temp_path, "w") as f:
+            f.write(self.to_prometheus())
+        os.replace(temp_path, self.prometheus_path)
+        return True
+    
+    def _entry(self, tool: str) -> Dict[str, Any]:
+        """Get a tool's metrics, creating them on first use. Called with the lock held."""
+        entry = self._tools.get(tool)
+        if entry is None:
+            entry = self._tools[tool] = {
+                "calls": 0,
+                "errors": 0,
+                **{key: Histogram(buckets, self.window) for key, (buckets, _, _) in HISTOGRAMS.items()},
+            }
+        return entry
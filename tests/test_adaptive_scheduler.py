@@ -0,0 +1,165 @@
+"""
+Unit tests for adaptive scheduling from historical agent durations.
+"""
+
+import os
+import sys
+import threading
+from datetime import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.analytics_store import AnalyticsEvent, AnalyticsStore
+from workflows.adaptive_scheduler import AdaptiveScheduler, DurationEstimate, DurationEstimates
+from workflows.workflow_engine import AgentResult, WorkflowEngine
+
+
+def seed_history(store, durations, task_type="frontend", runs=3):
+    """Store runs successful stage_duration events per agent, with durations in seconds."""
+    now = datetime.utcnow().isoformat()
+    store.store_events([
+        AnalyticsEvent(
+            f"{agent}_{task_type}_{run}", "stage_duration", agent, now,
+            {"duration": seconds * 1000, "status": "success", "taskType": task_type}
+        )
+        for agent, seconds in durations.items()
+        for run in range(runs)
+    ])
+
+
+def estimates_for(durations):
+    return DurationEstimates({
+        agent: DurationEstimate(agent=agent, p50=seconds, p95=seconds * 2, count=5)
+        for agent, seconds in durations.items()
+    })
+
+
+@pytest.fixture
+def store(tmp_path):
+    return AnalyticsStore(log_dir=str(tmp_path / "analytics"))
+
+
+class TestAdaptiveScheduler:
+    """Tests for estimates, pool sizing and dominance warnings."""
+    
+    def test_task_type_history_overrides_other_types(self, store):
+        """Test that an agent's task type history wins over its overall history."""
+        seed_history(store, {"review": 2.0, "qa": 4.0}, task_type="backend")
+        seed_history(store, {"review": 10.0}, task_type="frontend")
+        scheduler = AdaptiveScheduler(store, min_samples=3)
+        
+        estimates = scheduler.estimates("frontend")
+        
+        assert estimates.get("review").task_type == "frontend"
+        assert estimates.expected("review") == 10.0
+        assert estimates.get("qa").task_type is None
+        # Agents without history are expected to take the median of the known agents
+        assert estimates.longest_first(["qa", "review", "unknown"]) == ["review", "unknown", "qa"]
+    
+    def test_too_few_samples_are_ignored(self, store):
+        """Test that agents below min_samples get the default estimate."""
+        seed_history(store, {"review": 10.0}, runs=2)
+        scheduler = AdaptiveScheduler(store, min_samples=3)
+        
+        assert scheduler.estimates("frontend").get("review") is None
+    
+    def test_group_workers_match_expected_parallelism(self):
+        """Test that the pool is no larger than the shortest makespan needs."""
+        scheduler = AdaptiveScheduler(max_workers=8)
+        estimates = estimates_for({"a": 10.0, "b": 5.0, "c": 4.0, "d": 1.0})
+        
+        assert scheduler.group_workers(["a", "b", "c", "d"], estimates) == 2
+        assert scheduler.group_workers(["b", "c"], estimates) == 2
+        assert scheduler.group_workers(["a", "b", "c", "d"], estimates, limit=1) == 1
+    
+    def test_dag_workers_skip_finished_stages(self):
+        """Test DAG pool sizing over the stages still to run."""
+        scheduler = AdaptiveScheduler()
+        estimates = estimates_for({"a": 5.0, "b": 5.0, "c": 5.0})
+        dependencies = {"a": [], "b": [], "c": []}
+        
+        assert scheduler.dag_workers(dependencies, estimates) == 3
+        assert scheduler.dag_workers(dependencies, estimates, done=["a"]) == 2
+    
+    def test_dominated_group_warning(self):
+        """Test that a group waiting on one slow agent is reported."""
+        scheduler = AdaptiveScheduler()
+        estimates = estimates_for({"review": 40.0, "unit_test": 2.0, "performance": 10.0, "qa": 8.0})
+        
+        warnings = scheduler.dominated_groups([["review", "unit_test"], ["performance", "qa"]], estimates)
+        
+        assert [(w["group"], w["agent"]) for w in warnings] == [(1, "review")]
+        assert "p95 80.0s" in warnings[0]["message"]
+
+
+class TestEngineAdaptiveScheduling:
+    """Tests for WorkflowEngine with the adaptive scheduler."""
+    
+    def make_engine(self, tmp_path, store, started):
+        engine = WorkflowEngine(context_dir=str(tmp_path / "contexts"))
+        engine.enable_adaptive_scheduler(store)
+        lock = threading.Lock()
+        
+        def make_handler(name):
+            def handler(context):
+                with lock:
+                    started.append(name)
+                return AgentResult(status="success", data={"agent": name})
+            return handler
+        
+        for name in ("frontend", "review", "qa", "performance"):
+            engine.register_agent(name, make_handler(name))
+        return engine
+    
+    def test_unknown_scheduler(self):
+        """Test that an unknown scheduler name is rejected."""
+        with pytest.raises(ValueError):
+            WorkflowEngine(scheduler="fastest")
+    
+    def test_parallel_group_longest_first(self, tmp_path, store):
+        """Test that a group starts its slowest agent first and records the schedule."""
+        seed_history(store, {"review": 1.0, "qa": 30.0, "performance": 2.0})
+        started = []
+        engine = self.make_engine(tmp_path, store, started)
+        context = engine.create_workflow("Build React component")
+        
+        engine.run_workflow_parallel(
+            context, parallel_groups=[["frontend"], ["review", "performance", "qa"]], max_workers=1
+        )
+        
+        assert started == ["frontend", "qa", "performance", "review"]
+        schedule = context.metadata["execution"]["schedule"]
+        assert schedule["group_workers"] == [1, 1]
+        assert schedule["warnings"][0]["agent"] == "qa"
+    
+    def test_dag_ready_stages_longest_first(self, tmp_path, store):
+        """Test that ready DAG stages are submitted by expected duration."""
+        seed_history(store, {"review": 1.0, "performance": 20.0, "qa": 5.0})
+        started = []
+        engine = self.make_engine(tmp_path, store, started)
+        context = engine.create_workflow("Build React component")
+        
+        engine.run_workflow_dag(
+            context,
+            {"frontend": [], "review": ["frontend"], "qa": ["frontend"], "performance": ["frontend"]},
+            max_workers=1
+        )
+        
+        assert started == ["frontend", "performance", "qa", "review"]
+        assert context.metadata["execution"]["max_workers"] == 1
+    
+    def test_records_stage_durations(self, tmp_path, store):
+        """Test that stage handler times are added to the history with the task type."""
+        engine = self.make_engine(tmp_path, store, [])
+        context = engine.create_workflow("Build React component")
+        
+        engine.run_workflow_parallel(context, parallel_groups=[["frontend"], ["review", "qa"]])
+        engine.shutdown()
+        
+        stats = store.get_duration_stats(days=1, task_type=context.task_type.value)
+        assert set(stats) == {"frontend", "review", "qa"}
+        # Stage timings are not task events, so task counts are unchanged
+        assert store.query_events(event_type="task_completed") == []
+        assert len(store.query_events(event_type="stage_duration")) == 3
@@ -0,0 +1,158 @@
+"""
+Unit tests for the Analytics Sink.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.analytics_sink import AnalyticsSink
+from tools.analytics_store import AnalyticsEvent, AnalyticsStore
+
+
+def make_event(n, timestamp="2024-01-15T10:00:00"):
+    """Create a numbered event."""
+    return AnalyticsEvent(
+        event_id=f"event-{n}",
+        event_type="task_started",
+        agent_name="frontend",
+        timestamp=timestamp,
+        data={"n": n},
+    )
+
+
+class CountingStore(AnalyticsStore):
+    """Store that counts batch writes and can be held up by a gate."""
+    
+    def __init__(self, log_dir, gate=None):
+        super().__init__(log_dir=log_dir)
+        self.batches = []
+        self.gate = gate
+    
+    def store_events(self, events):
+        if self.gate is not None:
+            self.gate.wait(5)
+        self.batches.append(len(events))
+        return super().store_events(events)
+
+
+def hold_writer(sink):
+    """Submit one event and wait until the writer is stuck writing it."""
+    sink.submit(make_event(0))
+    deadline = time.monotonic() + 5
+    while (sink._pending or not sink._writing) and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return CountingStore(str(tmp_path))
+
+
+class TestStoreEvents:
+    """Tests for AnalyticsStore.store_events."""
+    
+    def test_groups_by_day_and_replaces_by_id(self, store, tmp_path):
+        """Test that a batch is written per daily file and later events win."""
+        store.store_event(make_event(1))
+        updated = make_event(1)
+        updated.data = {"n": "updated"}
+        
+        stored = store.store_events([updated, make_event(2), make_event(3, "2024-01-16T10:00:00")])
+        
+        assert stored == 3
+        with open(tmp_path / "events_2024-01-15.json") as f:
+            assert [e["data"]["n"] for e in json.load(f)] == ["updated", 2]
+        with open(tmp_path / "events_2024-01-16.json") as f:
+            assert len(json.load(f)) == 1
+
+
+class TestAnalyticsSink:
+    """Tests for the background analytics writer."""
+    
+    def test_flush_group_commits(self, store):
+        """Test that queued events are written in one batch on flush."""
+        sink = AnalyticsSink(store=store, flush_interval=10)
+        for n in range(50):
+            assert sink.submit(make_event(n))
+        
+        assert sink.flush(timeout=5)
+        
+        assert store.batches == [50]
+        assert len(store.query_events("2024-01-15", "2024-01-15", limit=1000)) == 50
+        assert sink.stats()["written"] == 50
+        sink.close()
+    
+    def test_batch_size_limits_writes(self, store):
+        """Test that a full batch is written without waiting for the interval."""
+        sink = AnalyticsSink(store=store, batch_size=10, flush_interval=10)
+        for n in range(25):
+            sink.submit(make_event(n))
+        
+        assert sink.flush(timeout=5)
+        
+        assert sum(store.batches) == 25
+        assert max(store.batches) <= 10
+        sink.close()
+    
+    def test_drop_new_when_full(self, tmp_path):
+        """Test that new events are dropped while the writer is behind."""
+        gate = threading.Event()
+        sink = AnalyticsSink(store=CountingStore(str(tmp_path), gate=gate), max_queue=2, batch_size=1, flush_interval=0)
+        hold_writer(sink)
+        
+        results = [sink.submit(make_event(n)) for n in range(1, 5)]
+        gate.set()
+        sink.close()
+        
+        assert results == [True, True, False, False]
+        assert sink.stats()["dropped"] == 2
+        assert sink.stats()["written"] == 3
+    
+    def test_drop_oldest_when_full(self, tmp_path):
+        """Test that the oldest queued events make room for new ones."""
+        gate = threading.Event()
+        store = CountingStore(str(tmp_path), gate=gate)
+        sink = AnalyticsSink(store=store, max_queue=2, flush_interval=0, overflow="drop_oldest")
+        hold_writer(sink)
+        
+        results = [sink.submit(make_event(n)) for n in range(1, 5)]
+        gate.set()
+        sink.close()
+        
+        assert results == [True] * 4
+        assert sink.stats()["dropped"] == 2
+        events = store.query_events("2024-01-15", "2024-01-15")
+        assert sorted(e.event_id for e in events) == ["event-0", "event-3", "event-4"]
+    
+    def test_block_waits_for_room(self, tmp_path):
+        """Test that the block policy waits for the writer instead of dropping."""
+        store = CountingStore(str(tmp_path))
+        sink = AnalyticsSink(store=store, max_queue=2, batch_size=2, flush_interval=10, overflow="block")
+        
+        results = [sink.submit(make_event(n)) for n in range(6)]
+        sink.close()
+        
+        assert results == [True] * 6
+        assert sink.stats()["written"] == 6
+        assert sink.stats()["dropped"] == 0
+    
+    def test_closed_sink_drops_events(self, store):
+        """Test that close flushes and later events are dropped."""
+        sink = AnalyticsSink(store=store, flush_interval=10)
+        sink.submit(make_event(0))
+        
+        assert sink.close()
+        assert not sink.submit(make_event(1))
+        assert store.batches == [1]
+    
+    def test_unknown_overflow_rejected(self, store):
+        """Test that an unknown overflow policy is rejected."""
+        with pytest.raises(ValueError):
+            AnalyticsSink(store=store, overflow="spill")
@@ -266,6 +266,25 @@ class TestAnalyticsStore:
         assert "totalSizeBytes" in stats
         assert "retentionDays" in stats
     
+    def test_get_duration_stats(self, store):
+        """Test duration percentiles per agent, optionally for one task type."""
+        now = datetime.utcnow().isoformat()
+        success = {"status": "success"}
+        events = [
+            AnalyticsEvent(f"review_{i}", "stage_duration", "review", now, {**success, "duration": ms, "taskType": "frontend"})
+            for i, ms in enumerate([100, 200, 300, 400, 5000])
+        ]
+        events.append(AnalyticsEvent("review_backend", "stage_duration", "review", now, {**success, "duration": 50, "taskType": "backend"}))
+        events.append(AnalyticsEvent("review_failed", "stage_duration", "review", now, {"status": "error", "duration": 9000}))
+        # Dispatcher task events are task metrics, not stage timings
+        events.append(AnalyticsEvent("review_task", "task_completed", "review", now, {**success, "duration": 70000}))
+        store.store_events(events)
+        
+        stats = store.get_duration_stats(days=1, task_type="frontend")
+        
+        assert stats["review"] == {"count": 5, "p50": 300, "p95": 5000}
+        assert store.get_duration_stats(days=1)["review"]["count"] == 6
+    
     def test_extract_date(self, store):
         """Test _extract_date helper method."""
         timestamp = "2024-01-15T10:30:00"
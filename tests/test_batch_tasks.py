@@ -0,0 +1,127 @@
+"""
+Unit tests for batch task input, results and TaskManagerAgent.run_tasks.
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.task_manager_agent import TaskManagerAgent, read_tasks
+from agents.task_manager_agent.batch import BatchResultWriter, load_finished, to_batch_task
+from workflows.context_store import ContextStore
+from workflows.workflow_engine import AgentResult
+
+
+@pytest.fixture
+def task_manager(tmp_path):
+    """Create a task manager whose agents are replaced by a fast handler."""
+    manager = TaskManagerAgent()
+    manager.engine.context_store = ContextStore(str(tmp_path / "contexts"))
+    seen = []
+    
+    def handler(context):
+        seen.append(context["metadata"]["batch_task_id"])
+        if "broken" in context["task"]:
+            return AgentResult(status="error", error="boom")
+        return AgentResult(status="success", data={"ok": True})
+    
+    for agent_name in manager.dispatcher.list_agents():
+        manager.engine.register_agent(agent_name, handler, execution="thread")
+    manager.seen = seen
+    yield manager
+    manager.shutdown()
+
+
+def read_results(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+class TestBatchInput:
+    """Tests for reading batch tasks."""
+    
+    def test_read_jsonl(self, tmp_path):
+        """Test objects, plain strings and blank lines in JSONL input."""
+        path = tmp_path / "tasks.jsonl"
+        path.write_text(
+            '{"id": "EPA-1", "task": "Build header", "metadata": {"branch": "feature/header"}}\n'
+            '\n'
+            '"Write unit tests for Button"\n'
+        )
+        
+        tasks = list(read_tasks(str(path)))
+        
+        assert [(t.task_id, t.task_description) for t in tasks] == [
+            ("EPA-1", "Build header"),
+            ("1", "Write unit tests for Button"),
+        ]
+        assert tasks[0].metadata == {"branch": "feature/header"}
+    
+    def test_read_csv_extra_columns_become_metadata(self, tmp_path):
+        """Test CSV input with an ID column and extra columns."""
+        path = tmp_path / "tasks.csv"
+        path.write_text("ticket_id,description,branch\nEPA-7,\"Add API endpoint, with auth\",feature/api\n")
+        
+        task = next(read_tasks(str(path)))
+        
+        assert task.task_id == "EPA-7"
+        assert task.task_description == "Add API endpoint, with auth"
+        assert task.metadata == {"ticket_id": "EPA-7", "branch": "feature/api"}
+    
+    def test_missing_description_rejected(self):
+        """Test that tasks without a description are rejected."""
+        with pytest.raises(ValueError):
+            to_batch_task({"id": "EPA-1"}, 0)
+    
+    def test_load_finished_skips_torn_line(self, tmp_path):
+        """Test the resume cursor ignores a torn last line and can retry failures."""
+        path = tmp_path / "results.jsonl"
+        path.write_text(
+            '{"task_id": "a", "status": "completed"}\n'
+            '{"task_id": "b", "status": "failed"}\n'
+            '{"task_id": "c", "sta'
+        )
+        
+        assert load_finished(str(path)) == {"a", "b"}
+        assert load_finished(str(path), retry_failed=True) == {"a"}
+        
+        with BatchResultWriter(str(path)) as writer:
+            writer.write({"task_id": "d", "status": "completed"})
+        assert load_finished(str(path)) == {"a", "b", "d"}
+
+
+class TestRunTasks:
+    """Tests for TaskManagerAgent.run_tasks."""
+    
+    def test_writes_results_and_resumes(self, task_manager, tmp_path):
+        """Test that a rerun skips tasks that already have results."""
+        output = str(tmp_path / "results.jsonl")
+        tasks = [{"id": f"T-{i}", "task": f"Build component {i}"} for i in range(5)]
+        
+        first = task_manager.run_tasks(tasks[:2], output_path=output, max_concurrent_jobs=2, verbose=False)
+        assert first == {"output": output, "completed": 2, "failed": 0, "skipped": 0}
+        
+        task_manager.seen.clear()
+        second = task_manager.run_tasks(tasks, output_path=output, max_concurrent_jobs=2, verbose=False)
+        
+        assert second == {"output": output, "completed": 3, "failed": 0, "skipped": 2}
+        assert set(task_manager.seen) == {"T-2", "T-3", "T-4"}
+        records = read_results(output)
+        assert sorted(r["task_id"] for r in records) == [f"T-{i}" for i in range(5)]
+        assert all(r["workflow_id"] and "trace" not in r["result"] for r in records)
+    
+    def test_retry_failed(self, task_manager, tmp_path):
+        """Test that failed tasks are only re-run when asked."""
+        output = str(tmp_path / "results.jsonl")
+        tasks = ["Build header", "Build broken footer"]
+        
+        summary = task_manager.run_tasks(tasks, output_path=output, verbose=False)
+        assert (summary["completed"], summary["failed"]) == (1, 1)
+        
+        assert task_manager.run_tasks(tasks, output_path=output, verbose=False)["skipped"] == 2
+        retried = task_manager.run_tasks(tasks, output_path=output, retry_failed=True, verbose=False)
+        assert (retried["skipped"], retried["failed"]) == (1, 1)
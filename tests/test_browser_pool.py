@@ -0,0 +1,147 @@
+"""
+Unit tests for the broken experience detector's browser pool.
+
+The pool is exercised with in-memory browser doubles, so these tests do
+not need Playwright or Chromium.
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.broken_experience_detector_agent.browser_pool import BrowserPool
+
+
+class FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+        self.closed = False
+    
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+        self.closed = False
+        self.contexts = []
+    
+    def is_connected(self):
+        return self.connected and not self.closed
+    
+    async def new_context(self, **options):
+        context = FakeContext(self)
+        self.contexts.append(context)
+        return context
+    
+    async def close(self):
+        self.closed = True
+
+
+class FakeChromium:
+    def __init__(self):
+        self.browsers = []
+    
+    async def launch(self, **options):
+        browser = FakeBrowser()
+        self.browsers.append(browser)
+        return browser
+
+
+class FakePlaywright:
+    def __init__(self):
+        self.chromium = FakeChromium()
+        self.stopped = False
+    
+    async def stop(self):
+        self.stopped = True
+
+
+def make_pool(**kwargs):
+    """Create a pool that launches fake browsers."""
+    pool = BrowserPool(**kwargs)
+    pool._playwright = FakePlaywright()
+    return pool
+
+
+class TestBrowserPool:
+    """Tests for BrowserPool."""
+    
+    def test_browser_is_reused_across_scans(self):
+        """Test that consecutive scans share one browser with fresh contexts."""
+        async def scenario():
+            pool = make_pool()
+            first = await pool.acquire_context()
+            await pool.release_context(first)
+            second = await pool.acquire_context()
+            await pool.release_context(second)
+            return pool, first, second
+        
+        pool, first, second = asyncio.run(scenario())
+        
+        assert first is not second
+        assert first.closed and second.closed
+        assert first.browser is second.browser
+        assert pool.stats()["launches"] == 1
+    
+    def test_browser_recycled_after_max_scans(self):
+        """Test that a browser is closed once its last scan finishes, and replaced."""
+        async def scenario():
+            pool = make_pool(max_scans_per_browser=2)
+            first = await pool.acquire_context()
+            second = await pool.acquire_context()
+            assert not first.browser.closed
+            await pool.release_context(first)
+            assert not first.browser.closed
+            await pool.release_context(second)
+            third = await pool.acquire_context()
+            await pool.release_context(third)
+            return pool, first, third
+        
+        pool, first, third = asyncio.run(scenario())
+        
+        assert first.browser.closed
+        assert third.browser is not first.browser
+        assert pool.stats()["launches"] == 2
+    
+    def test_relaunch_after_crash(self):
+        """Test that a disconnected browser is replaced on the next scan."""
+        async def scenario():
+            pool = make_pool()
+            first = await pool.acquire_context()
+            first.browser.connected = False
+            await pool.release_context(first)
+            second = await pool.acquire_context()
+            await pool.release_context(second)
+            await pool.close()
+            return pool, first, second
+        
+        pool, first, second = asyncio.run(scenario())
+        
+        assert second.browser is not first.browser
+        assert second.browser.closed
+        assert pool.stats()["launches"] == 2
+    
+    def test_contexts_are_bounded(self):
+        """Test that scans beyond max_contexts wait for a free context."""
+        async def scenario():
+            pool = make_pool(max_contexts=1)
+            first = await pool.acquire_context()
+            waiter = asyncio.create_task(pool.acquire_context())
+            await asyncio.sleep(0.01)
+            assert not waiter.done()
+            await pool.release_context(first)
+            second = await asyncio.wait_for(waiter, 1)
+            await pool.close()
+            return pool, second
+        
+        pool, second = asyncio.run(scenario())
+        
+        assert second.closed
+        with pytest.raises(RuntimeError):
+            asyncio.run(pool.acquire_context())
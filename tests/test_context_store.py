@@ -0,0 +1,315 @@
+"""
+Unit tests for the journaled Context Store.
+"""
+
+import json
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from workflows.blob_store import BlobStore, is_blob_ref
+from workflows.context_store import ContextStore
+from workflows.workflow_engine import TaskType, WorkflowContext
+
+
+def make_context(workflow_id="wf1"):
+    """Build a small workflow context."""
+    return WorkflowContext(
+        workflow_id=workflow_id,
+        task_description="Build React component",
+        task_type=TaskType.FRONTEND,
+        pipeline=["frontend", "review"],
+        metadata={"ticket": "EPA-1"},
+    )
+
+
+def read_journal(store, workflow_id="wf1"):
+    """Read the journal records for a workflow."""
+    with open(store.journal_path(workflow_id)) as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Create a store under a temp dir."""
+    return ContextStore(str(tmp_path / "contexts"), compact_every=3)
+
+
+class TestContextStore:
+    """Tests for ContextStore."""
+    
+    def test_first_save_writes_snapshot(self, store):
+        """Test that the first checkpoint is a full snapshot."""
+        store.save(make_context())
+        
+        records = read_journal(store)
+        assert [r["op"] for r in records] == ["snapshot"]
+    
+    def test_update_only_contains_changes(self, store):
+        """Test that a checkpoint appends only the changed stage and trace events."""
+        context = make_context()
+        store.save(context)
+        
+        context.stages["frontend"].status = "completed"
+        context.stages["frontend"].output_data = {"files": ["Button.tsx"]}
+        context.add_trace_event("frontend", "execute", "success")
+        store.save(context)
+        
+        update = read_journal(store)[-1]
+        assert update["op"] == "update"
+        assert list(update["stages"]) == ["frontend"]
+        assert len(update["trace"]) == 1
+        assert "workflow" not in update
+    
+    def test_unchanged_save_appends_nothing(self, store):
+        """Test that saving an unchanged context does not grow the journal."""
+        context = make_context()
+        store.save(context)
+        store.save(context)
+        
+        assert len(read_journal(store)) == 1
+    
+    def test_replay_recovers_latest_state(self, store, tmp_path):
+        """Test that a fresh store replays snapshot plus updates."""
+        context = make_context()
+        store.save(context)
+        context.status = "running"
+        context.current_agent = "frontend"
+        context.stages["frontend"].output_data = {"files": ["Button.tsx"]}
+        context.add_trace_event("frontend", "execute", "success")
+        store.save(context)
+        context.metadata["pr_number"] = 12
+        store.save(context)
+        
+        loaded = ContextStore(store.root_dir).load("wf1")
+        
+        assert loaded.to_dict() == context.to_dict()
+    
+    def test_reassigned_metadata_is_journaled(self, tmp_path):
+        """Test that metadata replaced several times between saves is never lost to id reuse."""
+        store = ContextStore(str(tmp_path / "contexts"), compact_every=1000)
+        context = make_context()
+        store.save(context)
+        for idx in range(50):
+            # Like the result cache stats, replaced once per lookup
+            context.metadata["result_cache"] = {"hits": idx, "misses": 0}
+            context.metadata["result_cache"] = {"hits": idx, "misses": 1}
+            store.save(context)
+            assert ContextStore(store.root_dir).load("wf1").metadata["result_cache"] == {"hits": idx, "misses": 1}
+        
+        context.metadata["result_cache"]["misses"] = 2
+        store.save(context)
+        assert ContextStore(store.root_dir).load("wf1").metadata["result_cache"]["misses"] == 2
+    
+    def test_failed_write_is_retried(self, store, tmp_path, monkeypatch):
+        """Test that changes from a checkpoint that failed to write go into the next one."""
+        context = make_context()
+        store.save(context)
+        journal_path = store.journal_path
+        context.stages["frontend"].status = "completed"
+        context.metadata["pr_number"] = 12
+        
+        monkeypatch.setattr(store, "journal_path", lambda workflow_id: str(tmp_path))
+        with pytest.raises(OSError):
+            store.save(context)
+        monkeypatch.setattr(store, "journal_path", journal_path)
+        store.save(context)
+        
+        loaded = ContextStore(store.root_dir).load("wf1")
+        assert loaded.stages["frontend"].status == "completed"
+        assert loaded.metadata["pr_number"] == 12
+    
+    def test_compaction(self, store):
+        """Test that the journal is compacted after compact_every updates and on completion."""
+        context = make_context()
+        store.save(context)
+        for idx in range(3):
+            context.add_trace_event("frontend", "execute", f"step{idx}")
+            store.save(context)
+        assert len(read_journal(store)) == 4
+        
+        context.add_trace_event("frontend", "execute", "step3")
+        store.save(context)
+        assert len(read_journal(store)) == 1
+        
+        context.add_trace_event("review", "execute", "success")
+        store.save(context)
+        context.status = "completed"
+        store.save(context)
+        
+        records = read_journal(store)
+        assert [r["op"] for r in records] == ["snapshot"]
+        assert store.load("wf1").to_dict() == context.to_dict()
+    
+    def test_torn_write_is_ignored(self, store):
+        """Test that a partially written last record does not break recovery."""
+        context = make_context()
+        store.save(context)
+        with open(store.journal_path("wf1"), "a") as f:
+            f.write('{"op": "update", "workflow": {"status": "fa')
+        
+        assert store.load("wf1").status == "pending"
+    
+    def test_workflows_are_isolated(self, store):
+        """Test that concurrent workflows keep separate journals."""
+        first = make_context("wf1")
+        second = make_context("wf2")
+        store.save(first)
+        time.sleep(0.01)
+        store.save(second)
+        second.status = "failed"
+        store.save(second)
+        
+        assert store.load("wf1").status == "pending"
+        assert store.load().workflow_id == "wf2"
+        assert sorted(store.list_workflows()) == ["wf1", "wf2"]
+        
+        store.delete("wf2")
+        assert store.list_workflows() == ["wf1"]
+        store.delete()
+        assert store.load() is None
+
+
+class TestBlobStore:
+    """Tests for blob references in stage payloads."""
+    
+    def test_shared_output_written_once(self, store):
+        """Test that an output passed on to later stages is journaled by reference."""
+        figma_tree = {"nodes": [{"id": f"node-{i}", "name": "Frame " * 20} for i in range(200)]}
+        context = make_context()
+        context.stages["frontend"].output_data = figma_tree
+        context.stages["review"].input_data = {
+            "task": context.task_description,
+            "previous_output": figma_tree,
+            "all_outputs": {"frontend": figma_tree},
+        }
+        store.save(context)
+        
+        with open(store.journal_path("wf1")) as f:
+            journal_bytes = len(f.read())
+        stages = read_journal(store)[0]["context"]["stages"]
+        
+        assert is_blob_ref(stages["frontend"]["output_data"]["nodes"])
+        assert stages["review"]["input_data"]["previous_output"] == stages["frontend"]["output_data"]
+        assert stages["review"]["input_data"]["all_outputs"]["frontend"] == stages["frontend"]["output_data"]
+        assert journal_bytes < len(json.dumps(figma_tree))
+        
+        loaded = ContextStore(store.root_dir).load("wf1")
+        
+        assert loaded.to_dict() == context.to_dict()
+        assert loaded.stages["review"].input_data["previous_output"]["nodes"] is loaded.stages["frontend"].output_data["nodes"]
+    
+    def test_stored_output_not_hashed_again(self, store, monkeypatch):
+        """Test that later stages holding a stored output reuse its encoding."""
+        figma_tree = {"nodes": [{"id": f"node-{i}", "name": "Frame " * 20} for i in range(200)]}
+        context = make_context()
+        context.stages["frontend"].output_data = figma_tree
+        store.save(context)
+        
+        writes = []
+        write = store.blob_store._write
+        monkeypatch.setattr(store.blob_store, "_write", lambda encoded, value: writes.append(value) or write(encoded, value))
+        context.stages["review"].input_data = {
+            "previous_output": figma_tree,
+            "all_outputs": {"frontend": figma_tree},
+        }
+        store.save(context)
+        
+        stage = read_journal(store)[-1]["stages"]["review"]
+        assert writes == []
+        assert is_blob_ref(stage["input_data"]["previous_output"]["nodes"])
+        assert ContextStore(store.root_dir).load("wf1").to_dict() == context.to_dict()
+    
+    def test_reassigned_output_is_rehashed(self, store):
+        """Test that an output edited in place is stored again once unpinned or compacted."""
+        output = {"status": "done", "payload": "x" * 10000}
+        context = make_context()
+        context.stages["frontend"].output_data = output
+        store.save(context)
+        
+        context.stages["frontend"].output_data = {"status": "redone", "payload": "y" * 10000}
+        store.save(context)
+        output["status"] = "edited"
+        context.stages["review"].input_data = {"previous_output": output}
+        store.save(context)
+        
+        assert ContextStore(store.root_dir).load("wf1").stages["review"].input_data["previous_output"] == output
+        
+        context.stages["frontend"].output_data["status"] = "edited again"
+        store.compact_every = 1
+        store.save(context)
+        
+        assert ContextStore(store.root_dir).load("wf1").to_dict() == context.to_dict()
+    
+    def test_small_values_stay_inline(self, tmp_path):
+        """Test that values under the threshold are not turned into blobs."""
+        blobs = BlobStore(str(tmp_path), min_blob_bytes=1024)
+        value = {"files": ["Button.tsx"], "nested": {"big": "x" * 2000}}
+        
+        encoded = blobs.encode(value)
+        
+        assert encoded["files"] == ["Button.tsx"]
+        assert is_blob_ref(encoded["nested"])
+        assert blobs.decode(encoded) == value
+    
+    def test_evicted_blobs_reload_from_disk(self, tmp_path):
+        """Test that values dropped from memory are read back from their files."""
+        blobs = BlobStore(str(tmp_path), min_blob_bytes=100, max_memory_bytes=500)
+        values = [{"payload": str(i) * 300} for i in range(3)]
+        refs = [blobs.encode(value) for value in values]
+        
+        fresh = BlobStore(str(tmp_path))
+        
+        assert [blobs.decode(ref) for ref in refs] == values
+        assert [fresh.decode(ref) for ref in refs] == values
+        with pytest.raises(KeyError):
+            fresh.get("0" * 64)
+    
+    def test_changed_container_gets_new_blob(self, tmp_path):
+        """Test that a container grown in place is stored again, not by its old reference."""
+        blobs = BlobStore(str(tmp_path), min_blob_bytes=100)
+        all_outputs = {"frontend": "x" * 200}
+        first = blobs.encode(all_outputs)
+        all_outputs["review"] = "y" * 200
+        second = blobs.encode(all_outputs)
+        
+        assert first != second
+        assert BlobStore(str(tmp_path)).decode(second) == all_outputs
+    
+    def test_same_length_edit_gets_new_blob(self, tmp_path):
+        """Test that an in-place edit keeping the container's length is stored again."""
+        blobs = BlobStore(str(tmp_path), min_blob_bytes=100)
+        output = {"status": "done", "payload": "x" * 200}
+        first = blobs.encode(output)
+        output["status"] = "pending"
+        second = blobs.encode(output)
+        
+        assert first != second
+        assert BlobStore(str(tmp_path)).decode(second) == output
+        assert blobs.decode(first)["status"] == "done"
+    
+    def test_edited_decoded_value_is_dropped_from_memory(self, tmp_path):
+        """Test that a loaded value edited in place no longer answers for its old blob."""
+        ref = BlobStore(str(tmp_path), min_blob_bytes=100).encode({"status": "done", "payload": "x" * 200})
+        blobs = BlobStore(str(tmp_path), min_blob_bytes=100)
+        loaded = blobs.decode(ref)
+        loaded["status"] = "pending"
+        
+        assert blobs.encode(loaded) != ref
+        assert blobs.decode(ref)["status"] == "done"
+        assert blobs.decode(ref) is not loaded
+    
+    def test_delete_all_removes_blobs(self, store):
+        """Test that clearing every workflow also clears the blob store."""
+        context = make_context()
+        context.stages["frontend"].output_data = {"diff": "+" * 10000}
+        store.save(context)
+        assert os.listdir(store.blob_store.root_dir)
+        
+        store.delete()
+        
+        assert not os.path.exists(store.blob_store.root_dir)
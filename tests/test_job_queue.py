@@ -0,0 +1,203 @@
+"""
+Unit tests for the workflow job queue and agent pool.
+"""
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.task_manager_agent import TaskManagerAgent, WorkflowJobQueue
+from tools.agent_pool import AgentPool, get_agent_pool, shutdown_agent_pool
+from workflows.context_store import ContextStore
+from workflows.workflow_engine import AgentResult
+
+
+class InFlightCounter:
+    """Handler factory that records peak concurrency per agent."""
+    
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.active = {}
+        self.peak = {}
+    
+    def handler(self, context):
+        name = context["agent_name"]
+        with self.lock:
+            self.active[name] = self.active.get(name, 0) + 1
+            self.peak[name] = max(self.peak.get(name, 0), self.active[name])
+        time.sleep(self.delay)
+        with self.lock:
+            self.active[name] -= 1
+        return AgentResult(status="success", data={"job_id": context["metadata"]["job_id"]})
+
+
+@pytest.fixture
+def task_manager(tmp_path):
+    """Create a task manager whose agents are replaced by fast thread handlers."""
+    manager = TaskManagerAgent()
+    manager.engine.context_store = ContextStore(str(tmp_path / "contexts"))
+    yield manager
+    manager.shutdown()
+
+
+def register_counter(manager, counter):
+    """Register the counter's handler for every dispatcher agent."""
+    for agent_name in manager.dispatcher.list_agents():
+        manager.engine.register_agent(agent_name, counter.handler, execution="thread")
+
+
+class TestWorkflowJobQueue:
+    """Tests for WorkflowJobQueue."""
+    
+    def test_jobs_run_concurrently_with_isolated_contexts(self, task_manager):
+        """Test that each job gets its own workflow and results."""
+        counter = InFlightCounter()
+        register_counter(task_manager, counter)
+        
+        with WorkflowJobQueue(task_manager, max_concurrent_jobs=4) as queue:
+            jobs = queue.submit_many([
+                {"task_description": "Build React component", "metadata": {"ticket": f"EPA-{idx}"}}
+                for idx in range(6)
+            ])
+            queue.wait()
+        
+        assert [job.status for job in jobs] == ["completed"] * 6
+        assert len({job.workflow_id for job in jobs}) == 6
+        assert counter.peak["frontend"] > 1
+        for job in jobs:
+            assert job.context.stages["review"].output_data["job_id"] == job.job_id
+            stored = task_manager.engine.load_context(job.workflow_id)
+            assert stored.metadata["ticket"] == job.metadata["ticket"]
+        assert queue.summary() == {"total": 6, "by_status": {"completed": 6}}
+    
+    def test_per_agent_limit(self, task_manager):
+        """Test that an agent limit holds across all jobs."""
+        counter = InFlightCounter()
+        register_counter(task_manager, counter)
+        
+        with WorkflowJobQueue(task_manager, max_concurrent_jobs=4, agent_limits={"review": 1}) as queue:
+            queue.submit_many([{"task_description": "Build React component"} for _ in range(4)])
+            queue.wait()
+        
+        assert counter.peak["review"] == 1
+        assert counter.peak["frontend"] > 1
+    
+    def test_cancel_queued_job(self, task_manager):
+        """Test that jobs which have not started can be cancelled."""
+        counter = InFlightCounter(delay=0.1)
+        register_counter(task_manager, counter)
+        
+        with WorkflowJobQueue(task_manager, max_concurrent_jobs=1) as queue:
+            first = queue.submit("Build React component")
+            second = queue.submit("Build React component")
+            assert queue.cancel(second.job_id)
+            queue.wait([first.job_id])
+        
+        assert first.status == "completed"
+        assert queue.get_status(second.job_id)["status"] == "cancelled"
+    
+    def test_shutdown_closes_only_own_task_manager(self, task_manager, monkeypatch):
+        """Test that a queue shuts down the task manager it created, not a shared one."""
+        closed = []
+        monkeypatch.setattr(TaskManagerAgent, "shutdown", lambda self, wait=True: closed.append(self))
+        
+        with WorkflowJobQueue(task_manager):
+            pass
+        with WorkflowJobQueue() as queue:
+            pass
+        
+        assert closed == [queue.task_manager]
+
+
+class TestAgentPool:
+    """Tests for AgentPool."""
+    
+    def test_instances_are_reused_exclusively(self):
+        """Test that a released instance is reused but never leased twice at once."""
+        pool = AgentPool()
+        
+        with pool.lease("figma", object) as first:
+            with pool.lease("figma", object) as second:
+                assert first is not second
+        with pool.lease("figma", object) as third:
+            assert third in (first, second)
+        
+        assert pool.stats()["created"] == 2
+        assert pool.stats()["reused"] == 1
+    
+    def test_close_closes_idle_instances(self):
+        """Test that close() releases pooled resources."""
+        closed = []
+        
+        class Closable:
+            def close(self):
+                closed.append(self)
+        
+        pool = AgentPool(max_idle_per_key=1)
+        first = pool.acquire("sonar", Closable)
+        second = pool.acquire("sonar", Closable)
+        pool.release("sonar", first)
+        pool.release("sonar", second)
+        assert closed == [second]
+        
+        pool.close()
+        assert closed == [second, first]
+    
+    def test_idle_instances_are_evicted(self):
+        """Test that instances idle past idle_timeout are closed by the reaper."""
+        closed = []
+        
+        class Closable:
+            def close(self):
+                closed.append(self)
+        
+        pool = AgentPool(idle_timeout=0.05)
+        agent = pool.acquire("jira", Closable)
+        pool.release("jira", agent)
+        
+        deadline = time.monotonic() + 5
+        while not closed and time.monotonic() < deadline:
+            time.sleep(0.01)
+        pool.close()
+        
+        assert closed == [agent]
+        assert pool.stats()["evicted"] == 1
+        assert pool.stats()["idle"] == {}
+    
+    def test_expired_instances_are_not_reused(self):
+        """Test that an instance past its max_age is replaced on the next lease."""
+        pool = AgentPool(idle_timeout=None)
+        
+        with pool.lease("commerce", object, max_age=0) as first:
+            pass
+        with pool.lease("commerce", object, max_age=60) as second:
+            pass
+        with pool.lease("commerce", object) as third:
+            pass
+        
+        assert second is not first
+        assert third is second
+        assert pool.stats()["evicted"] == 1
+    
+    def test_shutdown_agent_pool(self):
+        """Test that the process-wide pool closes its agents on shutdown."""
+        closed = []
+        
+        class Closable:
+            def close(self):
+                closed.append(self)
+        
+        pool = get_agent_pool()
+        with pool.lease("test-shutdown", Closable) as agent:
+            pass
+        shutdown_agent_pool()
+        
+        assert closed == [agent]
+        assert get_agent_pool() is not pool
+        shutdown_agent_pool()
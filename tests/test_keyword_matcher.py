@@ -0,0 +1,104 @@
+"""
+Unit tests for the keyword matcher and task type detection.
+"""
+
+import json
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from workflows.keyword_matcher import KeywordMatcher
+from workflows.workflow_engine import TASK_KEYWORDS, TaskType, WorkflowEngine
+
+
+RULES_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "workflows", "workflow_rules.json"
+)
+
+
+def naive_detect(description, keywords):
+    """Reference implementation: one substring check per keyword."""
+    description = description.lower()
+    if "figma.com" in description:
+        return TaskType.FIGMA
+    
+    best, best_score = TaskType.DEFAULT, 0
+    for task_type in TaskType:
+        score = len({kw.lower() for kw in keywords.get(task_type, []) if kw.lower() in description})
+        if score > best_score:
+            best, best_score = task_type, score
+    return best
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    """Create an engine with the default keywords."""
+    monkeypatch.setattr(WorkflowEngine, "CONTEXT_DIR", str(tmp_path / "contexts"))
+    return WorkflowEngine()
+
+
+class TestKeywordMatcher:
+    """Tests for KeywordMatcher."""
+    
+    def test_finds_overlapping_and_prefix_keywords(self):
+        """Test that keywords inside or overlapping other matches are all found."""
+        matcher = KeywordMatcher({"a": ["unit test", "unit tests", "test coverage", "coverage"]})
+        
+        assert matcher.find("Unit Test Coverage") == {"unit test", "test coverage", "coverage"}
+        assert matcher.find("write unit tests") == {"unit test", "unit tests"}
+    
+    def test_count_distinct_keywords_per_label(self):
+        """Test that a keyword shared by labels counts once for each label."""
+        matcher = KeywordMatcher({"sonar": ["sonar", "code quality"], "review": ["code quality", "lint"]})
+        
+        assert matcher.count("sonar code quality, code quality again") == {"sonar": 2, "review": 1}
+    
+    def test_escapes_regex_characters(self):
+        """Test keywords containing regex metacharacters."""
+        matcher = KeywordMatcher({"a": ["100% coverage", "next.js", "figma.com"]})
+        
+        assert matcher.find("next.js app on figma.com with 100% coverage") == {"100% coverage", "next.js", "figma.com"}
+        assert matcher.find("nextxjs") == set()
+    
+    def test_empty_matcher(self):
+        """Test a matcher without keywords."""
+        assert KeywordMatcher({}).find("anything") == set()
+
+
+class TestDetectTaskType:
+    """Tests for WorkflowEngine task type detection."""
+    
+    def test_matches_naive_detection(self, engine):
+        """Test the compiled matcher agrees with per-keyword substring checks."""
+        words = [kw for kws in TASK_KEYWORDS.values() for kw in kws] + ["the", "page", "fix", "header"]
+        rng = random.Random(7)
+        descriptions = [" ".join(rng.choice(words) for _ in range(rng.randint(1, 20))) for _ in range(500)]
+        
+        assert engine.detect_task_types(descriptions) == [naive_detect(d, TASK_KEYWORDS) for d in descriptions]
+    
+    def test_figma_url_wins(self, engine):
+        """Test that Figma URLs take priority over keyword scores."""
+        assert engine.detect_task_type("Review lint standards https://www.figma.com/file/abc") == TaskType.FIGMA
+    
+    def test_repeated_descriptions_are_cached(self, engine):
+        """Test that repeated descriptions are served from the LRU cache."""
+        engine.detect_task_types(["Generate unit tests"] * 3)
+        
+        info = engine._detect_task_type_cached.cache_info()
+        assert info.misses == 1
+        assert info.hits == 2
+    
+    def test_keywords_loaded_from_rules(self):
+        """Test that the rules file keywords replace the defaults."""
+        with open(RULES_FILE) as f:
+            rule_keywords = json.load(f)["keywords"]
+        keywords = {TaskType(name): kws for name, kws in rule_keywords.items() if name in {t.value for t in TaskType}}
+        engine = WorkflowEngine(rules_file=RULES_FILE)
+        
+        description = "Add playwright testing for checkout"
+        assert engine.detect_task_type(description) == naive_detect(description, keywords) == TaskType.QA
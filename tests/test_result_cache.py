@@ -0,0 +1,173 @@
+"""
+Unit tests for the agent result cache.
+"""
+
+import contextlib
+import os
+import subprocess
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from workflows.agent_dispatcher import AgentDispatcher
+from workflows.result_cache import ResultCache, git_revision, stable_hash
+from workflows.workflow_engine import AgentResult, WorkflowEngine
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """Create a git repository with one commit."""
+    repo_root = tmp_path / "repo"
+    repo_root.mkdir()
+    (repo_root / "Button.tsx").write_text("export const Button = () => null;\n")
+    git = ["git", "-c", "user.name=Test", "-c", "user.email=test@example.com"]
+    subprocess.run(git + ["init", "-q"], cwd=repo_root, check=True)
+    subprocess.run(git + ["add", "."], cwd=repo_root, check=True)
+    subprocess.run(git + ["commit", "-q", "-m", "init"], cwd=repo_root, check=True)
+    return repo_root
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    """Create an engine with the result cache enabled under a temp dir."""
+    monkeypatch.setattr(WorkflowEngine, "CONTEXT_DIR", str(tmp_path / "contexts"))
+    engine = WorkflowEngine()
+    engine.enable_result_cache(str(tmp_path / "cache"), agents=["sonar"])
+    return engine
+
+
+class TestResultCache:
+    """Tests for ResultCache."""
+    
+    def test_stable_hash_ignores_key_order(self):
+        """Test that dict ordering does not change the hash."""
+        assert stable_hash({"a": 1, "b": [1, 2]}) == stable_hash({"b": [1, 2], "a": 1})
+    
+    def test_put_and_get(self, tmp_path):
+        """Test a round trip through the disk cache."""
+        cache = ResultCache(str(tmp_path / "cache"))
+        cache.put("ab" * 32, "sonar", AgentResult(status="success", data={"issues": []}, next="review"))
+        
+        result = ResultCache(str(tmp_path / "cache")).get("ab" * 32)
+        
+        assert result.data == {"issues": []}
+        assert result.next == "review"
+        assert cache.get("cd" * 32) is None
+    
+    def test_lru_eviction(self, tmp_path):
+        """Test that the least recently used entry is evicted first."""
+        cache = ResultCache(str(tmp_path / "cache"), max_bytes=700)
+        payload = {"blob": "x" * 100}
+        cache.put("a" * 64, "sonar", AgentResult(status="success", data=payload))
+        cache.put("b" * 64, "sonar", AgentResult(status="success", data=payload))
+        cache.get("a" * 64)
+        cache.put("c" * 64, "sonar", AgentResult(status="success", data=payload))
+        
+        assert cache.get("b" * 64) is None
+        assert cache.get("a" * 64) is not None
+        assert cache.stats()["evictions"] == 1
+        assert cache.stats()["bytes"] <= 700
+    
+    def test_git_revision_tracks_working_tree(self, repo, tmp_path):
+        """Test that the revision changes with uncommitted edits."""
+        clean = git_revision(str(repo))
+        (repo / "Button.tsx").write_text("export const Button = () => 'changed';\n")
+        
+        assert clean and "+dirty." not in clean
+        assert git_revision(str(repo)).startswith(clean + "+dirty.")
+        assert git_revision(str(tmp_path)) is None
+
+
+class TestEngineResultCache:
+    """Tests for result caching in WorkflowEngine."""
+    
+    def test_rerun_hits_cache(self, engine, repo):
+        """Test that re-running a stage with unchanged inputs skips the handler."""
+        calls = []
+        
+        def handler(context):
+            calls.append(context["input"]["files"])
+            return AgentResult(status="success", data={"issues": 0})
+        
+        engine.register_agent("sonar", handler)
+        input_data = {"files": ["Button.tsx"]}
+        
+        first = engine.create_workflow("Run sonar checks", {"repo_root": str(repo)})
+        engine.execute_agent("sonar", first, input_data)
+        second = engine.create_workflow("Run sonar checks", {"repo_root": str(repo)})
+        result = engine.execute_agent("sonar", second, input_data)
+        
+        assert len(calls) == 1
+        assert result.data == {"issues": 0}
+        assert first.metadata["trace"][-1]["status"] == "miss"
+        assert second.metadata["trace"][-1]["status"] == "hit"
+        assert second.metadata["result_cache"] == {"hits": 1, "misses": 0}
+    
+    def test_changes_invalidate(self, engine, repo):
+        """Test that new input or a changed working tree misses the cache."""
+        calls = []
+        
+        def handler(context):
+            calls.append(1)
+            return AgentResult(status="success", data={})
+        
+        engine.register_agent("sonar", handler)
+        context = engine.create_workflow("Run sonar checks", {"repo_root": str(repo)})
+        
+        engine.execute_agent("sonar", context, {"files": ["Button.tsx"]})
+        engine.execute_agent("sonar", context, {"files": ["Card.tsx"]})
+        (repo / "Button.tsx").write_text("export const Button = () => 'changed';\n")
+        engine.execute_agent("sonar", context, {"files": ["Button.tsx"]})
+        
+        assert len(calls) == 3
+    
+    def test_uncacheable_results_are_not_stored(self, engine, repo):
+        """Test that errors and results marked uncacheable are re-executed."""
+        calls = []
+        
+        def handler(context):
+            calls.append(1)
+            return AgentResult(status="success", data={}, cacheable=False)
+        
+        engine.register_agent("sonar", handler)
+        engine.register_agent("frontend", handler)
+        context = engine.create_workflow("Run sonar checks", {"repo_root": str(repo)})
+        
+        for _ in range(2):
+            engine.execute_agent("sonar", context, {})
+            engine.execute_agent("frontend", context, {})
+        
+        assert len(calls) == 4
+
+
+class FakeDebtAgent:
+    """Stands in for TechnicalDebtAgent without scanning a repository."""
+    
+    def analyze(self, repo_path, include_sonarcloud=True):
+        return SimpleNamespace(status="success", error=None, to_dict=lambda: {}, to_markdown=lambda: "")
+    
+    def generate_summary(self, repo_path, include_sonarcloud=True):
+        return "summary"
+    
+    def generate_register(self, repo_path, include_sonarcloud=True):
+        return "register"
+
+
+class TestDispatcherCacheability:
+    """Tests for which dispatcher results may be served from the result cache."""
+    
+    @pytest.mark.parametrize("task", ["Analyze technical debt", "Debt summary for leadership", "Debt register"])
+    def test_technical_debt_with_sonarcloud_is_not_cacheable(self, task, monkeypatch, tmp_path):
+        """Test that debt results with live SonarCloud data are never cached."""
+        dispatcher = AgentDispatcher()
+        monkeypatch.setattr(dispatcher, "_lease_agent", lambda key, factory: contextlib.nullcontext(FakeDebtAgent()))
+        
+        def run(input_data):
+            return dispatcher._technical_debt_handler({"task": task, "input": {"repo_path": str(tmp_path), **input_data}})
+        
+        assert run({}).cacheable is False
+        assert run({"include_sonarcloud": True}).cacheable is False
+        assert run({"include_sonarcloud": False}).cacheable is True
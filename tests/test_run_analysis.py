@@ -0,0 +1,164 @@
+"""
+Unit tests for workflow run analysis.
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from workflows.run_analysis import analyze_run, simulate_dag, simulate_groups, stage_timeline
+from workflows.workflow_engine import AgentResult, TaskType, WorkflowContext, WorkflowEngine, WorkflowStage
+
+START = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def make_context(times, execution):
+    """Build a finished context from {agent: (start, end)} offsets in seconds."""
+    context = WorkflowContext(
+        workflow_id="wf-analysis",
+        task_description="Build React component",
+        task_type=TaskType.FRONTEND,
+        pipeline=list(times),
+        started_at=START.isoformat(),
+        status="completed",
+        metadata={"execution": execution},
+    )
+    for agent, (start, end) in times.items():
+        stage = context.stages[agent]
+        stage.status = "completed"
+        stage.started_at = (START + timedelta(seconds=start)).isoformat()
+        stage.completed_at = (START + timedelta(seconds=end)).isoformat()
+    return context
+
+
+class TestSimulation:
+    """Tests for the schedule simulations behind the what-if report."""
+    
+    def test_groups_run_one_after_another(self):
+        """Test that group wall times add up, each set by its slowest stage."""
+        durations = {"a": 10, "b": 5, "c": 2}
+        
+        assert simulate_groups([["a", "b"], ["c"]], durations, workers=4) == 12
+        assert simulate_groups([["a", "b"], ["c"]], durations, workers=1) == 17
+    
+    def test_dag_starts_stages_when_dependencies_finish(self):
+        """Test that a stage waits only for its own dependencies."""
+        durations = {"a": 10, "b": 1, "c": 1}
+        dependencies = {"a": [], "b": [], "c": ["b"]}
+        
+        assert simulate_dag(dependencies, durations, workers=2) == 10
+        assert simulate_dag(dependencies, durations, workers=1) == 12
+
+
+class TestAnalyzeRun:
+    """Tests for the critical-path report."""
+    
+    def test_timeline_is_relative_to_workflow_start(self):
+        """Test that stage times are seconds from the workflow start."""
+        context = make_context({"frontend": (1, 4)}, {"mode": "sequential"})
+        context.stages["review"] = WorkflowStage(agent_name="review")
+        
+        timeline = stage_timeline(context)
+        
+        assert [(t.agent, t.start, t.end) for t in timeline] == [("frontend", 1.0, 4.0)]
+    
+    def test_parallel_groups_report(self):
+        """Test the critical path, group idle time and utilization of a parallel run."""
+        # Group 2 waits 40s for review while unit_test finishes in 1s
+        context = make_context(
+            {
+                "frontend": (0, 10),
+                "unit_test": (10, 11),
+                "review": (10, 50),
+                "sonar": (50, 55),
+            },
+            {
+                "mode": "parallel",
+                "parallel_groups": [["frontend"], ["unit_test", "review"], ["sonar"]],
+                "max_workers": 4,
+            },
+        )
+        
+        report = analyze_run(context)
+        
+        assert report["wall_seconds"] == 55
+        assert report["critical_path"]["agents"] == ["frontend", "review", "sonar"]
+        group = report["groups"][1]
+        assert group["group"] == 2
+        assert group["slowest"] == "review"
+        assert group["idle_seconds"] == 39
+        assert report["utilization"]["workers"] == 4
+        assert report["utilization"]["peak_concurrency"] == 2
+        assert report["utilization"]["busy_seconds"] == 56
+        assert report["what_if"][0]["kind"] == "speedup"
+        assert report["what_if"][0]["description"] == "making `review` 2x faster saves 20.0s"
+    
+    def test_group_move_respects_dependencies(self):
+        """Test that a move is suggested only when dependencies allow it."""
+        # lint does not need frontend, so it can join group 1 and overlap it
+        times = {"frontend": (0, 30), "lint": (30, 50), "review": (50, 55)}
+        execution = {
+            "mode": "parallel",
+            "parallel_groups": [["frontend"], ["lint"], ["review"]],
+            "max_workers": 2,
+        }
+        context = make_context(times, execution)
+        
+        report = analyze_run(context, dependencies={"frontend": [], "lint": [], "review": ["frontend", "lint"]})
+        moves = {what_if["description"]: what_if for what_if in report["what_if"] if what_if["kind"] == "move"}
+        assert "moving `lint` from group 2 to group 1 saves 20.0s" in moves
+        assert all(what_if["dependency_checked"] for what_if in moves.values())
+        
+        report = analyze_run(context, dependencies={"frontend": [], "lint": ["frontend"], "review": ["lint"]})
+        assert not [what_if for what_if in report["what_if"] if what_if["kind"] == "move"]
+    
+    def test_dag_critical_path_records_waits(self):
+        """Test that the critical path follows the latest-finishing dependency."""
+        context = make_context(
+            {"figma": (0, 5), "frontend": (6, 20), "performance": (6, 8), "review": (21, 30)},
+            {
+                "mode": "dag",
+                "dependencies": {
+                    "figma": [], "frontend": ["figma"],
+                    "performance": ["figma"], "review": ["frontend", "performance"],
+                },
+                "max_workers": 4,
+            },
+        )
+        
+        report = analyze_run(context)
+        
+        assert report["critical_path"]["agents"] == ["figma", "frontend", "review"]
+        assert [stage["wait_seconds"] for stage in report["critical_path"]["stages"]] == [0.0, 1.0, 1.0]
+        assert report["simulated_seconds"] == 28
+        assert report["groups"] == []
+
+
+class TestEngineAnalyzeRun:
+    """Tests for WorkflowEngine.analyze_run."""
+    
+    def test_analyzes_saved_parallel_run(self, tmp_path):
+        """Test that a parallel run records its workers and can be analyzed from the store."""
+        engine = WorkflowEngine(context_dir=str(tmp_path))
+        for name in ("frontend", "review", "qa"):
+            engine.register_agent(name, lambda input_data: AgentResult(status="success"))
+        context = engine.create_workflow("Build React component")
+        
+        engine.run_workflow_parallel(context, parallel_groups=[["frontend"], ["review", "qa"]], max_workers=3)
+        report = engine.analyze_run(context.workflow_id)
+        
+        assert report["workflow_id"] == context.workflow_id
+        assert report["utilization"]["workers"] == 3
+        assert [group["agents"] for group in report["groups"]][0] == ["frontend"]
+        assert report["critical_path"]["agents"][0] == "frontend"
+    
+    def test_unknown_workflow(self, tmp_path):
+        """Test that analyzing a missing workflow raises KeyError."""
+        engine = WorkflowEngine(context_dir=str(tmp_path))
+        
+        with pytest.raises(KeyError):
+            engine.analyze_run("missing")
@@ -0,0 +1,643 @@
+"""
+Unit tests and startup benchmark for the MCP tool registry.
+
+Tool schemas are declared statically and agent modules are imported on the
+first call_tool that needs them, so importing the registry must not pull in
+any agent or workflow module. Each startup check runs in a fresh
+interpreter, since this test session has already imported most of the tree.
+"""
+
+import asyncio
+import json
+import os
+import subprocess
+import threading
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mcp import types
+
+from tools import registry as tool_registry
+from tools.registry import ToolProgress, ToolRegistry, ToolSpec, builtin_tool_specs, register_tools
+from tools.result_store import ResultStore, paginate
+from tools.sessions import ToolSession, current_session, resolve_workflow_id
+from tools.tool_metrics import Histogram, ToolMetrics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Generous ceiling on top of the MCP SDK import, to catch an eager agent import
+# without failing on a slow CI machine
+STARTUP_BUDGET_SECONDS = 5.0
+
+STARTUP_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "modules": sorted(m for m in sys.modules if m.split(".")[0] in ("agents", "workflows")),
+}}))
+"""
+
+
+def measure_import(module):
+    """Import a module in a fresh interpreter and report the time and heavy modules loaded."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [os.path.join(ROOT, "src"), ROOT] + ([env["PYTHONPATH"]] if env.get("PYTHONPATH") else [])
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", STARTUP_SCRIPT.format(module=module)],
+        env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+class TestRegistryStartup:
+    """Tests for MCP server cold start cost."""
+    
+    def test_registry_import_does_not_load_agents(self):
+        """Test that importing the tool registry imports no agent or workflow modules."""
+        result = measure_import("tools.registry")
+        
+        assert result["modules"] == []
+        assert result["seconds"] < STARTUP_BUDGET_SECONDS
+    
+    def test_tools_package_import_is_lightweight(self):
+        """Test that importing the tools package defers the registry and sprint report."""
+        result = measure_import("tools")
+        
+        assert result["modules"] == []
+        assert result["seconds"] < STARTUP_BUDGET_SECONDS
+    
+    def test_agents_package_exports_are_lazy(self):
+        """Test that importing one agent does not import its siblings."""
+        result = measure_import("agents.qa_agent")
+        
+        assert result["modules"] == ["agents", "agents.qa_agent", "agents.qa_agent.agent"]
+    
+    def test_lazy_exports_resolve(self):
+        """Test that the package-level re-exports still resolve."""
+        import agents
+        import tools
+        
+        assert agents.QAAgent.__name__ == "QAAgent"
+        assert "TaskManagerAgent" in dir(agents)
+        assert callable(tools.generate_sprint_report)
+
+
+class FakeServer:
+    """Captures the handlers register_tools installs with the MCP decorators."""
+    
+    def __init__(self):
+        self.handlers = {}
+    
+    def list_tools(self):
+        return self._capture("list_tools")
+    
+    def call_tool(self):
+        return self._capture("call_tool")
+    
+    def _capture(self, kind):
+        def decorator(func):
+            self.handlers[kind] = func
+            return func
+        return decorator
+
+
+def text_spec(name, text="ok"):
+    """Create a spec whose handler echoes a fixed text."""
+    return ToolSpec(
+        name=name,
+        description=f"{name} tool",
+        input_schema={"type": "object", "properties": {}},
+        handler=lambda arguments: [types.TextContent(type="text", text=text)]
+    )
+
+
+class TestToolRegistry:
+    """Tests for ToolRegistry dispatch and the cached Tool list."""
+    
+    def test_builtin_specs_are_unique(self):
+        """Test that every built-in tool has one spec with a handler."""
+        specs = builtin_tool_specs()
+        names = [spec.name for spec in specs]
+        
+        assert len(names) == len(set(names))
+        assert "fs_read_file" in names and "jira_get_issue" in names
+        assert all(callable(spec.handler) for spec in specs)
+        assert [spec.name for spec in specs if spec.is_async] == ["broken_experience_detector_scan_site"]
+    
+    def test_dispatch_sync_and_async(self):
+        """Test that sync handlers are called and async handlers awaited."""
+        registry = ToolRegistry()
+        registry.register(text_spec("sync_tool", "sync"))
+        
+        async def async_handler(arguments):
+            return [types.TextContent(type="text", text=arguments["value"])]
+        
+        registry.register(ToolSpec("async_tool", "", {"type": "object"}, async_handler))
+        
+        assert asyncio.run(registry.call("sync_tool", {}))[0].text == "sync"
+        assert asyncio.run(registry.call("async_tool", {"value": "async"}))[0].text == "async"
+        with pytest.raises(ValueError, match="Unknown tool"):
+            asyncio.run(registry.call("missing", {}))
+    
+    def test_tool_list_cached_until_changed(self):
+        """Test that the Tool list is reused and rebuilt after registration."""
+        registry = ToolRegistry()
+        registry.register(text_spec("a"))
+        
+        tools = registry.list_tools()
+        assert registry.list_tools() is tools
+        
+        registry.register(text_spec("b"))
+        assert [tool.name for tool in registry.list_tools()] == ["a", "b"]
+        assert registry.unregister("a")
+        assert [tool.name for tool in registry.list_tools()] == ["b"]
+    
+    def test_duplicate_names_rejected(self):
+        """Test that a name can only be replaced explicitly."""
+        registry = ToolRegistry()
+        registry.register(text_spec("a", "first"))
+        
+        with pytest.raises(ValueError):
+            registry.register(text_spec("a", "second"))
+        registry.register(text_spec("a", "second"), replace=True)
+        assert asyncio.run(registry.call("a", {}))[0].text == "second"
+    
+    def test_register_tools_applies_tool_packs(self, monkeypatch):
+        """Test that tool packs are served next to the built-in tools."""
+        monkeypatch.setattr(tool_registry, "_TOOL_PACKS", [])
+        
+        @tool_registry.register_tool_pack
+        def pack(registry):
+            registry.register(text_spec("pack_tool", "from pack"))
+        
+        server = FakeServer()
+        registry = register_tools(server)
+        tools = asyncio.run(server.handlers["list_tools"]())
+        
+        assert "pack_tool" in registry
+        assert [tool.name for tool in tools] == registry.names()
+        assert asyncio.run(server.handlers["call_tool"]("pack_tool", {}))[0].text == "from pack"
+        error = asyncio.run(server.handlers["call_tool"]("missing", {}))[0].text
+        assert error == "Error executing tool 'missing': Unknown tool: missing"
+
+
+class TestToolConcurrency:
+    """Tests for worker pools, per-tool limits and queue depth."""
+    
+    def blocking_spec(self, name, release, **kwargs):
+        """Create a spec whose sync handler blocks until release is set."""
+        def handler(arguments):
+            assert release.wait(5)
+            return [types.TextContent(type="text", text=threading.current_thread().name)]
+        return ToolSpec(name, "", {"type": "object"}, handler, **kwargs)
+    
+    def test_sync_handlers_run_off_the_event_loop(self):
+        """Test that blocking sync calls overlap and leave the loop free."""
+        release = threading.Event()
+        registry = ToolRegistry(io_workers=4)
+        registry.register(self.blocking_spec("slow", release))
+        
+        async def scenario():
+            calls = [asyncio.create_task(registry.call("slow", {})) for _ in range(3)]
+            while registry.stats()["pools"]["io"]["running"] < 3:
+                await asyncio.sleep(0.01)
+            release.set()
+            return await asyncio.gather(*calls)
+        
+        results = asyncio.run(scenario())
+        registry.shutdown()
+        
+        assert all(result[0].text.startswith("mcp-tool-io") for result in results)
+    
+    def test_max_concurrency_and_queue_depth(self):
+        """Test that calls over a tool's limit wait and are counted as queued."""
+        release = threading.Event()
+        registry = ToolRegistry(cpu_workers=1)
+        registry.register(self.blocking_spec("limited", release, max_concurrency=1))
+        registry.register(self.blocking_spec("cpu_bound", release, pool="cpu"))
+        
+        async def scenario():
+            calls = [asyncio.create_task(registry.call(name, {})) for name in ("limited", "limited", "cpu_bound", "cpu_bound")]
+            while registry.queue_depth() < 2:
+                await asyncio.sleep(0.01)
+            stats = registry.stats()
+            release.set()
+            await asyncio.gather(*calls)
+            return stats
+        
+        stats = asyncio.run(scenario())
+        registry.shutdown()
+        
+        assert stats["queue_depth"] == 2
+        assert stats["tools"]["limited"] == {"waiting": 1, "active": 1, "max_concurrency": 1}
+        assert stats["pools"]["cpu"] == {"workers": 1, "queued": 1, "running": 1}
+        assert registry.queue_depth() == 0
+    
+    def test_invalid_pool_rejected(self):
+        """Test that specs must name a known worker pool."""
+        with pytest.raises(ValueError):
+            ToolSpec("bad", "", {}, lambda arguments: [], pool="gpu")
+
+
+class TestCoalescing:
+    """Tests for sharing identical read-only calls."""
+    
+    def counting_spec(self, name, release, calls, **kwargs):
+        """Create a read-only spec that counts its runs and blocks until release is set."""
+        def handler(arguments):
+            calls.append(arguments)
+            run = len(calls)
+            assert release.wait(5)
+            if arguments.get("fail"):
+                raise RuntimeError("upstream down")
+            return [types.TextContent(type="text", text=f"run {run}")]
+        return ToolSpec(name, "", {"type": "object"}, handler, read_only=True, **kwargs)
+    
+    def test_identical_calls_share_one_run(self):
+        """Test that duplicates in flight share a run and other arguments do not."""
+        release = threading.Event()
+        calls = []
+        registry = ToolRegistry()
+        registry.register(self.counting_spec("jira_get_issue", release, calls))
+        
+        async def scenario():
+            tasks = [
+                asyncio.create_task(registry.call("jira_get_issue", {"issue_key": "EPA-1", "fields": ["a", "b"]})),
+                asyncio.create_task(registry.call("jira_get_issue", {"fields": ["a", "b"], "issue_key": "EPA-1"})),
+                asyncio.create_task(registry.call("jira_get_issue", {"issue_key": "EPA-2"})),
+            ]
+            while len(calls) < 2:
+                await asyncio.sleep(0.01)
+            release.set()
+            return [result[0].text for result in await asyncio.gather(*tasks)]
+        
+        texts = asyncio.run(scenario())
+        
+        assert len(calls) == 2
+        assert texts[0] == texts[1]
+        assert texts[2] != texts[0]
+        assert registry.stats()["coalesced"] == 1
+        asyncio.run(registry.call("jira_get_issue", {"issue_key": "EPA-1", "fields": ["a", "b"]}))
+        assert len(calls) == 3
+    
+    def test_cache_ttl(self):
+        """Test that completed results are reused within the TTL only."""
+        release = threading.Event()
+        release.set()
+        calls = []
+        registry = ToolRegistry()
+        registry.register(self.counting_spec("figma_read", release, calls, cache_ttl=60))
+        
+        first = asyncio.run(registry.call("figma_read", {"url": "x"}))
+        second = asyncio.run(registry.call("figma_read", {"url": "x"}))
+        
+        assert len(calls) == 1
+        assert [item.text for item in second] == [item.text for item in first]
+        assert registry.stats()["cache_hits"] == 1
+        
+        registry.register(self.counting_spec("figma_read", release, calls, cache_ttl=60), replace=True)
+        asyncio.run(registry.call("figma_read", {"url": "x"}))
+        assert len(calls) == 2
+    
+    def test_errors_shared_but_not_cached(self):
+        """Test that a failed run fails every waiting caller and is not cached."""
+        release = threading.Event()
+        calls = []
+        registry = ToolRegistry(read_cache_ttl=60)
+        registry.register(self.counting_spec("sonar_get_issues", release, calls))
+        
+        async def scenario():
+            tasks = [asyncio.create_task(registry.call("sonar_get_issues", {"fail": True})) for _ in range(2)]
+            while not calls:
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.01)
+            release.set()
+            return await asyncio.gather(*tasks, return_exceptions=True)
+        
+        results = asyncio.run(scenario())
+        
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert len(calls) == 1
+        with pytest.raises(RuntimeError):
+            asyncio.run(registry.call("sonar_get_issues", {"fail": True}))
+        assert len(calls) == 2
+    
+    def test_cache_ttl_requires_read_only(self):
+        """Test that only read-only tools can cache results."""
+        with pytest.raises(ValueError):
+            ToolSpec("write", "", {}, lambda arguments: [], cache_ttl=5)
+
+
+class FakeSession:
+    """Stands in for an MCP ServerSession."""
+
+
+class SessionServer(FakeServer):
+    """FakeServer whose current request belongs to a switchable client session."""
+    
+    def __init__(self):
+        super().__init__()
+        self.session = None
+    
+    @property
+    def request_context(self):
+        return SimpleNamespace(session=self.session, meta=None)
+
+
+class TestSessions:
+    """Tests for per-session workflow state on a shared server."""
+    
+    def session_pack(self, registry):
+        """Register tools that start and look up workflows like the task manager tools."""
+        def start(arguments):
+            current_session.get().add_workflow(arguments["workflow_id"])
+            return [types.TextContent(type="text", text=threading.current_thread().name)]
+        
+        def status(arguments):
+            try:
+                workflow_id = resolve_workflow_id(arguments.get("workflow_id"))
+            except LookupError:
+                workflow_id = "no_task"
+            return [types.TextContent(type="text", text=str(workflow_id))]
+        
+        registry.register(ToolSpec("start", "", {"type": "object"}, start))
+        registry.register(ToolSpec("status", "", {"type": "object"}, status))
+    
+    def test_workflows_isolated_per_session(self, monkeypatch):
+        """Test that each client only sees the workflows it started."""
+        monkeypatch.setattr(tool_registry, "_TOOL_PACKS", [self.session_pack])
+        server = SessionServer()
+        register_tools(server, isolate_sessions=True)
+        call = server.handlers["call_tool"]
+        alice, bob = FakeSession(), FakeSession()
+        
+        server.session = alice
+        thread = asyncio.run(call("start", {"workflow_id": "wf-alice"}))[0].text
+        assert thread.startswith("mcp-tool-io")
+        assert asyncio.run(call("status", {}))[0].text == "wf-alice"
+        
+        server.session = bob
+        assert asyncio.run(call("status", {}))[0].text == "no_task"
+        assert asyncio.run(call("status", {"workflow_id": "wf-alice"}))[0].text == "wf-alice"
+        asyncio.run(call("start", {"workflow_id": "wf-bob"}))
+        assert asyncio.run(call("status", {}))[0].text == "wf-bob"
+        
+        server.session = alice
+        assert asyncio.run(call("status", {}))[0].text == "wf-alice"
+    
+    def test_without_isolation_latest_workflow_is_used(self):
+        """Test that stdio servers keep the most-recent-workflow default."""
+        assert current_session.get() is None
+        assert resolve_workflow_id(None) is None
+        assert resolve_workflow_id("wf-1") == "wf-1"
+    
+    def test_session_workflow_order(self):
+        """Test that the most recently started workflow is the default."""
+        session = ToolSession()
+        session.add_workflow("a")
+        session.add_workflow("b")
+        session.add_workflow("a")
+        session.remove_workflow("a")
+        
+        assert session.workflow_ids == ["b"]
+        assert session.last_workflow_id == "b"
+    
+    def test_http_app_routes(self):
+        """Test that the HTTP app serves streamable HTTP and SSE."""
+        from mcp.server import Server
+        from pnd_agents.server import create_http_app
+        
+        app = create_http_app(Server(name="pnd-agents-test"))
+        
+        assert [route.path for route in app.routes] == ["/mcp", "/sse", "/messages"]
+
+
+class FakeTaskManager:
+    """Stands in for TaskManagerAgent, recording instances and shutdowns."""
+    
+    created = []
+    
+    def __init__(self, use_result_cache=False):
+        self.use_result_cache = use_result_cache
+        self.closed = False
+        self.created.append(self)
+    
+    def analyze_task(self, task_description):
+        return {"task": task_description}
+    
+    def get_status(self, workflow_id=None):
+        return None
+    
+    def shutdown(self, wait=True):
+        self.closed = True
+
+
+class TestTaskManagerTools:
+    """Tests for the TaskManagerAgent shared by the task_manager_* tools."""
+    
+    def test_one_task_manager_per_server(self, monkeypatch):
+        """Test that calls share one task manager, shut down with the server."""
+        import agents.task_manager_agent as task_manager_module
+        
+        monkeypatch.setattr(task_manager_module, "TaskManagerAgent", FakeTaskManager)
+        monkeypatch.setattr(FakeTaskManager, "created", [])
+        monkeypatch.setattr(tool_registry, "_task_managers", {})
+        registry = ToolRegistry()
+        registry.register_all(builtin_tool_specs())
+        
+        for _ in range(2):
+            asyncio.run(registry.call("task_manager_analyze", {"task_description": "Build a carousel"}))
+            asyncio.run(registry.call("task_manager_status", {}))
+        registry.shutdown()
+        
+        assert len(FakeTaskManager.created) == 1
+        assert tool_registry.get_task_manager() is FakeTaskManager.created[0]
+        tool_registry.shutdown_task_managers()
+        assert FakeTaskManager.created[0].closed
+        assert tool_registry.get_task_manager() is not FakeTaskManager.created[0]
+        tool_registry.shutdown_task_managers()
+
+
+class TestLargeResults:
+    """Tests for the response byte budget, fetch_result and progress."""
+    
+    def test_large_result_spilled_and_paged(self, tmp_path):
+        """Test that an oversized response is returned in pages that reassemble it."""
+        registry = ToolRegistry(max_result_bytes=200, results_dir=str(tmp_path))
+        lines = [f"line {i} \u00e9\u00e8" for i in range(100)]
+        registry.register(text_spec("big", "\n".join(lines)))
+        registry.register(tool_registry.fetch_result_spec(registry))
+        
+        first = asyncio.run(registry.call("big", {}))
+        footer = json.loads(first[1].text)
+        pages = [first[0].text]
+        while footer["next_cursor"]:
+            page = asyncio.run(registry.call("fetch_result", {
+                "result_id": footer["result_id"],
+                "cursor": footer["next_cursor"],
+            }))
+            assert len(page[0].text.encode("utf-8")) <= 200
+            pages.append(page[0].text)
+            footer = json.loads(page[1].text)
+        
+        assert "".join(pages) == "\n".join(lines)
+        assert footer["total_bytes"] == len("\n".join(lines).encode("utf-8"))
+        assert asyncio.run(registry.call("big", {})) != first
+    
+    def test_small_result_unchanged(self, tmp_path):
+        """Test that responses within the budget are returned as they are."""
+        registry = ToolRegistry(max_result_bytes=200, results_dir=str(tmp_path))
+        registry.register(text_spec("small", "ok"))
+        
+        assert [item.text for item in asyncio.run(registry.call("small", {}))] == ["ok"]
+        assert os.listdir(tmp_path) == []
+    
+    def test_progress_passed_to_handler(self):
+        """Test that progress=True handlers get the caller's reporter, or a no-op."""
+        sent = []
+        
+        async def send(progress, total, message):
+            sent.append((progress, total, message))
+        
+        def handler(arguments, progress):
+            progress(1, 2, "Halfway")
+            return [types.TextContent(type="text", text=str(progress.enabled))]
+        
+        registry = ToolRegistry()
+        registry.register(ToolSpec("staged", "", {"type": "object"}, handler, progress=True))
+        
+        async def scenario():
+            result = await registry.call("staged", {}, progress=ToolProgress(send, asyncio.get_running_loop()))
+            await asyncio.sleep(0.01)
+            return result
+        
+        assert asyncio.run(scenario())[0].text == "True"
+        assert sent == [(1, 2, "Halfway")]
+        assert asyncio.run(registry.call("staged", {}))[0].text == "False"
+    
+    def test_invalid_result_id_and_cursor(self, tmp_path):
+        """Test that unknown results and bad cursors are rejected."""
+        store = ResultStore(str(tmp_path))
+        result_id = store.save("abc")
+        
+        assert store.read_page(result_id) == {"text": "abc", "next_cursor": None, "total_bytes": 3}
+        with pytest.raises(KeyError):
+            store.read_page("../etc/passwd")
+        with pytest.raises(ValueError):
+            store.read_page(result_id, cursor="10")
+    
+    def test_paginate(self):
+        """Test list pagination cursors."""
+        items = list(range(5))
+        
+        assert paginate(items, None, 2) == ([0, 1], "2")
+        assert paginate(items, "4", 2) == ([4], None)
+        with pytest.raises(ValueError):
+            paginate(items, "9", 2)
+
+
+class TestToolMetrics:
+    """Tests for per-tool timing, payload and error metrics."""
+    
+    def test_calls_timed_and_counted(self, tmp_path):
+        """Test that queue time, run time, sizes and errors are recorded per tool."""
+        release = threading.Event()
+        metrics_file = str(tmp_path / "metrics" / "pnd_tools.prom")
+        registry = ToolRegistry(metrics_file=metrics_file)
+        
+        def slow(arguments):
+            assert release.wait(5)
+            return [types.TextContent(type="text", text="x" * 1000)]
+        
+        async def failing(arguments):
+            raise RuntimeError("boom")
+        
+        registry.register(ToolSpec("slow", "", {"type": "object"}, slow, max_concurrency=1))
+        registry.register(ToolSpec("failing", "", {"type": "object"}, failing))
+        
+        async def scenario():
+            calls = [asyncio.create_task(registry.call("slow", {"n": i})) for i in range(2)]
+            await asyncio.sleep(0.05)
+            release.set()
+            await asyncio.gather(*calls)
+            with pytest.raises(RuntimeError):
+                await registry.call("failing", {})
+        
+        asyncio.run(scenario())
+        registry.shutdown()
+        snapshot = registry.metrics.snapshot()
+        
+        assert snapshot["slow"]["calls"] == 2
+        assert snapshot["slow"]["errors"] == 0
+        assert snapshot["slow"]["run_seconds"]["max"] >= 0.04
+        assert snapshot["slow"]["queue_seconds"]["max"] >= 0.04
+        assert snapshot["slow"]["response_bytes"]["p50"] == 1000
+        assert snapshot["failing"]["errors"] == 1
+        assert snapshot["failing"]["error_rate"] == 1.0
+        
+        with open(metrics_file) as f:
+            text = f.read()
+        assert 'pnd_tool_calls_total{tool="slow"} 2' in text
+        assert 'pnd_tool_errors_total{tool="failing"} 1' in text
+        assert 'pnd_tool_response_bytes_bucket{tool="slow",le="1024"} 2' in text
+        assert 'pnd_tool_run_seconds_count{tool="slow"} 2' in text
+    
+    def test_handled_errors_counted(self, monkeypatch):
+        """Test that a built-in handler's own error response counts as a failed call."""
+        import agents.sonar_validation_agent as sonar_module
+        
+        def unreachable(project_key):
+            raise ConnectionError("SonarCloud unreachable")
+        
+        monkeypatch.setattr(sonar_module, "SonarValidationAgent", unreachable)
+        registry = ToolRegistry(read_cache_ttl=60)
+        registry.register_all(builtin_tool_specs())
+        
+        for _ in range(2):
+            result = asyncio.run(registry.call("sonar_get_issues", {"project_key": "missing"}))
+            assert result[0].text == "Sonar Issues Error: SonarCloud unreachable"
+        registry.shutdown()
+        snapshot = registry.metrics.snapshot()
+        
+        assert snapshot["sonar_get_issues"]["calls"] == 2
+        assert snapshot["sonar_get_issues"]["errors"] == 2
+    
+    def test_server_stats_tool(self):
+        """Test that mcp_server_stats reports tools sorted by the requested metric."""
+        registry = ToolRegistry()
+        registry.register(text_spec("small", "a"))
+        registry.register(text_spec("large", "a" * 500))
+        registry.register(tool_registry.server_stats_spec(registry))
+        for name in ("small", "large", "large"):
+            asyncio.run(registry.call(name, {}))
+        
+        result = asyncio.run(registry.call("mcp_server_stats", {"sort_by": "response_bytes"}))
+        stats = json.loads(result[0].text)
+        
+        assert [entry["tool"] for entry in stats["tools"]] == ["large", "small"]
+        assert stats["tools"][0]["calls"] == 2
+        assert stats["queue_depth"] == 0
+        by_calls = json.loads(asyncio.run(registry.call("mcp_server_stats", {"sort_by": "calls", "limit": 1}))[0].text)
+        assert [entry["tool"] for entry in by_calls["tools"]] == ["large"]
+    
+    def test_histogram_percentiles_and_buckets(self):
+        """Test percentile estimates and Prometheus bucket placement."""
+        histogram = Histogram((1, 10))
+        for value in range(1, 101):
+            histogram.observe(value / 10)
+        
+        summary = histogram.summary()
+        assert summary["count"] == 100
+        assert summary["p50"] == pytest.approx(5.0, abs=0.1)
+        assert summary["max"] == 10.0
+        assert histogram.bucket_counts == [10, 90, 0]
+        assert ToolMetrics().write_prometheus() is False
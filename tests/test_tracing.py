@@ -0,0 +1,183 @@
+"""
+Unit tests for workflow tracing.
+"""
+
+import json
+import os
+import sys
+import threading
+
+import httpx
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from workflows.tracing import Tracer, http_event_hooks, tracer
+from workflows.workflow_engine import AgentResult, WorkflowEngine, WorkflowStage
+
+
+@pytest.fixture
+def enabled_tracer():
+    """Enable the process-wide tracer for one test."""
+    tracer.enable()
+    yield tracer
+    tracer.enable(False)
+    tracer.clear()
+
+
+class TestTracer:
+    """Tests for span recording and export."""
+    
+    def test_disabled_records_nothing(self):
+        """Test that spans are no-ops until the tracer is enabled."""
+        local = Tracer()
+        with local.span("stage", "stage", trace_id="wf") as span:
+            span.set_attribute("status", "success")
+        
+        assert local.spans("wf") == []
+    
+    def test_nested_spans_share_trace(self):
+        """Test that spans without a trace ID join the enclosing span's."""
+        local = Tracer()
+        local.enable()
+        with local.span("review", "stage", trace_id="wf") as outer:
+            with local.span("GET api", "http"):
+                pass
+        with local.span("orphan", "http"):
+            pass
+        
+        spans = local.spans("wf")
+        assert [s.name for s in spans] == ["review", "GET api"]
+        assert spans[1].parent_id == outer.span_id
+        assert spans[0].end_ns >= spans[1].end_ns
+    
+    def test_error_recorded(self):
+        """Test that an exception marks the span as failed."""
+        local = Tracer()
+        local.enable()
+        with pytest.raises(RuntimeError):
+            with local.span("sonar", "stage", trace_id="wf"):
+                raise RuntimeError("boom")
+        
+        assert local.spans("wf")[0].error == "RuntimeError: boom"
+    
+    def test_chrome_export(self, tmp_path):
+        """Test that spans become complete events on per-thread tracks."""
+        local = Tracer()
+        local.enable()
+        
+        barrier = threading.Barrier(2)
+        
+        def stage(name):
+            with local.span(name, "stage", trace_id="wf"):
+                barrier.wait(5)
+        
+        threads = [threading.Thread(target=stage, args=(name,), name=f"worker-{name}") for name in ("a", "b")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        path = local.export("wf", str(tmp_path / "wf.json"))
+        with open(path) as f:
+            data = json.load(f)
+        
+        complete = [e for e in data["traceEvents"] if e["ph"] == "X"]
+        names = {e["args"]["name"] for e in data["traceEvents"] if e["name"] == "thread_name"}
+        assert sorted(e["name"] for e in complete) == ["a", "b"]
+        assert len({e["tid"] for e in complete}) == 2
+        assert names == {"worker-a", "worker-b"}
+        assert min(e["ts"] for e in complete) == 0
+    
+    def test_otlp_export(self):
+        """Test the OTLP/JSON layout."""
+        local = Tracer()
+        local.enable()
+        with local.span("review", "stage", {"agent": "review"}, trace_id="wf"):
+            with local.span("GET api", "http", {"http.status_code": 200}):
+                pass
+        
+        data = local.to_otlp("wf")
+        
+        spans = data["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        assert len({s["traceId"] for s in spans}) == 1
+        assert len(spans[0]["traceId"]) == 32
+        assert spans[1]["parentSpanId"] == spans[0]["spanId"]
+        assert spans[1]["kind"] == 3
+        assert {"key": "http.status_code", "value": {"intValue": "200"}} in spans[1]["attributes"]
+    
+    def test_unknown_format_rejected(self, tmp_path):
+        """Test that an unknown export format is rejected."""
+        with pytest.raises(ValueError):
+            Tracer().export("wf", str(tmp_path / "wf.json"), format="zipkin")
+    
+    def test_bounded_traces(self):
+        """Test that the least recently traced workflows are forgotten."""
+        local = Tracer(max_traces=2)
+        local.enable()
+        for trace_id in ("a", "b", "c"):
+            with local.span("stage", "stage", trace_id=trace_id):
+                pass
+        
+        assert local.spans("a") == []
+        assert len(local.spans("c")) == 1
+
+
+class TestHttpHooks:
+    """Tests for the httpx event hooks."""
+    
+    def test_request_span_nested_under_stage(self, enabled_tracer):
+        """Test that requests made inside a span are recorded as child spans."""
+        transport = httpx.MockTransport(lambda request: httpx.Response(503))
+        client = httpx.Client(transport=transport, event_hooks=http_event_hooks())
+        
+        client.get("https://api.figma.com/v1/files/abc?depth=2")
+        with enabled_tracer.span("figma", "stage", trace_id="wf-http") as stage:
+            client.get("https://api.figma.com/v1/files/abc?depth=2")
+        
+        spans = enabled_tracer.spans("wf-http")
+        assert [s.name for s in spans] == ["figma", "GET api.figma.com/v1/files/abc"]
+        assert spans[1].parent_id == stage.span_id
+        assert spans[1].attributes["http.url"] == "https://api.figma.com/v1/files/abc"
+        assert spans[1].attributes["http.status_code"] == 503
+        assert spans[1].error == "HTTP 503"
+
+
+class TestEngineTracing:
+    """Tests for spans recorded by the workflow engine."""
+    
+    def test_parallel_workflow_writes_trace(self, tmp_path, monkeypatch, enabled_tracer):
+        """Test that stages and cross-agent calls are exported when the workflow finishes."""
+        monkeypatch.setattr(WorkflowEngine, "CONTEXT_DIR", str(tmp_path / "contexts"))
+        engine = WorkflowEngine(trace_dir=str(tmp_path / "traces"))
+        
+        def leaf(context):
+            return AgentResult(status="success", data={})
+        
+        def caller(context):
+            return context["call_agent"]("technical_debt", {"path": "src"})
+        
+        engine.register_agent("technical_debt", leaf)
+        engine.register_agent("review", caller)
+        engine.register_agent("sonar", leaf)
+        engine.set_agent_timeout("sonar", 5)
+        
+        context = engine.create_workflow("Build React component")
+        context.pipeline = ["review", "sonar"]
+        context.stages = {name: WorkflowStage(agent_name=name) for name in context.pipeline}
+        result = engine.run_workflow_dag(context, {"review": [], "sonar": []})
+        engine.shutdown()
+        
+        path = result.metadata["trace_file"]
+        assert path == str(tmp_path / "traces" / f"{context.workflow_id}.chrome.json")
+        with open(path) as f:
+            events = [e for e in json.load(f)["traceEvents"] if e["ph"] == "X"]
+        by_name = {e["name"]: e for e in events}
+        assert set(by_name) == {"review", "sonar", "call technical_debt"}
+        assert by_name["call technical_debt"]["args"]["parent_id"] == by_name["review"]["args"]["span_id"]
+        assert by_name["sonar"]["args"]["status"] == "success"
+    
+    def test_unknown_trace_format_rejected(self, tmp_path):
+        """Test that the engine rejects an unknown trace format."""
+        with pytest.raises(ValueError):
+            WorkflowEngine(context_dir=str(tmp_path), trace_format="zipkin")
@@ -0,0 +1,595 @@
+"""
+Unit tests for the Workflow Engine.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from workflows.workflow_engine import AgentResult, WorkflowEngine, WorkflowStage
+
+
+def make_handler(name, delay=0.0, status="success", log=None):
+    """Build a handler that sleeps and records start/end events."""
+    def handler(context):
+        if log is not None:
+            log.append((name, "start", time.monotonic()))
+        time.sleep(delay)
+        if log is not None:
+            log.append((name, "end", time.monotonic()))
+        return AgentResult(
+            status=status,
+            data={"agent": name, "upstream": sorted(context["input"].get("previous_outputs", {}))},
+            error="boom" if status == "error" else None,
+        )
+    return handler
+
+
+class Interrupted(BaseException):
+    """Stands in for a crash or Ctrl+C part way through a run."""
+
+
+def pid_handler(context):
+    """Module-level handler so it can be pickled into a worker process."""
+    return AgentResult(status="success", data={"pid": os.getpid(), "task": context["task"]})
+
+
+def make_context(engine, pipeline):
+    """Create a workflow running a custom pipeline of registered agents."""
+    context = engine.create_workflow("Build React component")
+    context.pipeline = list(pipeline)
+    context.stages = {name: WorkflowStage(agent_name=name) for name in pipeline}
+    return context
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    """Create an engine that writes its context under a temp dir."""
+    monkeypatch.setattr(WorkflowEngine, "CONTEXT_DIR", str(tmp_path / "contexts"))
+    engine = WorkflowEngine(max_process_workers=2)
+    yield engine
+    engine.shutdown()
+
+
+class TestDependencyGraph:
+    """Tests for dependency graph helpers."""
+    
+    def test_dependencies_from_groups(self):
+        """Test that groups translate into barrier dependencies."""
+        deps = WorkflowEngine.dependencies_from_groups([["a"], ["b", "c"], ["d"]])
+        
+        assert deps == {"a": [], "b": ["a"], "c": ["a"], "d": ["b", "c"]}
+    
+    def test_topological_order(self):
+        """Test ordering respects dependencies."""
+        order = WorkflowEngine.topological_order({"c": ["b"], "b": ["a"], "a": []})
+        
+        assert order == ["a", "b", "c"]
+    
+    def test_topological_order_detects_cycle(self):
+        """Test that cycles are rejected."""
+        with pytest.raises(ValueError):
+            WorkflowEngine.topological_order({"a": ["b"], "b": ["a"]})
+
+
+class TestRunWorkflowDag:
+    """Tests for DAG execution."""
+    
+    def test_dependents_start_before_unrelated_straggler(self, engine):
+        """Test that a slow agent only delays the agents depending on it."""
+        log = []
+        engine.register_agent("frontend", make_handler("frontend", log=log))
+        engine.register_agent("unit_test", make_handler("unit_test", 0.05, log=log))
+        engine.register_agent("performance", make_handler("performance", 0.4, log=log))
+        engine.register_agent("review", make_handler("review", log=log))
+        
+        context = engine.create_workflow("Build React component")
+        context.pipeline = ["frontend", "unit_test", "performance", "review"]
+        dependencies = {
+            "frontend": [],
+            "unit_test": ["frontend"],
+            "performance": ["frontend"],
+            "review": ["frontend", "unit_test"],
+        }
+        
+        result = engine.run_workflow_dag(context, dependencies, max_workers=4)
+        
+        assert result.status == "completed"
+        times = {(name, kind): t for name, kind, t in log}
+        assert times[("review", "end")] < times[("performance", "end")]
+        assert result.stages["review"].output_data["upstream"] == ["frontend", "unit_test"]
+    
+    def test_failure_stops_dependents(self, engine):
+        """Test that dependents of a failed stage do not run without continue_on_error."""
+        engine.register_agent("a", make_handler("a", status="error"))
+        engine.register_agent("b", make_handler("b"))
+        
+        context = engine.create_workflow("Build React component")
+        context.pipeline = ["a", "b"]
+        
+        result = engine.run_workflow_dag(context, {"a": [], "b": ["a"]})
+        
+        assert result.status == "failed"
+        assert result.stages["b"].status == "pending"
+    
+    def test_run_workflow_parallel_uses_dependencies(self, engine):
+        """Test that run_workflow_parallel switches to DAG mode when given dependencies."""
+        seen = []
+        lock = threading.Lock()
+        
+        def handler(context):
+            with lock:
+                seen.append(context["agent_name"])
+            return AgentResult(status="success", data={"ok": True})
+        
+        for name in ("a", "b"):
+            engine.register_agent(name, handler)
+        
+        context = engine.create_workflow("Build React component")
+        context.pipeline = ["a", "b"]
+        
+        result = engine.run_workflow_parallel(context, dependencies={"a": [], "b": ["a"]})
+        
+        assert result.status == "completed"
+        assert seen == ["a", "b"]
+        assert result.metadata["trace"][0]["details"]["mode"] == "dag"
+
+
+class TestResumeWorkflow:
+    """Tests for resuming interrupted workflows."""
+    
+    def test_resume_partially_finished_group(self, engine):
+        """Test that only unfinished agents of a group and later groups re-run."""
+        calls = []
+        lock = threading.Lock()
+        
+        def register(fail):
+            for name in ("a", "b", "c", "d"):
+                handler = make_handler(name, status="error" if name in fail else "success")
+                
+                def recorded(context, handler=handler, name=name):
+                    with lock:
+                        calls.append(name)
+                    return handler(context)
+                engine.register_agent(name, recorded)
+        
+        register(fail={"c"})
+        context = make_context(engine, ["a", "b", "c", "d"])
+        
+        first = engine.run_workflow_parallel(context, [["a"], ["b", "c"], ["d"]])
+        assert first.status == "failed"
+        assert first.stages["d"].status == "pending"
+        
+        b_output = first.stages["b"].output_data
+        calls.clear()
+        register(fail=set())
+        loaded = engine.load_context(context.workflow_id)
+        result = engine.resume_workflow(loaded)
+        
+        assert result.status == "completed"
+        assert sorted(calls) == ["c", "d"]
+        assert result.stages["b"].output_data == b_output
+        assert result.stages["d"].output_data["upstream"] == ["b", "c"]
+    
+    @pytest.fixture
+    def restarted(self, engine):
+        """Create a second engine on the same journals, as a restarted process would."""
+        fresh = WorkflowEngine(context_dir=engine.context_store.root_dir)
+        yield fresh
+        fresh.shutdown()
+    
+    @staticmethod
+    def register_recorded(engine, calls, crash=None):
+        """Register handlers a-d that record their calls; crash(name) runs first in agent b."""
+        lock = threading.Lock()
+        for name in ("a", "b", "c", "d"):
+            handler = make_handler(name)
+            
+            def recorded(context, handler=handler, name=name):
+                with lock:
+                    calls.append(name)
+                if crash and name == "b":
+                    crash(name)
+                return handler(context)
+            engine.register_agent(name, recorded)
+    
+    @staticmethod
+    def crash(name):
+        raise Interrupted(name)
+    
+    def test_resume_interrupted_dag_run(self, engine, restarted):
+        """Test that stages finished before a DAG run is interrupted are not re-run."""
+        self.register_recorded(engine, [], crash=self.crash)
+        context = make_context(engine, ["a", "b", "c", "d"])
+        with pytest.raises(Interrupted):
+            engine.run_workflow_dag(context, {"a": [], "b": ["a"], "c": ["b"], "d": ["c"]}, max_workers=1)
+        
+        calls = []
+        self.register_recorded(restarted, calls)
+        loaded = restarted.load_context(context.workflow_id)
+        assert loaded.stages["a"].status == "completed"
+        assert loaded.stages["b"].status not in WorkflowEngine.RESUME_DONE_STATUSES
+        
+        result = restarted.resume_workflow(loaded)
+        
+        assert result.status == "completed"
+        assert calls == ["b", "c", "d"]
+        assert result.stages["b"].input_data["previous_output"] == {"agent": "a", "upstream": []}
+        assert any(
+            event["details"].get("restored") == ["a"]
+            for event in result.metadata["trace"] if event.get("details")
+        )
+    
+    def test_resume_interrupted_parallel_group(self, engine, restarted):
+        """Test that agents finished before a multi-agent group is interrupted are not re-run."""
+        a_done = threading.Event()
+        
+        def crash_after_a(name):
+            # Only fail once the group has recorded a's result
+            a_done.wait(5)
+            self.crash(name)
+        
+        def on_stage_complete(agent_name, result, ctx):
+            if agent_name == "a":
+                a_done.set()
+        
+        self.register_recorded(engine, [], crash=crash_after_a)
+        context = make_context(engine, ["a", "b", "c", "d"])
+        with pytest.raises(Interrupted):
+            engine.run_workflow_parallel(
+                context, [["a", "b"], ["c", "d"]], on_stage_complete=on_stage_complete, max_workers=2
+            )
+        
+        calls = []
+        self.register_recorded(restarted, calls)
+        loaded = restarted.load_context(context.workflow_id)
+        assert loaded.stages["a"].status == "completed"
+        
+        result = restarted.resume_workflow(loaded)
+        
+        assert result.status == "completed"
+        assert sorted(calls) == ["b", "c", "d"]
+        assert result.stages["c"].output_data["upstream"] == ["a", "b"]
+    
+    def test_resume_interrupted_sequential_run(self, engine, restarted):
+        """Test that a sequential run resumes after the last stage finished before the interruption."""
+        self.register_recorded(engine, [], crash=self.crash)
+        context = make_context(engine, ["a", "b", "c"])
+        with pytest.raises(Interrupted):
+            engine.run_workflow(context)
+        
+        calls = []
+        self.register_recorded(restarted, calls)
+        result = restarted.resume_workflow(restarted.load_context(context.workflow_id))
+        
+        assert result.status == "completed"
+        assert calls == ["b", "c"]
+        assert result.stages["a"].output_data == {"agent": "a", "upstream": []}
+        assert result.stages["b"].input_data["previous_agent"] == "a"
+
+
+class TestRunWorkflowAsync:
+    """Tests for asyncio execution."""
+    
+    def test_async_and_sync_handlers(self, engine):
+        """Test that async handlers are awaited and sync handlers run alongside them."""
+        active = []
+        peak = []
+        
+        async def slow_handler(context):
+            active.append(context["agent_name"])
+            peak.append(len(active))
+            await asyncio.sleep(0.05)
+            active.remove(context["agent_name"])
+            return AgentResult(status="success", data={"agent": context["agent_name"]})
+        
+        for name in ("a", "b", "c"):
+            engine.register_agent(name, slow_handler)
+        engine.register_agent("d", make_handler("d"))
+        
+        context = engine.create_workflow("Build React component")
+        context.pipeline = ["a", "b", "c", "d"]
+        
+        result = asyncio.run(engine.run_workflow_async(context, parallel_groups=[["a", "b", "c"], ["d"]]))
+        
+        assert result.status == "completed"
+        assert max(peak) == 3
+        assert result.stages["d"].output_data["upstream"] == ["a", "b", "c"]
+    
+    def test_call_agent_async(self, engine):
+        """Test that async handlers can fan out cross-agent calls concurrently."""
+        async def leaf(context):
+            await asyncio.sleep(0.01)
+            return AgentResult(status="success", data={"value": context["input"]["n"] * 2})
+        
+        async def root(context):
+            results = await asyncio.gather(*[
+                context["call_agent_async"]("leaf", {"n": n}) for n in range(3)
+            ])
+            return AgentResult(status="success", data={"values": [r.data["value"] for r in results]})
+        
+        engine.register_agent("leaf", leaf)
+        engine.register_agent("root", root)
+        
+        context = engine.create_workflow("Build React component")
+        context.pipeline = ["root"]
+        
+        result = asyncio.run(engine.run_workflow_async(context))
+        
+        assert result.stages["root"].output_data == {"values": [0, 2, 4]}
+    
+    def test_execute_agent_runs_async_handler(self, engine):
+        """Test that the synchronous path also accepts async handlers."""
+        async def handler(context):
+            return AgentResult(status="success", data={"ok": True})
+        
+        engine.register_agent("a", handler)
+        context = engine.create_workflow("Build React component")
+        
+        result = engine.execute_agent("a", context, {})
+        
+        assert result.status == "success"
+
+
+class TestStageTimeouts:
+    """Tests for stage timeouts and straggler policies."""
+    
+    def make_slow_handler(self, seen_tokens):
+        """Build a handler that waits on its cancel token for up to a second."""
+        def handler(context):
+            token = context["cancel_token"]
+            seen_tokens.append(token)
+            if token.wait(1.0):
+                return AgentResult(status="error", error="cancelled")
+            return AgentResult(status="success", data={"late": True})
+        return handler
+    
+    def test_fail_policy_cancels_and_fails(self, engine):
+        """Test that a timed-out stage is cancelled and fails the workflow."""
+        tokens = []
+        engine.register_agent("slow", self.make_slow_handler(tokens))
+        engine.register_agent("after", make_handler("after"))
+        engine.set_agent_timeout("slow", 0.1)
+        context = make_context(engine, ["slow", "after"])
+        
+        start = time.monotonic()
+        result = engine.run_workflow_dag(context, {"slow": [], "after": ["slow"]})
+        
+        assert time.monotonic() - start < 0.9
+        assert result.status == "failed"
+        assert result.stages["slow"].status == "error"
+        assert "timed out" in result.stages["slow"].error
+        assert result.stages["after"].status == "pending"
+        assert tokens[0].cancelled
+        timeouts = [e for e in result.metadata["trace"] if e["event_type"] == "timeout"]
+        assert timeouts[0]["status"] == "fail"
+        assert timeouts[0]["duration_ms"] == pytest.approx(100)
+    
+    def test_skip_policy_lets_group_finish(self, engine):
+        """Test that a skipped straggler does not stall or fail its parallel group."""
+        tokens = []
+        engine.register_agent("a", make_handler("a"))
+        engine.register_agent("slow", self.make_slow_handler(tokens))
+        engine.register_agent("b", make_handler("b"))
+        engine.set_agent_timeout("slow", 0.1, on_timeout="skip")
+        context = make_context(engine, ["a", "slow", "b"])
+        
+        result = engine.run_workflow_parallel(context, [["a", "slow"], ["b"]])
+        
+        assert result.status == "completed"
+        assert result.stages["slow"].status == "skipped"
+        assert result.stages["b"].status == "completed"
+        assert tokens[0].cancelled
+    
+    def test_continue_policy_records_late_result(self, engine):
+        """Test that a "continue" straggler keeps running and its output lands later."""
+        tokens = []
+        engine.register_agent("slow", self.make_slow_handler(tokens))
+        engine.register_agent("after", make_handler("after"))
+        engine.set_agent_timeout("slow", 0.1, on_timeout="continue")
+        context = make_context(engine, ["slow", "after"])
+        
+        result = engine.run_workflow(context)
+        
+        assert result.status == "completed"
+        assert result.stages["slow"].status == "timeout"
+        assert "previous_output" not in result.stages["after"].input_data
+        assert not tokens[0].cancelled
+        
+        deadline = time.monotonic() + 3
+        while result.stages["slow"].status == "timeout" and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert result.stages["slow"].status == "completed"
+        assert result.stages["slow"].output_data == {"late": True}
+    
+    def test_async_handler_timeout(self, engine):
+        """Test that async handlers are cancelled at their timeout."""
+        async def hang(context):
+            await asyncio.sleep(5)
+            return AgentResult(status="success")
+        
+        engine.register_agent("hang", hang)
+        engine.set_agent_timeout("hang", 0.1, on_timeout="skip")
+        context = make_context(engine, ["hang"])
+        
+        start = time.monotonic()
+        result = asyncio.run(engine.run_workflow_async(context, dependencies={"hang": []}))
+        
+        assert time.monotonic() - start < 1
+        assert result.status == "completed"
+        assert result.stages["hang"].status == "skipped"
+    
+    def test_timeouts_loaded_from_rules(self, tmp_path):
+        """Test millisecond timeouts and policies from the rules file."""
+        rules = tmp_path / "rules.json"
+        rules.write_text(json.dumps({
+            "agents": {"sonar": {"timeout": 1500, "onTimeout": "skip"}},
+            "defaults": {"timeout": 300000},
+        }))
+        engine = WorkflowEngine(rules_file=str(rules), context_dir=str(tmp_path / "contexts"))
+        
+        assert engine.get_agent_timeout("sonar") == 1.5
+        assert engine.get_straggler_policy("sonar") == "skip"
+        assert engine.get_agent_timeout("review") == 300
+        assert engine.get_straggler_policy("review") == "fail"
+        with pytest.raises(ValueError):
+            engine.set_agent_timeout("review", 10, on_timeout="retry")
+
+class TestExecutionPolicy:
+    """Tests for per-agent execution policies."""
+    
+    def test_policies_loaded_from_rules(self):
+        """Test that the rules file assigns execution policies."""
+        rules_file = os.path.join(
+            os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            "workflows", "workflow_rules.json"
+        )
+        engine = WorkflowEngine(rules_file, process_agents=True)
+        
+        assert engine.get_execution_policy("technical_debt") == "process"
+        assert engine.get_execution_policy("backend") == "inline"
+        assert engine.get_execution_policy("figma") == "thread"
+    
+    def test_process_policy_from_rules_is_opt_in(self):
+        """Test that rules file process agents run as threads unless enabled."""
+        rules_file = os.path.join(
+            os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            "workflows", "workflow_rules.json"
+        )
+        engine = WorkflowEngine(rules_file, process_agents=False)
+        
+        assert engine.get_execution_policy("technical_debt") == "thread"
+        assert engine.get_execution_policy("backend") == "inline"
+        engine.set_execution_policy("technical_debt", "process")
+        assert engine.get_execution_policy("technical_debt") == "process"
+    
+    def test_unknown_policy_rejected(self, engine):
+        """Test that unknown policies raise ValueError."""
+        with pytest.raises(ValueError):
+            engine.set_execution_policy("a", "gpu")
+    
+    def test_process_policy_runs_in_worker_process(self, engine):
+        """Test that process agents run outside the engine process."""
+        engine.register_agent("cpu", pid_handler, execution="process")
+        engine.register_agent("io", pid_handler)
+        
+        context = engine.create_workflow("Build React component")
+        context.pipeline = ["cpu", "io"]
+        
+        result = engine.run_workflow_dag(context, {"cpu": [], "io": []})
+        
+        assert result.status == "completed"
+        assert result.stages["cpu"].output_data["pid"] != os.getpid()
+        assert result.stages["cpu"].output_data["task"] == "Build React component"
+        assert result.stages["io"].output_data["pid"] == os.getpid()
+    
+    def test_inline_policy_runs_on_scheduler_thread(self, engine):
+        """Test that inline agents run on the thread driving the workflow."""
+        threads = {}
+        
+        def handler(context):
+            threads[context["agent_name"]] = threading.get_ident()
+            return AgentResult(status="success", data={})
+        
+        engine.register_agent("cheap", handler, execution="inline")
+        engine.register_agent("slow", handler)
+        
+        context = engine.create_workflow("Build React component")
+        context.pipeline = ["cheap", "slow"]
+        
+        result = engine.run_workflow_dag(context, {"cheap": [], "slow": []})
+        
+        assert result.status == "completed"
+        assert threads["cheap"] == threading.get_ident()
+        assert threads["slow"] != threading.get_ident()
+
+
+class TestCrossAgentCalls:
+    """Tests for memoized, concurrent cross-agent calls."""
+    
+    def test_identical_calls_run_once(self, engine):
+        """Test that stages making the same call in one workflow share its result."""
+        calls = []
+        
+        def debt(context):
+            calls.append(context["input"])
+            time.sleep(0.05)
+            return AgentResult(status="success", data={"items": 3})
+        
+        def caller(context):
+            result = context["call_agent"]("technical_debt", {"path": "src"})
+            return AgentResult(status="success", data={"items": result.data["items"]})
+        
+        engine.register_agent("technical_debt", debt)
+        engine.register_agent("review", caller)
+        engine.register_agent("sonar", caller)
+        
+        context = make_context(engine, ["review", "sonar"])
+        result = engine.run_workflow_dag(context, {"review": [], "sonar": []})
+        
+        assert result.status == "completed"
+        assert calls == [{"path": "src"}]
+        assert result.stages["review"].output_data == result.stages["sonar"].output_data == {"items": 3}
+        statuses = [e["status"] for e in result.metadata["trace"] if e["event_type"] == "cross_agent_call"]
+        assert statuses.count("started") == 1
+        assert statuses.count("memoized") == 1
+        
+        # Another workflow calls the agent again
+        engine.run_workflow_dag(make_context(engine, ["review"]), {"review": []})
+        assert len(calls) == 2
+    
+    def test_fan_out_runs_concurrently(self, engine):
+        """Test that futures from call_agent_future run side by side."""
+        def leaf(context):
+            time.sleep(0.2)
+            return AgentResult(status="success", data={"value": context["input"]["n"] * 2})
+        
+        def root(context):
+            futures = [context["call_agent_future"]("leaf", {"n": n}) for n in range(4)]
+            return AgentResult(status="success", data={"values": [f.result().data["value"] for f in futures]})
+        
+        engine.register_agent("leaf", leaf)
+        engine.register_agent("root", root)
+        
+        started = time.monotonic()
+        result = engine.execute_agent("root", make_context(engine, ["root"]), {})
+        
+        assert result.data == {"values": [0, 2, 4, 6]}
+        assert time.monotonic() - started < 0.6
+    
+    def test_nested_calls_do_not_starve_pool(self, engine, monkeypatch):
+        """Test that a call waiting on an unstarted call runs it on its own thread."""
+        monkeypatch.setattr(engine, "CROSS_AGENT_WORKERS", 1)
+        
+        engine.register_agent("inner", make_handler("inner"))
+        engine.register_agent("outer", lambda context: context["call_agent"]("inner", {}))
+        engine.register_agent("root", lambda context: context["call_agent_future"]("outer", {}).result())
+        
+        result = engine.execute_agent("root", make_context(engine, ["root"]), {})
+        
+        assert result.status == "success"
+        assert result.data["agent"] == "inner"
+    
+    def test_cycle_returns_error(self, engine):
+        """Test that a call waiting on itself through another agent fails instead of deadlocking."""
+        def a(context):
+            return context["call_agent"]("b", {})
+        
+        def b(context):
+            return context["call_agent"]("a", {})
+        
+        engine.register_agent("a", a)
+        engine.register_agent("b", b)
+        engine.register_agent("root", lambda context: context["call_agent"]("a", {}))
+        
+        result = engine.execute_agent("root", make_context(engine, ["root"]), {})
+        
+        assert result.status == "error"
+        assert "Cross-agent call cycle: b -> a -> b" in result.error
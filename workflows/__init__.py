@@ -3,15 +3,43 @@ PND Agents Workflow System
 
 This module provides the workflow engine and agent dispatcher
 for orchestrating multi-agent pipelines.
+
+The engine and dispatcher are imported on first access, so agents and
+tools can use lightweight submodules such as workflows.tracing without
+loading the engine.
 """
 
-from .workflow_engine import WorkflowEngine, TaskType, WorkflowContext
-from .agent_dispatcher import AgentDispatcher, AGENT_REGISTRY
+import importlib
+
+# Lazily imported name -> submodule defining it
+_LAZY_EXPORTS = {
+    "WorkflowEngine": "workflow_engine",
+    "TaskType": "workflow_engine",
+    "WorkflowContext": "workflow_engine",
+    "AgentHandler": "workflow_engine",
+    "AsyncAgentHandler": "workflow_engine",
+    "CancellationToken": "workflow_engine",
+    "StageTimeoutError": "workflow_engine",
+    "AgentDispatcher": "agent_dispatcher",
+    "AGENT_REGISTRY": "agent_dispatcher",
+}
 
 __all__ = [
     "WorkflowEngine",
     "TaskType",
     "WorkflowContext",
+    "AgentHandler",
+    "AsyncAgentHandler",
+    "CancellationToken",
+    "StageTimeoutError",
     "AgentDispatcher",
     "AGENT_REGISTRY",
 ]
+
+
+def __getattr__(name):
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_LAZY_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,303 @@
+"""
+Adaptive Scheduler
+
+Stage ordering and worker pool sizing from historical agent durations.
+
+The static scheduler submits ready stages in plan order to a pool of
+max_workers threads. The adaptive scheduler reads the p50 and p95
+durations recorded in the analytics store for each agent and task type,
+and:
+
+- submits ready stages longest expected (p50) duration first, so a slow
+  stage does not start last behind a queue of short ones
+- sizes each worker pool to the fewest workers that still reach the
+  shortest expected makespan, simulated as in run analysis
+- warns when one agent dominates a parallel group's expected makespan,
+  where more workers cannot help and the groups should change instead
+
+An agent with too little history for the task type falls back to its
+history across all task types, then to the median of the known agents.
+While adaptive scheduling is on, the engine records the handler time of
+every stage it runs (cache hits excluded), so the history builds up with
+use.
+"""
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from workflows.run_analysis import simulate_dag, simulate_groups
+
+logger = logging.getLogger("pnd_agents.workflow")
+
+# Stage schedulers
+SCHEDULERS = ("static", "adaptive")
+
+# Days of analytics history read for estimates
+DEFAULT_HISTORY_DAYS = int(os.environ.get("PND_SCHEDULER_HISTORY_DAYS", "14"))
+
+# Completed runs of an agent needed before its history is used
+DEFAULT_MIN_SAMPLES = int(os.environ.get("PND_SCHEDULER_MIN_SAMPLES", "3"))
+
+# Largest worker pool chosen from the history when the caller sets no limit
+DEFAULT_MAX_WORKERS = int(os.environ.get("PND_SCHEDULER_MAX_WORKERS", "16"))
+
+# Seconds estimates are reused before the history is read again
+DEFAULT_REFRESH_SECONDS = 300.0
+
+# Expected duration (seconds) of agents with no usable history, when no agent has any
+DEFAULT_ESTIMATE_SECONDS = 1.0
+
+# A group is dominated when its slowest agent's p50 is at least this many
+# times that of the next slowest
+DOMINANCE_RATIO = 3.0
+
+# Pool sizing accepts an expected makespan this fraction above the best one
+SIZING_TOLERANCE = 0.05
+
+
+@dataclass
+class DurationEstimate:
+    """Historical durations of one agent, in seconds."""
+    agent: str
+    p50: float
+    p95: float
+    count: int
+    task_type: Optional[str] = None  # None when taken from every task type
+
+
+class DurationEstimates:
+    """Expected stage durations for one task type."""
+    
+    def __init__(self, estimates: Dict[str, DurationEstimate]):
+        self.estimates = estimates
+        known = sorted(estimate.p50 for estimate in estimates.values())
+        self.default_seconds = known[len(known) // 2] if known else DEFAULT_ESTIMATE_SECONDS
+    
+    def get(self, agent: str) -> Optional[DurationEstimate]:
+        return self.estimates.get(agent)
+    
+    def expected(self, agent: str) -> float:
+        """Get an agent's expected (p50) duration."""
+        estimate = self.estimates.get(agent)
+        return estimate.p50 if estimate else self.default_seconds
+    
+    def longest_first(self, agents: Iterable[str]) -> List[str]:
+        """Order agents by expected duration, longest first; ties keep their order."""
+        return sorted(agents, key=lambda agent: -self.expected(agent))
+    
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            agent: {"p50": estimate.p50, "p95": estimate.p95, "count": estimate.count, "task_type": estimate.task_type}
+            for agent, estimate in self.estimates.items()
+        }
+
+
+class AdaptiveScheduler:
+    """
+    Duration-aware stage ordering and pool sizing for the workflow engine.
+    
+    Features:
+    - p50/p95 per agent and task type from the analytics store
+    - Estimates cached per task type for refresh_seconds
+    - Pool sizes from simulated makespans, capped by the caller's limit
+    - Stage durations recorded through a background analytics sink
+    """
+    
+    def __init__(
+        self,
+        store: Optional[Any] = None,
+        history_days: int = DEFAULT_HISTORY_DAYS,
+        min_samples: int = DEFAULT_MIN_SAMPLES,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        refresh_seconds: float = DEFAULT_REFRESH_SECONDS
+    ):
+        """
+        Initialize the scheduler.
+        
+        Args:
+            store: AnalyticsStore to read and record durations; defaults to
+                   the shared store, written through the process-wide sink.
+            history_days: Days of history read for estimates.
+            min_samples: Completed runs needed before an agent's history is used.
+            max_workers: Largest pool chosen when the caller sets no limit.
+            refresh_seconds: Seconds estimates are reused before re-reading.
+        """
+        self.store = store
+        self._own_sink = store is not None
+        self.history_days = history_days
+        self.min_samples = min_samples
+        self.max_workers = max(1, max_workers)
+        self.refresh_seconds = refresh_seconds
+        self._estimates: Dict[str, Tuple[float, DurationEstimates]] = {}  # Task type -> (loaded at, estimates)
+        self._sink = None
+        self._lock = threading.Lock()
+    
+    def estimates(self, task_type: str) -> DurationEstimates:
+        """Get the expected stage durations for a task type."""
+        with self._lock:
+            cached = self._estimates.get(task_type)
+            if cached is not None and time.monotonic() - cached[0] < self.refresh_seconds:
+                return cached[1]
+        
+        estimates: Dict[str, DurationEstimate] = {}
+        store = self._get_store()
+        if store is not None:
+            try:
+                # Task type history overrides the history across every task type
+                for scope in (None, task_type):
+                    for agent, stats in store.get_duration_stats(self.history_days, scope).items():
+                        if stats["count"] >= self.min_samples:
+                            estimates[agent] = DurationEstimate(
+                                agent=agent,
+                                p50=stats["p50"] / 1000,
+                                p95=stats["p95"] / 1000,
+                                count=stats["count"],
+                                task_type=scope,
+                            )
+            except Exception as e:
+                logger.warning(f"Could not read agent duration history: {e}")
+        
+        result = DurationEstimates(estimates)
+        with self._lock:
+            self._estimates[task_type] = (time.monotonic(), result)
+        return result
+    
+    def invalidate(self):
+        """Forget cached estimates, so the next workflow re-reads the history."""
+        with self._lock:
+            self._estimates.clear()
+    
+    def group_workers(self, group: List[str], estimates: DurationEstimates, limit: Optional[int] = None) -> int:
+        """Get the fewest workers that run a parallel group in close to its shortest expected time."""
+        durations = {agent: estimates.expected(agent) for agent in group}
+        return self._fewest_workers(
+            lambda workers: simulate_groups([group], durations, workers),
+            min(limit or self.max_workers, len(group))
+        )
+    
+    def dag_workers(
+        self,
+        dependencies: Dict[str, List[str]],
+        estimates: DurationEstimates,
+        limit: Optional[int] = None,
+        done: Iterable[str] = ()
+    ) -> int:
+        """Get the fewest workers that run a dependency graph in close to its shortest expected time."""
+        done = set(done)
+        durations = {
+            agent: 0.0 if agent in done else estimates.expected(agent)
+            for agent in dependencies
+        }
+        return self._fewest_workers(
+            lambda workers: simulate_dag(dependencies, durations, workers),
+            min(limit or self.max_workers, len(dependencies) - len(done & set(dependencies)))
+        )
+    
+    def dominated_groups(self, groups: List[List[str]], estimates: DurationEstimates) -> List[Dict[str, Any]]:
+        """
+        Find parallel groups whose expected makespan is set by one agent.
+        
+        Returns:
+            One warning per dominated group, with a "message" for the log.
+        """
+        warnings = []
+        for idx, group in enumerate(groups):
+            if len(group) < 2:
+                continue
+            slowest, runner_up = estimates.longest_first(group)[:2]
+            expected, next_expected = estimates.expected(slowest), estimates.expected(runner_up)
+            if expected < DOMINANCE_RATIO * next_expected:
+                continue
+            estimate = estimates.get(slowest)
+            p95 = estimate.p95 if estimate else expected
+            warnings.append({
+                "group": idx + 1,
+                "agent": slowest,
+                "expected_seconds": round(expected, 3),
+                "p95_seconds": round(p95, 3),
+                "next_seconds": round(next_expected, 3),
+                "message": (
+                    f"Group {idx + 1} expected makespan is dominated by `{slowest}` "
+                    f"(p50 {expected:.1f}s, p95 {p95:.1f}s; next slowest `{runner_up}` {next_expected:.1f}s)"
+                ),
+            })
+        return warnings
+    
+    def record(
+        self,
+        agent_name: str,
+        task_type: str,
+        seconds: float,
+        status: str,
+        workflow_id: Optional[str] = None
+    ) -> bool:
+        """
+        Queue a stage's handler time for the duration history.
+        
+        Recorded as a stage_duration event, so stage runs are not counted
+        as tasks by the analytics reports.
+        
+        Returns:
+            True if the event was queued.
+        """
+        sink = self._get_sink()
+        if sink is None:
+            return False
+        from tools.analytics_store import STAGE_DURATION_EVENT, AnalyticsEvent
+        
+        return sink.submit(AnalyticsEvent(
+            event_id=f"{agent_name}_{workflow_id}" if workflow_id else f"{agent_name}_{time.time_ns()}",
+            event_type=STAGE_DURATION_EVENT,
+            agent_name=agent_name,
+            timestamp=datetime.utcnow().isoformat(),
+            data={
+                "duration": seconds * 1000,
+                "status": status,
+                "taskType": task_type,
+                "workflowId": workflow_id,
+            },
+        ))
+    
+    def close(self, timeout: Optional[float] = 5.0):
+        """Write queued durations of a scheduler-owned sink and stop it."""
+        with self._lock:
+            sink, self._sink = self._sink, None
+        if sink is not None and self._own_sink:
+            sink.close(timeout)
+    
+    def _fewest_workers(self, makespan, limit: int) -> int:
+        """Get the fewest workers whose simulated makespan is within SIZING_TOLERANCE of the best."""
+        limit = max(1, limit)
+        best = makespan(limit)
+        for workers in range(1, limit):
+            if makespan(workers) <= best * (1 + SIZING_TOLERANCE):
+                return workers
+        return limit
+    
+    def _get_store(self):
+        """Get the analytics store, or None if the analytics tools are not importable."""
+        if self.store is None:
+            try:
+                from tools.analytics_store import AnalyticsStore
+            except ImportError:
+                return None
+            self.store = AnalyticsStore()
+        return self.store
+    
+    def _get_sink(self):
+        """Get the sink durations are recorded through, or None if analytics is not available."""
+        with self._lock:
+            if self._sink is not None:
+                return self._sink
+            try:
+                from tools.analytics_sink import AnalyticsSink, get_analytics_sink
+            except ImportError:
+                return None
+            # A store given explicitly gets its own sink; otherwise share the process-wide one
+            self._sink = AnalyticsSink(store=self.store) if self._own_sink else get_analytics_sink()
+            return self._sink
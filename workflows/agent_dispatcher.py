@@ -5,15 +5,17 @@ Maps agent names to their handler functions and provides
 a unified interface for executing agents.
 """
 
+import asyncio
 import os
 import sys
 import time
-from typing import Dict, Any, Callable, Optional
+from contextlib import contextmanager
+from typing import Dict, Any, Callable, Iterator, Optional
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from workflows.workflow_engine import AgentResult
+from workflows.workflow_engine import AgentResult, AnyAgentHandler, is_async_handler
 
 
 class AgentDispatcher:
@@ -26,7 +28,7 @@ class AgentDispatcher:
     
     def __init__(self):
         """Initialize the agent dispatcher."""
-        self._handlers: Dict[str, Callable[[Dict[str, Any]], AgentResult]] = {}
+        self._handlers: Dict[str, AnyAgentHandler] = {}
         self._register_default_handlers()
     
     def _register_default_handlers(self):
@@ -45,17 +47,18 @@ class AgentDispatcher:
         self.register("technical_debt", self._technical_debt_handler)
         self.register("test_analysis_design", self._test_analysis_design_handler)
     
-    def register(self, name: str, handler: Callable[[Dict[str, Any]], AgentResult]):
+    def register(self, name: str, handler: AnyAgentHandler):
         """
         Register an agent handler.
         
         Args:
             name: Agent name (e.g., "figma", "frontend")
-            handler: Function that takes context dict and returns AgentResult
+            handler: Function that takes context dict and returns AgentResult,
+                    or an async function returning AgentResult
         """
         self._handlers[name] = handler
     
-    def get_handler(self, name: str) -> Optional[Callable[[Dict[str, Any]], AgentResult]]:
+    def get_handler(self, name: str) -> Optional[AnyAgentHandler]:
         """Get a handler by name."""
         return self._handlers.get(name)
     
@@ -63,6 +66,8 @@ class AgentDispatcher:
         """
         Execute an agent with the given context.
         
+        Async handlers are run to completion on a fresh event loop.
+        
         Args:
             agent_name: Name of the agent to execute.
             context: Context dictionary with task, input, metadata, etc.
@@ -79,69 +84,141 @@ class AgentDispatcher:
         
         # Track task start with analytics
         start_time = time.time()
-        task_description = context.get("task", "")
-        jira_task_id = context.get("metadata", {}).get("jira_task_id")
-        workflow_id = context.get("metadata", {}).get("workflow_id")
+        self._track_started(agent_name, context)
+        
+        try:
+            if is_async_handler(handler):
+                result = asyncio.run(handler(context))
+            else:
+                result = handler(context)
+        except Exception as e:
+            self._track_failed(agent_name, context, start_time, e)
+            return AgentResult(
+                status="error",
+                error=str(e)
+            )
+        
+        self._track_finished(agent_name, context, start_time, result)
+        return result
+    
+    async def execute_async(self, agent_name: str, context: Dict[str, Any]) -> AgentResult:
+        """
+        Execute an agent from async code.
+        
+        Async handlers are awaited; sync handlers run in a worker thread so
+        they do not block the event loop.
+        
+        Args:
+            agent_name: Name of the agent to execute.
+            context: Context dictionary with task, input, metadata, etc.
+        
+        Returns:
+            AgentResult from the agent.
+        """
+        handler = self._handlers.get(agent_name)
+        if not handler:
+            return AgentResult(
+                status="error",
+                error=f"No handler registered for agent: {agent_name}"
+            )
+        
+        start_time = time.time()
+        self._track_started(agent_name, context)
         
+        try:
+            if is_async_handler(handler):
+                result = await handler(context)
+            else:
+                result = await asyncio.to_thread(handler, context)
+        except Exception as e:
+            self._track_failed(agent_name, context, start_time, e)
+            return AgentResult(
+                status="error",
+                error=str(e)
+            )
+        
+        self._track_finished(agent_name, context, start_time, result)
+        return result
+    
+    def _track_started(self, agent_name: str, context: Dict[str, Any]):
+        """Record a task_started analytics event."""
         try:
             from tools.analytics_store import record_event
             record_event(
                 event_type="task_started",
                 agent_name=agent_name,
-                task_description=task_description,
-                jira_task_id=jira_task_id,
+                task_description=context.get("task", ""),
+                jira_task_id=context.get("metadata", {}).get("jira_task_id"),
+                background=True,
             )
         except ImportError:
             pass  # Analytics not available
-        
+    
+    def _track_finished(self, agent_name: str, context: Dict[str, Any], start_time: float, result: AgentResult):
+        """Record a task_completed or task_failed analytics event for a handler result."""
+        duration_ms = (time.time() - start_time) * 1000
         try:
-            result = handler(context)
-            
-            # Track task completion with analytics
-            duration_ms = (time.time() - start_time) * 1000
-            try:
-                from tools.analytics_store import record_event
-                event_type = "task_completed" if result.status == "success" else "task_failed"
-                record_event(
-                    event_type=event_type,
-                    agent_name=agent_name,
-                    task_description=task_description,
-                    jira_task_id=jira_task_id,
-                    metrics={
-                        "duration": duration_ms,
-                        "status": result.status,
-                    },
-                    errors=[result.error] if result.error else None,
-                )
-            except ImportError:
-                pass  # Analytics not available
-            
-            return result
-        except Exception as e:
-            # Track task failure with analytics
-            duration_ms = (time.time() - start_time) * 1000
-            try:
-                from tools.analytics_store import record_event
-                record_event(
-                    event_type="task_failed",
-                    agent_name=agent_name,
-                    task_description=task_description,
-                    jira_task_id=jira_task_id,
-                    metrics={"duration": duration_ms},
-                    errors=[str(e)],
-                )
-            except ImportError:
-                pass  # Analytics not available
-            
-            return AgentResult(
-                status="error",
-                error=str(e)
+            from tools.analytics_store import record_event
+            event_type = "task_completed" if result.status == "success" else "task_failed"
+            record_event(
+                event_type=event_type,
+                agent_name=agent_name,
+                task_description=context.get("task", ""),
+                jira_task_id=context.get("metadata", {}).get("jira_task_id"),
+                metrics={
+                    "duration": duration_ms,
+                    "status": result.status,
+                },
+                errors=[result.error] if result.error else None,
+                background=True,
             )
+        except ImportError:
+            pass  # Analytics not available
+    
+    def _track_failed(self, agent_name: str, context: Dict[str, Any], start_time: float, error: Exception):
+        """Record a task_failed analytics event for a handler exception."""
+        duration_ms = (time.time() - start_time) * 1000
+        try:
+            from tools.analytics_store import record_event
+            record_event(
+                event_type="task_failed",
+                agent_name=agent_name,
+                task_description=context.get("task", ""),
+                jira_task_id=context.get("metadata", {}).get("jira_task_id"),
+                metrics={"duration": duration_ms},
+                errors=[str(error)],
+                background=True,
+            )
+        except ImportError:
+            pass  # Analytics not available
     
     def list_agents(self) -> list:
         """List all registered agent names."""
         return list(self._handlers.keys())
     
+    @contextmanager
+    def _lease_agent(self, key: str, factory: Callable[[], Any]) -> Iterator[Any]:
+        """
+        Lease a reusable agent instance from the process-wide agent pool.
+        
+        Pooled agents keep their HTTP clients warm across calls and jobs;
+        each lease is exclusive, so concurrent workflows never share one.
+        """
+        try:
+            from tools.agent_pool import get_agent_pool
+        except ImportError:
+            # Pool not available, fall back to a one-off instance
+            agent = factory()
+            try:
+                yield agent
+            finally:
+                if hasattr(agent, "close"):
+                    agent.close()
+            return
+        
+        with get_agent_pool().lease(key, factory) as agent:
+            yield agent
+    
     # ==================== Agent Handlers ====================
     
     def _figma_handler(self, context: Dict[str, Any]) -> AgentResult:
@@ -173,12 +250,11 @@ class AgentDispatcher:
         try:
             from agents.figma_reader_agent import FigmaReaderAgent
             
-            agent = FigmaReaderAgent()
-            result = agent.read_figma_url(figma_url)
-            agent.close()
-            
-            # Convert to frontend-friendly format
-            output = agent.get_component_for_frontend_agent(result)
+            with self._lease_agent("figma", FigmaReaderAgent) as agent:
+                result = agent.read_figma_url(figma_url)
+                
+                # Convert to frontend-friendly format
+                output = agent.get_component_for_frontend_agent(result)
             
             return AgentResult(
                 status="success",
@@ -708,73 +784,74 @@ class AgentDispatcher:
         try:
             from agents.sonar_validation_agent import SonarValidationAgent
             
-            agent = SonarValidationAgent()
-            
-            if is_pre_pr_mode:
-                # Pre-PR mode: Use local validation with guardrails
-                # This doesn't require a PR to exist
-                repo_name = metadata.get("repo_name", "default")
-                
-                # Get pre-generation checklist (guardrails)
-                checklist = agent.get_pre_generation_checklist(repo_name)
-                
-                # If we have generated code from previous stages, validate it
-                validation_results = []
-                files_to_generate = previous_output.get("files_to_generate", [])
-                component_spec = previous_output.get("component_spec", {})
-                
-                # Build a summary of what would be validated
-                pre_pr_data = {
-                    "mode": "pre_pr_validation",
-                    "quality_gate_status": "PENDING_PR",
-                    "pre_generation_checklist": checklist,
-                    "files_to_validate": files_to_generate,
-                    "component_name": component_spec.get("name", "Component"),
-                    "guardrails_applied": [g.rule_id for g in agent.GUARDRAILS],
-                    "recommendations": [
-                        "Run lint checks: pnpm lint or npm run lint",
-                        "Run type checks: pnpm check-types or npm run typecheck",
-                        "Run tests: pnpm test or npm test",
-                        "Ensure 100% test coverage for new code",
-                        "Review code against Sonar guardrails above",
-                        "Create PR to trigger full SonarCloud analysis",
-                    ],
-                    "next_steps": [
-                        "1. Commit your changes to the feature branch",
-                        "2. Create a PR to trigger SonarCloud analysis",
-                        "3. Review SonarCloud results on the PR",
-                        "4. Fix any issues before merging",
-                    ],
-                }
-                
-                return AgentResult(
-                    status="success",
-                    data=pre_pr_data,
-                    next=None,  # End of workflow in pre-PR mode
-                    error=None
-                )
-            else:
-                # Post-PR mode: Fetch results from SonarCloud API
-                branch = input_data.get("branch", "master")
-                repo_path = input_data.get("repo_path")
-                
-                agent_context = {
-                    "task_description": task,
-                    "input_data": {
-                        "branch": branch,
-                        "repo_path": repo_path,
+            with self._lease_agent("sonar", SonarValidationAgent) as agent:
+                if is_pre_pr_mode:
+                    # Pre-PR mode: Use local validation with guardrails
+                    # This doesn't require a PR to exist
+                    repo_name = metadata.get("repo_name", "default")
+                    
+                    # Get pre-generation checklist (guardrails)
+                    checklist = agent.get_pre_generation_checklist(repo_name)
+                    
+                    # If we have generated code from previous stages, validate it
+                    validation_results = []
+                    files_to_generate = previous_output.get("files_to_generate", [])
+                    component_spec = previous_output.get("component_spec", {})
+                    
+                    # Build a summary of what would be validated
+                    pre_pr_data = {
+                        "mode": "pre_pr_validation",
+                        "quality_gate_status": "PENDING_PR",
+                        "pre_generation_checklist": checklist,
+                        "files_to_validate": files_to_generate,
+                        "component_name": component_spec.get("name", "Component"),
+                        "guardrails_applied": [g.rule_id for g in agent.GUARDRAILS],
+                        "recommendations": [
+                            "Run lint checks: pnpm lint or npm run lint",
+                            "Run type checks: pnpm check-types or npm run typecheck",
+                            "Run tests: pnpm test or npm test",
+                            "Ensure 100% test coverage for new code",
+                            "Review code against Sonar guardrails above",
+                            "Create PR to trigger full SonarCloud analysis",
+                        ],
+                        "next_steps": [
+                            "1. Commit your changes to the feature branch",
+                            "2. Create a PR to trigger SonarCloud analysis",
+                            "3. Review SonarCloud results on the PR",
+                            "4. Fix any issues before merging",
+                        ],
                     }
-                }
-                
-                result = agent.run(agent_context)
-                
-                return AgentResult(
-                    status=result.get("status", "success"),
-                    data=result.get("data", {}),
-                    next=result.get("next"),
-                    error=result.get("error")
-                )
-                
+                    
+                    return AgentResult(
+                        status="success",
+                        data=pre_pr_data,
+                        next=None,  # End of workflow in pre-PR mode
+                        error=None
+                    )
+                else:
+                    # Post-PR mode: Fetch results from SonarCloud API
+                    branch = input_data.get("branch", "master")
+                    repo_path = input_data.get("repo_path")
+                    
+                    agent_context = {
+                        "task_description": task,
+                        "input_data": {
+                            "branch": branch,
+                            "repo_path": repo_path,
+                        }
+                    }
+                    
+                    result = agent.run(agent_context)
+                    
+                    return AgentResult(
+                        status=result.get("status", "success"),
+                        data=result.get("data", {}),
+                        next=result.get("next"),
+                        error=result.get("error"),
+                        # SonarCloud results change without any local change
+                        cacheable=False
+                    )
+        
         except ImportError:
             # Fallback if agent not available - provide static validation checklist
             return AgentResult(
@@ -910,38 +987,43 @@ class AgentDispatcher:
 
             repo_path = input_data.get("repo_path") or metadata.get("repo_path") or os.getcwd()
             include_sonarcloud = input_data.get("include_sonarcloud", True)
+            # SonarCloud issues change without any local change, so only
+            # local-only analyses may be served from the result cache
+            cacheable = not include_sonarcloud
 
-            agent = TechnicalDebtAgent()
-
-            task_lower = task.lower()
-            if "register" in task_lower:
-                result = agent.generate_register(repo_path, include_sonarcloud=include_sonarcloud)
-                return AgentResult(
-                    status="success",
-                    data={
-                        "register": result,
-                        "format": "markdown",
-                    }
-                )
-            elif "summary" in task_lower or "leadership" in task_lower or "executive" in task_lower:
-                result = agent.generate_summary(repo_path, include_sonarcloud=include_sonarcloud)
-                return AgentResult(
-                    status="success",
-                    data={
-                        "summary": result,
-                        "format": "markdown",
-                    }
-                )
-            else:
-                report = agent.analyze(repo_path, include_sonarcloud=include_sonarcloud)
-                return AgentResult(
-                    status=report.status,
-                    data={
-                        "report": report.to_dict(),
-                        "markdown": report.to_markdown(),
-                    },
-                    error=report.error
-                )
+            with self._lease_agent("technical_debt", TechnicalDebtAgent) as agent:
+                task_lower = task.lower()
+                if "register" in task_lower:
+                    result = agent.generate_register(repo_path, include_sonarcloud=include_sonarcloud)
+                    return AgentResult(
+                        status="success",
+                        data={
+                            "register": result,
+                            "format": "markdown",
+                        },
+                        cacheable=cacheable
+                    )
+                elif "summary" in task_lower or "leadership" in task_lower or "executive" in task_lower:
+                    result = agent.generate_summary(repo_path, include_sonarcloud=include_sonarcloud)
+                    return AgentResult(
+                        status="success",
+                        data={
+                            "summary": result,
+                            "format": "markdown",
+                        },
+                        cacheable=cacheable
+                    )
+                else:
+                    report = agent.analyze(repo_path, include_sonarcloud=include_sonarcloud)
+                    return AgentResult(
+                        status=report.status,
+                        data={
+                            "report": report.to_dict(),
+                            "markdown": report.to_markdown(),
+                        },
+                        error=report.error,
+                        cacheable=cacheable
+                    )
         except ImportError:
             return AgentResult(
                 status="error",
@@ -0,0 +1,273 @@
+"""
+Blob Store
+
+Content-addressed storage for large stage inputs and outputs.
+
+Stage payloads such as Figma trees, PR diffs and debt registers are passed
+from stage to stage by reference, but every checkpoint used to write them
+out again: once as the producing stage's output, then inside every later
+stage's "previous_output" and "all_outputs". Encoding a context through
+the blob store replaces each large value with a {"$blob": <sha256>}
+reference, so a payload is serialized and written once however many
+stages hold it. Decoding returns one shared object per blob.
+
+Blobs are written to disk when first stored, so journals that reference
+them stay loadable after a restart; decoded values are kept in memory up
+to a byte budget. Stage outputs are pinned when stored, so the stages that
+pass them on reuse their encoding instead of hashing them again.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# Key marking a blob reference in encoded payloads
+BLOB_REF_KEY = "$blob"
+
+# Encoded values at least this large (bytes of JSON, estimated) become blobs
+DEFAULT_MIN_BLOB_BYTES = int(os.environ.get("PND_BLOB_MIN_BYTES", "4096"))
+
+# Decoded blob values kept in memory
+DEFAULT_MEMORY_BYTES = int(os.environ.get("PND_BLOB_MEMORY_BYTES", str(64 * 1024 * 1024)))
+
+# Estimated JSON size of a reference
+REF_BYTES = len(BLOB_REF_KEY) + 64 + 8
+
+
+def is_blob_ref(value: Any) -> bool:
+    """Check whether a value is a blob reference."""
+    return isinstance(value, dict) and len(value) == 1 and isinstance(value.get(BLOB_REF_KEY), str)
+
+
+class BlobStore:
+    """
+    Content-addressed blobs on disk with an in-memory LRU of decoded values.
+    
+    Every encode hashes the current content, so a value edited in place gets
+    a new blob, except for pinned values: their encoding is reused until
+    they are unpinned or pinned again. Only values the store decoded itself
+    are kept in memory; if one of them is edited in place and encoded again,
+    its stale entry is dropped.
+    """
+    
+    def __init__(
+        self,
+        root_dir: str,
+        min_blob_bytes: int = DEFAULT_MIN_BLOB_BYTES,
+        max_memory_bytes: int = DEFAULT_MEMORY_BYTES
+    ):
+        """
+        Initialize the blob store.
+        
+        Args:
+            root_dir: Directory holding the blob files.
+            min_blob_bytes: Encoded values at least this large become blobs.
+            max_memory_bytes: Budget for decoded values kept in memory.
+        """
+        self.root_dir = root_dir
+        self.min_blob_bytes = min_blob_bytes
+        self.max_memory_bytes = max_memory_bytes
+        self._memory: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()  # Digest -> (value, size)
+        self._memory_bytes = 0
+        self._decoded: Dict[int, str] = {}  # id of a value in _memory -> its digest
+        # id of a pinned value -> (value, encoded, size). The value is held so its id is not reused.
+        self._pinned: Dict[int, Tuple[Any, Any, int]] = {}
+        self._lock = threading.RLock()
+    
+    def put(self, value: Any) -> Dict[str, str]:
+        """Store a JSON-compatible value as one blob and return its reference."""
+        return self._write(value, value)
+    
+    def get(self, digest: str) -> Any:
+        """
+        Load a blob's value, with nested references resolved.
+        
+        Raises:
+            KeyError: If the blob does not exist.
+        """
+        with self._lock:
+            cached = self._memory.get(digest)
+            if cached is not None:
+                self._memory.move_to_end(digest)
+                return cached[0]
+        
+        try:
+            with open(self.blob_path(digest), "r") as f:
+                text = f.read()
+        except FileNotFoundError:
+            raise KeyError(f"Blob not found: {digest}")
+        
+        value = self.decode(json.loads(text))
+        with self._lock:
+            self._remember(digest, value, len(text))
+        return value
+    
+    def encode(self, value: Any) -> Any:
+        """
+        Replace large values inside a JSON-compatible value with blob references.
+        
+        Nested values are encoded first, so a blob holds references to the
+        blobs inside it rather than copies. A container that appears several
+        times in the value is serialized once.
+        """
+        return self._encode(value, {})[0]
+    
+    def pin(self, value: Any) -> Any:
+        """
+        Encode a container and keep its encoded form for later encodes.
+        
+        Used for stage outputs, which later stages hold unchanged in their
+        "previous_output" and "all_outputs": encoding those reuses the
+        pinned form instead of serializing and hashing the output again.
+        Pinning a value again rehashes it, picking up in-place edits.
+        """
+        self.unpin(value)
+        encoded, size = self._encode(value, {})
+        if isinstance(value, (dict, list, tuple)):
+            with self._lock:
+                self._pinned[id(value)] = (value, encoded, size)
+        return encoded
+    
+    def unpin(self, value: Any):
+        """Forget a pinned value's encoded form, e.g. once its stage output is reassigned."""
+        with self._lock:
+            pinned = self._pinned.get(id(value))
+            if pinned is not None and pinned[0] is value:
+                del self._pinned[id(value)]
+    
+    def decode(self, value: Any) -> Any:
+        """Resolve every blob reference inside an encoded value."""
+        if is_blob_ref(value):
+            return self.get(value[BLOB_REF_KEY])
+        if isinstance(value, dict):
+            return {key: self.decode(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.decode(item) for item in value]
+        return value
+    
+    def blob_path(self, digest: str) -> str:
+        """Get the file path of a blob."""
+        return os.path.join(self.root_dir, digest[:2], f"{digest}.json")
+    
+    def prune(self, max_age: float) -> int:
+        """Delete blob files not written for max_age seconds. Returns the number deleted."""
+        if not os.path.isdir(self.root_dir):
+            return 0
+        
+        cutoff = time.time() - max_age
+        removed = 0
+        with self._lock:
+            for directory, _, names in os.walk(self.root_dir):
+                for name in names:
+                    path = os.path.join(directory, name)
+                    try:
+                        if os.path.getmtime(path) < cutoff:
+                            os.remove(path)
+                            removed += 1
+                    except OSError:
+                        continue
+            self._forget_all()
+        return removed
+    
+    def clear(self):
+        """Delete every blob."""
+        with self._lock:
+            shutil.rmtree(self.root_dir, ignore_errors=True)
+            self._forget_all()
+    
+    def _encode(self, value: Any, seen: Dict[int, Tuple[Any, int]]) -> Tuple[Any, int]:
+        """
+        Encode a value, returning it with its estimated JSON size.
+        
+        seen memoizes containers by id for one encode() call, while the
+        caller holds them, so shared outputs are serialized once per call.
+        """
+        if isinstance(value, str):
+            return value, len(value) + 2
+        if not isinstance(value, (dict, list, tuple)):
+            return value, 8
+        if is_blob_ref(value):
+            return value, REF_BYTES
+        if id(value) in seen:
+            return seen[id(value)]
+        pinned = self._pinned.get(id(value))
+        if pinned is not None and pinned[0] is value:
+            return pinned[1], pinned[2]
+        
+        if isinstance(value, dict):
+            encoded = {}
+            size = 2
+            for key, item in value.items():
+                encoded[key], item_size = self._encode(item, seen)
+                size += item_size + len(str(key)) + 4
+        else:
+            encoded = []
+            size = 2
+            for item in value:
+                encoded_item, item_size = self._encode(item, seen)
+                encoded.append(encoded_item)
+                size += item_size + 1
+        
+        if size < self.min_blob_bytes:
+            self._forget_changed(value, None)
+            seen[id(value)] = (encoded, size)
+        else:
+            seen[id(value)] = (self._write(encoded, value), REF_BYTES)
+        return seen[id(value)]
+    
+    def _write(self, encoded: Any, value: Any) -> Dict[str, str]:
+        """Write an encoded value's blob unless it exists."""
+        text = json.dumps(encoded, sort_keys=True, separators=(",", ":"), default=str)
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        path = self.blob_path(digest)
+        with self._lock:
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.{threading.get_ident()}.tmp"
+                with open(tmp_path, "w") as f:
+                    f.write(text)
+                os.replace(tmp_path, path)
+            # The caller's value is not cached: it may still be edited in place
+            self._forget_changed(value, digest)
+        return {BLOB_REF_KEY: digest}
+    
+    def _forget_changed(self, value: Any, digest: Optional[str]):
+        """Drop a value decoded by this store from memory if it no longer hashes to its blob."""
+        with self._lock:
+            cached_digest = self._decoded.get(id(value))
+            if cached_digest is None or cached_digest == digest:
+                return
+            cached = self._memory.get(cached_digest)
+            if cached is not None and cached[0] is value:
+                self._forget(cached_digest)
+    
+    def _remember(self, digest: str, value: Any, size: int):
+        """Keep a decoded value in memory, evicting the least recently used. Called with the lock held."""
+        if digest in self._memory:
+            self._memory.move_to_end(digest)
+            return
+        self._memory[digest] = (value, size)
+        self._memory_bytes += size
+        if isinstance(value, (dict, list)):
+            self._decoded[id(value)] = digest
+        while self._memory_bytes > self.max_memory_bytes and len(self._memory) > 1:
+            self._forget(next(iter(self._memory)))
+    
+    def _forget(self, digest: str):
+        """Drop one decoded value from memory. Called with the lock held."""
+        value, size = self._memory.pop(digest)
+        self._memory_bytes -= size
+        if self._decoded.get(id(value)) == digest:
+            del self._decoded[id(value)]
+    
+    def _forget_all(self):
+        # Pinned references may point at deleted blobs
+        self._pinned.clear()
+        self._memory.clear()
+        self._memory_bytes = 0
+        self._decoded.clear()
@@ -0,0 +1,350 @@
+"""
+Context Store
+
+Journaled, per-workflow persistence for WorkflowContext.
+
+Each workflow gets its own JSONL journal keyed by workflow_id. The first
+record is a full snapshot; every later save appends only what changed
+since the previous save (workflow fields, reassigned stages, changed
+metadata keys and new trace events). The latest state is recovered by
+replaying the journal from its last snapshot. Journals are compacted back
+into a single snapshot periodically and when a workflow finishes.
+
+Large stage inputs and outputs are kept in a blob store next to the
+journals (see blob_store) and journaled as references, so an output
+passed on to later stages is written once rather than with every stage.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional, Tuple, TYPE_CHECKING
+
+from workflows.blob_store import BlobStore
+
+if TYPE_CHECKING:
+    from workflows.workflow_engine import WorkflowContext
+
+
+# Top-level WorkflowContext fields journaled as scalars
+WORKFLOW_FIELDS = (
+    "workflow_id",
+    "task_description",
+    "task_type",
+    "pipeline",
+    "started_at",
+    "completed_at",
+    "status",
+    "current_agent",
+)
+
+FINAL_STATUSES = ("completed", "failed")
+
+
+@dataclass
+class _JournalState:
+    """What has already been written to a workflow's journal."""
+    workflow: Dict[str, Any] = field(default_factory=dict)
+    # Agent -> (status, started_at, completed_at, error, input_data, output_data).
+    # The payloads are held, not their ids, so a freed id cannot be reused.
+    stages: Dict[str, Tuple] = field(default_factory=dict)
+    metadata: Dict[str, str] = field(default_factory=dict)  # Key -> digest of its JSON
+    trace: Optional[List[Any]] = None  # Trace list journaled so far, held for the same reason
+    trace_len: int = 0
+    updates_since_snapshot: int = 0
+
+
+def _stage_fingerprint(stage: Any) -> Tuple:
+    return (stage.status, stage.started_at, stage.completed_at, stage.error, stage.input_data, stage.output_data)
+
+
+def _stage_changed(old: Optional[Tuple], new: Tuple) -> bool:
+    """Compare stage fingerprints: scalars by value, payloads by identity."""
+    return old is None or old[:4] != new[:4] or old[4] is not new[4] or old[5] is not new[5]
+
+
+def _digest(value: Any) -> str:
+    """Digest a metadata value's JSON, so reassigned and edited values are both detected."""
+    return hashlib.sha256(json.dumps(value, default=str).encode("utf-8")).hexdigest()
+
+
+class ContextStore:
+    """
+    Store for workflow contexts, one append-only journal per workflow.
+    
+    Stages are treated as changed when their status or times change or
+    their input or output is reassigned (the engine assigns fresh dicts for
+    stage input and output), so a checkpoint costs time proportional to the
+    change rather than to the accumulated outputs; in-place edits of stage
+    payloads are picked up by the next compaction. Stage outputs stay pinned
+    in the blob store while they are the journaled output of their stage,
+    so later stages holding them are journaled without hashing them again.
+    Metadata values are small and compared by a digest of their JSON.
+    
+    The journal state is only advanced once its record has been written,
+    so a failed checkpoint is retried in full by the next one.
+    """
+    
+    JOURNAL_SUFFIX = ".jsonl"
+    BLOB_DIR = "blobs"
+    
+    def __init__(self, root_dir: str, compact_every: int = 100, blob_store: Optional[BlobStore] = None):
+        """
+        Initialize the context store.
+        
+        Args:
+            root_dir: Directory holding one journal per workflow.
+            compact_every: Number of incremental updates after which the
+                          journal is rewritten as a single snapshot.
+            blob_store: Store for large stage payloads. Defaults to a
+                        "blobs" directory under root_dir.
+        """
+        self.root_dir = root_dir
+        self.compact_every = max(1, compact_every)
+        self.blob_store = blob_store or BlobStore(os.path.join(root_dir, self.BLOB_DIR))
+        self._states: Dict[str, _JournalState] = {}
+        self._lock = threading.Lock()
+    
+    def journal_path(self, workflow_id: str) -> str:
+        """Get the journal path for a workflow."""
+        return os.path.join(self.root_dir, f"{workflow_id}{self.JOURNAL_SUFFIX}")
+    
+    def save(self, context: "WorkflowContext"):
+        """
+        Checkpoint a workflow context.
+        
+        Appends a delta record, or writes a fresh snapshot if the journal
+        is new to this store, due for compaction, or the workflow finished.
+        """
+        with self._lock:
+            state = self._states.get(context.workflow_id)
+            if (
+                state is None
+                or state.updates_since_snapshot >= self.compact_every
+                or (context.status in FINAL_STATUSES and context.status != state.workflow.get("status"))
+            ):
+                self._write_snapshot(context)
+                return
+            
+            new_state, metadata = self._capture(context)
+            new_state.updates_since_snapshot = state.updates_since_snapshot
+            update = self._build_update(context, state, new_state, metadata)
+            if update:
+                try:
+                    with open(self.journal_path(context.workflow_id), "a") as f:
+                        f.write(json.dumps({"op": "update", **update}, default=str) + "\n")
+                except BaseException:
+                    self._release(new_state, state)
+                    raise
+                new_state.updates_since_snapshot += 1
+            self._release(state, new_state)
+            self._states[context.workflow_id] = new_state
+    
+    def load(self, workflow_id: Optional[str] = None) -> Optional["WorkflowContext"]:
+        """
+        Recover a workflow context by replaying its journal.
+        
+        Args:
+            workflow_id: Workflow to load. Defaults to the most recently
+                        updated workflow.
+        
+        Returns:
+            The recovered WorkflowContext, or None if there is no journal.
+        """
+        from workflows.workflow_engine import WorkflowContext
+        
+        if workflow_id is None:
+            workflow_ids = self.list_workflows()
+            if not workflow_ids:
+                return None
+            workflow_id = workflow_ids[0]
+        
+        data = self._replay(self.journal_path(workflow_id))
+        if data is None:
+            return None
+        
+        try:
+            return WorkflowContext.from_dict(data, self.blob_store)
+        except (KeyError, ValueError):
+            return None
+    
+    def list_workflows(self) -> List[str]:
+        """List stored workflow IDs, most recently updated first."""
+        if not os.path.isdir(self.root_dir):
+            return []
+        
+        journals = [
+            os.path.join(self.root_dir, name)
+            for name in os.listdir(self.root_dir)
+            if name.endswith(self.JOURNAL_SUFFIX)
+        ]
+        journals.sort(key=os.path.getmtime, reverse=True)
+        return [os.path.basename(path)[:-len(self.JOURNAL_SUFFIX)] for path in journals]
+    
+    def compact(self, workflow_id: str):
+        """Rewrite a workflow's journal as a single snapshot of its replayed state."""
+        with self._lock:
+            context = self.load(workflow_id)
+            if context:
+                self._write_snapshot(context)
+    
+    def delete(self, workflow_id: Optional[str] = None):
+        """
+        Delete stored workflows.
+        
+        Args:
+            workflow_id: Workflow to delete. Deletes every journal, and
+                        the blobs they reference, if None.
+        """
+        with self._lock:
+            workflow_ids = [workflow_id] if workflow_id else self.list_workflows()
+            for wid in workflow_ids:
+                state = self._states.pop(wid, None)
+                if state is not None:
+                    self._release(state)
+                path = self.journal_path(wid)
+                if os.path.exists(path):
+                    os.remove(path)
+            if not workflow_id:
+                # Blobs are shared between workflows, so only dropped with all of them
+                self.blob_store.clear()
+    
+    def _write_snapshot(self, context: "WorkflowContext"):
+        """Atomically replace a journal with a single snapshot record."""
+        os.makedirs(self.root_dir, exist_ok=True)
+        path = self.journal_path(context.workflow_id)
+        tmp_path = f"{path}.tmp"
+        
+        # Rehash every output, so in-place edits reach the snapshot
+        old_state = self._states.get(context.workflow_id)
+        if old_state is not None:
+            self._release(old_state)
+        state, metadata = self._capture(context)
+        data = context.to_dict(self.blob_store)
+        data["metadata"] = metadata
+        if state.trace is not None:
+            data["metadata"]["trace"] = state.trace[:state.trace_len]
+        try:
+            with open(tmp_path, "w") as f:
+                f.write(json.dumps({"op": "snapshot", "context": data}, default=str) + "\n")
+            os.replace(tmp_path, path)
+        except BaseException:
+            self._release(state, old_state)
+            raise
+        
+        self._states[context.workflow_id] = state
+    
+    def _release(self, old: _JournalState, new: Optional[_JournalState] = None):
+        """Unpin the stage outputs of a journal state that the new state no longer holds."""
+        kept = {id(fingerprint[5]) for fingerprint in new.stages.values()} if new else set()
+        for fingerprint in old.stages.values():
+            if id(fingerprint[5]) not in kept:
+                self.blob_store.unpin(fingerprint[5])
+    
+    @staticmethod
+    def _capture(context: "WorkflowContext") -> Tuple[_JournalState, Dict[str, Any]]:
+        """
+        Fingerprint the context as a checkpoint will write it.
+        
+        Returns the journal state after the write and a copy of the
+        metadata: workers may add keys while the scheduling thread saves.
+        """
+        metadata = dict(context.metadata)
+        workflow = {name: getattr(context, name) for name in WORKFLOW_FIELDS}
+        workflow["task_type"] = context.task_type.value
+        # Keep our own copy so in-place pipeline edits are detected
+        workflow["pipeline"] = list(context.pipeline)
+        trace = metadata.get("trace")
+        state = _JournalState(
+            workflow=workflow,
+            stages={agent_name: _stage_fingerprint(stage) for agent_name, stage in list(context.stages.items())},
+            metadata={key: _digest(value) for key, value in metadata.items() if key != "trace"},
+            trace=trace,
+            trace_len=len(trace) if trace is not None else 0,
+        )
+        return state, metadata
+    
+    def _build_update(
+        self,
+        context: "WorkflowContext",
+        old: _JournalState,
+        new: _JournalState,
+        metadata: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Collect what changed between the journaled state and the captured one."""
+        update: Dict[str, Any] = {}
+        
+        changed_fields = {
+            name: value for name, value in new.workflow.items()
+            if name not in old.workflow or old.workflow[name] != value
+        }
+        if changed_fields:
+            update["workflow"] = changed_fields
+        
+        changed_stages = {
+            agent_name: context.stages[agent_name].to_dict(self.blob_store)
+            for agent_name, fingerprint in new.stages.items()
+            if _stage_changed(old.stages.get(agent_name), fingerprint)
+        }
+        if changed_stages:
+            update["stages"] = changed_stages
+        
+        changed_metadata = {
+            key: metadata[key] for key, digest in new.metadata.items()
+            if old.metadata.get(key) != digest
+        }
+        removed_metadata = [key for key in old.metadata if key not in new.metadata]
+        if changed_metadata:
+            update["metadata"] = changed_metadata
+        if removed_metadata:
+            update["metadata_removed"] = removed_metadata
+        
+        trace = new.trace or []
+        if new.trace is not old.trace or new.trace_len < old.trace_len:
+            if new.trace_len or old.trace_len:
+                update["trace_reset"] = True
+                update["trace"] = trace[:new.trace_len]
+        elif new.trace_len > old.trace_len:
+            update["trace"] = trace[old.trace_len:new.trace_len]
+        
+        return update
+    
+    @staticmethod
+    def _replay(path: str) -> Optional[Dict[str, Any]]:
+        """Rebuild a context dict from a journal, starting at its last snapshot."""
+        if not os.path.exists(path):
+            return None
+        
+        data: Optional[Dict[str, Any]] = None
+        with open(path, "r") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final write from a crash; everything before it is intact
+                    continue
+                
+                if record.get("op") == "snapshot":
+                    data = record["context"]
+                elif record.get("op") == "update" and data is not None:
+                    ContextStore._apply_update(data, record)
+        
+        return data
+    
+    @staticmethod
+    def _apply_update(data: Dict[str, Any], record: Dict[str, Any]):
+        """Apply one update record to a context dict."""
+        data.update(record.get("workflow", {}))
+        data.setdefault("stages", {}).update(record.get("stages", {}))
+        
+        metadata = data.setdefault("metadata", {})
+        metadata.update(record.get("metadata", {}))
+        for key in record.get("metadata_removed", []):
+            metadata.pop(key, None)
+        
+        if record.get("trace_reset"):
+            metadata["trace"] = list(record.get("trace", []))
+        elif record.get("trace"):
+            metadata.setdefault("trace", []).extend(record["trace"])
@@ -0,0 +1,93 @@
+"""
+Keyword Matcher
+
+Multi-pattern substring matcher used for task type detection.
+
+All keywords are compiled into one regular expression shaped like a trie
+(shared prefixes are factored out), which finds the longest keyword
+starting at a position. Each search resumes one character after the last
+match, so overlapping keywords are found too, and shorter keywords that
+are prefixes of a match are expanded from a precomputed table. Matching
+cost grows with the length of the text, not with the number of keywords.
+"""
+
+import re
+from typing import Dict, Hashable, Iterable, List, Set
+
+
+class KeywordMatcher:
+    """
+    Case-insensitive matcher for a fixed set of labelled keywords.
+    
+    Keywords match anywhere in the text (plain substring semantics), and a
+    keyword may belong to several labels.
+    """
+    
+    def __init__(self, keywords: Dict[Hashable, Iterable[str]]):
+        """
+        Compile the matcher.
+        
+        Args:
+            keywords: Mapping of label (e.g. a TaskType) to its keywords.
+        """
+        self._labels: Dict[str, List[Hashable]] = {}
+        for label, label_keywords in keywords.items():
+            for keyword in label_keywords:
+                keyword = keyword.lower()
+                if keyword and label not in self._labels.setdefault(keyword, []):
+                    self._labels[keyword].append(label)
+        
+        # Every keyword that is a prefix of another also matches wherever the longer one does
+        self._prefixes: Dict[str, List[str]] = {
+            keyword: [other for other in self._labels if keyword.startswith(other)]
+            for keyword in self._labels
+        }
+        
+        self._pattern = re.compile(self._trie_pattern(sorted(self._labels))) if self._labels else None
+    
+    def find(self, text: str) -> Set[str]:
+        """Get the distinct keywords occurring in text."""
+        if self._pattern is None:
+            return set()
+        
+        text = text.lower()
+        search = self._pattern.search
+        found: Set[str] = set()
+        match = search(text)
+        while match:
+            found.update(self._prefixes[match.group()])
+            match = search(text, match.start() + 1)
+        return found
+    
+    def count(self, text: str) -> Dict[Hashable, int]:
+        """Count the distinct keywords of each label occurring in text."""
+        counts: Dict[Hashable, int] = {}
+        for keyword in self.find(text):
+            for label in self._labels[keyword]:
+                counts[label] = counts.get(label, 0) + 1
+        return counts
+    
+    @classmethod
+    def _trie_pattern(cls, keywords: List[str]) -> str:
+        """
+        Build a regex for a sorted list of keywords, factoring out shared prefixes.
+        
+        Optional groups are greedy, so the longest keyword at a position wins.
+        """
+        terminal = "" in keywords
+        branches: Dict[str, List[str]] = {}
+        for keyword in keywords:
+            if keyword:
+                branches.setdefault(keyword[0], []).append(keyword[1:])
+        
+        alternatives = [
+            re.escape(char) + cls._trie_pattern(rest)
+            for char, rest in branches.items()
+        ]
+        if not alternatives:
+            return ""
+        
+        body = alternatives[0] if len(alternatives) == 1 else f"(?:{'|'.join(alternatives)})"
+        if terminal:
+            return f"(?:{body})?"
+        return body
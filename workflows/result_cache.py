@@ -0,0 +1,246 @@
+"""
+Result Cache
+
+Content-addressed, on-disk cache of agent stage results.
+
+Entries are keyed by a SHA-256 of the agent name, handler version, repo
+revision and a canonical JSON encoding of the stage input, so a re-run
+with unchanged inputs against an unchanged working tree returns the
+stored result instead of executing the agent again. The cache is bounded
+by total size and evicts least recently used entries first.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import subprocess
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Any, Optional, Tuple, TYPE_CHECKING
+
+from workflows.tracing import tracer
+
+if TYPE_CHECKING:
+    from workflows.workflow_engine import AgentResult
+
+logger = logging.getLogger("pnd_agents.result_cache")
+
+
+def stable_hash(payload: Any) -> str:
+    """Hash a JSON-compatible payload independently of dict ordering."""
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def git_revision(repo_root: str) -> Optional[str]:
+    """
+    Get a revision string identifying the state of a git working tree.
+    
+    Returns the HEAD commit, suffixed with a digest of uncommitted changes
+    (tracked diffs plus untracked file sizes and mtimes) when the tree is
+    dirty, or None if repo_root is not a git repository.
+    """
+    def git(*args: str) -> subprocess.CompletedProcess:
+        with tracer.span(f"git {args[0]}", "subprocess", {"command": " ".join(["git", *args])}) as span:
+            result = subprocess.run(
+                ["git", *args], cwd=repo_root, capture_output=True, timeout=30
+            )
+            span.set_attribute("exit_code", result.returncode)
+            return result
+    
+    try:
+        head = git("rev-parse", "HEAD")
+        if head.returncode != 0:
+            return None
+        revision = head.stdout.decode().strip()
+        
+        status = git("status", "--porcelain", "--untracked-files=all")
+        if not status.stdout.strip():
+            return revision
+        
+        digest = hashlib.sha256(status.stdout)
+        digest.update(git("diff", "HEAD").stdout)
+        for line in status.stdout.decode(errors="replace").splitlines():
+            if line.startswith("??"):
+                path = os.path.join(repo_root, line[3:].strip())
+                try:
+                    stat = os.stat(path)
+                    digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+                except OSError:
+                    pass
+        return f"{revision}+dirty.{digest.hexdigest()[:12]}"
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+class ResultCache:
+    """
+    Disk-backed LRU cache of AgentResults.
+    
+    Features:
+    - One JSON file per entry, sharded by key prefix
+    - Size-based eviction of least recently used entries
+    - Hit/miss/eviction counters
+    - Safe for concurrent use from multiple threads
+    """
+    
+    def __init__(self, root_dir: str, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Initialize the result cache.
+        
+        Args:
+            root_dir: Directory holding cache entries.
+            max_bytes: Maximum total size of cache entries on disk.
+        """
+        self.root_dir = root_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # key -> (size in bytes, last access time); loaded from disk on first use
+        self._index: Optional[Dict[str, Tuple[int, float]]] = None
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def make_key(self, agent_name: str, version: str, revision: Optional[str], payload: Dict[str, Any]) -> str:
+        """Build the cache key for an agent invocation."""
+        return stable_hash({
+            "agent": agent_name,
+            "version": version,
+            "revision": revision,
+            "payload": payload,
+        })
+    
+    def get(self, key: str) -> Optional["AgentResult"]:
+        """
+        Look up a cached result, marking it as recently used.
+        
+        Returns:
+            The cached AgentResult, or None on a miss.
+        """
+        from workflows.workflow_engine import AgentResult
+        
+        path = self._entry_path(key)
+        with self._lock:
+            self._load_index()
+            try:
+                with open(path, "r") as f:
+                    entry = json.load(f)
+                os.utime(path)
+            except (OSError, ValueError):
+                self.misses += 1
+                self._forget(key)
+                return None
+            
+            self.hits += 1
+            self._index[key] = (self._index.get(key, (0, 0))[0], time.time())
+        
+        result = entry["result"]
+        return AgentResult(
+            status=result["status"],
+            data=result.get("data", {}),
+            next=result.get("next"),
+            error=result.get("error")
+        )
+    
+    def put(self, key: str, agent_name: str, result: "AgentResult"):
+        """Store a result and evict old entries if the cache is over budget."""
+        entry = json.dumps({
+            "key": key,
+            "agent": agent_name,
+            "created_at": datetime.utcnow().isoformat(),
+            "result": {
+                "status": result.status,
+                "data": result.data,
+                "next": result.next,
+                "error": result.error,
+            },
+        }, default=str)
+        
+        path = self._entry_path(key)
+        with self._lock:
+            self._load_index()
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w") as f:
+                f.write(entry)
+            os.replace(tmp_path, path)
+            
+            self._forget(key)
+            size = len(entry.encode("utf-8"))
+            self._index[key] = (size, time.time())
+            self._total_bytes += size
+            self._evict()
+    
+    def clear(self):
+        """Delete every cache entry."""
+        with self._lock:
+            self._load_index()
+            for key in list(self._index):
+                self._remove(key)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get cache counters and size."""
+        with self._lock:
+            self._load_index()
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._index),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+            }
+    
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.root_dir, key[:2], f"{key}.json")
+    
+    def _load_index(self):
+        """Scan existing entries once so eviction accounts for earlier runs."""
+        if self._index is not None:
+            return
+        
+        self._index = {}
+        self._total_bytes = 0
+        if not os.path.isdir(self.root_dir):
+            return
+        
+        for shard in os.listdir(self.root_dir):
+            shard_dir = os.path.join(self.root_dir, shard)
+            if not os.path.isdir(shard_dir):
+                continue
+            for name in os.listdir(shard_dir):
+                if not name.endswith(".json"):
+                    continue
+                try:
+                    stat = os.stat(os.path.join(shard_dir, name))
+                except OSError:
+                    continue
+                self._index[name[:-len(".json")]] = (stat.st_size, stat.st_mtime)
+                self._total_bytes += stat.st_size
+    
+    def _evict(self):
+        """Remove least recently used entries until the cache fits its budget."""
+        if self._total_bytes <= self.max_bytes:
+            return
+        
+        for key, _ in sorted(self._index.items(), key=lambda item: item[1][1]):
+            if self._total_bytes <= self.max_bytes:
+                break
+            self._remove(key)
+            self.evictions += 1
+    
+    def _forget(self, key: str):
+        """Drop a key from the index without touching disk."""
+        size, _ = self._index.pop(key, (0, 0))
+        self._total_bytes -= size
+    
+    def _remove(self, key: str):
+        """Delete an entry from disk and the index."""
+        self._forget(key)
+        try:
+            os.remove(self._entry_path(key))
+        except OSError:
+            pass
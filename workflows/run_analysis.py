@@ -0,0 +1,379 @@
+"""
+Run Analysis
+
+Critical-path and bottleneck report for finished workflows.
+
+The stage timeline is rebuilt from the start and end times recorded on
+each stage, and the execution plan from the workflow metadata: parallel
+groups, a dependency graph, or a sequential pipeline. From these the
+report derives:
+
+- the critical path: the chain of stages that set the wall time
+- idle time per parallel group: worker time spent waiting at the group
+  barrier for the group's slowest stage
+- worker utilization: busy worker-seconds over available worker-seconds
+- what-if speedups, re-simulated from the recorded durations: moving a
+  stage to another parallel group, or halving a critical-path stage
+
+Stages that did not record both times (pending, or restored from an
+earlier run) are left out of the timeline.
+"""
+
+import heapq
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from workflows.workflow_engine import WorkflowContext
+
+# What-if scenarios reported, largest saving first
+MAX_WHAT_IFS = 5
+
+# Savings smaller than this (seconds) are not reported
+MIN_SAVING_SECONDS = 0.001
+
+
+@dataclass
+class StageTiming:
+    """When a stage ran, in seconds from the start of the workflow."""
+    agent: str
+    status: str
+    start: float
+    end: float
+    group: Optional[int] = None  # Index into the parallel groups
+    
+    @property
+    def duration(self) -> float:
+        return max(0.0, self.end - self.start)
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def stage_timeline(context: "WorkflowContext") -> List[StageTiming]:
+    """Get the timing of every stage that recorded a start and end, in start order."""
+    times = []
+    for agent, stage in context.stages.items():
+        start, end = _parse_time(stage.started_at), _parse_time(stage.completed_at)
+        if start and end:
+            times.append((agent, stage.status, start, end))
+    if not times:
+        return []
+    
+    origin = _parse_time(context.started_at) or min(start for _, _, start, _ in times)
+    origin = min([origin] + [start for _, _, start, _ in times])
+    groups = context.metadata.get("execution", {}).get("parallel_groups") or []
+    group_of = {agent: idx for idx, group in enumerate(groups) for agent in group}
+    
+    timings = [
+        StageTiming(
+            agent=agent,
+            status=status,
+            start=(start - origin).total_seconds(),
+            end=(end - origin).total_seconds(),
+            group=group_of.get(agent),
+        )
+        for agent, status, start, end in times
+    ]
+    return sorted(timings, key=lambda timing: (timing.start, timing.end))
+
+
+def _run_dependencies(context: "WorkflowContext", timed: List[str]) -> Dict[str, List[str]]:
+    """
+    Get what each timed stage waited for in this run.
+    
+    Parallel groups are a barrier, so a stage waited for every stage of
+    the previous group that ran.
+    """
+    plan = context.metadata.get("execution", {})
+    timed_set = set(timed)
+    if plan.get("parallel_groups"):
+        deps: Dict[str, List[str]] = {}
+        previous: List[str] = []
+        for group in plan["parallel_groups"]:
+            ran = [agent for agent in group if agent in timed_set]
+            for agent in ran:
+                deps[agent] = list(previous)
+            if ran:
+                previous = ran
+        return deps
+    if plan.get("dependencies"):
+        return {
+            agent: [dep for dep in plan["dependencies"].get(agent, []) if dep in timed_set]
+            for agent in timed
+        }
+    order = [agent for agent in context.pipeline if agent in timed_set]
+    return {agent: order[idx - 1:idx] for idx, agent in enumerate(order)}
+
+
+def critical_path(timings: List[StageTiming], dependencies: Dict[str, List[str]]) -> List[StageTiming]:
+    """
+    Get the chain of stages that set the wall time.
+    
+    Starts from the stage that finished last and follows, at each step,
+    the dependency that finished last.
+    """
+    if not timings:
+        return []
+    by_agent = {timing.agent: timing for timing in timings}
+    current = max(timings, key=lambda timing: timing.end)
+    path = [current]
+    seen = {current.agent}
+    while True:
+        upstream = [by_agent[dep] for dep in dependencies.get(current.agent, []) if dep in by_agent]
+        upstream = [timing for timing in upstream if timing.agent not in seen]
+        if not upstream:
+            break
+        current = max(upstream, key=lambda timing: timing.end)
+        path.append(current)
+        seen.add(current.agent)
+    return list(reversed(path))
+
+
+def _makespan(durations: List[float], workers: int) -> float:
+    """Time to run independent tasks on a number of workers, longest first."""
+    if not durations:
+        return 0.0
+    loads = [0.0] * max(1, min(workers, len(durations)))
+    for duration in sorted(durations, reverse=True):
+        heapq.heapreplace(loads, loads[0] + duration)
+    return max(loads)
+
+
+def simulate_groups(groups: List[List[str]], durations: Dict[str, float], workers: int) -> float:
+    """Wall time of parallel groups run one after another with the given durations."""
+    return sum(
+        _makespan([durations[agent] for agent in group if agent in durations], workers)
+        for group in groups
+    )
+
+
+def simulate_dag(dependencies: Dict[str, List[str]], durations: Dict[str, float], workers: int) -> float:
+    """Wall time of a dependency graph, starting each stage once its dependencies finish and a worker is free."""
+    remaining = {agent: set(deps) & set(durations) for agent, deps in dependencies.items() if agent in durations}
+    ready = [agent for agent, deps in remaining.items() if not deps]
+    running: List[Tuple[float, str]] = []
+    now = 0.0
+    while ready or running:
+        while ready and len(running) < max(1, workers):
+            agent = ready.pop(0)
+            heapq.heappush(running, (now + durations[agent], agent))
+        now, finished = heapq.heappop(running)
+        for agent, deps in remaining.items():
+            if finished in deps:
+                deps.discard(finished)
+                if not deps:
+                    ready.append(agent)
+    return now
+
+
+def _peak_concurrency(timings: List[StageTiming]) -> int:
+    """Most stages running at the same time."""
+    events = sorted(
+        [(timing.start, 1) for timing in timings] + [(timing.end, -1) for timing in timings],
+        key=lambda event: (event[0], event[1])
+    )
+    peak = running = 0
+    for _, delta in events:
+        running += delta
+        peak = max(peak, running)
+    return peak
+
+
+def _group_report(groups: List[List[str]], timings: List[StageTiming]) -> List[Dict[str, Any]]:
+    """Wall, busy and idle time of each parallel group that ran."""
+    by_agent = {timing.agent: timing for timing in timings}
+    report = []
+    for idx, group in enumerate(groups):
+        ran = [by_agent[agent] for agent in group if agent in by_agent]
+        if not ran:
+            continue
+        start = min(timing.start for timing in ran)
+        end = max(timing.end for timing in ran)
+        slowest = max(ran, key=lambda timing: timing.end)
+        report.append({
+            "group": idx + 1,
+            "agents": [timing.agent for timing in ran],
+            "start": round(start, 3),
+            "wall_seconds": round(end - start, 3),
+            "busy_seconds": round(sum(timing.duration for timing in ran), 3),
+            # Worker time spent waiting for the slowest stage at the group barrier
+            "idle_seconds": round(sum(end - timing.end for timing in ran), 3),
+            "slowest": slowest.agent,
+        })
+    return report
+
+
+def _move_is_valid(
+    agent: str,
+    target: int,
+    groups: List[List[str]],
+    dependencies: Optional[Dict[str, List[str]]]
+) -> bool:
+    """Check that a stage moved to a group still runs after its dependencies and before its dependents."""
+    if dependencies is None:
+        return True
+    group_of = {other: idx for idx, group in enumerate(groups) for other in group}
+    for dep in dependencies.get(agent, []):
+        if dep in group_of and group_of[dep] >= target:
+            return False
+    for other, deps in dependencies.items():
+        if agent in deps and other in group_of and group_of[other] <= target:
+            return False
+    return True
+
+
+def _move_what_ifs(
+    groups: List[List[str]],
+    durations: Dict[str, float],
+    workers: int,
+    dependencies: Optional[Dict[str, List[str]]]
+) -> List[Dict[str, Any]]:
+    """Savings from moving one stage into another parallel group."""
+    baseline = simulate_groups(groups, durations, workers)
+    what_ifs = []
+    for source, group in enumerate(groups):
+        for agent in group:
+            if agent not in durations:
+                continue
+            # Without a dependency graph, only neighbouring groups are suggested
+            targets = range(len(groups)) if dependencies is not None else (source - 1, source + 1)
+            for target in targets:
+                if target == source or not 0 <= target < len(groups):
+                    continue
+                if not _move_is_valid(agent, target, groups, dependencies):
+                    continue
+                moved = [
+                    [other for other in members if other != agent] + ([agent] if idx == target else [])
+                    for idx, members in enumerate(groups)
+                ]
+                saves = baseline - simulate_groups(moved, durations, workers)
+                if saves >= MIN_SAVING_SECONDS:
+                    what_ifs.append({
+                        "kind": "move",
+                        "agent": agent,
+                        "from_group": source + 1,
+                        "to_group": target + 1,
+                        "saves_seconds": round(saves, 3),
+                        "dependency_checked": dependencies is not None,
+                        "description": f"moving `{agent}` from group {source + 1} to group {target + 1} saves {saves:.1f}s",
+                    })
+    return what_ifs
+
+
+def _speedup_what_ifs(
+    path: List[StageTiming],
+    simulate,
+    durations: Dict[str, float]
+) -> List[Dict[str, Any]]:
+    """Savings from making each critical-path stage twice as fast."""
+    baseline = simulate(durations)
+    what_ifs = []
+    for timing in path:
+        saves = baseline - simulate({**durations, timing.agent: durations[timing.agent] / 2})
+        if saves >= MIN_SAVING_SECONDS:
+            what_ifs.append({
+                "kind": "speedup",
+                "agent": timing.agent,
+                "saves_seconds": round(saves, 3),
+                "description": f"making `{timing.agent}` 2x faster saves {saves:.1f}s",
+            })
+    return what_ifs
+
+
+def analyze_run(
+    context: "WorkflowContext",
+    dependencies: Optional[Dict[str, List[str]]] = None
+) -> Dict[str, Any]:
+    """
+    Build the critical-path and bottleneck report of a workflow run.
+    
+    Args:
+        context: The workflow context, e.g. from WorkflowEngine.load_context().
+        dependencies: Data dependencies between agents, e.g. the task type's
+                      "dependencies" from workflow_rules.json. Used to check
+                      that a suggested group move keeps each agent after its
+                      inputs; without it only moves to a neighbouring group
+                      are suggested.
+    
+    Returns:
+        Dict with "stages", "critical_path", "groups" (parallel runs),
+        "utilization" and "what_if" (largest saving first).
+    """
+    plan = context.metadata.get("execution", {})
+    timings = stage_timeline(context)
+    durations = {timing.agent: timing.duration for timing in timings}
+    run_dependencies = _run_dependencies(context, list(durations))
+    path = critical_path(timings, run_dependencies)
+    
+    wall = max((timing.end for timing in timings), default=0.0) - min((timing.start for timing in timings), default=0.0)
+    busy = sum(durations.values())
+    peak = _peak_concurrency(timings)
+    workers = plan.get("max_workers") or max(peak, 1)
+    if plan.get("mode") == "sequential":
+        workers = 1
+    
+    groups = [list(group) for group in plan.get("parallel_groups") or []]
+    if groups:
+        def simulate(values):
+            return simulate_groups(groups, values, workers)
+        what_ifs = _move_what_ifs(groups, durations, workers, dependencies)
+    else:
+        def simulate(values):
+            return simulate_dag(run_dependencies, values, workers)
+        what_ifs = []
+    what_ifs += _speedup_what_ifs(path, simulate, durations)
+    what_ifs.sort(key=lambda what_if: -what_if["saves_seconds"])
+    simulated = simulate(durations)
+    
+    previous_end = None
+    path_stages = []
+    for timing in path:
+        path_stages.append({
+            "agent": timing.agent,
+            "duration_seconds": round(timing.duration, 3),
+            # Scheduling gap between the upstream stage finishing and this one starting
+            "wait_seconds": round(max(0.0, timing.start - previous_end), 3) if previous_end is not None else 0.0,
+        })
+        previous_end = timing.end
+    
+    return {
+        "workflow_id": context.workflow_id,
+        "status": context.status,
+        "mode": plan.get("mode", "sequential"),
+        "wall_seconds": round(wall, 3),
+        # Wall time the plan needs with these durations; the rest is engine overhead
+        "simulated_seconds": round(simulated, 3),
+        "stages": [
+            {
+                "agent": timing.agent,
+                "status": timing.status,
+                "group": timing.group + 1 if timing.group is not None else None,
+                "start": round(timing.start, 3),
+                "end": round(timing.end, 3),
+                "duration_seconds": round(timing.duration, 3),
+            }
+            for timing in timings
+        ],
+        "critical_path": {
+            "agents": [timing.agent for timing in path],
+            "seconds": round(sum(timing.duration for timing in path), 3),
+            "stages": path_stages,
+        },
+        "groups": _group_report(groups, timings),
+        "utilization": {
+            "workers": workers,
+            "peak_concurrency": peak,
+            "busy_seconds": round(busy, 3),
+            "capacity_seconds": round(wall * workers, 3),
+            "utilization": round(busy / (wall * workers), 3) if wall > 0 else 0.0,
+        },
+        "what_if": what_ifs[:MAX_WHAT_IFS],
+    }
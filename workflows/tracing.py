@@ -0,0 +1,368 @@
+"""
+Tracing
+
+Spans for workflow stages, cross-agent calls, HTTP requests and
+subprocess runs, exported per workflow as Chrome trace-event JSON or
+OTLP/JSON.
+
+The workflow trace events in context metadata say what happened; spans
+say where the time went. Each span records its thread, so a Chrome trace
+shows parallel groups side by side, one track per worker thread, with the
+HTTP and subprocess spans of a stage nested under it. Chrome traces open
+in Perfetto (ui.perfetto.dev) and chrome://tracing; OTLP/JSON files can be
+posted to an OpenTelemetry collector.
+
+Stage and cross-agent call spans name their workflow explicitly. Other
+spans are recorded only inside one of those: the current span is held in
+a context variable, so HTTP requests and commands run outside a workflow,
+or while tracing is off, cost one lookup.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# Trace file formats
+TRACE_FORMATS = ("chrome", "otlp")
+
+# Workflows whose spans are kept in memory
+DEFAULT_MAX_TRACES = 32
+
+# Spans kept per workflow; later spans are counted and dropped
+DEFAULT_MAX_SPANS = 100000
+
+# Span times are wall-clock nanoseconds measured with the monotonic clock
+_EPOCH_OFFSET_NS = time.time_ns() - time.perf_counter_ns()
+
+
+def _now_ns() -> int:
+    return time.perf_counter_ns() + _EPOCH_OFFSET_NS
+
+
+@dataclass
+class Span:
+    """One timed operation in a workflow trace."""
+    name: str
+    category: str  # stage, cross_agent_call, http, subprocess
+    trace_id: str  # Workflow ID
+    span_id: str = field(default_factory=lambda: uuid.uuid4().hex[:16])
+    parent_id: Optional[str] = None
+    start_ns: int = field(default_factory=_now_ns)
+    end_ns: Optional[int] = None
+    thread_id: int = field(default_factory=threading.get_ident)
+    thread_name: str = field(default_factory=lambda: threading.current_thread().name)
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+    
+    @property
+    def duration_ns(self) -> int:
+        return (self.end_ns or self.start_ns) - self.start_ns
+    
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+    
+    def set_error(self, error: str):
+        self.error = error
+
+
+class _NoopSpan:
+    """Stand-in yielded when a span is not recorded."""
+    
+    def set_attribute(self, key: str, value: Any):
+        pass
+    
+    def set_error(self, error: str):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+# Span enclosing the code running in this context
+current_span: ContextVar[Optional[Span]] = ContextVar("pnd_current_span", default=None)
+
+
+class Tracer:
+    """
+    Thread-safe span collector keyed by workflow.
+    
+    Features:
+    - Disabled by default; span() is a no-op until enable()
+    - Parent spans follow the context, including into handler threads
+    - Bounded number of traces and spans per trace
+    - Chrome trace-event and OTLP/JSON export
+    """
+    
+    def __init__(self, max_traces: int = DEFAULT_MAX_TRACES, max_spans: int = DEFAULT_MAX_SPANS):
+        """
+        Initialize the tracer.
+        
+        Args:
+            max_traces: Workflows whose spans are kept; the least recently
+                        traced are forgotten first.
+            max_spans: Spans kept per workflow.
+        """
+        self.enabled = False
+        self.max_traces = max_traces
+        self.max_spans = max_spans
+        self._traces: "OrderedDict[str, List[Span]]" = OrderedDict()
+        self._dropped: Dict[str, int] = {}
+        self._lock = threading.Lock()
+    
+    def enable(self, enabled: bool = True):
+        """Turn span recording on or off."""
+        self.enabled = enabled
+    
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        category: str,
+        attributes: Optional[Dict[str, Any]] = None,
+        trace_id: Optional[str] = None
+    ) -> Iterator[Any]:
+        """
+        Time a block as a span.
+        
+        Args:
+            name: Span name shown in the trace viewer.
+            category: Kind of operation (stage, http, subprocess, ...).
+            attributes: Extra details recorded with the span.
+            trace_id: Workflow the span belongs to; defaults to the
+                      enclosing span's. Without either, nothing is recorded.
+        
+        Yields:
+            The span, for set_attribute() and set_error() calls.
+        """
+        span = self.start_span(name, category, attributes, trace_id)
+        if span is None:
+            yield _NOOP_SPAN
+            return
+        
+        token = current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set_error(f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            current_span.reset(token)
+            self.end_span(span)
+    
+    def start_span(
+        self,
+        name: str,
+        category: str,
+        attributes: Optional[Dict[str, Any]] = None,
+        trace_id: Optional[str] = None
+    ) -> Optional[Span]:
+        """
+        Start a span without making it current; finish it with end_span().
+        
+        Returns:
+            The span, or None if it is not recorded.
+        """
+        if not self.enabled:
+            return None
+        parent = current_span.get()
+        if trace_id is None:
+            if parent is None:
+                return None
+            trace_id = parent.trace_id
+        return Span(
+            name=name,
+            category=category,
+            trace_id=trace_id,
+            parent_id=parent.span_id if parent is not None and parent.trace_id == trace_id else None,
+            attributes=dict(attributes or {}),
+        )
+    
+    def end_span(self, span: Span):
+        """Finish a span and record it."""
+        span.end_ns = _now_ns()
+        with self._lock:
+            spans = self._traces.get(span.trace_id)
+            if spans is None:
+                spans = self._traces[span.trace_id] = []
+                while len(self._traces) > self.max_traces:
+                    evicted, _ = self._traces.popitem(last=False)
+                    self._dropped.pop(evicted, None)
+            self._traces.move_to_end(span.trace_id)
+            if len(spans) < self.max_spans:
+                spans.append(span)
+            else:
+                self._dropped[span.trace_id] = self._dropped.get(span.trace_id, 0) + 1
+    
+    def spans(self, trace_id: str) -> List[Span]:
+        """Get the finished spans of a workflow, in start order."""
+        with self._lock:
+            spans = list(self._traces.get(trace_id, ()))
+        return sorted(spans, key=lambda span: span.start_ns)
+    
+    def clear(self, trace_id: Optional[str] = None):
+        """Forget the spans of one workflow, or of every workflow if None."""
+        with self._lock:
+            if trace_id is None:
+                self._traces.clear()
+                self._dropped.clear()
+            else:
+                self._traces.pop(trace_id, None)
+                self._dropped.pop(trace_id, None)
+    
+    def to_chrome(self, trace_id: str) -> Dict[str, Any]:
+        """
+        Render a workflow's spans as Chrome trace-event JSON.
+        
+        Spans become complete ("X") events on one track per thread, with
+        timestamps in microseconds from the first span.
+        """
+        spans = self.spans(trace_id)
+        origin = spans[0].start_ns if spans else 0
+        pid = os.getpid()
+        events: List[Dict[str, Any]] = [{
+            "name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+            "args": {"name": f"workflow {trace_id}"},
+        }]
+        
+        threads: Dict[int, str] = {}
+        for span in spans:
+            threads.setdefault(span.thread_id, span.thread_name)
+            args = {"span_id": span.span_id, **span.attributes}
+            if span.parent_id:
+                args["parent_id"] = span.parent_id
+            if span.error:
+                args["error"] = span.error
+            events.append({
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": (span.start_ns - origin) / 1000,
+                "dur": span.duration_ns / 1000,
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": args,
+            })
+        for thread_id, thread_name in threads.items():
+            events.append({
+                "name": "thread_name", "ph": "M", "pid": pid, "tid": thread_id,
+                "args": {"name": thread_name},
+            })
+        
+        with self._lock:
+            dropped = self._dropped.get(trace_id, 0)
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"workflow_id": trace_id, "dropped_spans": dropped},
+        }
+    
+    def to_otlp(self, trace_id: str, service_name: str = "pnd-agents") -> Dict[str, Any]:
+        """Render a workflow's spans as an OTLP/JSON ExportTraceServiceRequest."""
+        otlp_trace_id = hashlib.sha256(trace_id.encode("utf-8")).hexdigest()[:32]
+        otlp_spans = []
+        for span in self.spans(trace_id):
+            attributes = {"thread.id": span.thread_id, "thread.name": span.thread_name, **span.attributes}
+            otlp_span = {
+                "traceId": otlp_trace_id,
+                "spanId": span.span_id,
+                "name": span.name,
+                "kind": 3 if span.category == "http" else 1,  # CLIENT or INTERNAL
+                "startTimeUnixNano": str(span.start_ns),
+                "endTimeUnixNano": str(span.end_ns or span.start_ns),
+                "attributes": [_otlp_attribute("pnd.category", span.category)]
+                + [_otlp_attribute(key, value) for key, value in attributes.items()],
+                "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+            }
+            if span.parent_id:
+                otlp_span["parentSpanId"] = span.parent_id
+            otlp_spans.append(otlp_span)
+        
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [
+                    _otlp_attribute("service.name", service_name),
+                    _otlp_attribute("pnd.workflow_id", trace_id),
+                ]},
+                "scopeSpans": [{"scope": {"name": "pnd_agents.workflow"}, "spans": otlp_spans}],
+            }]
+        }
+    
+    def export(self, trace_id: str, path: str, format: str = "chrome") -> str:
+        """
+        Write a workflow's spans to a file.
+        
+        Args:
+            trace_id: Workflow ID.
+            path: File to write.
+            format: One of TRACE_FORMATS.
+        
+        Returns:
+            The path written.
+        
+        Raises:
+            ValueError: If the format is unknown.
+        """
+        if format not in TRACE_FORMATS:
+            raise ValueError(f"Unknown trace format: {format} (expected one of {TRACE_FORMATS})")
+        
+        data = self.to_chrome(trace_id) if format == "chrome" else self.to_otlp(trace_id)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(data, f, default=str)
+        os.replace(temp_path, path)
+        return path
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    """Build an OTLP KeyValue."""
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+# Process-wide tracer used by the engine, HTTP clients and command runners
+tracer = Tracer()
+
+
+def http_event_hooks() -> Dict[str, List[Callable[[Any], None]]]:
+    """
+    Get httpx event hooks recording each request made inside a span.
+    
+    The span ends when the response headers arrive, so it covers
+    connection, upload and server time but not reading the body.
+    Requests that fail before a response are not recorded.
+    """
+    def on_request(request):
+        span = tracer.start_span(
+            f"{request.method} {request.url.host}{request.url.path}",
+            "http",
+            {"http.method": request.method, "http.url": str(request.url.copy_with(query=None))},
+        )
+        if span is not None:
+            request.extensions["pnd_span"] = span
+    
+    def on_response(response):
+        span = response.request.extensions.get("pnd_span")
+        if span is not None:
+            span.set_attribute("http.status_code", response.status_code)
+            if response.status_code >= 500:
+                span.set_error(f"HTTP {response.status_code}")
+            tracer.end_span(span)
+    
+    return {"request": [on_request], "response": [on_response]}
@@ -7,21 +7,51 @@ building workflow plans, and executing agents in sequence or parallel.
 Supports:
 - Sequential execution (default)
 - Parallel execution for independent agents
-- Cross-agent communication via call_agent hook
-- Comprehensive logging and tracing
+- Dependency-driven (DAG) execution with ready-queue scheduling
+- Native asyncio execution with async or sync agent handlers
+- Per-agent execution policy (thread, process, inline)
+- Per-agent concurrency limits shared by every workflow on the engine
+- Per-agent stage timeouts with cooperative cancellation and straggler policies
+- Optional content-addressed cache of agent results (see result_cache)
+- Precise resume of interrupted sequential, parallel and DAG runs
+- Compiled keyword matching for task type detection (see keyword_matcher)
+- Cross-agent communication via call_agent hooks, memoized per workflow
+  and run concurrently with cycle detection
+- Comprehensive logging and tracing, with per-workflow span traces
+  exported as Chrome trace-event or OTLP JSON (see tracing)
+- Per-workflow journaled context persistence (see context_store), with
+  large stage payloads stored once by content hash (see blob_store)
 - Multi-repo support via RepoAdapter (Code Singularity pattern)
 """
 
+import asyncio
+import contextvars
+import functools
+import inspect
 import json
 import logging
+import multiprocessing
 import os
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import OrderedDict
+from concurrent.futures import (
+    FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait,
+    TimeoutError as FuturesTimeoutError
+)
 from datetime import datetime
 from enum import Enum
-from typing import Dict, List, Any, Optional, Callable, TYPE_CHECKING
+from typing import Dict, List, Any, Optional, Callable, Awaitable, Iterable, Tuple, Union, Protocol, TYPE_CHECKING
 from dataclasses import dataclass, field
 
+from workflows.adaptive_scheduler import SCHEDULERS, AdaptiveScheduler
+from workflows.blob_store import BlobStore
+from workflows.context_store import ContextStore
+from workflows.keyword_matcher import KeywordMatcher
+from workflows.result_cache import ResultCache, git_revision, stable_hash
+from workflows.run_analysis import analyze_run
+from workflows.tracing import TRACE_FORMATS, tracer
+
 if TYPE_CHECKING:
     from src.agents.repo_adapter import RepoAdapter
 
@@ -52,7 +82,7 @@ class TaskType(Enum):
     DEFAULT = "default"
 
 
-# Keywords for task type detection
+# Default keywords for task type detection, used when the rules file has no "keywords" block
 TASK_KEYWORDS: Dict[TaskType, List[str]] = {
     TaskType.FIGMA: [
         "figma", "design", "frame", "component", "ui spec",
@@ -101,11 +131,12 @@ TASK_KEYWORDS: Dict[TaskType, List[str]] = {
 @dataclass
 class AgentResult:
     """Result from an agent execution."""
-    status: str  # "success", "error", "skipped"
+    status: str  # "success", "error", "skipped", "timeout"
     data: Dict[str, Any] = field(default_factory=dict)
     next: Optional[str] = None  # Next agent to call (optional override)
     error: Optional[str] = None
     duration_ms: float = 0
+    cacheable: bool = True  # Set False for results that depend on external state
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -117,25 +148,104 @@ class AgentResult:
         }
 
 
+class AgentHandler(Protocol):
+    """Synchronous agent handler: takes the handler context and returns an AgentResult."""
+    
+    def __call__(self, context: Dict[str, Any]) -> AgentResult: ...
+
+
+class AsyncAgentHandler(Protocol):
+    """Asynchronous agent handler, awaited directly by run_workflow_async."""
+    
+    def __call__(self, context: Dict[str, Any]) -> Awaitable[AgentResult]: ...
+
+
+AnyAgentHandler = Union[AgentHandler, AsyncAgentHandler]
+
+
+def is_async_handler(handler: Callable[..., Any]) -> bool:
+    """Check whether a handler is a coroutine function or an object with an async __call__."""
+    return inspect.iscoroutinefunction(handler) or inspect.iscoroutinefunction(
+        getattr(handler, "__call__", None)
+    )
+
+
+class StageTimeoutError(Exception):
+    """Raised when an agent handler does not finish within its timeout."""
+    
+    def __init__(self, agent_name: str, timeout: float, future: Any = None):
+        super().__init__(f"Agent {agent_name} timed out after {timeout:g}s")
+        self.agent_name = agent_name
+        self.timeout = timeout
+        self.future = future  # The still-running handler, for straggler tracking
+
+
+class StageCancelledError(Exception):
+    """Raised by CancellationToken.raise_if_cancelled() once a stage has been cancelled."""
+
+
+class CancellationToken:
+    """
+    Cooperative cancellation flag passed to handlers as context["cancel_token"].
+    
+    The engine cancels a stage's token when the stage times out. Threads
+    cannot be interrupted from outside, so long-running handlers should
+    check the token between steps (or wait on it instead of sleeping) and
+    return early once it is set.
+    """
+    
+    def __init__(self):
+        self._event = threading.Event()
+        self.reason: Optional[str] = None
+    
+    def cancel(self, reason: str = "cancelled"):
+        """Request cancellation. Only the first reason is kept."""
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+    
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancellation was requested."""
+        return self._event.is_set()
+    
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until cancelled or timeout seconds pass; returns whether cancelled."""
+        return self._event.wait(timeout)
+    
+    def raise_if_cancelled(self):
+        """Raise StageCancelledError if cancellation was requested."""
+        if self.cancelled:
+            raise StageCancelledError(self.reason)
+
+
 @dataclass
 class WorkflowStage:
     """Represents a stage in the workflow."""
     agent_name: str
-    status: str = "pending"  # pending, in_progress, completed, failed, skipped
+    status: str = "pending"  # pending, in_progress, completed, failed, skipped, timeout
     started_at: Optional[str] = None
     completed_at: Optional[str] = None
     input_data: Dict[str, Any] = field(default_factory=dict)
     output_data: Dict[str, Any] = field(default_factory=dict)
     error: Optional[str] = None
     
-    def to_dict(self) -> Dict[str, Any]:
+    def to_dict(self, blobs: Optional[BlobStore] = None) -> Dict[str, Any]:
+        """
+        Serialize the stage.
+        
+        Args:
+            blobs: Store large input and output values here and serialize
+                   references to them instead of copies. The output is
+                   pinned, so later stages passing it on reuse its reference.
+        """
         return {
             "agent_name": self.agent_name,
             "status": self.status,
             "started_at": self.started_at,
             "completed_at": self.completed_at,
-            "input_data": self.input_data,
-            "output_data": self.output_data,
+            "input_data": blobs.encode(self.input_data) if blobs else self.input_data,
+            "output_data": blobs.pin(self.output_data) if blobs else self.output_data,
             "error": self.error
         }
 
@@ -162,13 +272,21 @@ class WorkflowContext:
             if agent not in self.stages:
                 self.stages[agent] = WorkflowStage(agent_name=agent)
     
-    def to_dict(self) -> Dict[str, Any]:
+    def to_dict(self, blobs: Optional[BlobStore] = None) -> Dict[str, Any]:
+        """
+        Serialize the context.
+        
+        Args:
+            blobs: Store large stage inputs and outputs here and serialize
+                   references to them, so a payload shared by several
+                   stages is written once.
+        """
         return {
             "workflow_id": self.workflow_id,
             "task_description": self.task_description,
             "task_type": self.task_type.value,
             "pipeline": self.pipeline,
-            "stages": {k: v.to_dict() for k, v in self.stages.items()},
+            "stages": {k: v.to_dict(blobs) for k, v in self.stages.items()},
             "started_at": self.started_at,
             "completed_at": self.completed_at,
             "status": self.status,
@@ -177,17 +295,29 @@ class WorkflowContext:
         }
     
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> "WorkflowContext":
-        """Create WorkflowContext from dictionary."""
+    def from_dict(cls, data: Dict[str, Any], blobs: Optional[BlobStore] = None) -> "WorkflowContext":
+        """
+        Create WorkflowContext from dictionary.
+        
+        Args:
+            data: Output of to_dict().
+            blobs: Store resolving blob references in stage inputs and
+                   outputs. Stages referencing the same blob share one object.
+        """
         stages = {}
         for agent, stage_data in data.get("stages", {}).items():
+            input_data = stage_data.get("input_data", {})
+            output_data = stage_data.get("output_data", {})
+            if blobs:
+                input_data = blobs.decode(input_data)
+                output_data = blobs.decode(output_data)
             stages[agent] = WorkflowStage(
                 agent_name=stage_data["agent_name"],
                 status=stage_data["status"],
                 started_at=stage_data.get("started_at"),
                 completed_at=stage_data.get("completed_at"),
-                input_data=stage_data.get("input_data", {}),
-                output_data=stage_data.get("output_data", {}),
+                input_data=input_data,
+                output_data=output_data,
                 error=stage_data.get("error")
             )
         
@@ -297,12 +427,61 @@ class WorkflowEngine:
     5. Stores state for recovery
     """
     
-    CONTEXT_FILE = "/tmp/pnd_agent_context.json"
+    CONTEXT_DIR = "/tmp/pnd_agent_contexts"
+    
+    # How a handler is run when its stage executes:
+    # - thread: in a worker thread (default, suits I/O-bound handlers)
+    # - process: in a shared process pool (CPU-bound handlers, bypasses the GIL)
+    # - inline: directly on the scheduling thread or event loop (cheap handlers)
+    EXECUTION_POLICIES = ("thread", "process", "inline")
+    DEFAULT_EXECUTION_POLICY = "thread"
+    
+    # Whether "process" policies from the rules file are honoured. Off by
+    # default: the pool uses spawn, so scripts driving the engine need an
+    # `if __name__ == "__main__":` guard. Otherwise those agents run as "thread".
+    PROCESS_AGENTS = os.environ.get("PND_PROCESS_AGENTS", "0") == "1"
+    
+    RESULT_CACHE_DIR = "/tmp/pnd_agent_cache"
+    RESULT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+    
+    # Metadata keys that change between runs of the same task and must not
+    # affect result cache keys
+    VOLATILE_METADATA_KEYS = ("trace", "job_id", "result_cache", "execution")
+    
+    # What happens when a stage exceeds its timeout:
+    # - fail: cancel the stage and record it as an error
+    # - skip: cancel the stage and mark it skipped; the workflow carries on
+    # - continue: stop waiting but let the handler finish in the background;
+    #   downstream stages run without its output and a late result is
+    #   recorded on the stage when it arrives
+    STRAGGLER_POLICIES = ("fail", "skip", "continue")
+    DEFAULT_STRAGGLER_POLICY = "fail"
+    
+    # Number of distinct task descriptions whose detected type is memoized
+    TASK_TYPE_CACHE_SIZE = 4096
+    
+    # Stage statuses that resume_workflow keeps instead of re-running
+    RESUME_DONE_STATUSES = ("completed", "skipped")
+    
+    # Worker pool size of parallel and DAG runs under the static scheduler
+    DEFAULT_MAX_WORKERS = 4
+    
+    # Worker threads shared by cross-agent calls
+    CROSS_AGENT_WORKERS = int(os.environ.get("PND_CROSS_AGENT_WORKERS", "8"))
+    
+    # Number of workflows whose cross-agent call results are memoized
+    CROSS_AGENT_MEMO_WORKFLOWS = 64
     
     def __init__(
         self,
         rules_file: Optional[str] = None,
-        repo_adapter: Optional["RepoAdapter"] = None
+        repo_adapter: Optional["RepoAdapter"] = None,
+        max_process_workers: Optional[int] = None,
+        context_dir: Optional[str] = None,
+        trace_dir: Optional[str] = None,
+        trace_format: Optional[str] = None,
+        scheduler: Optional[str] = None,
+        process_agents: Optional[bool] = None
     ):
         """
         Initialize the workflow engine.
@@ -313,10 +492,91 @@ class WorkflowEngine:
             repo_adapter: Optional RepoAdapter for multi-repo support.
                          When provided, repo context is injected into
                          workflow metadata and agent inputs.
+            max_process_workers: Size of the process pool used by agents with
+                                the "process" execution policy. Defaults to
+                                the number of CPUs.
+            context_dir: Directory for per-workflow context journals. Defaults
+                        to "contextDir" from the rules file, then CONTEXT_DIR.
+            trace_dir: Directory for per-workflow span traces, written when a
+                      workflow finishes. Defaults to "traceDir" from the rules
+                      file, then PND_TRACE_DIR; tracing is off without one.
+            trace_format: "chrome" (default) or "otlp". Defaults to
+                         "traceFormat" from the rules file, then PND_TRACE_FORMAT.
+            scheduler: "static" (default) or "adaptive"; see
+                      enable_adaptive_scheduler(). Defaults to "scheduler"
+                      from the rules file, then PND_SCHEDULER.
+            process_agents: Run agents whose rules file policy is "process"
+                           in the process pool. Defaults to PND_PROCESS_AGENTS;
+                           when off they run as "thread". Policies passed to
+                           register_agent() or set_execution_policy() always apply.
         """
         self.rules = self._load_rules(rules_file)
-        self._agent_handlers: Dict[str, Callable] = {}
+        # Data dependencies per task type, used to check what-if group moves
+        self._rule_dependencies: Dict[str, Dict[str, List[str]]] = self._load_rules_section(rules_file, "dependencies")
+        self._keyword_matcher = KeywordMatcher(self._load_keywords(rules_file))
+        self._detect_task_type_cached = functools.lru_cache(maxsize=self.TASK_TYPE_CACHE_SIZE)(
+            self._classify_task
+        )
+        self._agent_handlers: Dict[str, AnyAgentHandler] = {}
         self._repo_adapter = repo_adapter
+        self._execution_policies: Dict[str, str] = {}
+        self._agent_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._agent_timeouts: Dict[str, Optional[float]] = {}
+        self._straggler_policies: Dict[str, str] = {}
+        self._agent_versions: Dict[str, str] = {}
+        self._cacheable_agents: set = set()
+        self.result_cache: Optional[ResultCache] = None
+        self._cache_stats_lock = threading.Lock()
+        self._max_process_workers = max_process_workers
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._process_pool_lock = threading.Lock()
+        self._call_pool: Optional[ThreadPoolExecutor] = None
+        self._cross_agent_calls: "OrderedDict[str, _CrossAgentCalls]" = OrderedDict()  # workflow_id -> calls
+        self._cross_agent_lock = threading.Lock()
+        self.process_agents = self.PROCESS_AGENTS if process_agents is None else process_agents
+        
+        for agent_name, agent_config in self._load_rules_section(rules_file, "agents").items():
+            if "execution" in agent_config:
+                policy = agent_config["execution"]
+                if policy == "process" and not self.process_agents:
+                    policy = self.DEFAULT_EXECUTION_POLICY
+                self.set_execution_policy(agent_name, policy)
+            if agent_config.get("maxConcurrency"):
+                self.set_agent_concurrency(agent_name, agent_config["maxConcurrency"])
+            if agent_config.get("cacheable"):
+                self._cacheable_agents.add(agent_name)
+            if "version" in agent_config:
+                self._agent_versions[agent_name] = str(agent_config["version"])
+            if "timeout" in agent_config or "onTimeout" in agent_config:
+                self.set_agent_timeout(
+                    agent_name,
+                    agent_config["timeout"] / 1000 if agent_config.get("timeout") else None,
+                    on_timeout=agent_config.get("onTimeout")
+                )
+        
+        defaults = self._load_rules_section(rules_file, "defaults")
+        self._defaults = defaults
+        # "timeout" values in the rules file are in milliseconds
+        self._default_timeout: Optional[float] = defaults["timeout"] / 1000 if defaults.get("timeout") else None
+        self._default_straggler_policy = self._validate_straggler_policy(
+            "defaults", defaults.get("onTimeout", self.DEFAULT_STRAGGLER_POLICY)
+        )
+        self.context_store = ContextStore(context_dir or defaults.get("contextDir") or self.CONTEXT_DIR)
+        self.trace_dir = trace_dir or defaults.get("traceDir") or os.environ.get("PND_TRACE_DIR")
+        self.trace_format = (
+            trace_format or defaults.get("traceFormat") or os.environ.get("PND_TRACE_FORMAT") or "chrome"
+        )
+        if self.trace_format not in TRACE_FORMATS:
+            raise ValueError(f"Unknown trace format: {self.trace_format} (expected one of {TRACE_FORMATS})")
+        if self.trace_dir:
+            tracer.enable()
+        
+        self.scheduler = scheduler or defaults.get("scheduler") or os.environ.get("PND_SCHEDULER") or "static"
+        if self.scheduler not in SCHEDULERS:
+            raise ValueError(f"Unknown scheduler: {self.scheduler} (expected one of {SCHEDULERS})")
+        self.adaptive_scheduler: Optional[AdaptiveScheduler] = None
+        if self.scheduler == "adaptive":
+            self.enable_adaptive_scheduler()
     
     def _load_rules(self, rules_file: Optional[str]) -> Dict[str, List[str]]:
         """Load workflow rules from file or use defaults."""
@@ -342,45 +602,289 @@ class WorkflowEngine:
         
         return default_rules
     
-    def register_agent(self, name: str, handler: Callable[[Dict[str, Any]], AgentResult]):
+    def _load_rules_section(self, rules_file: Optional[str], section: str) -> Dict[str, Any]:
+        """Load a top-level block (e.g. "agents" or "defaults") from the rules file."""
+        if rules_file and os.path.exists(rules_file):
+            try:
+                with open(rules_file, "r") as f:
+                    return json.load(f).get(section, {})
+            except Exception:
+                pass
+        
+        return {}
+    
+    def _load_keywords(self, rules_file: Optional[str]) -> Dict[TaskType, List[str]]:
+        """Load task type keywords from the rules file, falling back to TASK_KEYWORDS."""
+        task_types = {task_type.value: task_type for task_type in TaskType}
+        keywords = {
+            task_types[name]: list(values)
+            for name, values in self._load_rules_section(rules_file, "keywords").items()
+            if name in task_types
+        }
+        return keywords or TASK_KEYWORDS
+    
+    def register_agent(self, name: str, handler: AnyAgentHandler, execution: Optional[str] = None):
         """
         Register an agent handler function.
         
         Args:
             name: Agent name (e.g., "figma", "frontend")
-            handler: Function that takes context dict and returns AgentResult
+            handler: Function that takes context dict and returns AgentResult,
+                    or an async function returning AgentResult
+            execution: Optional execution policy ("thread", "process" or "inline").
+                      Overrides the policy from the rules file.
         """
         self._agent_handlers[name] = handler
+        if execution:
+            self.set_execution_policy(name, execution)
+    
+    def set_execution_policy(self, name: str, policy: str):
+        """
+        Set how an agent's handler is run.
+        
+        Handlers with the "process" policy must be picklable (module-level
+        functions or methods of picklable objects) and receive a handler
+        context without the call_agent hooks or cancel token.
+        The pool starts workers with spawn, which re-imports the main
+        module, so a script driving the engine must guard its entry point
+        with `if __name__ == "__main__":`.
+        
+        Args:
+            name: Agent name.
+            policy: One of EXECUTION_POLICIES.
+        
+        Raises:
+            ValueError: If the policy is unknown.
+        """
+        if policy not in self.EXECUTION_POLICIES:
+            raise ValueError(
+                f"Unknown execution policy for {name}: {policy} "
+                f"(expected one of {', '.join(self.EXECUTION_POLICIES)})"
+            )
+        self._execution_policies[name] = policy
+    
+    def get_execution_policy(self, name: str) -> str:
+        """Get the execution policy for an agent."""
+        return self._execution_policies.get(name, self.DEFAULT_EXECUTION_POLICY)
+    
+    def set_agent_concurrency(self, name: str, limit: Optional[int]):
+        """
+        Limit how many instances of an agent may run at once.
+        
+        The limit is shared by every workflow running on this engine, e.g.
+        to cap calls against a rate-limited API when many workflows run
+        concurrently. Nested cross-agent calls to the same agent count
+        against the limit too.
+        
+        Args:
+            name: Agent name.
+            limit: Maximum concurrent executions, or None to remove the limit.
+        """
+        if limit is None:
+            self._agent_semaphores.pop(name, None)
+            return
+        if limit < 1:
+            raise ValueError(f"Concurrency limit for {name} must be at least 1, got {limit}")
+        self._agent_semaphores[name] = threading.BoundedSemaphore(limit)
+    
+    def set_agent_timeout(self, name: str, seconds: Optional[float], on_timeout: Optional[str] = None):
+        """
+        Set how long an agent's handler may run and what happens when it overruns.
+        
+        A timed-out handler's cancel token is cancelled (except with the
+        "continue" policy), but a thread or process that ignores the token
+        keeps running in the background. The agent's concurrency slot is
+        released at the timeout either way.
+        
+        Args:
+            name: Agent name.
+            seconds: Timeout in seconds, or None for no timeout. Overrides
+                    the default "timeout" from the rules file.
+            on_timeout: Optional straggler policy, one of STRAGGLER_POLICIES.
+        
+        Raises:
+            ValueError: If the timeout is not positive or the policy is unknown.
+        """
+        if seconds is not None and seconds <= 0:
+            raise ValueError(f"Timeout for {name} must be positive, got {seconds}")
+        self._agent_timeouts[name] = seconds
+        if on_timeout:
+            self._straggler_policies[name] = self._validate_straggler_policy(name, on_timeout)
+    
+    def get_agent_timeout(self, name: str) -> Optional[float]:
+        """Get an agent's timeout in seconds, or None if it may run indefinitely."""
+        if name in self._agent_timeouts:
+            return self._agent_timeouts[name]
+        return self._default_timeout
+    
+    def get_straggler_policy(self, name: str) -> str:
+        """Get what happens when an agent exceeds its timeout."""
+        return self._straggler_policies.get(name, self._default_straggler_policy)
+    
+    def _validate_straggler_policy(self, name: str, policy: str) -> str:
+        if policy not in self.STRAGGLER_POLICIES:
+            raise ValueError(
+                f"Unknown timeout policy for {name}: {policy} "
+                f"(expected one of {', '.join(self.STRAGGLER_POLICIES)})"
+            )
+        return policy
+    
+    def enable_result_cache(
+        self,
+        cache_dir: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        agents: Optional[List[str]] = None
+    ) -> ResultCache:
+        """
+        Turn on result caching for cacheable agents.
+        
+        A cacheable agent's successful result is stored under a key built
+        from the agent name, its handler version, the repo revision and
+        the stage input (task, input data and non-volatile metadata). A
+        later run with the same key returns the stored result without
+        calling the handler. Nothing is cached outside a git repository,
+        since the revision cannot be determined there.
+        
+        Args:
+            cache_dir: Cache directory. Defaults to "resultCacheDir" from the
+                      rules file, then RESULT_CACHE_DIR.
+            max_bytes: Size budget. Defaults to "resultCacheMaxBytes" from the
+                      rules file, then RESULT_CACHE_MAX_BYTES.
+            agents: Additional agents to mark cacheable, on top of those with
+                   "cacheable": true in the rules file.
+        
+        Returns:
+            The engine's ResultCache.
+        """
+        self.result_cache = ResultCache(
+            cache_dir or self._defaults.get("resultCacheDir") or self.RESULT_CACHE_DIR,
+            max_bytes or self._defaults.get("resultCacheMaxBytes") or self.RESULT_CACHE_MAX_BYTES
+        )
+        self._cacheable_agents.update(agents or [])
+        return self.result_cache
+    
+    def enable_adaptive_scheduler(
+        self,
+        store: Optional[Any] = None,
+        history_days: Optional[int] = None
+    ) -> AdaptiveScheduler:
+        """
+        Schedule stages from historical agent durations.
+        
+        Ready stages are submitted longest expected (p50) duration first.
+        Parallel and DAG runs size their worker pool to the expected
+        parallelism, with max_workers as an upper bound when given, and a
+        warning is logged for each parallel group whose expected makespan
+        is dominated by one agent. Every stage's handler time is recorded
+        with the workflow's task type, so estimates improve with use.
+        
+        Args:
+            store: AnalyticsStore holding the duration history. Defaults to
+                   the shared analytics store.
+            history_days: Days of history used. Defaults to
+                         "schedulerHistoryDays" from the rules file, then
+                         PND_SCHEDULER_HISTORY_DAYS.
+        
+        Returns:
+            The engine's AdaptiveScheduler.
+        """
+        kwargs = {}
+        if history_days or self._defaults.get("schedulerHistoryDays"):
+            kwargs["history_days"] = history_days or self._defaults["schedulerHistoryDays"]
+        self.adaptive_scheduler = AdaptiveScheduler(store, **kwargs)
+        self.scheduler = "adaptive"
+        return self.adaptive_scheduler
+    
+    def get_agent_version(self, name: str) -> str:
+        """
+        Get the version used in an agent's result cache keys.
+        
+        Combines the "version" from the rules file with the handler's
+        qualified name, so swapping the handler also invalidates entries.
+        """
+        handler = self._agent_handlers.get(name)
+        handler_name = getattr(handler, "__qualname__", type(handler).__name__)
+        return f"{self._agent_versions.get(name, '1')}:{handler_name}"
+    
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        """Get the shared process pool, creating it on first use."""
+        with self._process_pool_lock:
+            if self._process_pool is None:
+                # spawn avoids forking a process that already runs scheduler threads
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=self._max_process_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._process_pool
+    
+    def _get_call_pool(self) -> ThreadPoolExecutor:
+        """Get the thread pool shared by cross-agent calls, creating it on first use."""
+        with self._process_pool_lock:
+            if self._call_pool is None:
+                self._call_pool = ThreadPoolExecutor(
+                    max_workers=self.CROSS_AGENT_WORKERS,
+                    thread_name_prefix="pnd-call"
+                )
+            return self._call_pool
+    
+    def shutdown(self, wait: bool = True):
+        """
+        Shut down the process pool used by "process" agents and the cross-agent call pool, if started.
+        
+        Stage durations queued by the adaptive scheduler are written first.
+        """
+        if self.adaptive_scheduler is not None:
+            self.adaptive_scheduler.close()
+        with self._process_pool_lock:
+            if self._process_pool is not None:
+                self._process_pool.shutdown(wait=wait)
+                self._process_pool = None
+            if self._call_pool is not None:
+                self._call_pool.shutdown(wait=wait)
+                self._call_pool = None
     
     def detect_task_type(self, task_description: str) -> TaskType:
         """
         Detect the task type from the description.
         
+        Each task type scores one point per distinct keyword found in the
+        description; the highest score wins. Results are memoized for the
+        most recent TASK_TYPE_CACHE_SIZE descriptions.
+        
         Args:
             task_description: The task description text.
             
         Returns:
             The detected TaskType.
         """
-        description_lower = task_description.lower()
+        return self._detect_task_type_cached(task_description)
+    
+    def detect_task_types(self, task_descriptions: Iterable[str]) -> List[TaskType]:
+        """
+        Detect the task types of many descriptions, e.g. for batch triage.
+        
+        Args:
+            task_descriptions: Task description texts.
         
+        Returns:
+            The detected TaskTypes, in input order.
+        """
+        return [self._detect_task_type_cached(description) for description in task_descriptions]
+    
+    def _classify_task(self, task_description: str) -> TaskType:
+        """Score task types with one pass of the compiled keyword matcher."""
         # Check for Figma URLs first (highest priority)
-        if "figma.com" in description_lower:
+        if "figma.com" in task_description.lower():
             return TaskType.FIGMA
         
-        # Score each task type based on keyword matches
-        scores: Dict[TaskType, int] = {t: 0 for t in TaskType}
+        scores = self._keyword_matcher.count(task_description)
         
-        for task_type, keywords in TASK_KEYWORDS.items():
-            for keyword in keywords:
-                if keyword.lower() in description_lower:
-                    scores[task_type] += 1
-        
-        # Find the task type with highest score
+        # Find the task type with highest score; ties go to the first in TaskType order
         max_score = 0
         detected_type = TaskType.DEFAULT
         
-        for task_type, score in scores.items():
+        for task_type in TaskType:
+            score = scores.get(task_type, 0)
             if score > max_score:
                 max_score = score
                 detected_type = task_type
@@ -472,29 +976,101 @@ class WorkflowEngine:
         return self._repo_adapter.run_command(command_name, extra_args)
     
     def save_context(self, context: WorkflowContext):
-        """Save workflow context to file."""
+        """Checkpoint workflow context to its journal in the context store."""
+        if self.trace_dir and context.status in ("completed", "failed"):
+            self._write_trace(context)
         try:
-            with open(self.CONTEXT_FILE, "w") as f:
-                json.dump(context.to_dict(), f, indent=2)
+            self.context_store.save(context)
         except Exception as e:
             print(f"Warning: Could not save context: {e}")
     
-    def load_context(self) -> Optional[WorkflowContext]:
-        """Load workflow context from file."""
-        if not os.path.exists(self.CONTEXT_FILE):
+    def export_trace(self, workflow_id: str, path: Optional[str] = None, format: Optional[str] = None) -> Optional[str]:
+        """
+        Write the spans recorded for a workflow to a trace file.
+        
+        Args:
+            workflow_id: Workflow to export.
+            path: File to write. Defaults to <trace_dir>/<workflow_id>.<format>.json.
+            format: "chrome" or "otlp"; defaults to the engine's trace format.
+        
+        Returns:
+            The path written, or None if no spans were recorded.
+        
+        Raises:
+            ValueError: If the format is unknown, or no path is given and the
+                        engine has no trace_dir.
+        """
+        format = format or self.trace_format
+        if not tracer.spans(workflow_id):
             return None
+        if path is None:
+            if not self.trace_dir:
+                raise ValueError("No trace path given and no trace_dir configured")
+            path = os.path.join(self.trace_dir, f"{workflow_id}.{format}.json")
+        return tracer.export(workflow_id, path, format)
+    
+    def _write_trace(self, context: WorkflowContext):
+        """Export a finished workflow's spans and record the file in its metadata."""
+        try:
+            path = self.export_trace(context.workflow_id)
+        except Exception as e:
+            logger.warning(f"Could not write trace for {context.workflow_id}: {e}")
+            return
+        if path:
+            context.metadata["trace_file"] = path
+    
+    def load_context(self, workflow_id: Optional[str] = None) -> Optional[WorkflowContext]:
+        """
+        Load a workflow context from the context store.
         
+        Args:
+            workflow_id: Workflow to load. Defaults to the most recently
+                        updated workflow.
+        """
         try:
-            with open(self.CONTEXT_FILE, "r") as f:
-                data = json.load(f)
-                return WorkflowContext.from_dict(data)
+            return self.context_store.load(workflow_id)
         except Exception:
             return None
     
-    def clear_context(self):
-        """Clear the saved context file."""
-        if os.path.exists(self.CONTEXT_FILE):
-            os.remove(self.CONTEXT_FILE)
+    def analyze_run(
+        self,
+        workflow_id: Optional[str] = None,
+        dependencies: Optional[Dict[str, List[str]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Build the critical-path and bottleneck report of a saved workflow run.
+        
+        The stage timeline is rebuilt from the recorded stage start and end
+        times; see workflows.run_analysis for what the report contains.
+        
+        Args:
+            workflow_id: Workflow to analyze. Defaults to the most recently
+                        updated workflow.
+            dependencies: Data dependencies used to check suggested group
+                          moves. Defaults to the task type's "dependencies"
+                          from the rules file.
+        
+        Returns:
+            The report dict.
+        
+        Raises:
+            KeyError: If the workflow is not found.
+        """
+        context = self.load_context(workflow_id)
+        if context is None:
+            raise KeyError(f"Workflow not found: {workflow_id or '(latest)'}")
+        if dependencies is None:
+            dependencies = self._rule_dependencies.get(context.task_type.value)
+        return analyze_run(context, dependencies)
+    
+    def clear_context(self, workflow_id: Optional[str] = None):
+        """
+        Clear saved workflow contexts.
+        
+        Args:
+            workflow_id: Workflow to clear. Clears every saved workflow if None.
+        """
+        self.context_store.delete(workflow_id)
     
     def execute_agent(
         self,
@@ -529,6 +1105,7 @@ class WorkflowEngine:
         
         # Check if handler is registered
         handler = self._agent_handlers.get(agent_name)
+        timed_out = None
         if not handler:
             # Return a placeholder result if no handler
             result = AgentResult(
@@ -538,14 +1115,14 @@ class WorkflowEngine:
             )
         else:
             try:
-                # Execute the handler
-                result = handler({
-                    "task": context.task_description,
-                    "input": input_data,
-                    "metadata": context.metadata,
-                    "workflow_id": context.workflow_id,
-                    "agent_name": agent_name
-                })
+                # Execute the handler, or reuse a cached result
+                result = self._call_handler_cached(
+                    agent_name, handler, context, input_data,
+                    self._build_handler_context(agent_name, context, input_data)
+                )
+            except StageTimeoutError as e:
+                timed_out = e
+                result = self._timeout_result(context, e)
             except Exception as e:
                 result = AgentResult(
                     status="error",
@@ -562,6 +1139,8 @@ class WorkflowEngine:
             if result.error:
                 stage.error = result.error
         
+        if timed_out:
+            self._watch_straggler(context, stage, timed_out)
         self.save_context(context)
         
         return result
@@ -587,6 +1166,7 @@ class WorkflowEngine:
             Updated WorkflowContext.
         """
         context.status = "running"
+        context.metadata["execution"] = {"mode": "sequential", "continue_on_error": continue_on_error}
         self.save_context(context)
         
         # Start with task description as initial input
@@ -655,14 +1235,17 @@ class WorkflowEngine:
         parallel_groups: Optional[List[List[str]]] = None,
         on_stage_start: Optional[Callable[[str, WorkflowContext], None]] = None,
         on_stage_complete: Optional[Callable[[str, AgentResult, WorkflowContext], None]] = None,
-        max_workers: int = 4,
-        continue_on_error: bool = False
+        max_workers: Optional[int] = None,
+        continue_on_error: bool = False,
+        dependencies: Optional[Dict[str, List[str]]] = None
     ) -> WorkflowContext:
         """
         Run a workflow with parallel execution support.
         
         Agents within the same group run in parallel, groups run sequentially.
-        If parallel_groups is None, falls back to sequential execution.
+        If dependencies are given, the workflow runs in DAG mode instead
+        (see run_workflow_dag). If neither is given, falls back to
+        sequential execution.
         
         Args:
             context: The workflow context.
@@ -670,18 +1253,40 @@ class WorkflowEngine:
                             Example: [["figma"], ["frontend", "backend"], ["review"], ["unit_test", "performance"]]
             on_stage_start: Callback when a stage starts.
             on_stage_complete: Callback when a stage completes.
-            max_workers: Maximum number of parallel workers.
+            max_workers: Maximum number of parallel workers. Defaults to
+                        DEFAULT_MAX_WORKERS, or with adaptive scheduling to
+                        each group's expected parallelism.
             continue_on_error: If True, continue to next stages even if one fails.
                               Failed stages are recorded but don't stop the workflow.
-            
+            dependencies: Optional mapping of agent name to its upstream agents.
+                         When provided, agents start as soon as their upstream
+                         agents finish instead of waiting for a whole group.
+        
         Returns:
             Updated WorkflowContext.
         """
+        if dependencies:
+            return self.run_workflow_dag(
+                context,
+                dependencies,
+                on_stage_start=on_stage_start,
+                on_stage_complete=on_stage_complete,
+                max_workers=max_workers,
+                continue_on_error=continue_on_error
+            )
+        
         if not parallel_groups:
             logger.info("No parallel groups specified, falling back to sequential execution")
             return self.run_workflow(context, on_stage_start, on_stage_complete, continue_on_error)
         
         context.status = "running"
+        context.metadata["execution"] = {
+            "mode": "parallel",
+            "parallel_groups": parallel_groups,
+            "max_workers": max_workers or self.DEFAULT_MAX_WORKERS,
+            "continue_on_error": continue_on_error
+        }
+        group_plan = self._plan_groups(context, parallel_groups, max_workers)
         context.add_trace_event("workflow", "start", "running", details={"parallel_groups": parallel_groups})
         self.save_context(context)
         
@@ -695,7 +1300,7 @@ class WorkflowEngine:
         all_outputs: Dict[str, Dict[str, Any]] = {}
         had_error = False
         
-        for group_idx, agent_group in enumerate(parallel_groups):
+        for group_idx, (agent_group, group_workers) in enumerate(group_plan):
             logger.info(f"Executing group {group_idx + 1}/{len(parallel_groups)}: {agent_group}")
             context.add_trace_event(
                 "group", "start", "running",
@@ -734,18 +1339,15 @@ class WorkflowEngine:
                 group_results: Dict[str, AgentResult] = {}
                 group_errors: List[str] = []
                 
-                with ThreadPoolExecutor(max_workers=min(max_workers, len(agent_group))) as executor:
+                with ThreadPoolExecutor(max_workers=group_workers) as executor:
                     future_to_agent = {}
                     
-                    for agent_name in agent_group:
+                    for agent_name in self._inline_last(agent_group):
                         if on_stage_start:
                             on_stage_start(agent_name, context)
                         
                         agent_input = {**current_input, "all_outputs": all_outputs}
-                        future = executor.submit(
-                            self._execute_agent_thread_safe,
-                            agent_name, context, agent_input
-                        )
+                        future = self._submit_stage(executor, agent_name, context, agent_input)
                         future_to_agent[future] = agent_name
                     
                     for future in as_completed(future_to_agent):
@@ -769,6 +1371,9 @@ class WorkflowEngine:
                                 status="error",
                                 error=str(e)
                             )
+                        
+                        # Checkpoint each finished agent so a crash mid-group keeps it
+                        self.save_context(context)
                 
                 if group_errors:
                     had_error = True
@@ -809,85 +1414,1013 @@ class WorkflowEngine:
         logger.info(f"Workflow {'completed with errors' if had_error else 'completed successfully'}")
         return context
     
-    def _execute_agent_thread_safe(
+    def run_workflow_dag(
         self,
-        agent_name: str,
         context: WorkflowContext,
-        input_data: Dict[str, Any]
-    ) -> AgentResult:
-        """
-        Thread-safe wrapper for execute_agent.
-        
-        Avoids concurrent writes to context file by not saving during execution.
+        dependencies: Dict[str, List[str]],
+        on_stage_start: Optional[Callable[[str, WorkflowContext], None]] = None,
+        on_stage_complete: Optional[Callable[[str, AgentResult, WorkflowContext], None]] = None,
+        max_workers: Optional[int] = None,
+        continue_on_error: bool = False
+    ) -> WorkflowContext:
         """
+        Run a workflow as a dependency graph.
         
-        stage = context.stages.get(agent_name)
-        if stage:
-            stage.status = "in_progress"
-            stage.started_at = datetime.utcnow().isoformat()
-            stage.input_data = input_data
-        
-        context.current_agent = agent_name
-        
-        start_time = time.time()
+        Each agent starts as soon as all of its upstream agents have finished,
+        so a slow agent only delays the agents that actually depend on it.
+        Ready agents are scheduled on a shared executor in pipeline order,
+        or longest expected duration first with adaptive scheduling.
         
-        handler = self._agent_handlers.get(agent_name)
-        if not handler:
-            result = AgentResult(
-                status="skipped",
-                data={"message": f"No handler registered for agent: {agent_name}"},
-                error=None
-            )
-        else:
-            try:
-                call_agent_func = self._create_call_agent_func(context)
-                
-                result = handler({
-                    "task": context.task_description,
-                    "input": input_data,
-                    "metadata": context.metadata,
-                    "workflow_id": context.workflow_id,
-                    "agent_name": agent_name,
-                    "call_agent": call_agent_func
-                })
-            except Exception as e:
-                logger.error(f"Agent {agent_name} execution failed: {e}")
-                result = AgentResult(
-                    status="error",
-                    error=str(e)
-                )
+        Each agent receives the outputs of its direct upstream agents as
+        "previous_outputs", the output of its first upstream agent as
+        "previous_output", and every output produced so far as "all_outputs".
         
-        result.duration_ms = (time.time() - start_time) * 1000
+        Args:
+            context: The workflow context.
+            dependencies: Mapping of agent name to the agents it depends on.
+                         Example: {"frontend": [], "unit_test": ["frontend"],
+                         "performance": ["frontend"], "review": ["frontend", "unit_test"]}
+            on_stage_start: Callback when a stage starts.
+            on_stage_complete: Callback when a stage completes.
+            max_workers: Maximum number of parallel workers. Defaults to
+                        DEFAULT_MAX_WORKERS, or with adaptive scheduling to
+                        the graph's expected parallelism.
+            continue_on_error: If True, dependents of a failed stage still run.
+                              Failed stages are recorded but don't stop the workflow.
         
-        if stage:
-            stage.status = "completed" if result.status == "success" else result.status
-            stage.completed_at = datetime.utcnow().isoformat()
-            stage.output_data = result.data
-            if result.error:
-                stage.error = result.error
+        Returns:
+            Updated WorkflowContext.
         
-        context.add_trace_event(
-            agent_name, "execute", result.status,
-            duration_ms=result.duration_ms,
-            details={"has_data": bool(result.data), "has_error": bool(result.error)}
+        Raises:
+            ValueError: If the dependency graph contains a cycle.
+        """
+        schedule = self._start_dag(
+            context, dependencies, mode="dag",
+            continue_on_error=continue_on_error, max_workers=max_workers or self.DEFAULT_MAX_WORKERS
+        )
+        self._run_dag_schedule(
+            context, schedule, on_stage_start, on_stage_complete,
+            self._dag_pool_size(context, schedule, max_workers), continue_on_error
         )
         
-        return result
+        return self._finish_dag(context, schedule)
     
-    def _create_call_agent_func(self, context: WorkflowContext) -> Callable[[str, Dict[str, Any]], AgentResult]:
+    async def run_workflow_async(
+        self,
+        context: WorkflowContext,
+        parallel_groups: Optional[List[List[str]]] = None,
+        dependencies: Optional[Dict[str, List[str]]] = None,
+        on_stage_start: Optional[Callable[[str, WorkflowContext], None]] = None,
+        on_stage_complete: Optional[Callable[[str, AgentResult, WorkflowContext], None]] = None,
+        max_concurrency: int = 32,
+        continue_on_error: bool = False
+    ) -> WorkflowContext:
         """
-        Create a call_agent function for cross-agent communication.
+        Run a workflow on the asyncio event loop.
         
-        This allows agents to call other agents directly during execution.
+        Async handlers are awaited directly and sync handlers run in a worker
+        thread via asyncio.to_thread, so one event loop can drive many
+        I/O-bound stages at once. Stages are scheduled as a dependency graph:
+        explicit dependencies are used as-is, parallel groups become barrier
+        dependencies, and otherwise the pipeline runs as a chain.
+        
+        Args:
+            context: The workflow context.
+            parallel_groups: Optional list of agent groups (see run_workflow_parallel).
+            dependencies: Optional mapping of agent name to its upstream agents.
+            on_stage_start: Callback when a stage starts.
+            on_stage_complete: Callback when a stage completes.
+            max_concurrency: Maximum number of stages running at once.
+            continue_on_error: If True, dependents of a failed stage still run.
+        
+        Returns:
+            Updated WorkflowContext.
         """
-        def call_agent(agent_name: str, input_data: Dict[str, Any]) -> AgentResult:
-            logger.info(f"Cross-agent call: calling {agent_name}")
-            context.add_trace_event(
-                agent_name, "cross_agent_call", "started",
-                details={"caller": context.current_agent}
-            )
-            
-            handler = self._agent_handlers.get(agent_name)
+        if not dependencies:
+            if parallel_groups:
+                dependencies = self.dependencies_from_groups(parallel_groups)
+            else:
+                dependencies = {
+                    agent_name: context.pipeline[idx - 1:idx]
+                    for idx, agent_name in enumerate(context.pipeline)
+                }
+        
+        schedule = self._start_dag(
+            context, dependencies, mode="async",
+            continue_on_error=continue_on_error, max_workers=max_concurrency
+        )
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        running: Dict[asyncio.Task, str] = {}
+        
+        while True:
+            for agent_name in schedule.take_ready():
+                if on_stage_start:
+                    on_stage_start(agent_name, context)
+                
+                task = asyncio.ensure_future(self._execute_agent_async(
+                    agent_name, context, schedule.build_input(agent_name), semaphore
+                ))
+                running[task] = agent_name
+            
+            if not running:
+                break
+            
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                agent_name = running.pop(task)
+                try:
+                    result = task.result()
+                except Exception as e:
+                    logger.error(f"Agent {agent_name} failed with exception: {e}")
+                    result = AgentResult(status="error", error=str(e))
+                
+                self._complete_dag_stage(
+                    agent_name, result, context, schedule,
+                    on_stage_complete, continue_on_error
+                )
+        
+        return self._finish_dag(context, schedule)
+    
+    def resume_workflow(
+        self,
+        context: WorkflowContext,
+        on_stage_start: Optional[Callable[[str, WorkflowContext], None]] = None,
+        on_stage_complete: Optional[Callable[[str, AgentResult, WorkflowContext], None]] = None,
+        max_workers: Optional[int] = None,
+        continue_on_error: Optional[bool] = None
+    ) -> WorkflowContext:
+        """
+        Resume an interrupted workflow, re-running only unfinished stages.
+        
+        The execution plan recorded when the workflow started (sequential
+        pipeline, parallel groups or dependency graph) is replayed as a
+        dependency graph. Completed and skipped stages are not executed
+        again: their persisted outputs are restored so downstream stages
+        receive the same "previous_output(s)" and "all_outputs" as in the
+        original run. Pending, interrupted and failed stages run again,
+        including the unfinished agents of a partially completed group.
+        
+        Args:
+            context: The workflow context, e.g. from load_context().
+            on_stage_start: Callback when a stage starts.
+            on_stage_complete: Callback when a stage completes.
+            max_workers: Maximum number of parallel workers (see run_workflow_dag).
+            continue_on_error: Overrides the setting recorded for the original run.
+        
+        Returns:
+            Updated WorkflowContext.
+        """
+        plan = context.metadata.get("execution", {"mode": "sequential"})
+        if continue_on_error is None:
+            continue_on_error = plan.get("continue_on_error", False)
+        
+        if plan.get("dependencies"):
+            dependencies = plan["dependencies"]
+        elif plan.get("parallel_groups"):
+            dependencies = self.dependencies_from_groups(plan["parallel_groups"])
+        else:
+            dependencies = {
+                agent_name: context.pipeline[idx - 1:idx]
+                for idx, agent_name in enumerate(context.pipeline)
+            }
+        
+        completed = [
+            agent_name for agent_name, stage in context.stages.items()
+            if stage.status in self.RESUME_DONE_STATUSES
+        ]
+        logger.info(f"Resuming workflow {context.workflow_id}, keeping {len(completed)} finished stages")
+        
+        schedule = self._start_dag(
+            context, dependencies, mode="resume",
+            continue_on_error=continue_on_error, completed=completed
+        )
+        self._run_dag_schedule(
+            context, schedule, on_stage_start, on_stage_complete,
+            self._dag_pool_size(context, schedule, max_workers), continue_on_error
+        )
+        
+        return self._finish_dag(context, schedule)
+    
+    def _run_dag_schedule(
+        self,
+        context: WorkflowContext,
+        schedule: "_DagSchedule",
+        on_stage_start: Optional[Callable[[str, WorkflowContext], None]],
+        on_stage_complete: Optional[Callable[[str, AgentResult, WorkflowContext], None]],
+        max_workers: int,
+        continue_on_error: bool
+    ):
+        """Drive a DAG schedule to completion on a thread pool."""
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(schedule.order)))) as executor:
+            running: Dict[Any, str] = {}
+            
+            while True:
+                for agent_name in self._inline_last(schedule.take_ready()):
+                    if on_stage_start:
+                        on_stage_start(agent_name, context)
+                    
+                    future = self._submit_stage(executor, agent_name, context, schedule.build_input(agent_name))
+                    running[future] = agent_name
+                
+                if not running:
+                    break
+                
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    agent_name = running.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logger.error(f"Agent {agent_name} failed with exception: {e}")
+                        result = AgentResult(status="error", error=str(e))
+                    
+                    self._complete_dag_stage(
+                        agent_name, result, context, schedule,
+                        on_stage_complete, continue_on_error
+                    )
+    
+    def _start_dag(
+        self,
+        context: WorkflowContext,
+        dependencies: Dict[str, List[str]],
+        mode: str,
+        continue_on_error: bool = False,
+        completed: Optional[List[str]] = None,
+        max_workers: Optional[int] = None
+    ) -> "_DagSchedule":
+        """
+        Validate the dependency graph, mark the workflow running and build its schedule.
+        
+        Agents listed in completed are treated as already finished: their
+        persisted stage outputs seed the schedule and they are not run.
+        """
+        graph = self._normalize_dependencies(dependencies, context.pipeline)
+        order = self.topological_order(graph)
+        
+        for agent_name in order:
+            if agent_name not in context.stages:
+                context.stages[agent_name] = WorkflowStage(agent_name=agent_name)
+        
+        completed_outputs = {
+            agent_name: context.stages[agent_name].output_data
+            for agent_name in completed or []
+            if agent_name in graph
+        }
+        
+        context.status = "running"
+        if mode != "resume":
+            context.metadata["execution"] = {
+                "mode": mode,
+                "dependencies": graph,
+                "max_workers": max_workers,
+                "continue_on_error": continue_on_error
+            }
+        context.add_trace_event(
+            "workflow", "start", "running",
+            details={"mode": mode, "dependencies": graph, "restored": list(completed_outputs)}
+        )
+        self.save_context(context)
+        
+        logger.info(f"Starting {mode} workflow with {len(order) - len(completed_outputs)} agents")
+        
+        base_input = {
+            "task": context.task_description,
+            "metadata": context.metadata
+        }
+        priority = None
+        if self.adaptive_scheduler is not None:
+            estimates = self.adaptive_scheduler.estimates(context.task_type.value)
+            priority = {agent_name: estimates.expected(agent_name) for agent_name in graph}
+        return _DagSchedule(graph, order, base_input, completed_outputs, priority)
+    
+    def _complete_dag_stage(
+        self,
+        agent_name: str,
+        result: AgentResult,
+        context: WorkflowContext,
+        schedule: "_DagSchedule",
+        on_stage_complete: Optional[Callable[[str, AgentResult, WorkflowContext], None]],
+        continue_on_error: bool
+    ):
+        """
+        Record a finished DAG stage, checkpoint it and release the agents waiting on it.
+        
+        Called from the scheduling thread only, so checkpoints never overlap.
+        """
+        if on_stage_complete:
+            on_stage_complete(agent_name, result, context)
+        
+        if result.status == "error":
+            schedule.had_error = True
+            context.add_trace_event(agent_name, "error", "failed", details={"error": result.error})
+            if not continue_on_error:
+                schedule.stopped = True
+        
+        schedule.mark_done(agent_name, result)
+        self.save_context(context)
+    
+    def _finish_dag(self, context: WorkflowContext, schedule: "_DagSchedule") -> WorkflowContext:
+        """Mark a DAG workflow as finished and persist it."""
+        context.status = "failed" if schedule.had_error else "completed"
+        context.completed_at = datetime.utcnow().isoformat()
+        context.add_trace_event("workflow", "complete", context.status)
+        self.save_context(context)
+        
+        logger.info(f"Workflow {'completed with errors' if schedule.had_error else 'completed successfully'}")
+        return context
+    
+    @staticmethod
+    def dependencies_from_groups(parallel_groups: List[List[str]]) -> Dict[str, List[str]]:
+        """
+        Derive a dependency graph from parallel groups.
+        
+        Every agent depends on all agents of the previous group, which
+        reproduces the barrier semantics of run_workflow_parallel.
+        
+        Args:
+            parallel_groups: List of agent groups.
+        
+        Returns:
+            Mapping of agent name to the agents it depends on.
+        """
+        dependencies: Dict[str, List[str]] = {}
+        previous_group: List[str] = []
+        for group in parallel_groups:
+            for agent_name in group:
+                dependencies[agent_name] = list(previous_group)
+            previous_group = list(group)
+        return dependencies
+    
+    @staticmethod
+    def topological_order(dependencies: Dict[str, List[str]]) -> List[str]:
+        """
+        Order agents so that every agent comes after its dependencies.
+        
+        Ties are broken by the order in which agents appear in the mapping.
+        
+        Args:
+            dependencies: Mapping of agent name to the agents it depends on.
+        
+        Returns:
+            List of agent names in a valid execution order.
+        
+        Raises:
+            ValueError: If the dependency graph contains a cycle.
+        """
+        remaining = {agent: set(deps) for agent, deps in dependencies.items()}
+        order: List[str] = []
+        
+        while remaining:
+            ready = [agent for agent, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Dependency cycle detected between agents: {sorted(remaining)}")
+            for agent in ready:
+                order.append(agent)
+                del remaining[agent]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        
+        return order
+    
+    def _normalize_dependencies(
+        self,
+        dependencies: Dict[str, List[str]],
+        pipeline: List[str]
+    ) -> Dict[str, List[str]]:
+        """
+        Restrict a dependency graph to known agents.
+        
+        Agents from the pipeline that are missing from the mapping are added
+        without dependencies, and dependencies on agents outside the graph
+        are dropped.
+        """
+        graph: Dict[str, List[str]] = {agent: list(deps) for agent, deps in dependencies.items()}
+        for agent_name in pipeline:
+            graph.setdefault(agent_name, [])
+        
+        for agent_name, deps in graph.items():
+            unknown = [dep for dep in deps if dep not in graph]
+            if unknown:
+                logger.warning(f"Ignoring unknown dependencies for {agent_name}: {unknown}")
+            graph[agent_name] = [dep for dep in deps if dep in graph and dep != agent_name]
+        
+        return graph
+    
+    def _execute_agent_thread_safe(
+        self,
+        agent_name: str,
+        context: WorkflowContext,
+        input_data: Dict[str, Any]
+    ) -> AgentResult:
+        """
+        Thread-safe wrapper for execute_agent.
+        
+        Avoids concurrent writes to context file by not saving during execution.
+        """
+        stage = self._begin_stage(agent_name, context, input_data)
+        start_time = time.time()
+        timed_out = None
+        
+        handler = self._agent_handlers.get(agent_name)
+        if not handler:
+            result = AgentResult(
+                status="skipped",
+                data={"message": f"No handler registered for agent: {agent_name}"},
+                error=None
+            )
+        else:
+            try:
+                result = self._call_handler_cached(
+                    agent_name, handler, context, input_data,
+                    self._build_handler_context(agent_name, context, input_data)
+                )
+            except StageTimeoutError as e:
+                timed_out = e
+                result = self._timeout_result(context, e)
+            except Exception as e:
+                logger.error(f"Agent {agent_name} execution failed: {e}")
+                result = AgentResult(
+                    status="error",
+                    error=str(e)
+                )
+        
+        self._finish_stage(agent_name, context, stage, result, start_time)
+        if timed_out:
+            self._watch_straggler(context, stage, timed_out)
+        return result
+    
+    async def _execute_agent_async(
+        self,
+        agent_name: str,
+        context: WorkflowContext,
+        input_data: Dict[str, Any],
+        semaphore: asyncio.Semaphore
+    ) -> AgentResult:
+        """
+        Async counterpart of _execute_agent_thread_safe.
+        
+        Async handlers are awaited on the event loop; sync handlers are
+        offloaded with asyncio.to_thread.
+        """
+        async with semaphore:
+            stage = self._begin_stage(agent_name, context, input_data)
+            start_time = time.time()
+            timed_out = None
+            
+            handler = self._agent_handlers.get(agent_name)
+            if not handler:
+                result = AgentResult(
+                    status="skipped",
+                    data={"message": f"No handler registered for agent: {agent_name}"},
+                    error=None
+                )
+            else:
+                try:
+                    result = await self._call_handler_cached_async(
+                        agent_name, handler, context, input_data,
+                        self._build_handler_context(agent_name, context, input_data)
+                    )
+                except StageTimeoutError as e:
+                    timed_out = e
+                    result = self._timeout_result(context, e)
+                except Exception as e:
+                    logger.error(f"Agent {agent_name} execution failed: {e}")
+                    result = AgentResult(
+                        status="error",
+                        error=str(e)
+                    )
+            
+            self._finish_stage(agent_name, context, stage, result, start_time)
+            if timed_out:
+                self._watch_straggler(context, stage, timed_out)
+            return result
+    
+    def _begin_stage(
+        self,
+        agent_name: str,
+        context: WorkflowContext,
+        input_data: Dict[str, Any]
+    ) -> Optional[WorkflowStage]:
+        """Mark a stage as in progress and return it."""
+        stage = context.stages.get(agent_name)
+        if stage:
+            stage.status = "in_progress"
+            stage.started_at = datetime.utcnow().isoformat()
+            stage.input_data = input_data
+        
+        context.current_agent = agent_name
+        return stage
+    
+    def _finish_stage(
+        self,
+        agent_name: str,
+        context: WorkflowContext,
+        stage: Optional[WorkflowStage],
+        result: AgentResult,
+        start_time: float
+    ):
+        """Record the result of a stage and add its execute trace event."""
+        result.duration_ms = (time.time() - start_time) * 1000
+        
+        if stage:
+            stage.status = "completed" if result.status == "success" else result.status
+            stage.completed_at = datetime.utcnow().isoformat()
+            stage.output_data = result.data
+            if result.error:
+                stage.error = result.error
+        
+        context.add_trace_event(
+            agent_name, "execute", result.status,
+            duration_ms=result.duration_ms,
+            details={"has_data": bool(result.data), "has_error": bool(result.error)}
+        )
+    
+    def _build_handler_context(
+        self,
+        agent_name: str,
+        context: WorkflowContext,
+        input_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Build the context dict passed to an agent handler."""
+        return {
+            "task": context.task_description,
+            "input": input_data,
+            "metadata": context.metadata,
+            "workflow_id": context.workflow_id,
+            "agent_name": agent_name,
+            "cancel_token": CancellationToken(),
+            "call_agent": self._create_call_agent_func(context, caller=agent_name),
+            "call_agent_async": self._create_call_agent_async_func(context, caller=agent_name),
+            "call_agent_future": self._create_call_agent_future_func(context, caller=agent_name)
+        }
+    
+    def _timeout_result(self, context: WorkflowContext, error: StageTimeoutError) -> AgentResult:
+        """Turn a stage timeout into a result according to the agent's straggler policy."""
+        policy = self.get_straggler_policy(error.agent_name)
+        logger.warning(f"{error} (on timeout: {policy})")
+        context.add_trace_event(
+            error.agent_name, "timeout", policy,
+            duration_ms=error.timeout * 1000,
+            details={"timeout_s": error.timeout, "policy": policy}
+        )
+        
+        status = {"fail": "error", "skip": "skipped", "continue": "timeout"}[policy]
+        return AgentResult(status=status, error=str(error), cacheable=False)
+    
+    def _watch_straggler(self, context: WorkflowContext, stage: Optional[WorkflowStage], error: StageTimeoutError):
+        """Record the late result of a timed-out handler left running under the "continue" policy."""
+        if error.future is None or self.get_straggler_policy(error.agent_name) != "continue":
+            return
+        
+        started = time.time() - error.timeout
+        
+        def on_done(future):
+            if future.cancelled():
+                return
+            try:
+                late = future.result()
+            except Exception as e:
+                late = AgentResult(status="error", error=str(e))
+            
+            if stage and stage.status == "timeout":
+                stage.status = "completed" if late.status == "success" else late.status
+                stage.completed_at = datetime.utcnow().isoformat()
+                stage.output_data = late.data
+                stage.error = late.error
+            context.add_trace_event(
+                error.agent_name, "late_result", late.status,
+                duration_ms=(time.time() - started) * 1000,
+                details={"timeout_s": error.timeout}
+            )
+            # A running workflow persists this with its next checkpoint
+            if context.status in ("completed", "failed"):
+                self.save_context(context)
+        
+        error.future.add_done_callback(on_done)
+    
+    def _call_handler_cached(
+        self,
+        agent_name: str,
+        handler: AnyAgentHandler,
+        context: WorkflowContext,
+        input_data: Dict[str, Any],
+        handler_context: Dict[str, Any]
+    ) -> AgentResult:
+        """Return a cached result for the stage if there is one, otherwise call the handler."""
+        with tracer.span(agent_name, "stage", {"agent": agent_name}, trace_id=context.workflow_id) as span:
+            cache_key, cached = self._lookup_cached_result(agent_name, context, input_data)
+            if cached:
+                span.set_attribute("cached", True)
+                return cached
+            
+            started = time.perf_counter()
+            result = self._call_handler(agent_name, handler, handler_context)
+            self._record_duration(agent_name, context, result, time.perf_counter() - started)
+            span.set_attribute("status", result.status)
+            self._store_cached_result(cache_key, agent_name, result)
+            return result
+    
+    async def _call_handler_cached_async(
+        self,
+        agent_name: str,
+        handler: AnyAgentHandler,
+        context: WorkflowContext,
+        input_data: Dict[str, Any],
+        handler_context: Dict[str, Any]
+    ) -> AgentResult:
+        """Async counterpart of _call_handler_cached; cache I/O runs off the event loop."""
+        with tracer.span(agent_name, "stage", {"agent": agent_name}, trace_id=context.workflow_id) as span:
+            if agent_name not in self._cacheable_agents or not self.result_cache:
+                started = time.perf_counter()
+                result = await self._call_handler_async(agent_name, handler, handler_context)
+                self._record_duration(agent_name, context, result, time.perf_counter() - started)
+                span.set_attribute("status", result.status)
+                return result
+            
+            cache_key, cached = await asyncio.to_thread(self._lookup_cached_result, agent_name, context, input_data)
+            if cached:
+                span.set_attribute("cached", True)
+                return cached
+            
+            started = time.perf_counter()
+            result = await self._call_handler_async(agent_name, handler, handler_context)
+            self._record_duration(agent_name, context, result, time.perf_counter() - started)
+            span.set_attribute("status", result.status)
+            await asyncio.to_thread(self._store_cached_result, cache_key, agent_name, result)
+            return result
+    
+    def _record_duration(self, agent_name: str, context: WorkflowContext, result: AgentResult, seconds: float):
+        """Add a stage's handler time to the adaptive scheduler's duration history."""
+        if self.adaptive_scheduler is None or result.status == "skipped":
+            return
+        try:
+            self.adaptive_scheduler.record(
+                agent_name, context.task_type.value, seconds, result.status, context.workflow_id
+            )
+        except Exception as e:
+            logger.warning(f"Could not record duration of {agent_name}: {e}")
+    
+    def _lookup_cached_result(
+        self,
+        agent_name: str,
+        context: WorkflowContext,
+        input_data: Dict[str, Any]
+    ) -> Tuple[Optional[str], Optional[AgentResult]]:
+        """
+        Compute the stage's cache key and look it up.
+        
+        Returns (None, None) when the agent is not cached. Hits and misses
+        are counted per workflow and recorded as "cache" trace events.
+        """
+        if agent_name not in self._cacheable_agents or not self.result_cache:
+            return None, None
+        
+        repo_root = self._repo_adapter.repo_root if self._repo_adapter else context.metadata.get("repo_root", os.getcwd())
+        revision = git_revision(repo_root)
+        if revision is None:
+            return None, None
+        
+        metadata = {
+            key: value for key, value in context.metadata.items()
+            if key not in self.VOLATILE_METADATA_KEYS
+        }
+        payload = {
+            "task": context.task_description,
+            "input": {key: value for key, value in input_data.items() if key != "metadata"},
+            "metadata": metadata,
+        }
+        cache_key = self.result_cache.make_key(agent_name, self.get_agent_version(agent_name), revision, payload)
+        cached = self.result_cache.get(cache_key)
+        
+        with self._cache_stats_lock:
+            stats = dict(context.metadata.get("result_cache", {"hits": 0, "misses": 0}))
+            stats["hits" if cached else "misses"] += 1
+            context.metadata["result_cache"] = stats
+            context.add_trace_event(
+                agent_name, "cache", "hit" if cached else "miss",
+                details={"key": cache_key[:16], "revision": revision, **stats}
+            )
+        
+        return cache_key, cached
+    
+    def _store_cached_result(self, cache_key: Optional[str], agent_name: str, result: AgentResult):
+        """Cache a successful, cacheable result."""
+        if not cache_key or result.status != "success" or not result.cacheable:
+            return
+        
+        try:
+            self.result_cache.put(cache_key, agent_name, result)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not cache result for {agent_name}: {e}")
+    
+    def _call_handler(self, agent_name: str, handler: AnyAgentHandler, handler_context: Dict[str, Any]) -> AgentResult:
+        """Call a handler from synchronous code, honouring the agent's concurrency limit."""
+        semaphore = self._agent_semaphores.get(agent_name)
+        if not semaphore:
+            return self._invoke_handler(agent_name, handler, handler_context)
+        
+        with semaphore:
+            return self._invoke_handler(agent_name, handler, handler_context)
+    
+    def _invoke_handler(self, agent_name: str, handler: AnyAgentHandler, handler_context: Dict[str, Any]) -> AgentResult:
+        """
+        Call a handler from synchronous code according to the agent's execution policy.
+        
+        With a timeout, thread and inline handlers run on a daemon thread so
+        a hung handler can be abandoned without blocking executor shutdown
+        or interpreter exit.
+        
+        Raises:
+            StageTimeoutError: If the handler exceeds the agent's timeout.
+        """
+        timeout = self.get_agent_timeout(agent_name)
+        if self.get_execution_policy(agent_name) == "process":
+            future = self._get_process_pool().submit(
+                _run_handler_in_process, handler, _picklable_handler_context(handler_context)
+            )
+        elif timeout is None:
+            return _run_handler(handler, handler_context)
+        else:
+            future = _start_handler_thread(agent_name, handler, handler_context)
+        
+        try:
+            return future.result(timeout=timeout)
+        except FuturesTimeoutError:
+            self._abandon_handler(agent_name, future, handler_context, timeout)
+            raise StageTimeoutError(agent_name, timeout, future) from None
+    
+    async def _call_handler_async(
+        self,
+        agent_name: str,
+        handler: AnyAgentHandler,
+        handler_context: Dict[str, Any]
+    ) -> AgentResult:
+        """Await a handler, honouring the agent's concurrency limit."""
+        semaphore = self._agent_semaphores.get(agent_name)
+        if not semaphore:
+            return await self._invoke_handler_async(agent_name, handler, handler_context)
+        
+        # The limit is shared with threaded workflows, so wait for it off the event loop
+        await asyncio.to_thread(semaphore.acquire)
+        try:
+            return await self._invoke_handler_async(agent_name, handler, handler_context)
+        finally:
+            semaphore.release()
+    
+    async def _invoke_handler_async(
+        self,
+        agent_name: str,
+        handler: AnyAgentHandler,
+        handler_context: Dict[str, Any]
+    ) -> AgentResult:
+        """
+        Await a handler according to the agent's execution policy.
+        
+        Raises:
+            StageTimeoutError: If the handler exceeds the agent's timeout.
+        """
+        policy = self.get_execution_policy(agent_name)
+        timeout = self.get_agent_timeout(agent_name)
+        if policy == "process":
+            awaitable = asyncio.wrap_future(self._get_process_pool().submit(
+                _run_handler_in_process, handler, _picklable_handler_context(handler_context)
+            ))
+        elif is_async_handler(handler):
+            awaitable = handler(handler_context)
+        elif timeout is not None:
+            awaitable = asyncio.wrap_future(_start_handler_thread(agent_name, handler, handler_context))
+        elif policy == "inline":
+            return handler(handler_context)
+        else:
+            return await asyncio.to_thread(handler, handler_context)
+        
+        if timeout is None:
+            return await awaitable
+        
+        # Shield the task so a "continue" straggler survives the timeout
+        task = asyncio.ensure_future(awaitable)
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeout)
+        except asyncio.TimeoutError:
+            self._abandon_handler(agent_name, task, handler_context, timeout)
+            raise StageTimeoutError(agent_name, timeout, task) from None
+    
+    def _abandon_handler(self, agent_name: str, future: Any, handler_context: Dict[str, Any], timeout: float):
+        """Cancel a timed-out handler unless its straggler policy lets it finish."""
+        if self.get_straggler_policy(agent_name) == "continue":
+            return
+        
+        token = handler_context.get("cancel_token")
+        if token:
+            token.cancel(f"timed out after {timeout:g}s")
+        future.cancel()
+    
+    def _submit_stage(
+        self,
+        executor: ThreadPoolExecutor,
+        agent_name: str,
+        context: WorkflowContext,
+        input_data: Dict[str, Any]
+    ) -> Future:
+        """
+        Start a stage on the executor, or run it on the calling thread for inline agents.
+        
+        Inline stages return an already completed future so callers can
+        collect them together with pooled stages.
+        """
+        if self.get_execution_policy(agent_name) != "inline":
+            return executor.submit(self._execute_agent_thread_safe, agent_name, context, input_data)
+        
+        future: Future = Future()
+        try:
+            future.set_result(self._execute_agent_thread_safe(agent_name, context, input_data))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+    
+    def _plan_groups(
+        self,
+        context: WorkflowContext,
+        parallel_groups: List[List[str]],
+        max_workers: Optional[int]
+    ) -> List[Tuple[List[str], int]]:
+        """
+        Get the submission order and worker pool size of each parallel group.
+        
+        The static scheduler keeps the plan order and uses max_workers. The
+        adaptive scheduler orders each group longest expected duration
+        first, sizes its pool to the expected parallelism and records the
+        schedule in the execution metadata.
+        """
+        if self.adaptive_scheduler is None:
+            limit = max_workers or self.DEFAULT_MAX_WORKERS
+            return [(list(group), max(1, min(limit, len(group)))) for group in parallel_groups]
+        
+        estimates = self.adaptive_scheduler.estimates(context.task_type.value)
+        plan = [
+            (estimates.longest_first(group), self.adaptive_scheduler.group_workers(group, estimates, max_workers))
+            for group in parallel_groups
+        ]
+        warnings = self.adaptive_scheduler.dominated_groups(parallel_groups, estimates)
+        for warning in warnings:
+            logger.warning(warning["message"])
+        
+        context.metadata["execution"]["max_workers"] = max([workers for _, workers in plan], default=1)
+        context.metadata["execution"]["schedule"] = {
+            "scheduler": "adaptive",
+            "group_workers": [workers for _, workers in plan],
+            "expected_seconds": {agent: estimates.expected(agent) for group in parallel_groups for agent in group},
+            "warnings": warnings,
+        }
+        return plan
+    
+    def _dag_pool_size(self, context: WorkflowContext, schedule: "_DagSchedule", max_workers: Optional[int]) -> int:
+        """
+        Get the worker pool size of a DAG run.
+        
+        The adaptive scheduler sizes the pool to the expected parallelism of
+        the stages still to run, capped by max_workers, and records it in the
+        execution metadata.
+        """
+        if self.adaptive_scheduler is None:
+            return max_workers or self.DEFAULT_MAX_WORKERS
+        
+        estimates = self.adaptive_scheduler.estimates(context.task_type.value)
+        workers = self.adaptive_scheduler.dag_workers(schedule.graph, estimates, max_workers, done=schedule.all_outputs)
+        execution = context.metadata.setdefault("execution", {})
+        execution["max_workers"] = workers
+        execution["schedule"] = {
+            "scheduler": "adaptive",
+            "workers": workers,
+            "expected_seconds": {agent: estimates.expected(agent) for agent in schedule.graph},
+        }
+        return workers
+    
+    def _inline_last(self, agent_names: List[str]) -> List[str]:
+        """Order agents so pooled stages are submitted before inline stages run."""
+        return sorted(agent_names, key=lambda name: self.get_execution_policy(name) == "inline")
+    
+    def _create_call_agent_func(
+        self,
+        context: WorkflowContext,
+        caller: Optional[str] = None,
+        caller_key: Optional[Tuple[str, str]] = None
+    ) -> Callable[[str, Dict[str, Any]], AgentResult]:
+        """
+        Create a call_agent function for cross-agent communication.
+        
+        This allows agents to call other agents directly during execution.
+        The caller is bound up front because context.current_agent is
+        overwritten when stages run in parallel.
+        """
+        def call_agent(agent_name: str, input_data: Dict[str, Any]) -> AgentResult:
+            return self._submit_agent_call(context, agent_name, input_data, caller, caller_key).result()
+        
+        return call_agent
+    
+    def _create_call_agent_async_func(
+        self,
+        context: WorkflowContext,
+        caller: Optional[str] = None,
+        caller_key: Optional[Tuple[str, str]] = None
+    ) -> Callable[[str, Dict[str, Any]], Awaitable[AgentResult]]:
+        """
+        Create an awaitable call_agent function for async handlers.
+        
+        Lets async handlers fan out to several agents concurrently, e.g. with
+        asyncio.gather, without blocking the event loop.
+        """
+        async def call_agent_async(agent_name: str, input_data: Dict[str, Any]) -> AgentResult:
+            return await asyncio.wrap_future(
+                self._submit_agent_call(context, agent_name, input_data, caller, caller_key)
+            )
+        
+        return call_agent_async
+    
+    def _create_call_agent_future_func(
+        self,
+        context: WorkflowContext,
+        caller: Optional[str] = None,
+        caller_key: Optional[Tuple[str, str]] = None
+    ) -> Callable[[str, Dict[str, Any]], Future]:
+        """
+        Create a call_agent_future function for sync handlers.
+        
+        Returns a Future of the AgentResult, so a sync handler can start
+        several calls before waiting on any of them.
+        """
+        def call_agent_future(agent_name: str, input_data: Dict[str, Any]) -> Future:
+            return self._submit_agent_call(context, agent_name, input_data, caller, caller_key)
+        
+        return call_agent_future
+    
+    def _submit_agent_call(
+        self,
+        context: WorkflowContext,
+        agent_name: str,
+        input_data: Dict[str, Any],
+        caller: Optional[str],
+        caller_key: Optional[Tuple[str, str]]
+    ) -> Future:
+        """
+        Start a cross-agent call, or join the identical call already made in this workflow.
+        
+        Calls are memoized per workflow on agent name plus input hash and run
+        on the shared call pool, so fan-out calls run concurrently and
+        identical calls run once. A call that would end up waiting on itself,
+        directly or through other calls, resolves to an error result instead
+        of deadlocking.
+        
+        Args:
+            caller: Agent making the call, for the trace.
+            caller_key: Key of the cross-agent call making this call; None
+                        when a workflow stage makes it.
+        """
+        calls = self._get_cross_agent_calls(context)
+        key = (agent_name, stable_hash(input_data))
+        with calls.lock:
+            call = calls.calls.get(key)
+            cycle = calls.find_cycle(caller_key, key) if call is not None and caller_key else None
+            if cycle is None:
+                if call is None:
+                    call = calls.calls[key] = _CrossAgentCall(
+                        lambda: self._run_agent_call(context, calls, key, input_data)
+                    )
+                    start = True
+                else:
+                    start = False
+                if caller_key:
+                    calls.waits.setdefault(caller_key, set()).add(key)
+        
+        details = {"caller": caller or context.current_agent}
+        if cycle is not None:
+            error = "Cross-agent call cycle: " + " -> ".join(name for name, _ in [caller_key] + cycle)
+            logger.error(error)
+            context.add_trace_event(agent_name, "cross_agent_call", "cycle", details=details)
+            failed: Future = Future()
+            failed.set_result(AgentResult(status="error", error=error, cacheable=False))
+            return failed
+        
+        if start:
+            logger.info(f"Cross-agent call: calling {agent_name}")
+            context.add_trace_event(agent_name, "cross_agent_call", "started", details=details)
+            # Run under the caller's context, so the call's span nests under the caller's
+            self._get_call_pool().submit(contextvars.copy_context().run, call.run)
+        else:
+            context.add_trace_event(agent_name, "cross_agent_call", "memoized", details=details)
+        return call
+    
+    def _run_agent_call(
+        self,
+        context: WorkflowContext,
+        calls: "_CrossAgentCalls",
+        key: Tuple[str, str],
+        input_data: Dict[str, Any]
+    ) -> AgentResult:
+        """Run one memoized cross-agent call. Nested calls it makes are tracked under its key."""
+        agent_name = key[0]
+        try:
+            handler = self._agent_handlers.get(agent_name)
             if not handler:
                 return AgentResult(
                     status="error",
@@ -895,14 +2428,22 @@ class WorkflowEngine:
                 )
             
             try:
-                result = handler({
-                    "task": context.task_description,
-                    "input": input_data,
-                    "metadata": context.metadata,
-                    "workflow_id": context.workflow_id,
-                    "agent_name": agent_name,
-                    "is_cross_agent_call": True
-                })
+                with tracer.span(
+                    f"call {agent_name}", "cross_agent_call", {"agent": agent_name}, trace_id=context.workflow_id
+                ) as span:
+                    result = self._call_handler(agent_name, handler, {
+                        "task": context.task_description,
+                        "input": input_data,
+                        "metadata": context.metadata,
+                        "workflow_id": context.workflow_id,
+                        "agent_name": agent_name,
+                        "is_cross_agent_call": True,
+                        "cancel_token": CancellationToken(),
+                        "call_agent": self._create_call_agent_func(context, agent_name, key),
+                        "call_agent_async": self._create_call_agent_async_func(context, agent_name, key),
+                        "call_agent_future": self._create_call_agent_future_func(context, agent_name, key)
+                    })
+                    span.set_attribute("status", result.status)
                 
                 context.add_trace_event(
                     agent_name, "cross_agent_call", result.status,
@@ -916,8 +2457,21 @@ class WorkflowEngine:
                     status="error",
                     error=str(e)
                 )
-        
-        return call_agent
+        finally:
+            with calls.lock:
+                calls.waits.pop(key, None)
+    
+    def _get_cross_agent_calls(self, context: WorkflowContext) -> "_CrossAgentCalls":
+        """Get the memoized cross-agent calls of a workflow run, keeping the most recent runs."""
+        with self._cross_agent_lock:
+            calls = self._cross_agent_calls.get(context.workflow_id)
+            # A resumed workflow has a new context and calls its agents afresh
+            if calls is None or calls.context is not context:
+                calls = self._cross_agent_calls[context.workflow_id] = _CrossAgentCalls(context)
+            self._cross_agent_calls.move_to_end(context.workflow_id)
+            while len(self._cross_agent_calls) > self.CROSS_AGENT_MEMO_WORKFLOWS:
+                self._cross_agent_calls.popitem(last=False)
+            return calls
     
     def get_workflow_plan(self, task_description: str) -> Dict[str, Any]:
         """
@@ -972,3 +2526,181 @@ class WorkflowEngine:
         for stage in plan["stages"]:
             print(f"  {stage['step']}. {stage['agent'].capitalize()}Agent -> {stage['description']}")
         print()
+
+
+class _CrossAgentCall(Future):
+    """
+    Future of a memoized cross-agent call.
+    
+    The call runs once: on a worker of the engine's call pool, or on the
+    first thread that waits for the result before a worker picks it up, so
+    nested calls cannot starve the pool.
+    """
+    
+    def __init__(self, run: Callable[[], AgentResult]):
+        super().__init__()
+        self._run = run
+        self._claimed = False
+        self._claim_lock = threading.Lock()
+    
+    def run(self):
+        """Run the call unless another thread already has."""
+        with self._claim_lock:
+            if self._claimed:
+                return
+            self._claimed = True
+        if not self.set_running_or_notify_cancel():
+            return
+        try:
+            self.set_result(self._run())
+        except Exception as e:
+            self.set_exception(e)
+    
+    def result(self, timeout: Optional[float] = None) -> AgentResult:
+        if timeout is None:
+            self.run()
+        return super().result(timeout)
+
+
+class _CrossAgentCalls:
+    """Cross-agent calls made during one workflow run."""
+    
+    def __init__(self, context: WorkflowContext):
+        self.context = context
+        self.calls: Dict[Tuple[str, str], _CrossAgentCall] = {}  # (agent, input hash) -> call
+        self.waits: Dict[Tuple[str, str], set] = {}  # Running call -> calls it made
+        self.lock = threading.Lock()
+    
+    def find_cycle(self, caller_key: Tuple[str, str], key: Tuple[str, str]) -> Optional[List[Tuple[str, str]]]:
+        """
+        Check whether waiting on a call would deadlock its caller. Called with the lock held.
+        
+        Returns:
+            The chain of calls from key back to caller_key, or None.
+        """
+        path = [key]
+        seen = set()
+        
+        def visit(current: Tuple[str, str]) -> bool:
+            if current == caller_key:
+                return True
+            if current in seen:
+                return False
+            seen.add(current)
+            for nested in self.waits.get(current, ()):
+                path.append(nested)
+                if visit(nested):
+                    return True
+                path.pop()
+            return False
+        
+        return path if visit(key) else None
+
+
+class _DagSchedule:
+    """Ready-queue bookkeeping shared by the DAG schedulers."""
+    
+    def __init__(
+        self,
+        graph: Dict[str, List[str]],
+        order: List[str],
+        base_input: Dict[str, Any],
+        completed: Optional[Dict[str, Dict[str, Any]]] = None,
+        priority: Optional[Dict[str, float]] = None
+    ):
+        self.graph = graph
+        self.order = order
+        # Ready agents are taken highest priority (expected duration) first, then in plan order
+        self.priority = priority or {}
+        self.base_input = base_input
+        self.remaining = {agent: set(deps) for agent, deps in graph.items()}
+        self.dependents: Dict[str, List[str]] = {agent: [] for agent in graph}
+        for agent, deps in graph.items():
+            for dep in deps:
+                self.dependents[dep].append(agent)
+        
+        # Stages finished in an earlier run release their dependents up front
+        self.all_outputs: Dict[str, Dict[str, Any]] = dict(completed or {})
+        for agent in self.all_outputs:
+            for dependent in self.dependents[agent]:
+                self.remaining[dependent].discard(agent)
+        self.ready = [
+            agent for agent in order
+            if not self.remaining[agent] and agent not in self.all_outputs
+        ]
+        self.ready.sort(key=self._ready_key)
+        self.had_error = False
+        self.stopped = False
+    
+    def take_ready(self) -> List[str]:
+        """Pop every agent whose dependencies have finished, unless scheduling was stopped."""
+        ready, self.ready = self.ready, []
+        return [] if self.stopped else ready
+    
+    def mark_done(self, agent_name: str, result: AgentResult):
+        """Store a finished agent's output and queue dependents that became ready."""
+        if result.status != "error":
+            self.all_outputs[agent_name] = result.data
+        
+        for dependent in self.dependents[agent_name]:
+            self.remaining[dependent].discard(agent_name)
+            if not self.remaining[dependent]:
+                self.ready.append(dependent)
+        self.ready.sort(key=self._ready_key)
+    
+    def _ready_key(self, agent_name: str) -> Tuple[float, int]:
+        return -self.priority.get(agent_name, 0.0), self.order.index(agent_name)
+    
+    def build_input(self, agent_name: str) -> Dict[str, Any]:
+        """Build the input for a stage from the outputs of its upstream agents."""
+        upstream = self.graph[agent_name]
+        agent_input = {**self.base_input, "all_outputs": dict(self.all_outputs)}
+        
+        upstream_outputs = {dep: self.all_outputs[dep] for dep in upstream if self.all_outputs.get(dep)}
+        if upstream_outputs:
+            first_upstream = next(iter(upstream_outputs))
+            agent_input["previous_agent"] = first_upstream
+            agent_input["previous_output"] = upstream_outputs[first_upstream]
+            if len(upstream) > 1:
+                agent_input["previous_group"] = list(upstream)
+                agent_input["previous_outputs"] = upstream_outputs
+        
+        return agent_input
+
+
+def _run_handler(handler: AnyAgentHandler, handler_context: Dict[str, Any]) -> AgentResult:
+    """Call a handler synchronously, running async handlers to completion."""
+    if is_async_handler(handler):
+        return asyncio.run(handler(handler_context))
+    return handler(handler_context)
+
+
+def _run_handler_in_process(handler: AnyAgentHandler, handler_context: Dict[str, Any]) -> AgentResult:
+    """Entry point for handlers executed in the process pool."""
+    return _run_handler(handler, handler_context)
+
+
+def _start_handler_thread(agent_name: str, handler: AnyAgentHandler, handler_context: Dict[str, Any]) -> Future:
+    """Run a handler on a daemon thread and return a future for its result."""
+    future: Future = Future()
+    
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(_run_handler(handler, handler_context))
+        except Exception as e:
+            future.set_exception(e)
+    
+    # Carry the caller's context so spans started by the handler nest under its stage
+    context = contextvars.copy_context()
+    threading.Thread(target=context.run, args=(run,), name=f"pnd-stage-{agent_name}", daemon=True).start()
+    return future
+
+
+def _picklable_handler_context(handler_context: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop the call_agent hooks and cancel token, which cannot cross a process boundary."""
+    return {
+        key: value for key, value in handler_context.items()
+        if not callable(value) and not isinstance(value, CancellationToken)
+    }